@@ -1,15 +1,47 @@
+import functools
+import inspect
 import typing
+from contextvars import ContextVar
 from logging import getLogger
 
 from sqlalchemy import and_, select
 from sqlalchemy.sql.elements import BinaryExpression
 
+from app.base.tracing import span
 from app.store.database.sqlalchemy_base import BaseModel
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
 BM = typing.TypeVar("BM", bound=BaseModel)
+# параметры нового экземпляра для get_or_create или функция, которая их отдает
+CreateParams = (
+    dict[str, typing.Any] | typing.Callable[[], dict[str, typing.Any]]
+)
+
+
+def get_create_params(create_params: CreateParams) -> dict[str, typing.Any]:
+    return create_params() if callable(create_params) else create_params
+
+
+# метод аксессора, который сейчас выполняется: им подписываются метрики
+# запросов к БД (см. app.store.metrics) и спаны трассировки
+current_operation: ContextVar[str] = ContextVar(
+    "current_operation", default="other"
+)
+
+
+def _track_operation(operation: str, method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = current_operation.set(operation)
+        try:
+            with span(operation):
+                return await method(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+
+    return wrapper
 
 
 class BaseAccessor:
@@ -30,10 +62,12 @@ class BaseAccessor:
         self,
         model: BM,
         get_params: list[BinaryExpression],
-        create_params: dict[str, typing.Any],
+        create_params: CreateParams,
     ) -> tuple[bool, BM]:
         """Базовый метод для поиска экземпляра модели и его создания, если
-        он не обнаружен при поиске.
+        он не обнаружен при поиске. Вместо create_params можно передать
+        функцию, которая их возвращает: она вызывается, только если
+        экземпляр создается.
         Возвращает кортеж, состоящий из created (тип bool) и экземпляра модели.
         """
         created = False
@@ -42,8 +76,30 @@ class BaseAccessor:
         async with self.app.database.session() as session:
             instance = await session.scalar(get_query)
             if not instance:
-                instance = model(**create_params)
+                instance = model(**get_create_params(create_params))
                 session.add(instance)
                 await session.commit()
                 created = True
+                self.app.store.versions.bump_table(model.__tablename__)
             return created, instance
+
+
+class StorageAccessor(BaseAccessor):
+    """Аксессор данных (БД или хранилища в памяти). Его публичные корутины
+    оборачиваются так, чтобы на время их выполнения current_operation был
+    равен "Класс.метод", а в трассе update (если она есть) появлялся спан
+    с таким именем. Циклы и служебные объекты (воркеры, таймеры, Bot API)
+    наследуют BaseAccessor и не оборачиваются.
+    """
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if (
+                not name.startswith("_")
+                and name not in ("connect", "disconnect")
+                and inspect.iscoroutinefunction(value)
+            ):
+                setattr(
+                    cls, name, _track_operation(f"{cls.__name__}.{name}", value)
+                )
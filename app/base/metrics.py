@@ -0,0 +1,223 @@
+"""Метрики процесса и их выдача в текстовом формате Prometheus.
+
+Метрики живут в памяти процесса: наблюдение - это поиск корзины и пара
+сложений, поэтому сбор можно держать включенным всегда. Текст для
+Prometheus собирается только при запросе /metrics.
+"""
+
+import dataclasses
+import math
+import time
+from bisect import bisect_left
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+LabelValues = tuple[str, ...]
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин (как в Prometheus):
+    значение попадает в первую корзину, граница которой не меньше значения,
+    а значения больше последней границы - в корзину +Inf.
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.bucket_counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """Отдает пары (граница корзины, число значений не больше нее),
+        последняя граница - бесконечность.
+        """
+        result: list[tuple[float, int]] = []
+        total = 0
+        for bound, bucket_count in zip(
+            (*self.buckets, float("inf")), self.bucket_counts, strict=True
+        ):
+            total += bucket_count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, quantile: float) -> float:
+        """Оценивает квантиль сверху: отдает границу корзины, в которую он
+        попадает (0, если значений еще не было).
+        """
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        for bound, total in self.cumulative_counts():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    pairs: str = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values, strict=True)
+    )
+    return f"{{{pairs}}}"
+
+
+def format_samples(
+    name: str,
+    kind: str,
+    documentation: str,
+    samples: Mapping[LabelValues, float],
+    labelnames: Sequence[str] = (),
+) -> list[str]:
+    """Переводит значения счетчика или gauge (kind) в строки Prometheus."""
+    lines: list[str] = [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} {kind}",
+    ]
+    lines.extend(
+        f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}"
+        for labels, value in samples.items()
+    )
+    return lines
+
+
+def format_histograms(
+    name: str,
+    documentation: str,
+    histograms: Mapping[LabelValues, Histogram],
+    labelnames: Sequence[str] = (),
+) -> list[str]:
+    """Переводит гистограммы (по одной на набор значений меток) в строки
+    Prometheus: накопленные корзины, сумму и количество значений.
+    """
+    lines: list[str] = [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} histogram",
+    ]
+    bucket_labelnames: tuple[str, ...] = (*labelnames, "le")
+    for labels, histogram in histograms.items():
+        for bound, total in histogram.cumulative_counts():
+            bucket_labels: str = _format_labels(
+                bucket_labelnames, (*labels, _format_value(bound))
+            )
+            lines.append(f"{name}_bucket{bucket_labels} {total}")
+        formatted_labels: str = _format_labels(labelnames, labels)
+        lines.append(
+            f"{name}_sum{formatted_labels} {_format_value(histogram.sum)}"
+        )
+        lines.append(f"{name}_count{formatted_labels} {histogram.count}")
+    return lines
+
+
+def format_stats(
+    prefix: str, stats: Any, gauges: Collection[str] = ()
+) -> list[str]:
+    """Переводит датакласс со счетчиками (JobStats, TimerStats и т.п.)
+    в метрики prefix_<поле>: поля из gauges - gauge, остальные - счетчики.
+    """
+    lines: list[str] = []
+    for field in dataclasses.fields(stats):
+        value: float = getattr(stats, field.name)
+        documentation = f"{type(stats).__name__}.{field.name}"
+        if field.name in gauges:
+            lines += format_samples(
+                f"{prefix}_{field.name}", "gauge", documentation, {(): value}
+            )
+        else:
+            lines += format_samples(
+                f"{prefix}_{field.name}_total",
+                "counter",
+                documentation,
+                {(): value},
+            )
+    return lines
+
+
+class Counter:
+    """Счетчик Prometheus с метками."""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+        # у счетчика без меток значение 0 видно и до первого события
+        self.values: dict[LabelValues, float] = {} if labelnames else {(): 0}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        return format_samples(
+            self.name,
+            "counter",
+            self.documentation,
+            self.values,
+            self.labelnames,
+        )
+
+
+class LabeledHistogram:
+    """Набор гистограмм с одинаковыми корзинами: по одной на каждый
+    набор значений меток.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets: tuple[float, ...] = tuple(buckets)
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+        self.histograms: dict[LabelValues, Histogram] = (
+            {} if labelnames else {(): Histogram(self.buckets)}
+        )
+
+    def labels(self, *labels: str) -> Histogram:
+        histogram: Histogram | None = self.histograms.get(labels)
+        if histogram is None:
+            histogram = self.histograms[labels] = Histogram(self.buckets)
+        return histogram
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.labels(*labels).observe(value)
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Замеряет время блока в секундах (и при исключении тоже)."""
+        started: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self) -> list[str]:
+        return format_histograms(
+            self.name, self.documentation, self.histograms, self.labelnames
+        )
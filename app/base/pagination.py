@@ -0,0 +1,84 @@
+"""Постраничная выдача по ключу (keyset pagination).
+
+Следующая страница запрашивается не по номеру (OFFSET), а по курсору:
+значениям ключа сортировки последней строки страницы. Запрос страницы
+продолжает чтение индекса с этого места, поэтому время ответа не зависит
+от номера страницы и размера таблицы.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from marshmallow import ValidationError, fields
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    """Упаковывает значения ключа строки в непрозрачную строку курсора."""
+    raw: bytes = json.dumps(values, default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Распаковывает курсор. Вызывает ValueError, если курсор поврежден."""
+    try:
+        raw: bytes = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError("invalid cursor") from error
+    if not isinstance(values, list):
+        raise ValueError("invalid cursor")
+    return values
+
+
+def escape_like(value: str) -> str:
+    """Экранирует спецсимволы LIKE, чтобы искать строку как есть."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def make_page(
+    rows: Sequence[T], limit: int, key: Callable[[T], tuple[Any, ...]]
+) -> Page[T]:
+    """Собирает страницу из limit + 1 строк: лишняя строка означает, что
+    есть следующая страница, и курсор строится по последней строке страницы.
+    """
+    items: list[T] = list(rows[:limit])
+    if len(rows) <= limit:
+        return Page(items)
+    return Page(items, encode_cursor(*key(items[-1])))
+
+
+class Cursor(fields.Field):
+    """Поле схемы для курсора: проверяет его и приводит значения ключа
+    к нужным типам (converters - по одному на значение).
+    """
+
+    def __init__(self, *converters: Callable[[Any], Any], **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.converters = converters
+
+    def _deserialize(self, value, attr, data, **kwargs) -> tuple[Any, ...]:
+        try:
+            values: list[Any] = decode_cursor(str(value))
+            if len(values) != len(self.converters):
+                raise ValueError("invalid cursor")
+            return tuple(
+                convert(item)
+                for convert, item in zip(self.converters, values, strict=True)
+            )
+        except (TypeError, ValueError) as error:
+            raise ValidationError("Invalid cursor.") from error
@@ -0,0 +1,234 @@
+"""Трассировка обработки updates.
+
+Каждому update, попавшему в выборку, заводится трасса (Trace): корневой
+спан от получения update до конца его обработки. Текущий спан хранится
+в contextvar, поэтому вложенные спаны (вызовы аксессоров, запросы
+к Bot API) не нужно передавать по цепочке вызовов. Если update не попал
+в выборку, текущего спана нет, и span() ничего не делает.
+
+Готовые трассы копятся в ограниченном буфере Tracer и выгружаются в формате
+OTLP JSON (см. app.store.tracing).
+"""
+
+import random
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+TRACE_BUFFER_SIZE = 1000  # при переполнении вытесняются самые старые трассы
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_UNSET = 0
+STATUS_CODE_ERROR = 2
+
+_NO_SPAN = nullcontext()
+
+
+@dataclass
+class Span:
+    trace: "Trace" = field(repr=False)
+    span_id: str
+    parent_span_id: str | None
+    name: str
+    start_time: int  # наносекунды с начала эпохи
+    end_time: int | None = None
+    kind: int = SPAN_KIND_INTERNAL
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Trace:
+    """Трасса одного update: корневой спан и все его потомки."""
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        start_time: int,
+        attributes: dict[str, Any],
+    ) -> None:
+        self.tracer = tracer
+        self.trace_id: str = _new_id(128)
+        self.root = Span(
+            self, _new_id(64), None, name, start_time, attributes=attributes
+        )
+        self.spans: list[Span] = [self.root]
+
+    def add_span(
+        self,
+        name: str,
+        start_time: int,
+        end_time: int | None = None,
+        parent: Span | None = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        **attributes: Any,
+    ) -> Span:
+        """Добавляет спан (по умолчанию - потомка корневого спана)."""
+        span = Span(
+            self,
+            _new_id(64),
+            (parent or self.root).span_id,
+            name,
+            start_time,
+            end_time,
+            kind,
+            attributes,
+        )
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def activate(self) -> Iterator[Span]:
+        """Делает корневой спан текущим на время блока, а после блока
+        завершает трассу и отдает ее трейсеру.
+        """
+        token = current_span.set(self.root)
+        try:
+            yield self.root
+        except BaseException as error:
+            self.root.error = type(error).__name__
+            raise
+        finally:
+            current_span.reset(token)
+            self.root.end_time = time.time_ns()
+            self.tracer.record(self)
+
+
+@contextmanager
+def _child_span(
+    parent: Span, name: str, kind: int, attributes: dict[str, Any]
+) -> Iterator[Span]:
+    span: Span = parent.trace.add_span(
+        name, time.time_ns(), parent=parent, kind=kind, **attributes
+    )
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as error:
+        span.error = type(error).__name__
+        raise
+    finally:
+        current_span.reset(token)
+        span.end_time = time.time_ns()
+
+
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any):
+    """Контекстный менеджер спана - потомка текущего спана. Вне трассы
+    (или если трасса уже завершена, а задача, запущенная из нее, еще
+    работает) отдает общий пустой контекстный менеджер, в блок приходит None.
+    """
+    parent: Span | None = current_span.get()
+    if parent is None or parent.trace.root.end_time is not None:
+        return _NO_SPAN
+    return _child_span(parent, name, kind, attributes)
+
+
+class Tracer:
+    """Заводит трассы для доли sample_rate updates и хранит последние
+    buffer_size завершенных трасс до выгрузки.
+    """
+
+    def __init__(
+        self, sample_rate: float = 0.0, buffer_size: int = TRACE_BUFFER_SIZE
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.traces: deque[Trace] = deque(maxlen=buffer_size)
+        self.started = 0
+        self.dropped = 0
+
+    def start_trace(
+        self, name: str, start_time: int | None = None, **attributes: Any
+    ) -> Trace | None:
+        """Заводит трассу, если она попала в выборку, иначе отдает None."""
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        self.started += 1
+        return Trace(self, name, start_time or time.time_ns(), attributes)
+
+    def record(self, trace: Trace) -> None:
+        if len(self.traces) == self.traces.maxlen:
+            self.dropped += 1
+        self.traces.append(trace)
+
+    def drain(self) -> list[Trace]:
+        """Забирает все накопленные трассы."""
+        traces: list[Trace] = list(self.traces)
+        self.traces.clear()
+        return traces
+
+
+def _to_otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _to_otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _to_otlp_value(value)}
+        for key, value in attributes.items()
+    ]
+
+
+def _to_otlp_span(span: Span) -> dict[str, Any]:
+    otlp_span: dict[str, Any] = {
+        "traceId": span.trace.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time or span.start_time),
+        "attributes": _to_otlp_attributes(span.attributes),
+        "status": (
+            {"code": STATUS_CODE_ERROR, "message": span.error}
+            if span.error
+            else {"code": STATUS_CODE_UNSET}
+        ),
+    }
+    if span.parent_span_id:
+        otlp_span["parentSpanId"] = span.parent_span_id
+    return otlp_span
+
+
+def to_otlp(traces: list[Trace], service_name: str) -> dict[str, Any]:
+    """Переводит трассы в тело запроса OTLP/HTTP в формате JSON."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _to_otlp_attributes(
+                        {"service.name": service_name}
+                    )
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __name__},
+                        "spans": [
+                            _to_otlp_span(span)
+                            for trace in traces
+                            for span in trace.spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
@@ -9,7 +9,17 @@ CARDS: dict[str, int] = {
 
 BLACK_JACK = 21
 DILLER_STOP_SCORE = 17
+# пределы очков в симуляторе: очки там хранятся в int16, а раздача
+# с очень большим порогом не закончилась бы никогда
+SIMULATION_MIN_SCORE = 0
+SIMULATION_MAX_SCORE = 100
 MINIMAL_BET = 10
+NO_BET = 1  # ставка геймплея, пока игрок не сделал ставку
+
+# Шу (подставка для карт): сколько колод в нем замешано и какая часть шу
+# раздается до подрезной карты, после которой шу перемешивается заново
+SHOE_DECKS_NUMBER = 6
+SHOE_PENETRATION = 0.75
 
 
 class GameStatus(enum.StrEnum):
@@ -35,3 +45,34 @@ class PlayerStatus(enum.StrEnum):
     LOST = "lost"  # игрок проигрывает (его ставка - диллеру)
     WON = "won"  # ставка оплачивается 1:1 (т.е. плюсуем к балансу сумму ставки)
     TIE = "tie"  # в случае ничьей все остаются при своих
+
+
+class PlayerAction(enum.StrEnum):
+    HIT = "hit"  # игрок берет карту
+    STAND = "stand"  # игрок больше не берет карты
+
+
+class GameAction(enum.StrEnum):
+    """Коды действий в журнале игры (GameModel.actions). По сиду игры и этому
+    журналу восстанавливаются все карты игроков и диллера.
+    """
+
+    BET = "b"  # игрок сделал ставку и получил 2 карты
+    HIT = "h"  # игрок взял карту
+    STAND = "s"  # игрок больше не берет карты
+    DILLER = "d"  # диллер добрал карты
+
+
+class GameEventType(enum.StrEnum):
+    """Типы событий в журнале событий игр (таблица game_events)."""
+
+    CREATE = "create"  # игра создана
+    JOIN = "join"  # игрок присоединился к игре
+    STAGE = "stage"  # игра перешла на новую стадию
+    BET = "bet"  # игрок сделал ставку и получил 2 карты
+    HIT = "hit"  # игрок взял карту
+    STAND = "stand"  # игрок больше не берет карты
+    DILLER = "diller"  # диллер добрал карты
+    SETTLE = "settle"  # подведен итог игрока
+    FINISH = "finish"  # игра завершена
+    CANCEL = "cancel"  # игра отменена
@@ -0,0 +1,93 @@
+"""Восстановление состояния игры по журналу событий (таблица game_events).
+
+Журнал событий пишется параллельно с таблицами games и gameplays. Игра,
+собранная из событий, совпадает с игрой из этих таблиц: статусы, стадия,
+ставки и журнал действий берутся из событий, а карты выводятся по сиду
+так же, как для игры из БД (см. app.game.replay).
+"""
+
+from collections.abc import Iterable
+
+from .const import (
+    NO_BET,
+    GameAction,
+    GameEventType,
+    GameStage,
+    GameStatus,
+    PlayerStatus,
+)
+from .models import GameEventModel, GameModel, GamePlayModel
+from .replay import make_action, restore_game_cards
+
+# события, которые попадают в журнал действий игры
+EVENT_ACTIONS: dict[GameEventType, GameAction] = {
+    GameEventType.BET: GameAction.BET,
+    GameEventType.HIT: GameAction.HIT,
+    GameEventType.STAND: GameAction.STAND,
+    GameEventType.DILLER: GameAction.DILLER,
+}
+
+
+def _apply_player_event(gameplay: GamePlayModel, event: GameEventModel) -> None:
+    """Применяет к геймплею событие игрока."""
+    if event.type == GameEventType.BET:
+        gameplay.player_bet = event.data["bet"]
+    if event.type == GameEventType.STAND:
+        gameplay.player_status = PlayerStatus.STANDING
+    elif "status" in event.data:
+        gameplay.player_status = PlayerStatus(event.data["status"])
+
+
+def _apply_game_event(game: GameModel, event: GameEventModel) -> None:
+    """Применяет к игре событие, которое меняет ее стадию или статус."""
+    if event.type == GameEventType.STAGE:
+        game.stage = GameStage(event.data["stage"])
+    elif event.type == GameEventType.FINISH:
+        game.status = GameStatus.FINISHED
+    elif event.type == GameEventType.CANCEL:
+        game.status = GameStatus.CANCELED
+
+
+def rebuild_game(events: Iterable[GameEventModel]) -> GameModel | None:
+    """Собирает игру (без записи в БД) из ее событий, упорядоченных по id.
+    Возвращает None, если среди событий нет создания игры.
+    """
+    game: GameModel | None = None
+    gameplays: dict[int, GamePlayModel] = {}
+
+    for event in events:
+        if event.type == GameEventType.CREATE:
+            game = GameModel(
+                id=event.game_id,
+                chat_id=event.chat_id,
+                created_at=event.created_at,
+                status=GameStatus.ACTIVE,
+                stage=GameStage.WAITING_FOR_PLAYERS_TO_JOIN,
+                seed=event.data["seed"],
+                actions=[],
+                diller_cards=[],
+            )
+        elif game is None:
+            continue
+        elif event.type == GameEventType.JOIN:
+            gameplays[event.player_id] = GamePlayModel(
+                game_id=game.id,
+                player_id=event.player_id,
+                player_bet=NO_BET,
+                player_status=PlayerStatus.BETTING,
+            )
+        elif event.player_id in gameplays:
+            _apply_player_event(gameplays[event.player_id], event)
+        else:
+            _apply_game_event(game, event)
+
+        if game and event.type in EVENT_ACTIONS:
+            game.actions.append(
+                make_action(EVENT_ACTIONS[event.type], event.player_id)
+            )
+
+    if game is None:
+        return None
+    game.gameplays = list(gameplays.values())
+    restore_game_cards(game)
+    return game
@@ -1,27 +1,30 @@
 import re
-from datetime import datetime
-from typing import Annotated
+from datetime import date, datetime
+from typing import Annotated, Any
 
 from sqlalchemy import (
     ARRAY,
     BigInteger,
     CheckConstraint,
     ForeignKey,
+    Index,
     String,
     UniqueConstraint,
     text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.store.database.sqlalchemy_base import BaseModel
 from app.web.exceptions import TgUsernameError
 
-from .const import GameStage, GameStatus, PlayerStatus
+from .const import GameEventType, GameStage, GameStatus, PlayerStatus
 
 TG_USERNAME_REGEX: str = r"^[a-zA-Z0-9_]{5,32}$"
 DEFAULT_NEW_BALANCE = 1000
 intpk = Annotated[int, mapped_column(primary_key=True)]
 int_default_1000 = Annotated[int, mapped_column(default=DEFAULT_NEW_BALANCE)]
+counter = Annotated[int, mapped_column(default=0, server_default="0")]
 created_at = Annotated[
     datetime, mapped_column(server_default=text("TIMEZONE('utc', now())"))
 ]
@@ -42,6 +45,21 @@ class PlayerModel(BaseModel):
         back_populates="player"
     )
 
+    # индексы для поиска игроков (см. PlayerAccessor.list_players): по началу
+    # username без учета регистра и по части имени (нужно расширение pg_trgm)
+    __table_args__ = (
+        Index(
+            "players_username_prefix_idx",
+            text("lower(username) varchar_pattern_ops"),
+        ),
+        Index(
+            "players_first_name_trgm_idx",
+            "first_name",
+            postgresql_using="gin",
+            postgresql_ops={"first_name": "gin_trgm_ops"},
+        ),
+    )
+
     @validates("username")
     def validate_username(self, key: str, value: str):
         if value and not re.match(TG_USERNAME_REGEX, value):
@@ -66,6 +84,15 @@ class BalanceModel(BaseModel):
 
     __table_args__ = (
         UniqueConstraint("chat_id", "player_id", name="chat_player_unique"),
+        Index("balances_player_id_id_idx", "player_id", "id"),
+        Index("balances_chat_id_id_idx", "chat_id", "id"),
+        # по этим индексам загружаются топы балансов (см. LeaderboardAccessor)
+        Index(
+            "balances_chat_id_current_value_idx",
+            "chat_id",
+            text("current_value DESC"),
+        ),
+        Index("balances_current_value_idx", text("current_value DESC")),
     )
 
 
@@ -91,9 +118,28 @@ class GameModel(BaseModel):
         default=GameStage.WAITING_FOR_PLAYERS_TO_JOIN
     )
     diller_cards: Mapped[list[str]] = mapped_column(ARRAY(String))
+    # сид шу и журнал действий, по которым восстанавливаются карты игры
+    # (см. app.game.replay), сами массивы карт пишутся один раз в конце игры
+    seed: Mapped[int | None] = mapped_column(BigInteger())
+    actions: Mapped[list[str]] = mapped_column(
+        ARRAY(String), default=list, server_default="{}"
+    )
+    # шу после восстановления карт (не колонка): из него раздаются следующие
+    # карты, чтобы не проигрывать журнал заново на каждую карту
+    shoe = None
 
+    # ленивая загрузка запрещена: геймплеи подгружаются в запросе игры явно,
+    # а обращение к неподгруженным падает вместо скрытого запроса (N+1)
     gameplays: Mapped[list["GamePlayModel"]] = relationship(
-        back_populates="game"
+        back_populates="game", lazy="raise_on_sql"
+    )
+
+    # индексы для постраничной выдачи игр по (created_at, id), см. list_games
+    __table_args__ = (
+        Index("games_created_at_id_idx", "created_at", "id"),
+        Index("games_chat_id_created_at_id_idx", "chat_id", "created_at", "id"),
+        Index("games_status_created_at_id_idx", "status", "created_at", "id"),
+        Index("games_stage_created_at_id_idx", "stage", "created_at", "id"),
     )
 
 
@@ -114,7 +160,9 @@ class GamePlayModel(BaseModel):
     player_cards: Mapped[list[str] | None] = mapped_column(ARRAY(String))
 
     game: Mapped["GameModel"] = relationship(back_populates="gameplays")
-    player: Mapped["PlayerModel"] = relationship(back_populates="gameplays")
+    player: Mapped["PlayerModel"] = relationship(
+        back_populates="gameplays", lazy="raise_on_sql"
+    )
 
     __table_args__ = (
         UniqueConstraint("game_id", "player_id", name="game_player_unique"),
@@ -122,3 +170,76 @@ class GamePlayModel(BaseModel):
             "player_bet > 0", name="positive_player_bet_constraint"
         ),
     )
+
+
+class GameEventModel(BaseModel):
+    """Событие игры в журнале, в который только дописывают. По событиям
+    игры можно восстановить ее состояние (см. app.game.events), а аналитика
+    может читать журнал, не нагружая таблицы games и gameplays.
+    """
+
+    __tablename__ = "game_events"
+
+    repr_cols = ("type",)
+
+    id: Mapped[int] = mapped_column(BigInteger(), primary_key=True)
+    game_id: Mapped[int] = mapped_column(
+        ForeignKey("games.id", ondelete="CASCADE")
+    )
+    chat_id: Mapped[int] = mapped_column(BigInteger())
+    player_id: Mapped[int | None]
+    type: Mapped[GameEventType]
+    data: Mapped[dict[str, Any]] = mapped_column(JSONB(), server_default="{}")
+    # время события, а не записи: события пишутся в БД пачками
+    created_at: Mapped[datetime]
+
+    __table_args__ = (Index("game_events_game_id_idx", "game_id", "id"),)
+
+
+class PlayerStatsModel(BaseModel):
+    """Счетчики игр игрока в чате. Обновляются в транзакции завершения игры
+    (см. app.store.game.stats), поэтому статистика читается по первичному
+    ключу, без сканирования gameplays.
+    """
+
+    __tablename__ = "player_stats"
+
+    repr_cols = ("wins",)
+
+    chat_id: Mapped[int] = mapped_column(BigInteger(), primary_key=True)
+    player_id: Mapped[int] = mapped_column(
+        ForeignKey("players.id", ondelete="CASCADE"), primary_key=True
+    )
+    games: Mapped[counter]
+    wins: Mapped[counter]
+    losses: Mapped[counter]  # включая перебор
+    ties: Mapped[counter]
+    black_jacks: Mapped[counter]
+    wagered: Mapped[counter]  # сумма всех ставок
+    net: Mapped[counter]  # итоговый выигрыш (или проигрыш, если меньше 0)
+
+
+class ChatStatsModel(BaseModel):
+    """Счетчики игр чата: завершенные и отмененные игры, число игроков,
+    которые сыграли в чате хотя бы одну игру.
+    """
+
+    __tablename__ = "chat_stats"
+
+    chat_id: Mapped[int] = mapped_column(
+        BigInteger(), primary_key=True, autoincrement=False
+    )
+    games: Mapped[counter]
+    players: Mapped[counter]
+    cancels: Mapped[counter]
+
+
+class ChatDayStatsModel(BaseModel):
+    """Счетчики игр чата за сутки (по UTC)."""
+
+    __tablename__ = "chat_day_stats"
+
+    chat_id: Mapped[int] = mapped_column(BigInteger(), primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    games: Mapped[counter]
+    cancels: Mapped[counter]
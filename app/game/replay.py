@@ -0,0 +1,100 @@
+"""Детерминированное восстановление карт игры по сиду и журналу действий.
+
+Вместо того чтобы перезаписывать массивы карт на каждую взятую карту, игра
+хранит сид шу и журнал действий (GameModel.actions). Карты игроков и диллера
+заново выводятся отсюда: это и рабочий путь бота, и инструмент для разбора
+спорных игр.
+"""
+
+import typing
+from dataclasses import dataclass, field
+
+from app.web.exceptions import SeedlessGameError
+
+from .const import BLACK_JACK, CARDS, DILLER_STOP_SCORE, GameAction
+from .shoe import Shoe
+
+if typing.TYPE_CHECKING:
+    from .models import GameModel
+
+ACE_SCORE = 11
+ACTION_SEPARATOR = ":"
+
+
+@dataclass
+class GameReplay:
+    """Карты игры после проигрывания журнала действий и шу в том
+    состоянии, в котором из него будет раздана следующая карта.
+    """
+
+    shoe: Shoe
+    diller_cards: list[str]
+    player_cards: dict[int, list[str]] = field(default_factory=dict)
+
+
+def make_action(action: GameAction, player_id: int | None = None) -> str:
+    """Делает запись для журнала действий, например 'h:12'."""
+    if player_id is None:
+        return action
+    return f"{action}{ACTION_SEPARATOR}{player_id}"
+
+
+def parse_action(record: str) -> tuple[GameAction, int | None]:
+    """Разбирает запись журнала действий на действие и id игрока."""
+    action, _, player_id = record.partition(ACTION_SEPARATOR)
+    return GameAction(action), int(player_id) if player_id else None
+
+
+def draw_diller_cards(diller_cards: list[str], shoe: Shoe) -> int:
+    """Добавляет диллеру карты из шу, пока число его очков не достигнет 17,
+    возвращает итоговое число очков диллера с учетом наличия тузов.
+    """
+    aces: int = sum(1 for card in diller_cards if CARDS[card] == ACE_SCORE)
+    score: int = sum(CARDS[card] for card in diller_cards)
+
+    while score > BLACK_JACK and aces:
+        score -= 10
+        aces -= 1
+
+    while score < DILLER_STOP_SCORE:
+        new_card: str = shoe.draw()
+        if CARDS[new_card] + score > BLACK_JACK and aces:
+            score -= 10
+            aces -= 1
+        score += CARDS[new_card]
+        diller_cards.append(new_card)
+    return score
+
+
+def replay_game(seed: int, actions: list[str]) -> GameReplay:
+    """Восстанавливает карты игры: первая карта шу всегда уходит диллеру при
+    создании игры, дальше карты раздаются в порядке записей журнала.
+    """
+    shoe = Shoe(seed)
+    replay = GameReplay(shoe=shoe, diller_cards=[shoe.draw()])
+
+    for record in actions:
+        action, player_id = parse_action(record)
+        if action == GameAction.BET:
+            replay.player_cards[player_id] = shoe.draw_many(2)
+        elif action == GameAction.HIT:
+            replay.player_cards[player_id].append(shoe.draw())
+        elif action == GameAction.DILLER:
+            draw_diller_cards(replay.diller_cards, shoe)
+    return replay
+
+
+def restore_game_cards(game: "GameModel") -> GameReplay:
+    """Заполняет карты диллера и игроков в загруженной игре по ее сиду
+    и журналу действий (без записи в БД) и запоминает в игре шу, из которого
+    будет раздана следующая карта. Игру без сида восстановить нельзя.
+    """
+    if game.seed is None:
+        raise SeedlessGameError(game.id)
+
+    replay = replay_game(game.seed, game.actions)
+    game.shoe = replay.shoe
+    game.diller_cards = replay.diller_cards
+    for gameplay in game.gameplays:
+        gameplay.player_cards = replay.player_cards.get(gameplay.player_id)
+    return replay
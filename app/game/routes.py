@@ -3,10 +3,17 @@ import typing
 from .views import (
     BalanceAddView,
     BalanceListView,
+    ChatStatsView,
+    ExportView,
     GameAddView,
+    GameEventListView,
     GameListView,
+    GameReplayView,
     PlayerAddView,
     PlayerListView,
+    PlayerStatsView,
+    SimulationView,
+    TopListView,
 )
 
 if typing.TYPE_CHECKING:
@@ -16,7 +23,14 @@ if typing.TYPE_CHECKING:
 def setup_routes(app: "Application"):
     app.router.add_view("/game.add", GameAddView)
     app.router.add_view("/game.list", GameListView)
+    app.router.add_view("/game.replay", GameReplayView)
+    app.router.add_view("/game.events", GameEventListView)
     app.router.add_view("/game.player.add", PlayerAddView)
     app.router.add_view("/game.player.list", PlayerListView)
     app.router.add_view("/game.player.balance.add", BalanceAddView)
     app.router.add_view("/game.player.balance.list", BalanceListView)
+    app.router.add_view("/game.player.balance.top", TopListView)
+    app.router.add_view("/game.player.stats", PlayerStatsView)
+    app.router.add_view("/game.chat.stats", ChatStatsView)
+    app.router.add_view("/game.simulate", SimulationView)
+    app.router.add_view("/game.export", ExportView)
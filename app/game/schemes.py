@@ -1,10 +1,30 @@
-from marshmallow import Schema, fields
-from marshmallow.validate import Regexp
+from datetime import UTC, datetime
 
+from marshmallow import Schema, ValidationError, fields, validates_schema
+from marshmallow.validate import Length, Range, Regexp
+
+from app.base.pagination import MAX_PAGE_SIZE, PAGE_SIZE, Cursor
+from app.store.game.export import ExportFormat, ExportTable
+from app.store.game.leaderboard import LEADERBOARD_CAPACITY, LEADERBOARD_SIZE
+from app.store.game.stats import CHAT_DAY_STATS_DAYS
 from app.web.exceptions import TG_USERNAME_ERROR
 
+from .const import (
+    BLACK_JACK,
+    DILLER_STOP_SCORE,
+    MINIMAL_BET,
+    SIMULATION_MAX_SCORE,
+    SIMULATION_MIN_SCORE,
+    GameStage,
+    GameStatus,
+)
 from .models import TG_USERNAME_REGEX
 
+SIMULATION_MAX_HANDS = 10_000_000
+CHAT_DAY_STATS_MAX_DAYS = 366
+USERNAME_PREFIX_REGEX: str = r"^[a-zA-Z0-9_]{1,32}$"
+FIRST_NAME_MAX_LENGTH = 64
+
 
 class PlayerSchema(Schema):
     id = fields.Int(required=False)
@@ -16,12 +36,24 @@ class PlayerSchema(Schema):
     tg_id = fields.Int(required=True)
 
 
-class PlayerListSchema(Schema):
-    players = fields.Nested(PlayerSchema, many=True)
+class PageQuerySchema(Schema):
+    limit = fields.Int(
+        load_default=PAGE_SIZE, validate=Range(min=1, max=MAX_PAGE_SIZE)
+    )
+    cursor = Cursor(int)
 
 
-class PlayerIdSchema(Schema):
-    player_id = fields.Int()
+class PlayerListQuerySchema(PageQuerySchema):
+    tg_id = fields.Int()
+    username = fields.Str(
+        validate=Regexp(regex=USERNAME_PREFIX_REGEX, error=TG_USERNAME_ERROR)
+    )
+    first_name = fields.Str(validate=Length(min=1, max=FIRST_NAME_MAX_LENGTH))
+
+
+class PlayerListSchema(Schema):
+    players = fields.Nested(PlayerSchema, many=True)
+    next_cursor = fields.Str(allow_none=True)
 
 
 class BalanceSchema(Schema):
@@ -34,8 +66,80 @@ class BalanceSchema(Schema):
     # min_value = fields.Int(required=False)
 
 
+class BalanceListQuerySchema(PageQuerySchema):
+    player_id = fields.Int()
+    chat_id = fields.Int()
+
+
 class BalanceListSchema(Schema):
     balances = fields.Nested(BalanceSchema, many=True)
+    next_cursor = fields.Str(allow_none=True)
+
+
+class TopQuerySchema(Schema):
+    chat_id = fields.Int(required=False)
+    limit = fields.Int(
+        load_default=LEADERBOARD_SIZE,
+        validate=Range(min=1, max=LEADERBOARD_CAPACITY),
+    )
+
+
+class TopEntrySchema(Schema):
+    chat_id = fields.Int()
+    player_id = fields.Int()
+    current_value = fields.Int()
+    player = fields.Nested(PlayerSchema, allow_none=True)
+
+
+class TopListSchema(Schema):
+    top = fields.Nested(TopEntrySchema, many=True)
+
+
+class PlayerStatsQuerySchema(Schema):
+    player_id = fields.Int(required=True)
+    chat_id = fields.Int(required=True)
+
+
+class PlayerStatsSchema(Schema):
+    chat_id = fields.Int()
+    player_id = fields.Int()
+    games = fields.Int()
+    wins = fields.Int()
+    losses = fields.Int()
+    ties = fields.Int()
+    black_jacks = fields.Int()
+    wagered = fields.Int()
+    net = fields.Int()
+
+
+class ChatStatsQuerySchema(Schema):
+    chat_id = fields.Int(required=True)
+    days = fields.Int(
+        load_default=CHAT_DAY_STATS_DAYS,
+        validate=Range(min=1, max=CHAT_DAY_STATS_MAX_DAYS),
+    )
+
+
+class ChatDayStatsSchema(Schema):
+    day = fields.Date()
+    games = fields.Int()
+    cancels = fields.Int()
+
+
+class ChatStatsSchema(Schema):
+    chat_id = fields.Int()
+    games = fields.Int()
+    players = fields.Int()
+    cancels = fields.Int()
+    days = fields.Nested(ChatDayStatsSchema, many=True)
+
+
+class ExportQuerySchema(Schema):
+    table = fields.Enum(ExportTable, by_value=True, required=True)
+    format = fields.Enum(
+        ExportFormat, by_value=True, load_default=ExportFormat.NDJSON
+    )
+    gzip = fields.Bool(load_default=False)
 
 
 class GamePlaySchema(Schema):
@@ -54,6 +158,8 @@ class GameSchema(Schema):
     status = fields.Str(required=False)
     stage = fields.Str(required=False)
     diller_cards = fields.List(fields.Str, required=True)
+    seed = fields.Int(dump_only=True)
+    actions = fields.List(fields.Str, dump_only=True)
     gameplays = fields.Nested(GamePlaySchema, many=True)
 
 
@@ -66,5 +172,99 @@ class GameUpdateStageSchema(Schema):
     diller_cards = fields.List(fields.Str, required=False)
 
 
+class GameListQuerySchema(Schema):
+    limit = fields.Int(
+        load_default=PAGE_SIZE, validate=Range(min=1, max=MAX_PAGE_SIZE)
+    )
+    cursor = Cursor(datetime.fromisoformat, int)
+    chat_id = fields.Int()
+    status = fields.Enum(GameStatus, by_value=True)
+    stage = fields.Enum(GameStage, by_value=True)
+    created_from = fields.NaiveDateTime(timezone=UTC)
+    created_to = fields.NaiveDateTime(timezone=UTC)
+    with_gameplays = fields.Bool(load_default=False)
+
+
 class GameListSchema(Schema):
     games = fields.Nested(GameSchema, many=True)
+    next_cursor = fields.Str(allow_none=True)
+
+
+class GameIdSchema(Schema):
+    game_id = fields.Int(required=True)
+
+
+class GameEventSchema(Schema):
+    id = fields.Int()
+    game_id = fields.Int()
+    chat_id = fields.Int()
+    player_id = fields.Int(allow_none=True)
+    type = fields.Str()
+    data = fields.Dict()
+    created_at = fields.DateTime()
+
+
+class GameEventListSchema(Schema):
+    events = fields.Nested(GameEventSchema, many=True)
+    game = fields.Nested(GameSchema, allow_none=True)
+
+
+class PlayerCardsSchema(Schema):
+    player_id = fields.Int()
+    player_cards = fields.List(fields.Str)
+
+
+class GameReplaySchema(Schema):
+    game_id = fields.Int()
+    seed = fields.Int()
+    actions = fields.List(fields.Str)
+    diller_cards = fields.List(fields.Str)
+    players = fields.Nested(PlayerCardsSchema, many=True)
+
+
+class SimulationSchema(Schema):
+    hands = fields.Int(
+        load_default=1_000_000,
+        validate=Range(min=1, max=SIMULATION_MAX_HANDS),
+    )
+    bet = fields.Int(load_default=MINIMAL_BET, validate=Range(min=1))
+    diller_stop_score = fields.Int(
+        load_default=DILLER_STOP_SCORE,
+        validate=Range(min=SIMULATION_MIN_SCORE, max=SIMULATION_MAX_SCORE),
+    )
+    black_jack = fields.Int(
+        load_default=BLACK_JACK,
+        validate=Range(min=SIMULATION_MIN_SCORE, max=SIMULATION_MAX_SCORE),
+    )
+    player_stop_score = fields.Int(
+        load_default=DILLER_STOP_SCORE,
+        validate=Range(min=SIMULATION_MIN_SCORE, max=SIMULATION_MAX_SCORE),
+    )
+    win_payout = fields.Float(load_default=1.0)
+    black_jack_payout = fields.Float(load_default=1.0)
+    seed = fields.Int(required=False, allow_none=True)
+
+    @validates_schema
+    def validate_stop_scores(self, data: dict, **kwargs) -> None:
+        """Игрок и диллер не берут карты, набрав black_jack очков."""
+        for name in ("diller_stop_score", "player_stop_score"):
+            if data.get(name, 0) > data.get("black_jack", BLACK_JACK):
+                raise ValidationError(
+                    "Must be less than or equal to black_jack.", name
+                )
+
+
+class SimulationResultSchema(Schema):
+    config = fields.Nested(SimulationSchema)
+    hands = fields.Int()
+    rtp = fields.Float()
+    house_edge = fields.Float()
+    variance = fields.Float()
+    balance_drift = fields.Float()
+    balance_drift_std = fields.Float()
+    expected_balance = fields.Float()
+    win_rate = fields.Float()
+    loss_rate = fields.Float()
+    tie_rate = fields.Float()
+    exceeded_rate = fields.Float()
+    black_jack_rate = fields.Float()
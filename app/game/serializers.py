@@ -0,0 +1,22 @@
+"""Функции быстрой сериализации моделей игры (см. app.web.serializers).
+Отдают те же поля, что и схемы из app.game.schemes.
+"""
+
+from app.web.serializers import Serializer, make_serializer
+
+from .models import (
+    BalanceModel,
+    GameEventModel,
+    GameModel,
+    GamePlayModel,
+    PlayerModel,
+)
+
+serialize_player: Serializer = make_serializer(PlayerModel)
+serialize_balance: Serializer = make_serializer(BalanceModel)
+serialize_gameplay: Serializer = make_serializer(GamePlayModel)
+serialize_game: Serializer = make_serializer(
+    GameModel, nested={"gameplays": serialize_gameplay}
+)
+serialize_game_without_gameplays: Serializer = make_serializer(GameModel)
+serialize_game_event: Serializer = make_serializer(GameEventModel)
@@ -0,0 +1,56 @@
+import random
+
+from .const import CARDS, SHOE_DECKS_NUMBER, SHOE_PENETRATION
+
+# порядок карт в колоде: индекс карты в этом кортеже хранится в шу одним байтом
+CARD_NAMES: tuple[str, ...] = tuple(CARDS)
+SEED_BITS = 63  # сид хранится в BigInteger
+
+
+class Shoe:
+    """Шу из нескольких колод, которое перемешивается один раз за игру.
+
+    Порядок карт полностью определяется сидом, поэтому с игрой хранится только
+    сид, а шу восстанавливается из него. Карты хранятся в виде байтов (один
+    байт - индекс карты в CARD_NAMES), а раздача карты - это просто сдвиг
+    указателя position. Когда указатель доходит до подрезной карты, шу
+    перемешивается заново тем же генератором случайных чисел.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        decks_number: int = SHOE_DECKS_NUMBER,
+        penetration: float = SHOE_PENETRATION,
+    ) -> None:
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._unshuffled_cards = (
+            bytearray(range(len(CARD_NAMES))) * decks_number
+        )
+        self.cards = self._shuffle_cards()
+        self.position = 0
+        self.cut_position = int(len(self.cards) * penetration)
+
+    @staticmethod
+    def generate_seed() -> int:
+        """Генерирует сид для новой игры."""
+        return random.SystemRandom().getrandbits(SEED_BITS)
+
+    def _shuffle_cards(self) -> bytes:
+        cards = self._unshuffled_cards.copy()
+        self._random.shuffle(cards)
+        return bytes(cards)
+
+    def draw(self) -> str:
+        """Отдает следующую карту из шу, при необходимости перемешивая его."""
+        if self.position >= self.cut_position:
+            self.cards = self._shuffle_cards()
+            self.position = 0
+        card: str = CARD_NAMES[self.cards[self.position]]
+        self.position += 1
+        return card
+
+    def draw_many(self, number: int) -> list[str]:
+        """Отдает number следующих карт из шу."""
+        return [self.draw() for _ in range(number)]
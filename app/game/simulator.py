@@ -0,0 +1,318 @@
+"""Монте-Карло симулятор игры по правилам бота.
+
+Раздачи играются пачками на массивах NumPy, пачки распределяются по ядрам
+через пул процессов. Симулятор нужен, чтобы оценить доходность для игрока
+(RTP), дисперсию и дрейф баланса до того, как менять правила игры.
+
+Запуск из командной строки:
+    python -m app.game.simulator --hands 10000000 --player-stop-score 16 17
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from itertools import product
+
+import numpy as np
+
+from .const import (
+    BLACK_JACK,
+    DILLER_STOP_SCORE,
+    MINIMAL_BET,
+    RANKS,
+    SIMULATION_MAX_SCORE,
+    SIMULATION_MIN_SCORE,
+)
+from .models import DEFAULT_NEW_BALANCE
+
+# очки карт каждого достоинства (колода считается бесконечной, для шу
+# из нескольких колод разница пренебрежима)
+RANK_SCORES: np.ndarray = np.array(list(RANKS.values()), dtype=np.int8)
+ACE_SCORE = 11
+ACE_SCORE_DIFFERENCE = 10  # туз может стоить 1 очко вместо 11
+BATCH_SIZE = 1_000_000
+SESSION_HANDS = 100  # за сколько раздач считается дрейф баланса
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """Правила, по которым играется симуляция. По умолчанию совпадают
+    с правилами бота: выплата 1:1 и за выигрыш, и за блэкджек.
+
+    player_stop_score - стратегия игрока: он берет карты, пока сумма его
+    очков меньше этого числа.
+    """
+
+    hands: int = BATCH_SIZE
+    bet: int = MINIMAL_BET
+    diller_stop_score: int = DILLER_STOP_SCORE
+    black_jack: int = BLACK_JACK
+    player_stop_score: int = DILLER_STOP_SCORE
+    win_payout: float = 1.0
+    black_jack_payout: float = 1.0
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("diller_stop_score", "black_jack", "player_stop_score"):
+            if not (
+                SIMULATION_MIN_SCORE
+                <= getattr(self, name)
+                <= SIMULATION_MAX_SCORE
+            ):
+                raise ValueError(
+                    f"{name} must be between {SIMULATION_MIN_SCORE}"
+                    f" and {SIMULATION_MAX_SCORE}"
+                )
+
+
+@dataclass
+class SimulationTotals:
+    """Суммы по сыгранным раздачам, которые можно складывать между пачками."""
+
+    hands: int = 0
+    payout_sum: float = 0.0
+    payout_square_sum: float = 0.0
+    wins: int = 0
+    losses: int = 0
+    ties: int = 0
+    exceeded: int = 0
+    black_jacks: int = 0
+
+    def __add__(self, other: "SimulationTotals") -> "SimulationTotals":
+        return SimulationTotals(
+            **{
+                key: value + getattr(other, key)
+                for key, value in asdict(self).items()
+            }
+        )
+
+
+@dataclass
+class SimulationResult:
+    """Итоги симуляции для одной конфигурации правил.
+
+    rtp - доля поставленных очков, которая возвращается игроку;
+    variance - дисперсия выигрыша за раздачу в ставках;
+    balance_drift - ожидаемое изменение баланса за SESSION_HANDS раздач,
+    balance_drift_std - его стандартное отклонение.
+    """
+
+    config: SimulationConfig
+    hands: int
+    rtp: float
+    house_edge: float
+    variance: float
+    balance_drift: float
+    balance_drift_std: float
+    expected_balance: float
+    win_rate: float
+    loss_rate: float
+    tie_rate: float
+    exceeded_rate: float
+    black_jack_rate: float
+
+    @classmethod
+    def from_totals(
+        cls, config: SimulationConfig, totals: SimulationTotals
+    ) -> "SimulationResult":
+        hands = max(totals.hands, 1)
+        mean = totals.payout_sum / hands
+        variance = totals.payout_square_sum / hands - mean**2
+        drift = mean * config.bet * SESSION_HANDS
+        return cls(
+            config=config,
+            hands=totals.hands,
+            rtp=1 + mean,
+            house_edge=-mean,
+            variance=variance,
+            balance_drift=drift,
+            balance_drift_std=float(
+                np.sqrt(max(variance, 0.0) * SESSION_HANDS) * config.bet
+            ),
+            expected_balance=DEFAULT_NEW_BALANCE + drift,
+            win_rate=totals.wins / hands,
+            loss_rate=totals.losses / hands,
+            tie_rate=totals.ties / hands,
+            exceeded_rate=totals.exceeded / hands,
+            black_jack_rate=totals.black_jacks / hands,
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _draw(rng: np.random.Generator, size: int) -> np.ndarray:
+    return RANK_SCORES[rng.integers(len(RANK_SCORES), size=size)]
+
+
+def _reduce_aces(scores: np.ndarray, aces: np.ndarray, black_jack: int) -> None:
+    """Считает тузы за 1 очко, пока сумма очков больше black_jack (как
+    GameManager.process_score_with_aces).
+    """
+    while True:
+        mask = (scores > black_jack) & (aces > 0)
+        if not mask.any():
+            return
+        scores[mask] -= ACE_SCORE_DIFFERENCE
+        aces[mask] -= 1
+
+
+def _play_player_hands(
+    config: SimulationConfig, rng: np.random.Generator, hands: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Раздает игрокам по 2 карты, затем игроки берут карты, пока очков
+    меньше player_stop_score. Возвращает очки игроков и маску блэкджеков.
+    """
+    first_cards, second_cards = _draw(rng, hands), _draw(rng, hands)
+    scores = first_cards.astype(np.int16) + second_cards
+    aces = (first_cards == ACE_SCORE).astype(np.int8) + (
+        second_cards == ACE_SCORE
+    )
+    _reduce_aces(scores, aces, config.black_jack)
+    black_jacks = scores == config.black_jack
+
+    taking = scores < config.player_stop_score
+    while taking.any():
+        new_cards = _draw(rng, hands)
+        scores[taking] += new_cards[taking]
+        aces[taking] += new_cards[taking] == ACE_SCORE
+        _reduce_aces(scores, aces, config.black_jack)
+        taking &= scores < config.player_stop_score
+    return scores, black_jacks
+
+
+def _play_diller_hands(
+    config: SimulationConfig, rng: np.random.Generator, hands: int
+) -> np.ndarray:
+    """Добирает карты диллеру так же, как GameManager.take_cards_by_diller:
+    туз, пришедший во время добора, всегда считается за 11 очков.
+    """
+    first_cards = _draw(rng, hands)
+    scores = first_cards.astype(np.int16)
+    aces = (first_cards == ACE_SCORE).astype(np.int8)
+    taking = scores < config.diller_stop_score
+    while taking.any():
+        new_cards = _draw(rng, hands)
+        soften = taking & (new_cards + scores > config.black_jack) & (aces > 0)
+        scores[soften] -= ACE_SCORE_DIFFERENCE
+        aces[soften] -= 1
+        scores[taking] += new_cards[taking]
+        taking &= scores < config.diller_stop_score
+    return scores
+
+
+def simulate_batch(
+    config: SimulationConfig, hands: int, seed: np.random.SeedSequence
+) -> SimulationTotals:
+    """Играет hands раздач одного игрока против диллера по правилам бота
+    и подводит итоги, как BotHandler._handle_game_summarizing_stage.
+    """
+    rng = np.random.default_rng(seed)
+    player_scores, black_jacks = _play_player_hands(config, rng, hands)
+    diller_scores = _play_diller_hands(config, rng, hands)
+
+    exceeded = player_scores > config.black_jack
+    won = ~exceeded & (
+        (diller_scores > config.black_jack) | (player_scores > diller_scores)
+    )
+    lost = exceeded | (~won & (player_scores < diller_scores))
+    payouts = np.where(
+        black_jacks, config.black_jack_payout, config.win_payout
+    ) * won - lost.astype(np.float64)
+
+    return SimulationTotals(
+        hands=hands,
+        payout_sum=float(payouts.sum()),
+        payout_square_sum=float(np.square(payouts).sum()),
+        wins=int(won.sum()),
+        losses=int(lost.sum()),
+        ties=int((~won & ~lost).sum()),
+        exceeded=int(exceeded.sum()),
+        black_jacks=int(black_jacks.sum()),
+    )
+
+
+def _split_hands(hands: int, batch_size: int) -> list[int]:
+    batches = [batch_size] * (hands // batch_size)
+    if hands % batch_size:
+        batches.append(hands % batch_size)
+    return batches
+
+
+def simulate(
+    config: SimulationConfig,
+    executor: Executor | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> SimulationResult:
+    """Разбивает раздачи на пачки и играет их в executor (если он передан)
+    или в текущем процессе.
+    """
+    batches = _split_hands(config.hands, batch_size)
+    seeds = np.random.SeedSequence(config.seed).spawn(len(batches))
+    if executor is None:
+        results = map(simulate_batch, [config] * len(batches), batches, seeds)
+    else:
+        results = executor.map(
+            simulate_batch, [config] * len(batches), batches, seeds
+        )
+    return SimulationResult.from_totals(
+        config, sum(results, SimulationTotals())
+    )
+
+
+def simulate_many(
+    configs: list[SimulationConfig], workers: int | None = None
+) -> list[SimulationResult]:
+    """Прогоняет симуляцию для каждой конфигурации в общем пуле процессов."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [simulate(config, executor) for config in configs]
+
+
+def _parse_args(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Монте-Карло симуляция блэкджека по правилам бота"
+    )
+    parser.add_argument("--hands", type=int, default=10 * BATCH_SIZE)
+    parser.add_argument("--bet", type=int, default=MINIMAL_BET)
+    parser.add_argument(
+        "--diller-stop-score", type=int, nargs="+", default=[DILLER_STOP_SCORE]
+    )
+    parser.add_argument(
+        "--player-stop-score", type=int, nargs="+", default=[DILLER_STOP_SCORE]
+    )
+    parser.add_argument("--win-payout", type=float, default=1.0)
+    parser.add_argument("--black-jack-payout", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> None:
+    """Печатает итоги симуляции по одной JSON-строке на конфигурацию."""
+    parsed_args = _parse_args(args)
+    base_config = SimulationConfig(
+        hands=parsed_args.hands,
+        bet=parsed_args.bet,
+        win_payout=parsed_args.win_payout,
+        black_jack_payout=parsed_args.black_jack_payout,
+        seed=parsed_args.seed,
+    )
+    configs: list[SimulationConfig] = [
+        replace(
+            base_config,
+            diller_stop_score=diller_stop_score,
+            player_stop_score=player_stop_score,
+        )
+        for diller_stop_score, player_stop_score in product(
+            parsed_args.diller_stop_score, parsed_args.player_stop_score
+        )
+    ]
+    for result in simulate_many(configs, parsed_args.workers):
+        sys.stdout.write(json.dumps(result.to_dict()) + "\n")
+
+
+if __name__ == "__main__":
+    main()
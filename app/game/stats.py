@@ -0,0 +1,39 @@
+"""Итоги игроков, по которым обновляются счетчики статистики (таблицы
+player_stats, chat_stats и chat_day_stats).
+"""
+
+from dataclasses import dataclass
+
+from .const import BLACK_JACK, PlayerStatus
+from .models import GamePlayModel
+
+BLACK_JACK_CARDS_NUMBER = 2
+
+
+@dataclass(frozen=True)
+class PlayerResult:
+    player_id: int
+    status: PlayerStatus
+    bet: int
+    black_jack: bool = False
+
+    @property
+    def balance_change(self) -> int:
+        if self.status == PlayerStatus.WON:
+            return self.bet
+        if self.status == PlayerStatus.TIE:
+            return 0
+        return -self.bet
+
+
+def get_player_result(gameplay: GamePlayModel, score: int) -> PlayerResult:
+    """Собирает итог игрока по геймплею с финальным статусом."""
+    return PlayerResult(
+        player_id=gameplay.player_id,
+        status=PlayerStatus(gameplay.player_status),
+        bet=gameplay.player_bet,
+        black_jack=(
+            score == BLACK_JACK
+            and len(gameplay.player_cards) == BLACK_JACK_CARDS_NUMBER
+        ),
+    )
@@ -0,0 +1,152 @@
+"""Таблицы исходов диллера и базовая стратегия игрока по правилам бота.
+
+Таблицы считаются один раз на процесс (это занимает миллисекунды), после
+чего подсказка игроку - это поиск в словаре без обращений к БД.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import cache
+
+from .const import BLACK_JACK, CARDS, DILLER_STOP_SCORE, RANKS, PlayerAction
+
+ACE_SCORE = 11
+ACE_SCORE_DIFFERENCE = 10  # туз может стоить 1 очко вместо 11
+DILLER_BUST = BLACK_JACK + 1  # все переборы диллера сводятся к одному исходу
+MIN_HARD_SCORE = 4  # две двойки
+MIN_SOFT_SCORE = 12  # два туза
+
+# вероятность вытянуть карту с такими очками (колода считается бесконечной)
+SCORE_PROBABILITIES: dict[int, float] = {
+    score: list(RANKS.values()).count(score) / len(RANKS)
+    for score in sorted(set(RANKS.values()))
+}
+
+
+@dataclass(frozen=True)
+class StrategyHint:
+    """Подсказка для игрока: что выгоднее сделать и почему.
+
+    hit_ev и stand_ev - ожидаемый выигрыш в ставках, если взять карту
+    и если больше не брать карты.
+    """
+
+    action: PlayerAction
+    hit_ev: float
+    stand_ev: float
+    diller_bust_probability: float
+
+
+def get_hand_state(cards: list[str]) -> tuple[int, bool]:
+    """Считает очки руки так же, как GameManager.process_score_with_aces,
+    и определяет, мягкая ли рука (есть туз, который считается за 11 очков).
+    """
+    aces: int = sum(1 for card in cards if CARDS[card] == ACE_SCORE)
+    score: int = sum(CARDS[card] for card in cards)
+    while score > BLACK_JACK and aces:
+        score -= ACE_SCORE_DIFFERENCE
+        aces -= 1
+    return score, aces > 0
+
+
+def _diller_outcomes(
+    score: int, aces: int, stop_score: int
+) -> dict[int, float]:
+    """Распределение итоговых очков диллера, который добирает карты так же,
+    как GameManager.take_cards_by_diller: туз, пришедший во время добора,
+    всегда считается за 11 очков.
+    """
+    if score >= stop_score:
+        return {min(score, DILLER_BUST): 1.0}
+
+    outcomes: dict[int, float] = defaultdict(float)
+    for card_score, probability in SCORE_PROBABILITIES.items():
+        new_score, new_aces = score, aces
+        if card_score + new_score > BLACK_JACK and new_aces:
+            new_score -= ACE_SCORE_DIFFERENCE
+            new_aces -= 1
+        for final_score, final_probability in _diller_outcomes(
+            new_score + card_score, new_aces, stop_score
+        ).items():
+            outcomes[final_score] += probability * final_probability
+    return dict(outcomes)
+
+
+class StrategyTable:
+    """Таблицы исходов диллера для каждой открытой карты и решения
+    базовой стратегии для каждой суммы очков игрока (мягкой и жесткой).
+    """
+
+    def __init__(self, diller_stop_score: int = DILLER_STOP_SCORE) -> None:
+        self.diller_stop_score = diller_stop_score
+        self.diller_outcomes: dict[int, dict[int, float]] = {
+            up_card: _diller_outcomes(
+                up_card, int(up_card == ACE_SCORE), diller_stop_score
+            )
+            for up_card in SCORE_PROBABILITIES
+        }
+        self.hints: dict[tuple[int, bool, int], StrategyHint] = {}
+        hands: list[tuple[int, bool]] = [
+            (score, False) for score in range(MIN_HARD_SCORE, BLACK_JACK + 1)
+        ] + [(score, True) for score in range(MIN_SOFT_SCORE, BLACK_JACK + 1)]
+        for up_card in SCORE_PROBABILITIES:
+            for score, soft in hands:
+                self._build_hint(score, soft, up_card)
+
+    def _stand_ev(self, score: int, up_card: int) -> float:
+        expected_value = 0.0
+        for final_score, probability in self.diller_outcomes[up_card].items():
+            if final_score == DILLER_BUST or score > final_score:
+                expected_value += probability
+            elif score < final_score:
+                expected_value -= probability
+        return expected_value
+
+    def _build_hint(self, score: int, soft: bool, up_card: int) -> StrategyHint:
+        """Считает подсказку для руки score/soft и кладет ее в self.hints.
+        Подсказки для рук после взятия карты считаются рекурсивно.
+        """
+        if (score, soft, up_card) in self.hints:
+            return self.hints[score, soft, up_card]
+
+        hit_ev = 0.0
+        for card_score, probability in SCORE_PROBABILITIES.items():
+            new_score = score + card_score
+            aces = int(soft) + int(card_score == ACE_SCORE)
+            while new_score > BLACK_JACK and aces:
+                new_score -= ACE_SCORE_DIFFERENCE
+                aces -= 1
+            if new_score > BLACK_JACK:
+                hit_ev -= probability
+            else:
+                new_hint = self._build_hint(new_score, aces > 0, up_card)
+                hit_ev += probability * max(new_hint.hit_ev, new_hint.stand_ev)
+
+        stand_ev = self._stand_ev(score, up_card)
+        hint = StrategyHint(
+            action=PlayerAction.HIT
+            if hit_ev > stand_ev
+            else PlayerAction.STAND,
+            hit_ev=hit_ev,
+            stand_ev=stand_ev,
+            diller_bust_probability=self.diller_outcomes[up_card].get(
+                DILLER_BUST, 0.0
+            ),
+        )
+        self.hints[score, soft, up_card] = hint
+        return hint
+
+    def get_hint(
+        self, player_cards: list[str], diller_card: str
+    ) -> StrategyHint:
+        """Отдает подсказку для карт игрока против открытой карты диллера."""
+        score, soft = get_hand_state(player_cards)
+        return self.hints[score, soft, CARDS[diller_card]]
+
+
+@cache
+def get_strategy_table(
+    diller_stop_score: int = DILLER_STOP_SCORE,
+) -> StrategyTable:
+    """Строит таблицы один раз на процесс."""
+    return StrategyTable(diller_stop_score)
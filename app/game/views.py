@@ -1,4 +1,11 @@
-from aiohttp.web_exceptions import HTTPNotFound
+from contextlib import aclosing
+
+from aiohttp.web import ContentCoding, StreamResponse
+from aiohttp.web_exceptions import (
+    HTTPConflict,
+    HTTPNotFound,
+    HTTPTooManyRequests,
+)
 from aiohttp_apispec import (
     docs,
     querystring_schema,
@@ -6,19 +13,50 @@ from aiohttp_apispec import (
     response_schema,
 )
 
+from app.store.game.export import (
+    EXPORT_CONTENT_TYPES,
+    ExportFormat,
+    ExportTable,
+)
+from app.store.versions import Resource
 from app.web.app import View
-from app.web.mixins import AuthRequiredMixin
+from app.web.exceptions import SimulationBusyError
+from app.web.mixins import AuthRequiredMixin, ConditionalGetMixin
+from app.web.serializers import serialize_many
 from app.web.utils import json_response
 
+from .events import rebuild_game
 from .models import GamePlayModel
+from .replay import GameReplay, replay_game
 from .schemes import (
+    BalanceListQuerySchema,
     BalanceListSchema,
     BalanceSchema,
+    ChatStatsQuerySchema,
+    ChatStatsSchema,
+    ExportQuerySchema,
+    GameEventListSchema,
+    GameIdSchema,
+    GameListQuerySchema,
     GameListSchema,
+    GameReplaySchema,
     GameSchema,
-    PlayerIdSchema,
+    PlayerListQuerySchema,
     PlayerListSchema,
     PlayerSchema,
+    PlayerStatsQuerySchema,
+    PlayerStatsSchema,
+    SimulationResultSchema,
+    SimulationSchema,
+    TopListSchema,
+    TopQuerySchema,
+)
+from .serializers import (
+    serialize_balance,
+    serialize_game,
+    serialize_game_event,
+    serialize_game_without_gameplays,
+    serialize_player,
 )
 
 
@@ -35,12 +73,31 @@ class PlayerAddView(AuthRequiredMixin, View):
         return json_response(data=PlayerSchema().dump(player))
 
 
-class PlayerListView(AuthRequiredMixin, View):
-    @docs(tags=["players"], summary="Get list of players")
+class PlayerListView(AuthRequiredMixin, ConditionalGetMixin, View):
+    resource = Resource.PLAYERS
+
+    @docs(
+        tags=["players"],
+        summary="Get a page of players, search by tg_id, username prefix "
+        "or first name",
+    )
+    @querystring_schema(PlayerListQuerySchema)
     @response_schema(PlayerListSchema, 200)
     async def get(self):
-        players = await self.store.players.list_players()
-        return json_response(data=PlayerListSchema().dump({"players": players}))
+        cursor: tuple[int] | None = self.data.get("cursor")
+        page = await self.store.players.list_players(
+            limit=self.data["limit"],
+            after=cursor[0] if cursor else None,
+            tg_id=self.data.get("tg_id"),
+            username=self.data.get("username"),
+            first_name=self.data.get("first_name"),
+        )
+        return json_response(
+            data={
+                "players": await serialize_many(serialize_player, page.items),
+                "next_cursor": page.next_cursor,
+            }
+        )
 
 
 class BalanceAddView(AuthRequiredMixin, View):
@@ -59,21 +116,116 @@ class BalanceAddView(AuthRequiredMixin, View):
         return json_response(data=BalanceSchema().dump(balance))
 
 
-class BalanceListView(AuthRequiredMixin, View):
-    @docs(tags=["players"], summary="Get balances list filtered by player id")
-    @querystring_schema(PlayerIdSchema)
+class BalanceListView(AuthRequiredMixin, ConditionalGetMixin, View):
+    resource = Resource.BALANCES
+
+    @docs(
+        tags=["players"],
+        summary="Get a page of balances filtered by player id and chat id",
+    )
+    @querystring_schema(BalanceListQuerySchema)
     @response_schema(BalanceListSchema, 200)
     async def get(self):
-        try:
-            player_id = int(self.request.query["player_id"])
-        except KeyError:
-            player_id = None
-        balances = await self.store.players.list_balances(player_id)
+        cursor: tuple[int] | None = self.data.get("cursor")
+        page = await self.store.players.list_balances(
+            player_id=self.data.get("player_id"),
+            chat_id=self.data.get("chat_id"),
+            limit=self.data["limit"],
+            after=cursor[0] if cursor else None,
+        )
+        return json_response(
+            data={
+                "balances": await serialize_many(serialize_balance, page.items),
+                "next_cursor": page.next_cursor,
+            }
+        )
+
+
+class TopListView(AuthRequiredMixin, View):
+    @docs(
+        tags=["players"],
+        summary="Get top balances in the chat or in all chats",
+    )
+    @querystring_schema(TopQuerySchema)
+    @response_schema(TopListSchema, 200)
+    async def get(self):
+        top = await self.store.leaderboard.get_top(
+            self.data.get("chat_id"), self.data["limit"]
+        )
+        return json_response(data=TopListSchema().dump({"top": top}))
+
+
+class PlayerStatsView(AuthRequiredMixin, View):
+    @docs(tags=["players"], summary="Get player statistics in the chat")
+    @querystring_schema(PlayerStatsQuerySchema)
+    @response_schema(PlayerStatsSchema, 200)
+    async def get(self):
+        stats = await self.store.stats.get_player_stats(
+            self.data["player_id"], self.data["chat_id"]
+        )
+        if not stats:
+            raise HTTPNotFound(reason="no stats for such player in the chat")
+        return json_response(data=PlayerStatsSchema().dump(stats))
+
+
+class ChatStatsView(AuthRequiredMixin, View):
+    @docs(tags=["games"], summary="Get chat statistics by days")
+    @querystring_schema(ChatStatsQuerySchema)
+    @response_schema(ChatStatsSchema, 200)
+    async def get(self):
+        chat_id: int = self.data["chat_id"]
+        stats = await self.store.stats.get_chat_stats(chat_id)
+        if not stats:
+            raise HTTPNotFound(reason="no stats for such chat")
+        days = await self.store.stats.list_chat_day_stats(
+            chat_id, self.data["days"]
+        )
         return json_response(
-            data=BalanceListSchema().dump({"balances": balances})
+            data=ChatStatsSchema().dump(
+                {
+                    "chat_id": stats.chat_id,
+                    "games": stats.games,
+                    "players": stats.players,
+                    "cancels": stats.cancels,
+                    "days": days,
+                }
+            )
         )
 
 
+class ExportView(AuthRequiredMixin, View):
+    @docs(
+        tags=["games"],
+        summary="Stream a full dump of games, gameplays or balances "
+        "as NDJSON or CSV",
+    )
+    @querystring_schema(ExportQuerySchema)
+    async def get(self):
+        table: ExportTable = self.data["table"]
+        export_format: ExportFormat = self.data["format"]
+        response = StreamResponse(
+            headers={
+                "Content-Type": EXPORT_CONTENT_TYPES[export_format],
+                "Content-Disposition": (
+                    f'attachment; filename="{table}.{export_format}"'
+                ),
+            }
+        )
+        response.enable_chunked_encoding()
+        if self.data["gzip"]:
+            response.enable_compression(ContentCoding.gzip)
+        await response.prepare(self.request)
+        # если клиент отключился, write падает, а aclosing сразу закрывает
+        # курсор БД, не дожидаясь сборки мусора
+        async with aclosing(
+            self.store.exports.export(table, export_format)
+        ) as chunks:
+            async for chunk in chunks:
+                await response.write(chunk.encode())
+        await response.write_eof()
+        return response
+
+
 class GameAddView(AuthRequiredMixin, View):
     @docs(tags=["games"], summary="Add new game")
     @request_schema(GameSchema)
@@ -96,9 +248,108 @@ class GameAddView(AuthRequiredMixin, View):
         return json_response(data=GameSchema().dump(game))
 
 
-class GameListView(AuthRequiredMixin, View):
-    @docs(tags=["games"], summary="Get list of games")
+class GameListView(AuthRequiredMixin, ConditionalGetMixin, View):
+    resource = Resource.GAMES
+
+    @docs(
+        tags=["games"],
+        summary="Get a page of games (newest first) filtered by chat, "
+        "status, stage and creation time",
+    )
+    @querystring_schema(GameListQuerySchema)
     @response_schema(GameListSchema, 200)
     async def get(self):
-        games = await self.store.games.list_games()
-        return json_response(data=GameListSchema().dump({"games": games}))
+        with_gameplays: bool = self.data["with_gameplays"]
+        page = await self.store.games.list_games(
+            limit=self.data["limit"],
+            after=self.data.get("cursor"),
+            chat_id=self.data.get("chat_id"),
+            status=self.data.get("status"),
+            stage=self.data.get("stage"),
+            created_from=self.data.get("created_from"),
+            created_to=self.data.get("created_to"),
+            with_gameplays=with_gameplays,
+        )
+        return json_response(
+            data={
+                "games": await serialize_many(
+                    serialize_game
+                    if with_gameplays
+                    else serialize_game_without_gameplays,
+                    page.items,
+                ),
+                "next_cursor": page.next_cursor,
+            }
+        )
+
+
+class GameReplayView(AuthRequiredMixin, View):
+    @docs(
+        tags=["games"],
+        summary="Replay game cards from its seed and actions log",
+    )
+    @querystring_schema(GameIdSchema)
+    @response_schema(GameReplaySchema, 200)
+    async def get(self):
+        game_id = int(self.request.query["game_id"])
+        game = await self.store.games.get_game_by_id(game_id)
+        if not game:
+            raise HTTPNotFound(reason="no such game id")
+        if game.seed is None:
+            raise HTTPConflict(reason="game was created without seed")
+
+        replay: GameReplay = replay_game(game.seed, game.actions)
+        return json_response(
+            data=GameReplaySchema().dump(
+                {
+                    "game_id": game.id,
+                    "seed": game.seed,
+                    "actions": game.actions,
+                    "diller_cards": replay.diller_cards,
+                    "players": [
+                        {"player_id": player_id, "player_cards": cards}
+                        for player_id, cards in replay.player_cards.items()
+                    ],
+                }
+            )
+        )
+
+
+class GameEventListView(AuthRequiredMixin, View):
+    @docs(
+        tags=["games"],
+        summary="Get game events and the game state rebuilt from them",
+    )
+    @querystring_schema(GameIdSchema)
+    @response_schema(GameEventListSchema, 200)
+    async def get(self):
+        game_id = int(self.request.query["game_id"])
+        events = await self.store.game_events.list_game_events(game_id)
+        if not events:
+            raise HTTPNotFound(reason="no events for such game id")
+        game = rebuild_game(events)
+        return json_response(
+            data={
+                "events": await serialize_many(serialize_game_event, events),
+                "game": serialize_game(game) if game else None,
+            }
+        )
+
+
+class SimulationView(AuthRequiredMixin, View):
+    @docs(
+        tags=["games"],
+        summary="Simulate games to estimate RTP for the given rules",
+    )
+    @request_schema(SimulationSchema)
+    @response_schema(SimulationResultSchema, 200)
+    async def post(self):
+        try:
+            result = await self.store.simulations.simulate(**self.data)
+        except SimulationBusyError:
+            raise HTTPTooManyRequests(
+                reason="simulation is already running"
+            ) from None
+        return json_response(
+            data=SimulationResultSchema().dump(result.to_dict())
+        )
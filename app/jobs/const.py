@@ -0,0 +1,17 @@
+import enum
+
+JOBS_BATCH_SIZE = 100  # сколько задач воркер забирает из очереди за раз
+JOBS_POLL_INTERVAL_IN_SECONDS = 0.5  # как часто воркер опрашивает очередь
+JOB_LEASE_IN_SECONDS = 60  # после этого задачу может забрать другой узел
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY_IN_SECONDS = 5  # задержка перед повтором, растет с попытками
+
+
+class JobStatus(enum.StrEnum):
+    PENDING = "pending"  # ждет своего времени или выполняется (есть аренда)
+    FAILED = "failed"  # исчерпала попытки, хранится для разбора
+
+
+class JobKind(enum.StrEnum):
+    START_BETTING_STAGE = "start_betting_stage"
+    CANCEL_GAME_DUE_TO_TIMER = "cancel_game_due_to_timer"
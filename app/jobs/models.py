@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Annotated, Any
+
+from sqlalchemy import BigInteger, Index, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.store.database.sqlalchemy_base import BaseModel
+
+from .const import JOB_MAX_ATTEMPTS, JobStatus
+
+utc_now = Annotated[
+    datetime, mapped_column(server_default=text("TIMEZONE('utc', now())"))
+]
+
+
+class JobModel(BaseModel):
+    """Отложенная задача в общей для всех узлов бота очереди.
+
+    Пока задача выполняется, у нее есть аренда: locked_by - узел, который ее
+    забрал, locked_until - до какого времени (UTC). Если узел упал и аренда
+    истекла, задачу забирает другой узел. Выполненные задачи удаляются.
+    """
+
+    __tablename__ = "jobs"
+
+    repr_cols = ("run_at",)
+
+    id: Mapped[int] = mapped_column(BigInteger(), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50))
+    payload: Mapped[dict[str, Any]] = mapped_column(
+        JSONB(), server_default="{}"
+    )
+    status: Mapped[JobStatus] = mapped_column(default=JobStatus.PENDING)
+    run_at: Mapped[utc_now]
+    created_at: Mapped[utc_now]
+    attempts: Mapped[int] = mapped_column(server_default="0")
+    max_attempts: Mapped[int] = mapped_column(
+        default=JOB_MAX_ATTEMPTS, server_default=str(JOB_MAX_ATTEMPTS)
+    )
+    locked_by: Mapped[str | None] = mapped_column(String(100))
+    locked_until: Mapped[datetime | None]
+    last_error: Mapped[str | None]
+
+    __table_args__ = (
+        # частичный индекс: воркеры ищут только ожидающие задачи
+        Index(
+            "jobs_pending_run_at_idx",
+            "run_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
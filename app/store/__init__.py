@@ -2,35 +2,94 @@ import typing
 from logging import getLogger
 
 from app.store.database.database import Database
+from app.web.config import StorageBackend
 
 # from app.store.rabbit.rabbit import Rabbit
 
 if typing.TYPE_CHECKING:
+    from app.store.memory.storage import MemoryStorage
     from app.web.app import Application
 
 
 class Store:
-    def __init__(self, app: "Application"):
+    def __init__(self, app: "Application"):  # noqa: PLR0915
         from app.store.admin.accessor import AdminAccessor
         from app.store.bot.handler import BotHandler
         from app.store.bot.manager import BotManager
+        from app.store.bot.scheduler import StageTimerScheduler
         from app.store.game.accessor import (
             GameAccessor,
             GamePlayAccessor,
             PlayerAccessor,
         )
+        from app.store.game.events import GameEventAccessor
+        from app.store.game.export import ExportAccessor
+        from app.store.game.leaderboard import LeaderboardAccessor
         from app.store.game.manager import GameManager, PlayerManager
+        from app.store.game.simulation import SimulationAccessor
+        from app.store.game.stats import StatsAccessor
+        from app.store.game.write_buffer import GamePlayWriteBuffer
+        from app.store.jobs.accessor import JobAccessor
+        from app.store.jobs.worker import JobWorker
+        from app.store.metrics import MetricsAccessor
         from app.store.tg_api.accessor import TgApiAccessor
+        from app.store.tracing import TracingAccessor
+        from app.store.versions import ResourceVersions
+        from app.store.warmup import WarmupAccessor
 
+        # все таблицы бота хранятся в Postgres или в памяти процесса:
+        # у аксессоров один интерфейс
+        self.memory: "MemoryStorage | None" = None
+        if app.config and app.config.storage.backend == StorageBackend.MEMORY:
+            from app.store.memory.accessor import (
+                MemoryAdminAccessor,
+                MemoryExportAccessor,
+                MemoryGameAccessor,
+                MemoryGameEventAccessor,
+                MemoryGamePlayAccessor,
+                MemoryJobAccessor,
+                MemoryLeaderboardAccessor,
+                MemoryPlayerAccessor,
+                MemoryStatsAccessor,
+            )
+            from app.store.memory.storage import MemoryStorage
+
+            self.memory = MemoryStorage()
+            AdminAccessor = MemoryAdminAccessor  # noqa: N806
+            PlayerAccessor = MemoryPlayerAccessor  # noqa: N806
+            LeaderboardAccessor = MemoryLeaderboardAccessor  # noqa: N806
+            GameAccessor = MemoryGameAccessor  # noqa: N806
+            GamePlayAccessor = MemoryGamePlayAccessor  # noqa: N806
+            StatsAccessor = MemoryStatsAccessor  # noqa: N806
+            ExportAccessor = MemoryExportAccessor  # noqa: N806
+            GameEventAccessor = MemoryGameEventAccessor  # noqa: N806
+            JobAccessor = MemoryJobAccessor  # noqa: N806
+
+        self.versions = ResourceVersions()
+        self.metrics = MetricsAccessor(app)
+        self.tracing = TracingAccessor(app)
         self.admins = AdminAccessor(app)
         self.players = PlayerAccessor(app)
+        self.leaderboard = LeaderboardAccessor(app)
         self.games = GameAccessor(app)
         self.gameplays = GamePlayAccessor(app)
+        self.stats = StatsAccessor(app)
+        self.exports = ExportAccessor(app)
+        self.simulations = SimulationAccessor(app)
+        self.game_events = GameEventAccessor(app)
+        self.gameplay_writes = GamePlayWriteBuffer(app)
+        self.timers = StageTimerScheduler(app)
+        self.jobs = JobAccessor(app)
+        self.job_worker = JobWorker(app)
         self.bot_handler = BotHandler(app)
         self.bot_manager = BotManager(app)
         self.player_manager = PlayerManager(app)
         self.game_manager = GameManager(app)
+        # прогрев подключается после остальных аксессоров, а Bot API -
+        # последним: поллер запускается только после прогрева
+        self.warmup = WarmupAccessor(app)
         self.tg_api = TgApiAccessor(app)
+        self.bot_manager.register_jobs(self.job_worker)
         self.logger = getLogger("store")
 
 
@@ -3,13 +3,13 @@ from typing import TYPE_CHECKING
 from sqlalchemy import select
 
 from app.admin.models import AdminModel
-from app.base.base_accessor import BaseAccessor
+from app.base.base_accessor import StorageAccessor
 
 if TYPE_CHECKING:
     from app.web.app import Application
 
 
-class AdminAccessor(BaseAccessor):
+class AdminAccessor(StorageAccessor):
     async def connect(self, app: "Application") -> None:
         admin = await self.get_by_email(email=app.config.admin.email)
         if not admin:
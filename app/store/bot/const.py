@@ -1,7 +1,7 @@
 # Timer time
 WAITING_STAGE_TIMER_IN_SECONDS = 10  # TODO: change to 10 seconds
 BETTING_STAGE_TIMER_IN_SECONDS = 15  # TODO: change to 15 seconds
-PLAYERHIT_STAGE_TIMER_IN_SECONDS = 45  # TODO: пока не используется
+PLAYERHIT_STAGE_TIMER_IN_SECONDS = 45
 
 # URLs
 GAME_RULES_URL = "https://ru.wikihow.com/играть-в-блэкджек"
@@ -39,11 +39,16 @@ PLAYER_BLACK_JACK_MESSAGE = "У {player} на руках блэкджек."
 GAME_PLAYERHIT_STAGE_MESSAGE = (
     "Ставки сделаны. "
     "Теперь вы можете взять себе карту или отказаться брать новые карты.\n\n"
-    "Карты на руках:\n\n{cards_str}"
+    "Карты на руках:\n\n{cards_str}\n\n"
+    f"Если в течение {PLAYERHIT_STAGE_TIMER_IN_SECONDS} сек. никто не сделает "
+    "ход, игроки, которые еще берут карты, больше не будут их брать."
 )
 PLAYER_EXCEEDED_MESSAGE = "У {player} более 21 очка, на руках: {cards}"
 PLAYER_NOT_EXCEEDED_MESSAGE = "{player} берет еще карту, на руках: {cards}"
 PLAYER_STOP_TAKING_MESSAGE = "{player} больше не берет карты, на руках: {cards}"
+PLAYERHIT_TIMER_MESSAGE = (
+    "Время на ходы игроков вышло. {players} больше не берут карты."
+)
 PLAYER_EXCEDDED_RESULTS_MESSAGE = (
     "У {player} перебор, на руках: {cards} (в сумме {score}).\n"
     "-{bet} к балансу в этом чате.\n\n"
@@ -68,6 +73,7 @@ BUTTON_NO_MATCH_STAGE_MESSAGE = (
     "Данная кнопка не соответствует текущей стадии игры."
 )
 WRONG_STATUS_TO_TAKE_CARD_MESSAGE = "{player}, вы больше не можете брать карты."
+MOVE_IS_OVER_MESSAGE = "{player}, время этого хода уже вышло."
 NOT_GAME_USER_MESSAGE = "{player}, вы не являетесь игроком в текущей игре."
 MY_BALANCE_MESSAGE = "{player}, ваш баланс в этом чате составляет {value}."
 NO_BALANCE_MESSAGE = (
@@ -76,6 +82,26 @@ NO_BALANCE_MESSAGE = (
     "пользователем, пока идет стадия присоединения игроков (время этой стадии "
     "ограничено)."
 )
+TOP_MESSAGE = "Лучшие балансы в этом чате:\n{top}"
+TOP_PLACE_STR = "{place}. {player}: {value}"
+NO_TOP_MESSAGE = "В этом чате пока нет балансов."
+PLAYER_STATS_MESSAGE = (
+    "{player}, ваша статистика в этом чате: игр {games}, побед {wins}, "
+    "поражений {losses}, ничьих {ties}, блэкджеков {black_jacks}, "
+    "сумма ставок {wagered}, итог {net}."
+)
+NO_PLAYER_STATS_MESSAGE = (
+    "{player}, вы еще не сыграли в этом чате ни одной игры."
+)
+CHAT_STATS_MESSAGE = (
+    "В этом чате сыграно игр: {games} (сегодня: {today}), "
+    "игроков: {players}, отменено игр: {cancels}."
+)
+HINT_MESSAGE = (
+    "{player}, подсказка: {hint}.\nВероятность перебора у диллера: {bust}%."
+)
+HIT_HINT = "лучше взять карту"
+STAND_HINT = "лучше больше не брать карты"
 GAME_CANCELED_MESSAGE = (
     "Игра отменена, т.к. не все игроки успели вовремя сделать ставки."
 )
@@ -96,6 +122,7 @@ BET_100_BUTTON = "100💰"
 TAKE_CARD_BUTTON = "Взять карту"
 STOP_TAKING_BUTTON = "Достаточно карт"
 MY_BALANCE_BUTTON = "Мой баланс"
+HINT_BUTTON = "Подсказка"
 
 # Callback query names
 JOIN_GAME_CALLBACK = "join_new_game"
@@ -107,3 +134,4 @@ BET_100_CALLBACK = "make_bet_100"
 TAKE_CARD_CALLBACK = "take_card"
 STOP_TAKING_CALLBACK = "stop_taking"
 MY_BALANCE_CALLBACK = "my_balance"
+HINT_CALLBACK = "hint"
@@ -1,17 +1,34 @@
+import asyncio
 import typing
+from datetime import UTC, datetime
+from functools import partial
 from logging import getLogger
 
 from app.game.const import (
     BLACK_JACK,
+    GameEventType,
     GameStage,
-    GameStatus,
+    PlayerAction,
     PlayerStatus,
 )
-from app.game.models import BalanceModel, GameModel, PlayerModel
+from app.game.models import (
+    BalanceModel,
+    ChatDayStatsModel,
+    ChatStatsModel,
+    GameModel,
+    GamePlayModel,
+    PlayerModel,
+    PlayerStatsModel,
+)
+from app.game.stats import PlayerResult, get_player_result
+from app.game.strategy import StrategyHint, StrategyTable, get_strategy_table
+from app.jobs.const import JobKind
 from app.store.bot import const
 from app.store.bot.manager import BotManager
+from app.store.game.leaderboard import LeaderboardEntry
 from app.store.game.manager import GameManager, PlayerManager
-from app.store.tg_api.dataclasses import BotContext, CallbackQuery
+from app.store.tg_api.dataclasses import BotContext, CallbackQuery, Message
+from app.web.exceptions import MoveIsOverError
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
@@ -24,6 +41,7 @@ class BotHandler:
         """Подключается к app и к логгеру."""
         self.app = app
         self.logger = getLogger("bot handler")
+        self.strategy_table: StrategyTable = get_strategy_table()
 
     @property
     def bot_manager(self) -> BotManager:
@@ -63,7 +81,9 @@ class BotHandler:
                 context.chat_id,
             )
             game: GameModel = await self.game_manager.get_game(context.chat_id)
-            await self.game_manager.get_gameplay(game.id, player.id)
+            await self.game_manager.get_gameplay(
+                game.id, player.id, context.chat_id
+            )
             context.current_game = game
             await self.bot_manager.say_join_new_game(context)
             await self.bot_manager.say_player_joined(context)
@@ -93,19 +113,23 @@ class BotHandler:
                 gameplay.player_id for gameplay in game.gameplays
             ]
 
-        if game.stage == GameStage.WAITING_FOR_PLAYERS_TO_JOIN:
-            await self._handle_game_waiting_stage(game, query, context)
-        elif game.stage == GameStage.BETTING and is_player_user:
-            await self._handle_game_betting_stage(game, query, context)
-        elif game.stage == GameStage.PLAYERHIT and is_player_user:
-            await self._handle_game_playerhit_stage(game, query, context)
-        elif (
-            query_message == const.JOIN_GAME_CALLBACK
-            or query_message == const.ADD_PLAYER_CALLBACK
-        ):
-            await self.bot_manager.say_wait_next_game(context)
-        else:
-            await self.bot_manager.say_no_game_user(context)
+        try:
+            if game.stage == GameStage.WAITING_FOR_PLAYERS_TO_JOIN:
+                await self._handle_game_waiting_stage(game, query, context)
+            elif game.stage == GameStage.BETTING and is_player_user:
+                await self._handle_game_betting_stage(game, query, context)
+            elif game.stage == GameStage.PLAYERHIT and is_player_user:
+                await self._handle_game_playerhit_stage(game, query, context)
+            elif (
+                query_message == const.JOIN_GAME_CALLBACK
+                or query_message == const.ADD_PLAYER_CALLBACK
+            ):
+                await self.bot_manager.say_wait_next_game(context)
+            else:
+                await self.bot_manager.say_no_game_user(context)
+        except MoveIsOverError:
+            # пока ход обрабатывался, стадию закончил таймер: ход не записан
+            await self.bot_manager.say_move_is_over(context)
 
     async def handle_my_balance_query(
         self, query: CallbackQuery, context: BotContext
@@ -130,6 +154,76 @@ class BotHandler:
         else:
             await self.bot_manager.say_no_balance(context)
 
+    async def handle_top_command(self, context: BotContext) -> None:
+        """Обрабатывает команду /top: печатает лучшие балансы в чате."""
+        top: list[LeaderboardEntry] = await self.app.store.leaderboard.get_top(
+            context.chat_id
+        )
+        context.message = "\n".join(
+            const.TOP_PLACE_STR.format(
+                place=place,
+                player=entry.player.first_name or entry.player.username,
+                value=entry.current_value,
+            )
+            for place, entry in enumerate(top, start=1)
+            if entry.player
+        )
+        await self.bot_manager.say_top(context)
+
+    async def handle_stats_command(
+        self, message: Message, context: BotContext
+    ) -> None:
+        """Обрабатывает команду /stats: печатает статистику игрока и чата."""
+        player: (
+            PlayerModel | None
+        ) = await self.app.store.players.get_player_by_tg_id(message.from_.id)
+        player_stats: PlayerStatsModel | None = (
+            await self.app.store.stats.get_player_stats(
+                player.id, context.chat_id
+            )
+            if player
+            else None
+        )
+        chat_stats: (
+            ChatStatsModel | None
+        ) = await self.app.store.stats.get_chat_stats(context.chat_id)
+        day_stats: list[
+            ChatDayStatsModel
+        ] = await self.app.store.stats.list_chat_day_stats(
+            context.chat_id, days=1
+        )
+
+        lines: list[str] = [
+            const.PLAYER_STATS_MESSAGE.format(
+                player=context.username,
+                games=player_stats.games,
+                wins=player_stats.wins,
+                losses=player_stats.losses,
+                ties=player_stats.ties,
+                black_jacks=player_stats.black_jacks,
+                wagered=player_stats.wagered,
+                net=player_stats.net,
+            )
+            if player_stats
+            else const.NO_PLAYER_STATS_MESSAGE.format(player=context.username)
+        ]
+        if chat_stats:
+            lines.append(
+                const.CHAT_STATS_MESSAGE.format(
+                    games=chat_stats.games,
+                    today=(
+                        day_stats[0].games
+                        if day_stats
+                        and day_stats[0].day == datetime.now(UTC).date()
+                        else 0
+                    ),
+                    players=chat_stats.players,
+                    cancels=chat_stats.cancels,
+                )
+            )
+        context.message = "\n".join(lines)
+        await self.bot_manager.say_stats(context)
+
     async def _handle_game_waiting_stage(
         self, game: GameModel, query: CallbackQuery, context: BotContext
     ) -> None:
@@ -146,7 +240,9 @@ class BotHandler:
                 query.from_.first_name,
                 context.chat_id,
             )
-            await self.game_manager.get_gameplay(game.id, player.id)
+            await self.game_manager.get_gameplay(
+                game.id, player.id, context.chat_id
+            )
             await self.bot_manager.say_player_joined(context)
         else:
             await self.bot_manager.say_button_no_match_game_stage(context)
@@ -183,9 +279,16 @@ class BotHandler:
             all_players_have_bet, is_black_jack = await self._handle_bet(
                 game, query, context, bet_value
             )
+            if all_players_have_bet:
+                await self.app.store.job_worker.cancel(
+                    JobKind.CANCEL_GAME_DUE_TO_TIMER, game_id=game.id
+                )
+
             if is_black_jack and all_players_have_bet:
                 await self.bot_manager.say_player_has_blackjack(context)
-                await self._handle_game_dillerhit_stage(context)
+                await self._handle_game_dillerhit_stage(
+                    context, expected_stage=GameStage.BETTING
+                )
             elif is_black_jack:
                 await self.bot_manager.say_player_has_blackjack(context)
             elif all_players_have_bet:
@@ -206,21 +309,29 @@ class BotHandler:
         - нет ли у игрока блэкджека после генерации 2 случайныз карт.
         """
         context.bet_value = bet_value
-        await self.bot_manager.say_player_has_bet(context)
-        return await self.game_manager.update_gameplay_bet_status_and_cards(
-            game, query, bet_value
+        # о ставке сообщается, только если она успела записаться
+        bet_result = (
+            await self.game_manager.update_gameplay_bet_status_and_cards(
+                game, query, bet_value
+            )
         )
+        await self.bot_manager.say_player_has_bet(context)
+        return bet_result
 
     async def _handle_playerhit_initial(self, context: BotContext) -> None:
         """Меняет стадию ставок на стадию, когда игроки берут дополнительные
         карты, формирует строку с информацией о картах игроков и диллера
         и отправляет ее в BotManager, чтобы бот показал ее в чате.
         """
-        refreshed_game: GameModel = (
-            await self.app.store.games.change_active_game_stage(
-                chat_id=context.chat_id, stage=GameStage.PLAYERHIT
-            )
+        refreshed_game: (
+            GameModel | None
+        ) = await self.app.store.games.change_active_game_stage(
+            chat_id=context.chat_id,
+            stage=GameStage.PLAYERHIT,
+            expected_stage=GameStage.BETTING,
         )
+        if refreshed_game is None:
+            return  # игра уже ушла со стадии ставок (например, отменена)
 
         players_cards: list[str] = []
         for gameplay in refreshed_game.gameplays:
@@ -239,6 +350,55 @@ class BotHandler:
         cards_str: str = "\n".join(players_cards) + diller_card_str
         context.message = cards_str
         await self.bot_manager.say_players_take_cards(context)
+        self._schedule_playerhit_timer(context.chat_id, refreshed_game.id)
+
+    def _schedule_playerhit_timer(self, chat_id: int, game_id: int) -> None:
+        """Запускает (или перезапускает после хода игрока) таймер стадии
+        ходов игроков.
+        """
+        self.app.store.timers.schedule(
+            game_id=game_id,
+            stage=GameStage.PLAYERHIT,
+            seconds=const.PLAYERHIT_STAGE_TIMER_IN_SECONDS,
+            callback=partial(self.handle_playerhit_timeout, chat_id, game_id),
+        )
+
+    async def handle_playerhit_timeout(
+        self, chat_id: int, game_id: int
+    ) -> None:
+        """Завершает стадию ходов игроков по таймеру: игроки, которые еще
+        берут карты, перестают их брать, и карты начинает брать диллер.
+        Если игра уже ушла со стадии ходов игроков (в том числе пока таймер
+        срабатывал, а последний игрок отказывался от карт), ничего не делает.
+        """
+        game: (
+            GameModel | None
+        ) = await self.app.store.games.get_active_game_by_chat_id(chat_id)
+        if not game or game.id != game_id or game.stage != GameStage.PLAYERHIT:
+            return
+        game = await self.app.store.games.change_active_game_stage(
+            chat_id=chat_id,
+            stage=GameStage.DILLERHIT,
+            expected_stage=GameStage.PLAYERHIT,
+        )
+        if game is None:
+            return
+
+        stood_gameplays: list[
+            GamePlayModel
+        ] = await self.game_manager.stand_taking_players(game)
+        stood_player_ids: set[int] = {
+            gameplay.player_id for gameplay in stood_gameplays
+        }
+        context = BotContext(chat_id=chat_id, current_game=game)
+        context.message = ", ".join(
+            gameplay.player.first_name or gameplay.player.username
+            for gameplay in game.gameplays
+            if gameplay.player_id in stood_player_ids
+        )
+        if stood_player_ids:
+            await self.bot_manager.say_playerhit_time_is_up(context)
+        await self._settle_game(game, context)
 
     async def _handle_game_playerhit_stage(
         self, game: GameModel, query: CallbackQuery, context: BotContext
@@ -252,10 +412,15 @@ class BotHandler:
 
         TAKE_CARD_CALLBACK вызывается кнопкой "Взять карту".
         STOP_TAKING_CALLBACK вызывается кнопкой "Достаточно карт".
+        HINT_CALLBACK вызывается кнопкой "Подсказка" и не меняет игру.
         """
         query_message: str = query.data
         wrong_button = False
 
+        if query_message == const.HINT_CALLBACK:
+            await self._handle_hint(game, query, context)
+            return
+
         if query_message == const.TAKE_CARD_CALLBACK:
             (
                 exceeded,
@@ -286,6 +451,12 @@ class BotHandler:
             ) = await self.app.store.games.get_active_game_by_chat_id(
                 context.chat_id
             )
+            if (
+                refreshed_game is None
+                or refreshed_game.id != game.id
+                or refreshed_game.stage != GameStage.PLAYERHIT
+            ):
+                return  # пока шел ход, итоги игры подвел таймер
             no_taking_players: list[bool] = [
                 gameplay.player_status != PlayerStatus.TAKING
                 for gameplay in refreshed_game.gameplays
@@ -293,22 +464,77 @@ class BotHandler:
 
             if all(no_taking_players):
                 await self._handle_game_dillerhit_stage(context)
+            else:
+                self._schedule_playerhit_timer(context.chat_id, game.id)
+
+    async def _handle_hint(
+        self, game: GameModel, query: CallbackQuery, context: BotContext
+    ) -> None:
+        """Подсказывает игроку, брать ли ему еще карту. Подсказка берется из
+        заранее посчитанной таблицы стратегии, без запросов к БД: геймплеи
+        с игроками уже подгружены в игру.
+        """
+        gameplay: GamePlayModel = next(
+            filter(lambda x: x.player.tg_id == query.from_.id, game.gameplays)
+        )
+        if gameplay.player_status != PlayerStatus.TAKING:
+            await self.bot_manager.say_wrong_status_to_take_cards(context)
+            return
 
-    async def _handle_game_dillerhit_stage(self, context: BotContext) -> None:
-        """Обрабатывает игру на стадии, когда диллер берет карты."""
-        dillerhit_game: GameModel = (
-            await self.app.store.games.change_active_game_stage(
-                chat_id=context.chat_id, stage=GameStage.DILLERHIT
+        hint: StrategyHint = self.strategy_table.get_hint(
+            gameplay.player_cards, game.diller_cards[0]
+        )
+        context.message = const.HINT_MESSAGE.format(
+            player=context.username,
+            hint=const.HIT_HINT
+            if hint.action == PlayerAction.HIT
+            else const.STAND_HINT,
+            bust=round(hint.diller_bust_probability * 100),
+        )
+        await self.bot_manager.say_hint(context)
+
+    async def _handle_game_dillerhit_stage(
+        self,
+        context: BotContext,
+        expected_stage: GameStage = GameStage.PLAYERHIT,
+    ) -> None:
+        """Обрабатывает игру на стадии, когда диллер берет карты. Игра
+        переходит на эту стадию со стадии expected_stage; если ее уже
+        перевел другой обработчик (например, таймер), итоги подводит он.
+        """
+        if context.current_game:
+            self.app.store.timers.cancel(
+                context.current_game.id, GameStage.PLAYERHIT
             )
+        dillerhit_game: (
+            GameModel | None
+        ) = await self.app.store.games.change_active_game_stage(
+            chat_id=context.chat_id,
+            stage=GameStage.DILLERHIT,
+            expected_stage=expected_stage,
         )
+        if dillerhit_game is None:
+            return
+        await self._settle_game(dillerhit_game, context)
+
+    async def _settle_game(
+        self, dillerhit_game: GameModel, context: BotContext
+    ) -> None:
+        """Диллер берет карты, затем игра переходит на стадию подведения
+        итогов. Вызывается только тем, кто перевел игру на стадию DILLERHIT.
+        """
         diller_score: int = await self.game_manager.take_cards_by_diller(
             dillerhit_game
         )
-        summarizing_game: GameModel = (
-            await self.app.store.games.change_active_game_stage(
-                chat_id=context.chat_id, stage=GameStage.SUMMARIZING
-            )
+        summarizing_game: (
+            GameModel | None
+        ) = await self.app.store.games.change_active_game_stage(
+            chat_id=context.chat_id,
+            stage=GameStage.SUMMARIZING,
+            expected_stage=GameStage.DILLERHIT,
         )
+        if summarizing_game is None:
+            return
         await self._handle_game_summarizing_stage(
             summarizing_game, context, diller_score
         )
@@ -321,6 +547,8 @@ class BotHandler:
     ) -> None:
         """Обрабатывает игру на стадии подведения итогов."""
         game_results: list[str] = []
+        gameplays_written: list[asyncio.Future] = []
+        player_results: list[PlayerResult] = []
 
         for gameplay in summarizing_game.gameplays:
             player_score: int = self.game_manager.process_score_with_aces(
@@ -328,17 +556,22 @@ class BotHandler:
             )
 
             if gameplay.player_status == PlayerStatus.EXCEEDED:
-                result_str = await self.game_manager.finalize_player_result(
+                (
+                    result_str,
+                    gameplay_written,
+                ) = await self.game_manager.finalize_player_result(
                     chat_id=context.chat_id,
                     gameplay=gameplay,
                     player_score=player_score,
                     message=const.PLAYER_EXCEDDED_RESULTS_MESSAGE,
                     player_balance_change=-gameplay.player_bet,
                 )
-                game_results.append(result_str)
 
             elif diller_score > BLACK_JACK or player_score > diller_score:
-                result_str = await self.game_manager.finalize_player_result(
+                (
+                    result_str,
+                    gameplay_written,
+                ) = await self.game_manager.finalize_player_result(
                     chat_id=context.chat_id,
                     gameplay=gameplay,
                     player_score=player_score,
@@ -346,10 +579,12 @@ class BotHandler:
                     player_balance_change=gameplay.player_bet,
                     gameplay_status_change=PlayerStatus.WON,
                 )
-                game_results.append(result_str)
 
             elif player_score < diller_score:
-                result_str = await self.game_manager.finalize_player_result(
+                (
+                    result_str,
+                    gameplay_written,
+                ) = await self.game_manager.finalize_player_result(
                     chat_id=context.chat_id,
                     gameplay=gameplay,
                     player_score=player_score,
@@ -357,21 +592,35 @@ class BotHandler:
                     player_balance_change=-gameplay.player_bet,
                     gameplay_status_change=PlayerStatus.LOST,
                 )
-                game_results.append(result_str)
 
             else:
-                result_str = await self.game_manager.finalize_player_result(
+                (
+                    result_str,
+                    gameplay_written,
+                ) = await self.game_manager.finalize_player_result(
                     chat_id=context.chat_id,
                     gameplay=gameplay,
                     player_score=player_score,
                     message=const.PLAYER_TIE_RESULTS_MESSAGE,
                     gameplay_status_change=PlayerStatus.TIE,
                 )
-                game_results.append(result_str)
 
-        await self.app.store.games.change_game_fields(
-            game_id=summarizing_game.id,
-            new_values={"status": GameStatus.FINISHED},
+            game_results.append(result_str)
+            gameplays_written.append(gameplay_written)
+            player_results.append(get_player_result(gameplay, player_score))
+
+        # результаты отправляются только после записи итогов геймплеев; их
+        # могла записать и фоновая запись буфера, поэтому итог записи берется
+        # из future, а не из flush
+        try:
+            await self.app.store.gameplay_writes.flush()
+        finally:
+            await asyncio.gather(*gameplays_written)
+        await self.app.store.games.finish_game(
+            summarizing_game.id, context.chat_id, player_results
+        )
+        self.app.store.game_events.emit(
+            summarizing_game.id, context.chat_id, GameEventType.FINISH
         )
         game_results_str = const.GAME_RESULTS_MESSAGE.format(
             players="".join(game_results),
@@ -1,10 +1,12 @@
-import asyncio
 import typing
 from logging import getLogger
+from typing import Any
 
 from app.game.const import GameStage
 from app.game.models import GameModel, PlayerModel
+from app.jobs.const import JobKind
 from app.store.bot import const
+from app.store.jobs.worker import JobWorker
 from app.store.tg_api.accessor import TgApiAccessor
 from app.store.tg_api.dataclasses import (
     BotContext,
@@ -24,21 +26,61 @@ class BotManager:
         """Подключается к app и к логгеру."""
         self.app = app
         self.logger = getLogger("bot manager")
-        self.background_tasks = set()
 
     @property
     def tg_api(self) -> TgApiAccessor:
         return self.app.store.tg_api
 
-    async def _start_timer(self, coro: typing.Coroutine, seconds: int):
-        """Запускает таймер на время, указанное в аргументе seconds,
-        по прошествии этого времени вызывает корутину coro.
+    @property
+    def job_worker(self) -> JobWorker:
+        return self.app.store.job_worker
+
+    def register_jobs(self, job_worker: JobWorker) -> None:
+        """Регистрирует обработчики задач, которые бот ставит в очередь."""
+        job_worker.register(
+            JobKind.START_BETTING_STAGE, self.run_start_betting_stage_job
+        )
+        job_worker.register(
+            JobKind.CANCEL_GAME_DUE_TO_TIMER, self.run_cancel_game_job
+        )
+
+    async def run_start_betting_stage_job(self, payload: dict[str, Any]):
+        """Задача по таймеру стадии присоединения игроков. Задача может
+        выполниться повторно (после ошибки или если истекла аренда), поэтому
+        стадия ставок начинается, только если игра все еще ждет игроков.
+        Если стадию ставок уже начала прошлая попытка, но не дошла до конца
+        (например, не ушло сообщение), задача продолжает с нее: таймер
+        ставок ставится заново, а сообщение отправляется еще раз.
         """
-        try:
-            await asyncio.sleep(seconds)
-            await coro
-        except asyncio.CancelledError:
-            pass
+        chat_id: int = payload["chat_id"]
+        game: (
+            GameModel | None
+        ) = await self.app.store.games.get_active_game_by_chat_id(chat_id)
+        if not game or game.id != payload["game_id"]:
+            return
+
+        if game.stage == GameStage.WAITING_FOR_PLAYERS_TO_JOIN:
+            game = await self.app.store.games.change_active_game_stage(
+                chat_id=chat_id,
+                stage=GameStage.BETTING,
+                expected_stage=GameStage.WAITING_FOR_PLAYERS_TO_JOIN,
+            )
+        elif game.stage == GameStage.BETTING:
+            await self.job_worker.cancel(
+                JobKind.CANCEL_GAME_DUE_TO_TIMER, game_id=game.id
+            )
+        else:
+            return
+        if game:
+            await self.say_start_betting_stage(
+                BotContext(chat_id=chat_id, current_game=game)
+            )
+
+    async def run_cancel_game_job(self, payload: dict[str, Any]):
+        """Задача по таймеру стадии ставок."""
+        await self.say_game_was_cancelled_due_to_timer(
+            BotContext(chat_id=payload["chat_id"]), payload["game_id"]
+        )
 
     async def say_hi_and_play(self, context: BotContext):
         """Печатает приветствие и кнопки 'Новая игра', 'Мой баланс' и
@@ -118,17 +160,11 @@ class BotManager:
             ),
         )
         await self.tg_api.send_message(button_message, any_buttons_present=True)
-
-        # More info: https://docs.astral.sh/ruff/rules/asyncio-dangling-task/
-        timer_task: asyncio.Task = asyncio.create_task(
-            self._start_timer(
-                self.say_start_betting_stage(context),
-                const.WAITING_STAGE_TIMER_IN_SECONDS,
-            )
+        await self.job_worker.schedule(
+            JobKind.START_BETTING_STAGE,
+            {"chat_id": context.chat_id, "game_id": context.current_game.id},
+            const.WAITING_STAGE_TIMER_IN_SECONDS,
         )
-        self.logger.info(timer_task)
-        self.background_tasks.add(timer_task)
-        timer_task.add_done_callback(self.background_tasks.discard)
 
     async def say_player_joined(self, context: BotContext):
         """Печатает сообщение, что игрок присоединился к игре."""
@@ -151,16 +187,20 @@ class BotManager:
         )
 
     async def say_start_betting_stage(self, context: BotContext):
-        """Печатает сообщение о старте игры, её участниках и кнопки для ставок.
-        Затем запускает таймер, чтобы игроки сделали ставки в течение
-        определенного времени, либо игра отменится.
+        """Запускает таймер, чтобы игроки сделали ставки в течение
+        определенного времени, либо игра отменится, затем печатает сообщение
+        о старте игры, её участниках и кнопки для ставок. Игра в контексте
+        уже переведена на стадию ставок.
+
+        Таймер ставится до отправки сообщения: если сообщение не уйдет,
+        игра все равно не останется на стадии ставок навсегда.
         """
-        current_game: GameModel = (
-            await self.app.store.games.change_active_game_stage(
-                chat_id=context.chat_id, stage=GameStage.BETTING
-            )
+        current_game: GameModel = context.current_game
+        await self.job_worker.schedule(
+            JobKind.CANCEL_GAME_DUE_TO_TIMER,
+            {"chat_id": context.chat_id, "game_id": current_game.id},
+            const.BETTING_STAGE_TIMER_IN_SECONDS,
         )
-        context.current_game = current_game
         players: list[PlayerModel] = [
             gameplay.player for gameplay in current_game.gameplays
         ]
@@ -194,15 +234,6 @@ class BotManager:
             ),
         )
         await self.tg_api.send_message(button_message, any_buttons_present=True)
-        timer_task: asyncio.Task = asyncio.create_task(
-            self._start_timer(
-                self.say_game_was_cancelled_due_to_timer(context),
-                const.BETTING_STAGE_TIMER_IN_SECONDS,
-            )
-        )
-        self.logger.info(timer_task)
-        self.background_tasks.add(timer_task)
-        timer_task.add_done_callback(self.background_tasks.discard)
 
     async def say_player_has_bet(self, context: BotContext):
         """Печатает сообщение, что игрок такой-то сделал ставку такую-то."""
@@ -228,7 +259,8 @@ class BotManager:
 
     async def say_players_take_cards(self, context: BotContext):
         """Печатает сообщение, что ставки сделаны, показывает карты всех игроков
-        и диллера, выводит кнопки 'Взять карту' и 'Достаточно карт'.
+        и диллера, выводит кнопки 'Взять карту', 'Достаточно карт' и
+        'Подсказка'.
         """
         button_message = SendMessage(
             chat_id=context.chat_id,
@@ -245,6 +277,10 @@ class BotManager:
                         text=const.STOP_TAKING_BUTTON,
                         callback_data=const.STOP_TAKING_CALLBACK,
                     ),
+                    InlineKeyboardButton(
+                        text=const.HINT_BUTTON,
+                        callback_data=const.HINT_CALLBACK,
+                    ),
                 ]
             ),
         )
@@ -265,7 +301,7 @@ class BotManager:
 
     async def say_player_not_exceeded(self, context: BotContext):
         """Печатает сообщение, что игрок взял карту, и показывает его карты
-        вместе с кнопками 'Взять карту' и 'Достаточно карт'.
+        вместе с кнопками 'Взять карту', 'Достаточно карт' и 'Подсказка'.
         """
         button_message = SendMessage(
             chat_id=context.chat_id,
@@ -282,6 +318,10 @@ class BotManager:
                         text=const.STOP_TAKING_BUTTON,
                         callback_data=const.STOP_TAKING_CALLBACK,
                     ),
+                    InlineKeyboardButton(
+                        text=const.HINT_BUTTON,
+                        callback_data=const.HINT_CALLBACK,
+                    ),
                 ]
             ),
         )
@@ -300,6 +340,19 @@ class BotManager:
             )
         )
 
+    async def say_playerhit_time_is_up(self, context: BotContext):
+        """Печатает сообщение, что время на ходы игроков вышло и игроки,
+        которые еще брали карты, больше их не берут.
+        """
+        await self.tg_api.send_message(
+            SendMessage(
+                chat_id=context.chat_id,
+                text=const.PLAYERHIT_TIMER_MESSAGE.format(
+                    players=context.message
+                ),
+            )
+        )
+
     async def say_game_results(self, context: BotContext):
         """Печатает итоги игры и кнопки 'Новая игра', 'Мой баланс' и
         'Правила игры'.
@@ -326,6 +379,15 @@ class BotManager:
         )
         await self.tg_api.send_message(button_message, any_buttons_present=True)
 
+    async def say_hint(self, context: BotContext):
+        """Печатает подсказку для игрока: брать ли ему еще карту."""
+        await self.tg_api.send_message(
+            SendMessage(
+                chat_id=context.chat_id,
+                text=context.message,
+            )
+        )
+
     async def say_button_no_match_game_stage(self, context: BotContext):
         """Печатает сообщение, что кнопка не соответствует стадии игры."""
         await self.tg_api.send_message(
@@ -335,6 +397,17 @@ class BotManager:
             )
         )
 
+    async def say_move_is_over(self, context: BotContext):
+        """Печатает сообщение, что ход игрока не засчитан: пока он
+        обрабатывался, стадия игры закончилась (например, по таймеру).
+        """
+        await self.tg_api.send_message(
+            SendMessage(
+                chat_id=context.chat_id,
+                text=const.MOVE_IS_OVER_MESSAGE.format(player=context.username),
+            )
+        )
+
     async def say_wrong_status_to_take_cards(self, context: BotContext):
         """Печатает сообщение, что данный игрок уже не может брать карты
         (для случаев, когда игрок нажал на 'Достаточно карт', но затем пытается
@@ -384,7 +457,28 @@ class BotManager:
             )
         )
 
-    async def say_game_was_cancelled_due_to_timer(self, context: BotContext):
+    async def say_top(self, context: BotContext):
+        """Печатает лучшие балансы в данном чате."""
+        await self.tg_api.send_message(
+            SendMessage(
+                chat_id=context.chat_id,
+                text=(
+                    const.TOP_MESSAGE.format(top=context.message)
+                    if context.message
+                    else const.NO_TOP_MESSAGE
+                ),
+            )
+        )
+
+    async def say_stats(self, context: BotContext):
+        """Печатает статистику игрока и чата."""
+        await self.tg_api.send_message(
+            SendMessage(chat_id=context.chat_id, text=context.message)
+        )
+
+    async def say_game_was_cancelled_due_to_timer(
+        self, context: BotContext, game_id: int
+    ):
         """Инициирует отмену игры.
         Если игра была отменена, печатает сообщение об этом и кнопки
         'Новая игра', 'Мой баланс' и 'Правила игры'.
@@ -393,9 +487,7 @@ class BotManager:
         """
         canceled_game: (
             GameModel | None
-        ) = await self.app.store.games.cancel_active_game_due_to_timer(
-            context.current_game.id
-        )
+        ) = await self.app.store.games.cancel_active_game_due_to_timer(game_id)
         if canceled_game:
             button_message = SendMessage(
                 chat_id=context.chat_id,
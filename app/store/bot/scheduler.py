@@ -0,0 +1,195 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+import typing
+from collections.abc import Awaitable, Callable
+from contextvars import Context
+from dataclasses import dataclass
+
+from app.base.base_accessor import BaseAccessor
+from app.game.const import GameStage
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+TIMER_TICK_IN_SECONDS = 0.1  # таймеры, истекающие в пределах тика, - одна пачка
+
+TimerKey = tuple[int, GameStage]
+TimerCallback = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class Timer:
+    """Таймер стадии игры. Корутина создается вызовом callback только в момент
+    срабатывания таймера, поэтому в ней не оказывается устаревших данных.
+    """
+
+    key: TimerKey
+    deadline: float
+    callback: TimerCallback
+    is_cancelled: bool = False
+
+
+@dataclass
+class TimerStats:
+    """Счетчики работы планировщика таймеров."""
+
+    scheduled: int = 0
+    rescheduled: int = 0
+    cancelled: int = 0
+    fired: int = 0
+    failed: int = 0
+    batches: int = 0
+    max_batch_size: int = 0
+    pending: int = 0
+    running: int = 0
+
+
+class StageTimerScheduler(BaseAccessor):
+    """Единый планировщик таймеров стадий для всех игр.
+
+    Таймеры лежат в куче по времени срабатывания, а ждет их одна фоновая
+    задача, поэтому количество задач не зависит от количества чатов.
+    Таймер адресуется парой (game_id, stage): его можно отменить или
+    перезапустить. Время срабатывания округляется вверх до тика, и все
+    таймеры одного тика обрабатываются одной пачкой.
+    """
+
+    def __init__(
+        self,
+        app: "Application",
+        *args,
+        clock: Callable[[], float] = time.monotonic,
+        tick: float = TIMER_TICK_IN_SECONDS,
+        **kwargs,
+    ):
+        super().__init__(app, *args, **kwargs)
+        self.clock = clock
+        self.tick = tick
+        self.stats = TimerStats()
+        self._timers: dict[TimerKey, Timer] = {}
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._loop_task: asyncio.Task | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    async def connect(self, app: "Application") -> None:
+        self._start_loop()
+
+    async def disconnect(self, app: "Application") -> None:
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+    def _start_loop(self) -> None:
+        if self._loop_task is None or self._loop_task.done():
+            # цикл запускается из обработчика update: пустой контекст, чтобы
+            # он не унаследовал текущий спан трассы (см. app.base.tracing)
+            self._loop_task = asyncio.create_task(
+                self._run(), context=Context()
+            )
+
+    def schedule(
+        self,
+        game_id: int,
+        stage: GameStage,
+        seconds: float,
+        callback: TimerCallback,
+    ) -> Timer:
+        """Ставит таймер стадии игры. Если таймер для этой стадии уже стоит,
+        он перезапускается с новым временем и новым callback.
+        """
+        key: TimerKey = (game_id, stage)
+        old_timer: Timer | None = self._timers.get(key)
+        if old_timer:
+            old_timer.is_cancelled = True
+            self.stats.rescheduled += 1
+        else:
+            self.stats.scheduled += 1
+
+        deadline = math.ceil((self.clock() + seconds) / self.tick) * self.tick
+        timer = Timer(key=key, deadline=deadline, callback=callback)
+        self._timers[key] = timer
+        heapq.heappush(self._heap, (deadline, next(self._counter), timer))
+        self._wakeup.set()
+        self._start_loop()
+        return timer
+
+    def cancel(self, game_id: int, stage: GameStage) -> bool:
+        """Отменяет таймер стадии игры. Возвращает, был ли такой таймер.
+        Из кучи таймер удаляется лениво - при следующем проходе цикла.
+        """
+        timer: Timer | None = self._timers.pop((game_id, stage), None)
+        if timer is None:
+            return False
+        timer.is_cancelled = True
+        self.stats.cancelled += 1
+        return True
+
+    def get_stats(self) -> TimerStats:
+        """Отдает счетчики планировщика вместе с текущим числом таймеров."""
+        self.stats.pending = len(self._timers)
+        self.stats.running = len(self._batch_tasks)
+        return self.stats
+
+    def _pop_due_timers(self) -> list[Timer]:
+        now: float = self.clock()
+        due_timers: list[Timer] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, timer = heapq.heappop(self._heap)
+            if timer.is_cancelled:
+                continue
+            del self._timers[timer.key]
+            due_timers.append(timer)
+        return due_timers
+
+    async def _fire_batch(self, timers: list[Timer]) -> None:
+        results = await asyncio.gather(
+            *(timer.callback() for timer in timers), return_exceptions=True
+        )
+        for timer, result in zip(timers, results, strict=True):
+            if isinstance(result, Exception):
+                self.stats.failed += 1
+                self.logger.error("Timer %s failed", timer.key, exc_info=result)
+
+    def fire_due_timers(self) -> int:
+        """Запускает одной пачкой все таймеры, время которых пришло.
+        Возвращает размер пачки.
+        """
+        timers: list[Timer] = self._pop_due_timers()
+        if not timers:
+            return 0
+
+        self.stats.fired += len(timers)
+        self.stats.batches += 1
+        self.stats.max_batch_size = max(self.stats.max_batch_size, len(timers))
+        batch_task = asyncio.create_task(self._fire_batch(timers))
+        self._batch_tasks.add(batch_task)
+        batch_task.add_done_callback(self._batch_tasks.discard)
+        return len(timers)
+
+    async def wait_running(self) -> None:
+        """Дожидается уже запущенных пачек таймеров."""
+        await asyncio.gather(*self._batch_tasks)
+
+    async def _run(self) -> None:
+        """Цикл планировщика: спит до ближайшего таймера или до появления
+        нового таймера, затем запускает пачку истекших таймеров.
+        """
+        while True:
+            self._wakeup.clear()
+            self.fire_due_timers()
+            timeout: float | None = (
+                max(self._heap[0][0] - self.clock(), 0) if self._heap else None
+            )
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
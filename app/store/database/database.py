@@ -1,6 +1,11 @@
+import asyncio
+from collections.abc import Iterator
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import URL
+from sqlalchemy import URL, event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -15,6 +20,52 @@ if TYPE_CHECKING:
     from app.web.app import Application
 
 
+@dataclass
+class QueryStats:
+    """Сколько работы с БД понадобилось блоку кода (например, обработке
+    одного update). round_trips - это запросы плюс BEGIN, COMMIT и ROLLBACK.
+    """
+
+    statements: int = 0
+    round_trips: int = 0
+    checkouts: int = 0  # сколько раз соединение бралось из пула
+
+
+query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats", default=None
+)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Считает запросы к БД в блоке и в задачах, запущенных из него."""
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+
+
+def _count_statement(*args: Any) -> None:
+    stats: QueryStats | None = query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.round_trips += 1
+
+
+def _count_round_trip(*args: Any) -> None:
+    stats: QueryStats | None = query_stats.get()
+    if stats is not None:
+        stats.round_trips += 1
+
+
+def _count_checkout(*args: Any) -> None:
+    stats: QueryStats | None = query_stats.get()
+    if stats is not None:
+        stats.checkouts += 1
+
+
 class Database:
     def __init__(self, app: "Application") -> None:
         self.app = app
@@ -33,11 +84,33 @@ class Database:
                 self.app.config.database.port,
                 self.app.config.database.database,
             ),
+            pool_size=self.app.config.database.pool_size,
             # echo=True,  # uncomment for verbose sqlalchemy logs
         )
         self.session = async_sessionmaker(
             self.engine, expire_on_commit=False, class_=AsyncSession
         )
+        engine = self.engine.sync_engine
+        event.listen(engine, "before_cursor_execute", _count_statement)
+        for event_name in ("begin", "commit", "rollback"):
+            event.listen(engine, event_name, _count_round_trip)
+        event.listen(engine, "checkout", _count_checkout)
+        if self.app.store.memory is None:
+            with self.app.store.warmup.step("database_pool"):
+                await self.warm_up()
+
+    async def warm_up(self) -> None:
+        """Открывает все соединения пула, чтобы первые updates не ждали
+        TCP-соединения и аутентификации в Postgres. Соединения берутся
+        из пула одновременно, иначе пул отдавал бы одно и то же.
+        """
+        async with AsyncExitStack() as stack:
+            await asyncio.gather(
+                *(
+                    stack.enter_async_context(self.engine.connect())
+                    for _ in range(self.app.config.database.pool_size)
+                )
+            )
 
     async def disconnect(self, *args: Any, **kwargs: Any) -> None:
         if self.engine:
@@ -1,15 +1,32 @@
 from collections.abc import Sequence
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, select, update
+from sqlalchemy import and_, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.base.base_accessor import BaseAccessor
-from app.game.const import MINIMAL_BET, GameStage, GameStatus
+from app.base.base_accessor import StorageAccessor
+from app.base.pagination import PAGE_SIZE, Page, escape_like, make_page
+from app.game.const import (
+    MINIMAL_BET,
+    NO_BET,
+    GameEventType,
+    GameStage,
+    GameStatus,
+    PlayerStatus,
+)
 from app.game.models import BalanceModel, GameModel, GamePlayModel, PlayerModel
+from app.game.replay import restore_game_cards
+from app.game.shoe import Shoe
+from app.game.stats import PlayerResult
+from app.store.versions import Resource
 
+JoinKey = tuple[int, int]  # (game_id, player_id)
 
-class PlayerAccessor(BaseAccessor):
+
+class PlayerAccessor(StorageAccessor):
     async def create_player(
         self, username: str | None, tg_id: int, first_name: str
     ) -> PlayerModel:
@@ -20,6 +37,7 @@ class PlayerAccessor(BaseAccessor):
         async with self.app.database.session() as session:
             session.add(player)
             await session.commit()
+            self.app.store.versions.bump(Resource.PLAYERS)
         return player
 
     async def change_player_fields(
@@ -35,13 +53,48 @@ class PlayerAccessor(BaseAccessor):
         async with self.app.database.session() as session:
             player: PlayerModel = await session.scalar(query)
             await session.commit()
+            self.app.store.versions.bump(Resource.PLAYERS)
         return player
 
-    async def list_players(self) -> Sequence[PlayerModel]:
-        """Отдает список игроков."""
-        query = select(PlayerModel)
+    async def list_players(
+        self,
+        limit: int = PAGE_SIZE,
+        after: int | None = None,
+        tg_id: int | None = None,
+        username: str | None = None,
+        first_name: str | None = None,
+    ) -> Page[PlayerModel]:
+        """Отдает страницу игроков в порядке id, начиная после игрока с id
+        after. Игроков можно искать по telegram id, началу username (без
+        учета регистра) и части имени (по триграммному индексу).
+        """
+        conditions = []
+        if after:
+            conditions.append(PlayerModel.id > after)
+        if tg_id is not None:
+            conditions.append(PlayerModel.tg_id == tg_id)
+        if username:
+            conditions.append(
+                func.lower(PlayerModel.username).like(
+                    f"{escape_like(username.lower())}%"
+                )
+            )
+        if first_name:
+            conditions.append(
+                PlayerModel.first_name.ilike(f"%{escape_like(first_name)}%")
+            )
+
+        query = (
+            select(PlayerModel)
+            .where(*conditions)
+            .order_by(PlayerModel.id)
+            .limit(limit + 1)
+        )
         async with self.app.database.session() as session:
-            return await session.scalars(query)
+            players: Sequence[PlayerModel] = (
+                await session.scalars(query)
+            ).all()
+        return make_page(players, limit, lambda player: (player.id,))
 
     async def get_player_by_id(self, id_: int) -> PlayerModel | None:
         """Ищет игрока по id."""
@@ -63,22 +116,39 @@ class PlayerAccessor(BaseAccessor):
         async with self.app.database.session() as session:
             session.add(balance)
             await session.commit()
+            self.app.store.versions.bump(Resource.BALANCES)
+        self.app.store.leaderboard.on_balance_change(balance)
         return balance
 
     async def list_balances(
-        self, player_id: int | None = None
-    ) -> Sequence[BalanceModel]:
-        """Отдает список балансов всех игроков во всех чатах.
-        Можно отфильтровать по определенному игроку.
+        self,
+        player_id: int | None = None,
+        chat_id: int | None = None,
+        limit: int = PAGE_SIZE,
+        after: int | None = None,
+    ) -> Page[BalanceModel]:
+        """Отдает страницу балансов в порядке id, начиная после баланса
+        с id after. Можно отфильтровать по определенному игроку и чату.
         """
-        if not player_id:
-            query = select(BalanceModel)
-        else:
-            query = select(BalanceModel).where(
-                BalanceModel.player_id == player_id
-            )
+        conditions = []
+        if after:
+            conditions.append(BalanceModel.id > after)
+        if player_id:
+            conditions.append(BalanceModel.player_id == player_id)
+        if chat_id is not None:
+            conditions.append(BalanceModel.chat_id == chat_id)
+
+        query = (
+            select(BalanceModel)
+            .where(*conditions)
+            .order_by(BalanceModel.id)
+            .limit(limit + 1)
+        )
         async with self.app.database.session() as session:
-            return await session.scalars(query)
+            balances: Sequence[BalanceModel] = (
+                await session.scalars(query)
+            ).all()
+        return make_page(balances, limit, lambda balance: (balance.id,))
 
     async def get_balance_by_player_and_chat(
         self, player_id: int, chat_id: int
@@ -112,36 +182,95 @@ class PlayerAccessor(BaseAccessor):
         async with self.app.database.session() as session:
             balance = await session.scalar(query)
             await session.commit()
+            self.app.store.versions.bump(Resource.BALANCES)
+        self.app.store.leaderboard.on_balance_change(balance)
         return balance
 
 
-class GameAccessor(BaseAccessor):
+class GameAccessor(StorageAccessor):
     async def create_game(
         self,
         chat_id: int,
         diller_cards: list[str],
         gameplays: list[GamePlayModel],
+        seed: int | None = None,
     ) -> GameModel:
-        """Создает и отдает игру."""
+        """Создает и отдает игру. Если сид не передан, игре генерируется
+        новый: без сида карты игры нельзя ни раздать, ни восстановить.
+        """
+        if seed is None:
+            seed = Shoe.generate_seed()
         game = GameModel(
-            chat_id=chat_id, diller_cards=diller_cards, gameplays=gameplays
+            chat_id=chat_id,
+            diller_cards=diller_cards,
+            gameplays=gameplays,
+            seed=seed,
         )
         async with self.app.database.session() as session:
             session.add(game)
             await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
         return game
 
-    async def list_games(self) -> Sequence[GameModel]:
-        """Отдает список всех игр с подгруженными геймплеями."""
-        query = select(GameModel).options(selectinload(GameModel.gameplays))
+    async def list_games(
+        self,
+        limit: int = PAGE_SIZE,
+        after: tuple[datetime, int] | None = None,
+        chat_id: int | None = None,
+        status: GameStatus | None = None,
+        stage: GameStage | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        with_gameplays: bool = False,
+    ) -> Page[GameModel]:
+        """Отдает страницу игр, начиная с самых новых, по курсору after
+        (created_at и id последней игры предыдущей страницы). Игры можно
+        отфильтровать по чату, статусу, стадии и интервалу времени создания
+        [created_from, created_to), а также подгрузить их геймплеи.
+        """
+        conditions = []
+        if after:
+            conditions.append(
+                tuple_(GameModel.created_at, GameModel.id) < tuple_(*after)
+            )
+        if chat_id is not None:
+            conditions.append(GameModel.chat_id == chat_id)
+        if status:
+            conditions.append(GameModel.status == status)
+        if stage:
+            conditions.append(GameModel.stage == stage)
+        if created_from:
+            conditions.append(GameModel.created_at >= created_from)
+        if created_to:
+            conditions.append(GameModel.created_at < created_to)
+
+        query = (
+            select(GameModel)
+            .where(*conditions)
+            .order_by(GameModel.created_at.desc(), GameModel.id.desc())
+            .limit(limit + 1)
+        )
+        if with_gameplays:
+            query = query.options(selectinload(GameModel.gameplays))
         async with self.app.database.session() as session:
-            return await session.scalars(query)
+            games: Sequence[GameModel] = (await session.scalars(query)).all()
+        return make_page(games, limit, lambda game: (game.created_at, game.id))
+
+    async def get_game_by_id(self, game_id: int) -> GameModel | None:
+        """Ищет игру по id с подгруженными геймплеями."""
+        query = (
+            select(GameModel)
+            .where(GameModel.id == game_id)
+            .options(selectinload(GameModel.gameplays))
+        )
+        async with self.app.database.session() as session:
+            return await session.scalar(query)
 
     async def get_active_game_by_chat_id(
         self, chat_id: int
     ) -> GameModel | None:
         """Ищет в определенном чате активную игру с подгруженными геймплеями
-        и игроками.
+        и игроками. Карты игры восстанавливаются по сиду и журналу действий.
         """
         query = (
             select(GameModel)
@@ -158,7 +287,21 @@ class GameAccessor(BaseAccessor):
             )
         )
         async with self.app.database.session() as session:
-            return await session.scalar(query)
+            game: GameModel | None = await session.scalar(query)
+        if game:
+            restore_game_cards(game)
+        return game
+
+    async def count_active_games_by_stage(self) -> dict[GameStage, int]:
+        """Считает активные игры на каждой стадии (для метрик)."""
+        query = (
+            select(GameModel.stage, func.count())
+            .where(GameModel.status == GameStatus.ACTIVE)
+            .group_by(GameModel.stage)
+        )
+        async with self.app.database.session() as session:
+            rows = await session.execute(query)
+        return dict.fromkeys(GameStage, 0) | dict(rows.tuples().all())
 
     # TODO: больше не используется из-за появления get_or_create в BaseAccessor
     async def get_active_waiting_game_by_chat_id(
@@ -188,22 +331,99 @@ class GameAccessor(BaseAccessor):
         async with self.app.database.session() as session:
             game: GameModel = await session.scalar(query)
             await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
         return game
 
-    async def change_active_game_stage(
-        self, chat_id: int, stage: GameStage
-    ) -> GameModel:
-        """Находит активную игру (с подгруженными геймплеями и игроками)
-        по chat_id, переводит ее на новую стадию и возвращает эту игру.
+    async def finish_game(
+        self, game_id: int, chat_id: int, results: list[PlayerResult]
+    ) -> GameModel | None:
+        """Переводит активную игру в статус finished и в той же транзакции
+        увеличивает счетчики статистики по итогам игроков. Возвращает
+        завершенную игру или None, если игра уже не активна.
         """
         query = (
             update(GameModel)
             .where(
                 and_(
-                    GameModel.chat_id == chat_id,
+                    GameModel.id == game_id,
+                    GameModel.status == GameStatus.ACTIVE,
+                )
+            )
+            .values(status=GameStatus.FINISHED)
+            .returning(GameModel)
+        )
+        async with self.app.database.session() as session:
+            game: GameModel | None = await session.scalar(query)
+            if game:
+                await self.app.store.stats.record_game(
+                    session, chat_id, results
+                )
+            await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
+        return game
+
+    async def append_game_action(
+        self,
+        game_id: int,
+        action: str,
+        new_values: dict[str, Any] | None = None,
+        expected_stage: GameStage | None = None,
+    ) -> bool:
+        """Дописывает действие в конец журнала действий игры (и меняет
+        значения других полей, если они переданы) одним запросом.
+
+        Если передана expected_stage, действие дописывается, только если
+        игра все еще активна и на этой стадии: ход игрока, который
+        обрабатывался, пока таймер сменил стадию, не попадет в журнал после
+        карт диллера. Возвращает, было ли действие дописано.
+        """
+        conditions = [GameModel.id == game_id]
+        if expected_stage:
+            conditions.extend(
+                (
                     GameModel.status == GameStatus.ACTIVE,
+                    GameModel.stage == expected_stage,
                 )
             )
+        query = (
+            update(GameModel)
+            .where(and_(*conditions))
+            .values(
+                actions=func.array_append(GameModel.actions, action),
+                **(new_values or {}),
+            )
+            .returning(GameModel.id)
+        )
+        async with self.app.database.session() as session:
+            updated_id: int | None = await session.scalar(query)
+            await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
+        return updated_id is not None
+
+    async def change_active_game_stage(
+        self,
+        chat_id: int,
+        stage: GameStage,
+        expected_stage: GameStage | None = None,
+    ) -> GameModel | None:
+        """Находит активную игру (с подгруженными геймплеями и игроками)
+        по chat_id, переводит ее на новую стадию и возвращает эту игру
+        с восстановленными картами.
+
+        Если передана expected_stage, стадия меняется, только если игра
+        все еще на ней, иначе возвращается None: из двух обработчиков,
+        которые одновременно завершают одну стадию (например, таймер и ход
+        игрока), стадию сменит и продолжит игру только один.
+        """
+        conditions = [
+            GameModel.chat_id == chat_id,
+            GameModel.status == GameStatus.ACTIVE,
+        ]
+        if expected_stage:
+            conditions.append(GameModel.stage == expected_stage)
+        query = (
+            update(GameModel)
+            .where(and_(*conditions))
             .values(stage=stage)
             .returning(GameModel)
         ).options(
@@ -211,8 +431,14 @@ class GameAccessor(BaseAccessor):
         )
 
         async with self.app.database.session() as session:
-            game: GameModel = await session.scalar(query)
+            game: GameModel | None = await session.scalar(query)
             await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
+        if game:
+            restore_game_cards(game)
+            self.app.store.game_events.emit(
+                game.id, chat_id, GameEventType.STAGE, stage=stage
+            )
         return game
 
     async def check_all_players_have_bet(self, game_id: int) -> bool:
@@ -259,11 +485,18 @@ class GameAccessor(BaseAccessor):
         )
         async with self.app.database.session() as session:
             game = await session.scalar(query)
+            if game:
+                await self.app.store.stats.record_cancel(session, game.chat_id)
             await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
+        if game:
+            self.app.store.game_events.emit(
+                game.id, game.chat_id, GameEventType.CANCEL
+            )
         return game
 
 
-class GamePlayAccessor(BaseAccessor):
+class GamePlayAccessor(StorageAccessor):
     # TODO: больше не используется из-за появления get_or_create в BaseAccessor
     async def create_gameplay(
         self, game_id: int, player_id: int
@@ -275,6 +508,7 @@ class GamePlayAccessor(BaseAccessor):
         async with self.app.database.session() as session:
             session.add(gameplay)
             await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
         return gameplay
 
     async def get_gameplay_by_game_and_player(
@@ -290,6 +524,27 @@ class GamePlayAccessor(BaseAccessor):
         async with self.app.database.session() as session:
             return await session.scalar(query)
 
+    async def stand_taking_players(self, game_id: int) -> list[GamePlayModel]:
+        """Переводит всех игроков игры, которые еще берут карты, в статус
+        standing. Возвращает измененные геймплеи.
+        """
+        query = (
+            update(GamePlayModel)
+            .where(
+                and_(
+                    GamePlayModel.game_id == game_id,
+                    GamePlayModel.player_status == PlayerStatus.TAKING,
+                )
+            )
+            .values(player_status=PlayerStatus.STANDING)
+            .returning(GamePlayModel)
+        )
+        async with self.app.database.session() as session:
+            gameplays: list[GamePlayModel] = list(await session.scalars(query))
+            await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
+        return gameplays
+
     async def change_gameplay_fields(
         self, gameplay_id: int, new_values: dict[str, Any]
     ) -> GamePlayModel:
@@ -303,4 +558,68 @@ class GamePlayAccessor(BaseAccessor):
         async with self.app.database.session() as session:
             gameplay: GamePlayModel = await session.scalar(query)
             await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
         return gameplay
+
+    @staticmethod
+    async def _write_joins(
+        session: AsyncSession, joins: list[JoinKey]
+    ) -> dict[JoinKey, tuple[bool, GamePlayModel]]:
+        query = (
+            insert(GamePlayModel)
+            .values(
+                [
+                    {
+                        "game_id": game_id,
+                        "player_id": player_id,
+                        "player_bet": NO_BET,
+                    }
+                    for game_id, player_id in joins
+                ]
+            )
+            .on_conflict_do_nothing(constraint="game_player_unique")
+            .returning(GamePlayModel)
+        )
+        results: dict[JoinKey, tuple[bool, GamePlayModel]] = {
+            (gameplay.game_id, gameplay.player_id): (True, gameplay)
+            for gameplay in await session.scalars(query)
+        }
+        existing_keys: list[JoinKey] = [
+            key for key in joins if key not in results
+        ]
+        if existing_keys:
+            existing_query = select(GamePlayModel).where(
+                tuple_(GamePlayModel.game_id, GamePlayModel.player_id).in_(
+                    existing_keys
+                )
+            )
+            for gameplay in await session.scalars(existing_query):
+                results[gameplay.game_id, gameplay.player_id] = (
+                    False,
+                    gameplay,
+                )
+        return results
+
+    async def write_batch(
+        self, joins: list[JoinKey], updates: dict[int, dict[str, Any]]
+    ) -> dict[JoinKey, tuple[bool, GamePlayModel]]:
+        """Одной транзакцией присоединяет игроков к играм (многострочным
+        INSERT ... ON CONFLICT DO NOTHING) и меняет геймплеи по id (пачкой
+        UPDATE, которую asyncpg отправляет за один проход). Для каждого
+        присоединения отдает кортеж (created, геймплей).
+        """
+        async with self.app.database.session() as session:
+            join_results = (
+                await self._write_joins(session, joins) if joins else {}
+            )
+            if updates:
+                await session.execute(
+                    update(GamePlayModel),
+                    [
+                        {"id": gameplay_id, **new_values}
+                        for gameplay_id, new_values in updates.items()
+                    ],
+                )
+            await session.commit()
+            self.app.store.versions.bump(Resource.GAMES)
+        return join_results
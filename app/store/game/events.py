@@ -0,0 +1,211 @@
+import asyncio
+import typing
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import insert, select
+
+from app.base.base_accessor import StorageAccessor
+from app.game.const import GameEventType
+from app.game.models import GameEventModel
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+GAME_EVENTS_FLUSH_INTERVAL_IN_SECONDS = 0.005
+GAME_EVENTS_MAX_BUFFER_SIZE = 1000  # при таком размере буфер пишется сразу
+# больше событий буфер не держит: новые события отбрасываются, пока БД
+# не примет накопленные
+GAME_EVENTS_MAX_BUFFERED = 10_000
+GAME_EVENTS_RETRY_DELAY_IN_SECONDS = 1  # пауза после неудачной записи
+# после стольких неудачных записей подряд события пишутся по одному,
+# а события, которые не записались и так, отбрасываются
+GAME_EVENTS_MAX_FAILED_FLUSHES = 3
+
+
+@dataclass
+class GameEventStats:
+    """Счетчики записи журнала событий."""
+
+    emitted: int = 0
+    written: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    dropped: int = 0  # отброшенные события: буфер полон или запись не удалась
+    max_batch_size: int = 0
+    buffered: int = 0
+
+
+class GameEventAccessor(StorageAccessor):
+    """Журнал событий игр. События копятся в буфере процесса и раз в
+    несколько миллисекунд пишутся в game_events одним многострочным INSERT,
+    поэтому запись события не добавляет транзакцию на горячем пути бота.
+
+    Журнал не должен ни ронять бота, ни копить память без конца, поэтому
+    при недоступной БД события теряются (и считаются в stats.dropped):
+    буфер держит не больше max_buffered событий, а после max_failed_flushes
+    неудачных записей подряд события пишутся по одному, и те, что
+    не записались, отбрасываются (например, событие, которое нарушает
+    ограничение БД и валит весь INSERT).
+    """
+
+    def __init__(
+        self,
+        app: "Application",
+        *args,
+        flush_interval: float = GAME_EVENTS_FLUSH_INTERVAL_IN_SECONDS,
+        max_buffer_size: int = GAME_EVENTS_MAX_BUFFER_SIZE,
+        max_buffered: int = GAME_EVENTS_MAX_BUFFERED,
+        max_failed_flushes: int = GAME_EVENTS_MAX_FAILED_FLUSHES,
+        **kwargs,
+    ):
+        super().__init__(app, *args, **kwargs)
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.max_buffered = max_buffered
+        self.max_failed_flushes = max_failed_flushes
+        self.stats = GameEventStats()
+        self._failed_flushes_in_row = 0
+        self._buffer: list[dict[str, Any]] = []
+        self._buffer_is_full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.flush_task: asyncio.Task | None = None
+
+    async def connect(self, app: "Application") -> None:
+        self.flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def disconnect(self, app: "Application") -> None:
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+        await self.flush()
+
+    def emit(
+        self,
+        game_id: int,
+        chat_id: int,
+        event_type: GameEventType,
+        player_id: int | None = None,
+        **data: Any,
+    ) -> None:
+        """Кладет событие в буфер. Время события фиксируется сразу.
+        Если буфер полон, событие отбрасывается.
+        """
+        if len(self._buffer) >= self.max_buffered:
+            self.stats.dropped += 1
+            return
+        self._buffer.append(
+            {
+                "game_id": game_id,
+                "chat_id": chat_id,
+                "player_id": player_id,
+                "type": event_type,
+                "data": data,
+                "created_at": datetime.now(UTC).replace(tzinfo=None),
+            }
+        )
+        self.stats.emitted += 1
+        if len(self._buffer) >= self.max_buffer_size:
+            self._buffer_is_full.set()
+
+    async def flush(self) -> int:
+        """Пишет накопленные события одним INSERT. Если запись не удалась,
+        события возвращаются в начало буфера, а после max_failed_flushes
+        неудач подряд пишутся по одному. Возвращает число записанных событий.
+        """
+        async with self._flush_lock:
+            events, self._buffer = self._buffer, []
+            self._buffer_is_full.clear()
+            if not events:
+                return 0
+            try:
+                await self._write_events(events)
+            except Exception:
+                self.stats.failed_flushes += 1
+                self._failed_flushes_in_row += 1
+                if self._failed_flushes_in_row < self.max_failed_flushes:
+                    self._requeue(events)
+                    raise
+                self.logger.exception(
+                    "Game events flush failed %s times, writing %s events "
+                    "one by one",
+                    self._failed_flushes_in_row,
+                    len(events),
+                )
+                written: int = await self._insert_one_by_one(events)
+            else:
+                written = len(events)
+            self._failed_flushes_in_row = 0
+
+        self.stats.flushes += 1
+        self.stats.written += written
+        self.stats.max_batch_size = max(self.stats.max_batch_size, len(events))
+        return written
+
+    async def _write_events(self, events: list[dict[str, Any]]) -> None:
+        async with self.app.database.session() as session:
+            await session.execute(insert(GameEventModel), events)
+            await session.commit()
+
+    async def _insert_one_by_one(self, events: list[dict[str, Any]]) -> int:
+        """Пишет события по одному, отбрасывая те, что не записались.
+        Возвращает число записанных событий.
+        """
+        written = 0
+        for event in events:
+            try:
+                await self._write_events([event])
+            except Exception:
+                self.stats.dropped += 1
+            else:
+                written += 1
+        if written < len(events):
+            self.logger.error(
+                "Dropped %s game events that could not be written",
+                len(events) - written,
+            )
+        return written
+
+    def _requeue(self, events: list[dict[str, Any]]) -> None:
+        """Возвращает незаписанные события в начало буфера. То, что
+        не помещается в буфер, отбрасывается (самые новые события).
+        """
+        self._buffer[:0] = events
+        overflow: int = len(self._buffer) - self.max_buffered
+        if overflow > 0:
+            del self._buffer[self.max_buffered :]
+            self.stats.dropped += overflow
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._buffer_is_full.wait(), self.flush_interval
+                )
+            except TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                self.logger.exception("Game events flush failed")
+                await asyncio.sleep(GAME_EVENTS_RETRY_DELAY_IN_SECONDS)
+
+    def get_stats(self) -> GameEventStats:
+        self.stats.buffered = len(self._buffer)
+        return self.stats
+
+    async def list_game_events(self, game_id: int) -> Sequence[GameEventModel]:
+        """Отдает события игры в порядке их записи."""
+        query = (
+            select(GameEventModel)
+            .where(GameEventModel.game_id == game_id)
+            .order_by(GameEventModel.id)
+        )
+        async with self.app.database.session() as session:
+            return (await session.scalars(query)).all()
@@ -0,0 +1,114 @@
+import csv
+import enum
+import io
+import json
+from collections.abc import AsyncIterator, Iterable, Mapping
+from contextlib import aclosing
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Table, select
+
+from app.base.base_accessor import StorageAccessor
+from app.game.models import BalanceModel, GameModel, GamePlayModel
+
+EXPORT_BATCH_SIZE = 1000  # сколько строк читается из курсора БД за раз
+
+
+class ExportTable(enum.StrEnum):
+    GAMES = "games"
+    GAMEPLAYS = "gameplays"
+    BALANCES = "balances"
+
+
+class ExportFormat(enum.StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_TABLES: dict[ExportTable, Table] = {
+    ExportTable.GAMES: GameModel.__table__,
+    ExportTable.GAMEPLAYS: GamePlayModel.__table__,
+    ExportTable.BALANCES: BalanceModel.__table__,
+}
+EXPORT_CONTENT_TYPES: dict[ExportFormat, str] = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def format_ndjson(rows: Iterable[Mapping[str, Any]]) -> str:
+    """Переводит строки в NDJSON: по одному JSON-объекту на строку."""
+    return "".join(
+        json.dumps(dict(row), default=_to_json_value, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def format_csv(
+    rows: Iterable[Mapping[str, Any]], columns: list[str] | None = None
+) -> str:
+    """Переводит строки в CSV. Если переданы columns, первой строкой
+    пишется заголовок. Массивы пишутся в ячейку как JSON.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if columns:
+        writer.writerow(columns)
+    writer.writerows(
+        [
+            json.dumps(value, ensure_ascii=False)
+            if isinstance(value, list | dict)
+            else _to_json_value(value)
+            for value in row.values()
+        ]
+        for row in rows
+    )
+    return buffer.getvalue()
+
+
+class ExportAccessor(StorageAccessor):
+    """Выгрузка таблиц целиком. Строки читаются из серверного курсора
+    пачками, поэтому память не зависит от размера таблицы.
+    """
+
+    async def iter_rows(
+        self, table: ExportTable, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[list[Mapping[str, Any]]]:
+        """Отдает строки таблицы пачками по batch_size в порядке id."""
+        export_table: Table = EXPORT_TABLES[table]
+        query = (
+            select(export_table)
+            .order_by(export_table.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async with self.app.database.session() as session:
+            result = await session.stream(query)
+            async for rows in result.mappings().partitions():
+                yield rows
+
+    async def export(
+        self, table: ExportTable, export_format: ExportFormat
+    ) -> AsyncIterator[str]:
+        """Отдает таблицу в нужном формате по кускам (по одной пачке строк),
+        для CSV первым куском идет заголовок.
+
+        Генератор нужно закрывать (например, через contextlib.aclosing):
+        если выгрузку бросили на середине, только закрытие сразу освобождает
+        курсор и соединение с БД.
+        """
+        if export_format == ExportFormat.CSV:
+            yield format_csv([], list(EXPORT_TABLES[table].columns.keys()))
+        async with aclosing(self.iter_rows(table)) as batches:
+            async for rows in batches:
+                yield (
+                    format_csv(rows)
+                    if export_format == ExportFormat.CSV
+                    else format_ndjson(rows)
+                )
@@ -0,0 +1,179 @@
+import time
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select
+
+from app.base.base_accessor import StorageAccessor
+from app.game.models import BalanceModel, PlayerModel
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+LEADERBOARD_SIZE = 10  # сколько мест показывается по умолчанию
+LEADERBOARD_CAPACITY = 50  # сколько лучших балансов хранится в памяти
+LEADERBOARD_MAX_CHATS = 10_000  # для скольких чатов топ хранится в памяти
+# через сколько секунд топ перечитывается из БД (его могут менять другие узлы)
+LEADERBOARD_TTL_IN_SECONDS = 60
+
+BalanceKey = tuple[int, int]  # (chat_id, player_id)
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    chat_id: int
+    player_id: int
+    current_value: int
+    player: PlayerModel | None = None
+
+
+class TopBalances:
+    """Лучшие балансы одного чата (или всех чатов), которые обновляются
+    при каждом изменении баланса.
+
+    Хранится не больше capacity балансов. floor - значение, все балансы выше
+    которого гарантированно есть в структуре (None - в структуре есть вообще
+    все балансы). Если баланс опускается до floor или ниже, он удаляется из
+    структуры: его место в топе без БД уже не определить. Когда балансов
+    выше floor становится меньше, чем нужно показать, топ перечитывается.
+    """
+
+    def __init__(
+        self,
+        rows: list[tuple[BalanceKey, int]],
+        capacity: int = LEADERBOARD_CAPACITY,
+    ) -> None:
+        self.capacity = capacity
+        self.values: dict[BalanceKey, int] = dict(rows)
+        self.floor: int | None = (
+            min(self.values.values()) if len(rows) >= capacity else None
+        )
+        self.loaded_at: float = time.monotonic()
+
+    def update(self, key: BalanceKey, value: int) -> None:
+        if self.floor is None or value > self.floor:
+            self.values[key] = value
+        else:
+            self.values.pop(key, None)
+
+        if len(self.values) > self.capacity:
+            lowest_key: BalanceKey = min(
+                self.values, key=self.values.__getitem__
+            )
+            self.floor = self.values.pop(lowest_key)
+
+    def can_serve(self, limit: int) -> bool:
+        """Проверяет, что первые limit мест известны без запроса к БД.
+        Балансы, равные floor, взаимозаменяемы: это ничья.
+        """
+        if self.floor is None:
+            return True
+        return len(self.values) >= limit and (
+            sorted(self.values.values(), reverse=True)[limit - 1] >= self.floor
+        )
+
+    def top(self, limit: int) -> list[tuple[BalanceKey, int]]:
+        return sorted(self.values.items(), key=lambda item: -item[1])[:limit]
+
+
+class LeaderboardAccessor(StorageAccessor):
+    """Топ балансов по чатам и по всем чатам. Топ чата загружается из БД
+    при первом запросе по индексу (chat_id, current_value DESC), а дальше
+    обновляется в памяти при каждом изменении баланса, поэтому запрос топа
+    не сканирует таблицу balances.
+    """
+
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.chats: OrderedDict[int, TopBalances] = OrderedDict()
+        self.overall: TopBalances | None = None
+        self.loads = 0
+
+    def clear(self) -> None:
+        """Забывает загруженные топы: следующий запрос прочитает их из БД."""
+        self.chats.clear()
+        self.overall = None
+
+    def on_balance_change(self, balance: BalanceModel) -> None:
+        """Обновляет загруженные топы после изменения или создания баланса."""
+        key: BalanceKey = (balance.chat_id, balance.player_id)
+        if balance.chat_id in self.chats:
+            self.chats[balance.chat_id].update(key, balance.current_value)
+        if self.overall is not None:
+            self.overall.update(key, balance.current_value)
+
+    async def _load(self, chat_id: int | None) -> TopBalances:
+        query = (
+            select(
+                BalanceModel.chat_id,
+                BalanceModel.player_id,
+                BalanceModel.current_value,
+            )
+            .order_by(BalanceModel.current_value.desc())
+            .limit(LEADERBOARD_CAPACITY)
+        )
+        if chat_id is not None:
+            query = query.where(BalanceModel.chat_id == chat_id)
+        async with self.app.database.session() as session:
+            rows = (await session.execute(query)).all()
+        self.loads += 1
+        return TopBalances(
+            [
+                ((row_chat_id, player_id), value)
+                for row_chat_id, player_id, value in rows
+            ]
+        )
+
+    async def _get_players(
+        self, player_ids: set[int]
+    ) -> dict[int, PlayerModel]:
+        query = select(PlayerModel).where(PlayerModel.id.in_(player_ids))
+        async with self.app.database.session() as session:
+            return {
+                player.id: player for player in await session.scalars(query)
+            }
+
+    def _is_fresh(self, top: TopBalances | None, limit: int) -> bool:
+        return (
+            top is not None
+            and top.can_serve(limit)
+            and time.monotonic() - top.loaded_at < LEADERBOARD_TTL_IN_SECONDS
+        )
+
+    async def _get_top_balances(
+        self, chat_id: int | None, limit: int
+    ) -> TopBalances:
+        if chat_id is None:
+            if not self._is_fresh(self.overall, limit):
+                self.overall = await self._load(None)
+            return self.overall
+
+        top: TopBalances | None = self.chats.get(chat_id)
+        if not self._is_fresh(top, limit):
+            top = self.chats[chat_id] = await self._load(chat_id)
+        self.chats.move_to_end(chat_id)
+        while len(self.chats) > LEADERBOARD_MAX_CHATS:
+            self.chats.popitem(last=False)
+        return top
+
+    async def get_top(
+        self, chat_id: int | None = None, limit: int = LEADERBOARD_SIZE
+    ) -> list[LeaderboardEntry]:
+        """Отдает limit лучших балансов чата (или всех чатов, если chat_id
+        не передан) вместе с игроками.
+        """
+        top: TopBalances = await self._get_top_balances(chat_id, limit)
+        top_balances: list[tuple[BalanceKey, int]] = top.top(limit)
+        players: dict[int, PlayerModel] = await self._get_players(
+            {player_id for (_, player_id), _ in top_balances}
+        )
+        return [
+            LeaderboardEntry(
+                chat_id=balance_chat_id,
+                player_id=player_id,
+                current_value=value,
+                player=players.get(player_id),
+            )
+            for (balance_chat_id, player_id), value in top_balances
+        ]
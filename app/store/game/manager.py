@@ -1,4 +1,4 @@
-import random
+import asyncio
 import re
 import typing
 from logging import getLogger
@@ -6,13 +6,17 @@ from logging import getLogger
 from app.game.const import (
     BLACK_JACK,
     CARDS,
-    DILLER_STOP_SCORE,
+    GameAction,
+    GameEventType,
     GameStage,
     GameStatus,
     PlayerStatus,
 )
 from app.game.models import BalanceModel, GameModel, GamePlayModel, PlayerModel
+from app.game.replay import draw_diller_cards, make_action, replay_game
+from app.game.shoe import Shoe
 from app.store.tg_api.dataclasses import CallbackQuery
+from app.web.exceptions import MoveIsOverError, SeedlessGameError
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
@@ -90,7 +94,19 @@ class GameManager:
         self.logger = getLogger("game manager")
 
     async def get_game(self, chat_id: int) -> GameModel:
-        """Получает или создает новую игру."""
+        """Получает или создает новую игру. Новой игре достается сид, по
+        которому перемешивается ее шу, и первая карта из шу для диллера.
+        Сид и шу готовятся, только если игра действительно создается.
+        """
+
+        def get_new_game_params() -> dict[str, typing.Any]:
+            seed: int = Shoe.generate_seed()
+            return {
+                "chat_id": chat_id,
+                "diller_cards": [Shoe(seed).draw()],
+                "seed": seed,
+            }
+
         created, game = await self.app.store.players.get_or_create(
             model=GameModel,
             get_params=[
@@ -98,46 +114,81 @@ class GameManager:
                 GameModel.status == GameStatus.ACTIVE,
                 GameModel.stage == GameStage.WAITING_FOR_PLAYERS_TO_JOIN,
             ],
-            create_params={
-                "chat_id": chat_id,
-                "diller_cards": [random.choice(list(CARDS))],
-            },
+            create_params=get_new_game_params,
         )
         self.logger.info("Game: %s, created: %s", game, created)
+        if created:
+            self.app.store.game_events.emit(
+                game.id, chat_id, GameEventType.CREATE, seed=game.seed
+            )
         return game
 
-    async def get_gameplay(self, game_id: int, player_id: int) -> GamePlayModel:
-        """Получает или создает геймплей."""
-        created, gameplay = await self.app.store.players.get_or_create(
-            model=GamePlayModel,
-            get_params=[
-                GamePlayModel.game_id == game_id,
-                GamePlayModel.player_id == player_id,
-            ],
-            create_params={
-                "game_id": game_id,
-                "player_id": player_id,
-                "player_bet": 1,
-            },
+    async def get_gameplay(
+        self, game_id: int, player_id: int, chat_id: int
+    ) -> GamePlayModel:
+        """Получает или создает геймплей. Присоединения игроков из разных
+        чатов пишутся в БД общими пачками через буфер отложенной записи.
+        """
+        created, gameplay = await self.app.store.gameplay_writes.join_game(
+            game_id, player_id
         )
         self.logger.info("Gameplay: %s, created: %s", gameplay, created)
+        if created:
+            self.app.store.game_events.emit(
+                game_id, chat_id, GameEventType.JOIN, player_id
+            )
         return gameplay
 
+    @staticmethod
+    def _get_shoe(game: GameModel) -> Shoe:
+        """Отдает шу игры в том состоянии, в котором из него будет раздана
+        следующая карта. Игры загружаются с уже восстановленным шу, журнал
+        проигрывается заново, только если шу в игре еще нет.
+        """
+        if game.seed is None:
+            raise SeedlessGameError(game.id)
+        if game.shoe is None:
+            game.shoe = replay_game(game.seed, game.actions).shoe
+        return game.shoe
+
+    async def _append_action(
+        self,
+        game: GameModel,
+        action: GameAction,
+        player_id: int | None = None,
+        new_values: dict | None = None,
+        expected_stage: GameStage | None = None,
+    ) -> None:
+        """Дописывает действие в журнал игры - и в БД, и в уже загруженном
+        экземпляре игры. Если передана expected_stage, а игра уже ушла с нее,
+        действие не дописывается и поднимается MoveIsOverError.
+        """
+        record: str = make_action(action, player_id)
+        if not await self.app.store.games.append_game_action(
+            game.id, record, new_values, expected_stage
+        ):
+            raise MoveIsOverError(game.id)
+        game.actions = [*game.actions, record]
+
     async def update_gameplay_bet_status_and_cards(
         self, game: GameModel, query: CallbackQuery, bet_value: int
     ) -> tuple[bool, bool]:
-        """Находит геймплей, генерит 2 случайные карты и проверяет сумму очков.
+        """Находит геймплей, раздает игроку 2 карты из шу игры и проверяет
+        сумму очков.
 
         Если сумма очков равна 21 (то есть у игрока Блэк Джек), статус
         геймплея сразу меняется на STANDING, минуя стадию TAKING, а переменной
         is_black_jack присваивается значение True.
         Если сумма менее 21, геймплею присваивается статус TAKING.
-        Также в геймплее обновляются данные о картах игрока и его ставке.
+        Также в геймплее обновляется ставка игрока, а раздача карт
+        записывается в журнал действий игры.
 
         Затем происходит проверка, все ли игроки сделали ставку.
 
         Метод возвращает кортеж, состоящий из результата этой проверки и
-        значения переменной is_black_jack.
+        значения переменной is_black_jack. Если стадия ставок уже закончилась
+        (например, игру отменил таймер), розданные карты отбрасываются
+        и поднимается MoveIsOverError.
         """
         is_black_jack = False
         player: PlayerModel = await self.app.store.players.get_player_by_tg_id(
@@ -146,23 +197,38 @@ class GameManager:
         gameplay: GamePlayModel = next(
             filter(lambda x: x.player.id == player.id, game.gameplays)
         )
-        new_gameplay_values = {
-            "player_bet": bet_value,
-            "player_cards": [random.choice(list(CARDS)) for _ in range(2)],
-        }
+        shoe: Shoe = self._get_shoe(game)
+        gameplay.player_cards = shoe.draw_many(2)
+        new_gameplay_values = {"player_bet": bet_value}
 
-        if (
-            self.process_score_with_aces(new_gameplay_values["player_cards"])
-            == BLACK_JACK
-        ):
+        if self.process_score_with_aces(gameplay.player_cards) == BLACK_JACK:
             new_gameplay_values["player_status"] = PlayerStatus.STANDING
             is_black_jack = True
         else:
             new_gameplay_values["player_status"] = PlayerStatus.TAKING
 
-        await self.app.store.gameplays.change_gameplay_fields(
+        try:
+            await self._append_action(
+                game,
+                GameAction.BET,
+                player.id,
+                expected_stage=GameStage.BETTING,
+            )
+        except MoveIsOverError:
+            gameplay.player_cards, game.shoe = None, None
+            raise
+        # ставку нужно дождаться: ниже ставки всех игроков читаются из БД
+        await self.app.store.gameplay_writes.update_gameplay(
             gameplay.id, new_gameplay_values
         )
+        self.app.store.game_events.emit(
+            game.id,
+            game.chat_id,
+            GameEventType.BET,
+            player.id,
+            bet=bet_value,
+            status=new_gameplay_values["player_status"],
+        )
         return await self.app.store.games.check_all_players_have_bet(
             game.id
         ), is_black_jack
@@ -175,11 +241,13 @@ class GameManager:
         равен TAKING, то данный игрок в этой игре не вправе брать новые карты,
         и переменная wrong_player_status становится True.
 
-        Если игрок вправе брать карты, ему добавляется еще одна карта и
+        Если игрок вправе брать карты, ему добавляется еще одна карта из шу и
         происходит подсчет суммы очков с учетом наличия тузов среди карт.
-        Если сумма более 21, то переменная exceeded становится True.
-        Затем в геймплее этого игрока сохраняются его карты (с учетом только что
-        полученной новой карты).
+        Если сумма более 21, то переменная exceeded становится True, а геймплею
+        присваивается статус EXCEEDED. Сама карта в БД не пишется: в журнал
+        действий игры дописывается только то, что игрок взял карту. Если
+        стадия ходов игроков уже закончилась (например, итоги подвел таймер),
+        карта отбрасывается и поднимается MoveIsOverError.
 
         Метод возвращает переменную exceeded, обновленный список карт игрока и
         переменную wrong_player_status.
@@ -196,21 +264,34 @@ class GameManager:
             wrong_player_status = True
             return exceeded, gameplay.player_cards, wrong_player_status
 
-        gameplay.player_cards.append(random.choice(list(CARDS)))
+        shoe: Shoe = self._get_shoe(game)
+        gameplay.player_cards.append(shoe.draw())
         updated_cards: list[str] = gameplay.player_cards
         score: int = self.process_score_with_aces(updated_cards)
 
+        try:
+            await self._append_action(
+                game,
+                GameAction.HIT,
+                player.id,
+                expected_stage=GameStage.PLAYERHIT,
+            )
+        except MoveIsOverError:
+            # шу уже сдвинут на эту карту: его восстановят из журнала заново
+            gameplay.player_cards.pop()
+            game.shoe = None
+            raise
         if score > BLACK_JACK:
             exceeded = True
-            new_gameplay_values = {
-                "player_status": PlayerStatus.EXCEEDED,
-                "player_cards": updated_cards,
-            }
-        else:
-            new_gameplay_values = {"player_cards": updated_cards}
-
-        await self.app.store.gameplays.change_gameplay_fields(
-            gameplay.id, new_gameplay_values
+            await self.app.store.gameplay_writes.update_gameplay(
+                gameplay.id, {"player_status": PlayerStatus.EXCEEDED}
+            )
+        self.app.store.game_events.emit(
+            game.id,
+            game.chat_id,
+            GameEventType.HIT,
+            player.id,
+            status=PlayerStatus.EXCEEDED if exceeded else PlayerStatus.TAKING,
         )
         return exceeded, updated_cards, wrong_player_status
 
@@ -218,7 +299,8 @@ class GameManager:
         self, game: GameModel, query: CallbackQuery
     ) -> list[str]:
         """Меняет статус геймплея на STANDING (игрок больше не берет карты)
-        и возвращает список его карт.
+        и возвращает список его карт. Если стадия ходов игроков уже
+        закончилась, поднимается MoveIsOverError.
         """
         player: PlayerModel = await self.app.store.players.get_player_by_tg_id(
             query.from_.id
@@ -227,34 +309,54 @@ class GameManager:
             filter(lambda x: x.player.id == player.id, game.gameplays)
         )
         new_gameplay_values = {"player_status": PlayerStatus.STANDING}
-        await self.app.store.gameplays.change_gameplay_fields(
+        await self.app.store.gameplay_writes.update_gameplay(
             gameplay.id, new_gameplay_values
         )
+        await self._append_action(
+            game,
+            GameAction.STAND,
+            player.id,
+            expected_stage=GameStage.PLAYERHIT,
+        )
+        self.app.store.game_events.emit(
+            game.id, game.chat_id, GameEventType.STAND, player.id
+        )
         return gameplay.player_cards
 
+    async def stand_taking_players(
+        self, game: GameModel
+    ) -> list[GamePlayModel]:
+        """Переводит всех игроков, которые еще берут карты, в статус STANDING
+        (когда вышло время на ходы игроков) и записывает это в журнал действий.
+        Возвращает измененные геймплеи.
+        """
+        gameplays: list[
+            GamePlayModel
+        ] = await self.app.store.gameplays.stand_taking_players(game.id)
+        for gameplay in gameplays:
+            await self._append_action(
+                game, GameAction.STAND, gameplay.player_id
+            )
+            self.app.store.game_events.emit(
+                game.id, game.chat_id, GameEventType.STAND, gameplay.player_id
+            )
+        return gameplays
+
     async def take_cards_by_diller(self, game: GameModel) -> int:
-        """Добавляет карты диллеру, пока число его очков не достигнет 17,
-        возвращает итоговое число очков диллера с учетом наличия тузов.
+        """Добавляет диллеру карты из шу, пока число его очков не достигнет 17,
+        сохраняет итоговые карты диллера и возвращает итоговое число очков
+        диллера с учетом наличия тузов.
         """
-        aces: int = sum(
-            1 for card in game.diller_cards if re.match(ACES_REGEX, card)
+        shoe: Shoe = self._get_shoe(game)
+        score: int = draw_diller_cards(game.diller_cards, shoe)
+        await self._append_action(
+            game,
+            GameAction.DILLER,
+            new_values={"diller_cards": game.diller_cards},
+        )
+        self.app.store.game_events.emit(
+            game.id, game.chat_id, GameEventType.DILLER, score=score
         )
-        score: int = sum(CARDS[card] for card in game.diller_cards)
-
-        while score > BLACK_JACK and aces:
-            score -= 10
-            aces -= 1
-
-        while score < DILLER_STOP_SCORE:
-            new_card: str = random.choice(list(CARDS))
-            if CARDS[new_card] + score > BLACK_JACK and aces:
-                score -= 10
-                aces -= 1
-            score += CARDS[new_card]
-            game.diller_cards.append(new_card)
-
-        new_game_values = {"diller_cards": game.diller_cards}
-        await self.app.store.games.change_game_fields(game.id, new_game_values)
         return score
 
     async def finalize_player_result(
@@ -265,16 +367,34 @@ class GameManager:
         message: str,
         player_balance_change: int | None = None,
         gameplay_status_change: str | None = None,
-    ) -> str:
-        """Присваивает игроку в геймплее финальный статус (если у игрока не было
-        перебора очков), обновляет его баланс (если игрок не сыграл с диллером
-        вничью) и возвращает строку с результатами игрока.
+    ) -> tuple[str, asyncio.Future]:
+        """Сохраняет итоговые карты игрока, присваивает игроку в геймплее
+        финальный статус (если у игрока не было перебора очков), обновляет его
+        баланс (если игрок не сыграл с диллером вничью) и возвращает строку
+        с результатами игрока.
+
+        Итоги геймплея только кладутся в буфер отложенной записи, поэтому
+        вместе со строкой возвращается future их записи: перед отправкой
+        результатов игры вызывающий код должен его дождаться.
         """
+        new_gameplay_values = {"player_cards": gameplay.player_cards}
         if gameplay_status_change:
-            await self.app.store.gameplays.change_gameplay_fields(
-                gameplay_id=gameplay.id,
-                new_values={"player_status": gameplay_status_change},
+            new_gameplay_values["player_status"] = gameplay_status_change
+            gameplay.player_status = gameplay_status_change
+        gameplay_written: asyncio.Future = (
+            self.app.store.gameplay_writes.update_gameplay(
+                gameplay.id, new_gameplay_values
             )
+        )
+        self.app.store.game_events.emit(
+            gameplay.game_id,
+            chat_id,
+            GameEventType.SETTLE,
+            gameplay.player_id,
+            status=gameplay_status_change or gameplay.player_status,
+            score=player_score,
+            balance_change=player_balance_change or 0,
+        )
         if player_balance_change:
             await PlayerManager.change_player_balance(
                 self, gameplay.player_id, chat_id, player_balance_change
@@ -295,7 +415,7 @@ class GameManager:
                 ),
                 score=player_score,
             )
-        return result_str
+        return result_str, gameplay_written
 
     def process_score_with_aces(self, cards: list[str]) -> int:
         """Определяет суммарное число очков по картам, учитывая, что тузы
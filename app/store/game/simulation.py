@@ -0,0 +1,57 @@
+import asyncio
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any
+
+from app.base.base_accessor import BaseAccessor
+from app.web.exceptions import SimulationBusyError
+
+if typing.TYPE_CHECKING:
+    from app.game.simulator import SimulationResult
+    from app.web.app import Application
+
+# процессы симулятора: они делят ядра с ботом, поэтому их немного
+SIMULATION_WORKERS = 2
+# сколько симуляций может идти одновременно, остальные запросы отклоняются
+SIMULATION_MAX_CONCURRENT = 1
+
+
+class SimulationAccessor(BaseAccessor):
+    """Запускает симуляции (см. app.game.simulator) в общем пуле процессов.
+
+    Пул создается один на приложение с контекстом spawn: fork процесса
+    бота скопировал бы в воркеры цикл событий, сокеты asyncpg и потоки.
+    Процессы запускаются при первой симуляции, а не при старте.
+    """
+
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.executor: ProcessPoolExecutor | None = None
+        self.semaphore = asyncio.Semaphore(SIMULATION_MAX_CONCURRENT)
+
+    async def connect(self, app: "Application") -> None:
+        self.executor = ProcessPoolExecutor(
+            max_workers=SIMULATION_WORKERS, mp_context=get_context("spawn")
+        )
+
+    async def disconnect(self, app: "Application") -> None:
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def simulate(self, **config: Any) -> "SimulationResult":
+        """Играет симуляцию с правилами config. Если симуляций уже идет
+        SIMULATION_MAX_CONCURRENT, сразу поднимает SimulationBusyError.
+        """
+        # симулятор тянет numpy: импортируется при первом запросе, а не
+        # при старте приложения
+        from app.game.simulator import SimulationConfig, simulate
+
+        if self.semaphore.locked():
+            raise SimulationBusyError
+        async with self.semaphore:
+            # пул процессов ждем в отдельном потоке, чтобы не блокировать бота
+            return await asyncio.to_thread(
+                simulate, SimulationConfig(**config), self.executor
+            )
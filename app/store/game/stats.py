@@ -0,0 +1,145 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Date, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.base.base_accessor import StorageAccessor
+from app.game.const import PlayerStatus
+from app.game.models import (
+    ChatDayStatsModel,
+    ChatStatsModel,
+    PlayerStatsModel,
+)
+from app.game.stats import PlayerResult
+from app.store.database.sqlalchemy_base import BaseModel
+
+CHAT_DAY_STATS_DAYS = 7  # за сколько последних дней отдается статистика
+UTC_TODAY = cast(func.timezone("utc", func.now()), Date)
+
+
+class StatsAccessor(StorageAccessor):
+    """Счетчики статистики игроков и чатов. Счетчики увеличиваются в той же
+    транзакции, в которой игра завершается или отменяется (сессию передает
+    GameAccessor), а читаются по первичному ключу.
+    """
+
+    @staticmethod
+    async def _increment(
+        session: AsyncSession,
+        model: type[BaseModel],
+        key_columns: tuple[str, ...],
+        rows: list[dict[str, Any]],
+    ) -> Sequence[Any]:
+        """Одним INSERT ... ON CONFLICT DO UPDATE создает строки счетчиков
+        или прибавляет значения к существующим. Возвращает новые значения
+        счетчиков games (если они есть у модели).
+        """
+        query = insert(model).values(rows)
+        counters: list[str] = [
+            column for column in rows[0] if column not in key_columns
+        ]
+        query = query.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={
+                column: getattr(model, column) + query.excluded[column]
+                for column in counters
+            },
+        )
+        if "games" not in counters:
+            await session.execute(query)
+            return []
+        return (await session.scalars(query.returning(model.games))).all()
+
+    @staticmethod
+    def _get_player_counters(
+        chat_id: int, result: PlayerResult
+    ) -> dict[str, Any]:
+        """Значения, которые прибавляются к счетчикам игрока после игры."""
+        return {
+            "chat_id": chat_id,
+            "player_id": result.player_id,
+            "games": 1,
+            "wins": int(result.status == PlayerStatus.WON),
+            "losses": int(
+                result.status in (PlayerStatus.LOST, PlayerStatus.EXCEEDED)
+            ),
+            "ties": int(result.status == PlayerStatus.TIE),
+            "black_jacks": int(result.black_jack),
+            "wagered": result.bet,
+            "net": result.balance_change,
+        }
+
+    async def record_game(
+        self,
+        session: AsyncSession,
+        chat_id: int,
+        results: list[PlayerResult],
+    ) -> None:
+        """Увеличивает счетчики игроков и чата после завершения игры."""
+        player_games: Sequence[int] = []
+        if results:
+            player_games = await self._increment(
+                session,
+                PlayerStatsModel,
+                ("chat_id", "player_id"),
+                [
+                    self._get_player_counters(chat_id, result)
+                    for result in results
+                ],
+            )
+        # игрок сыграл в чате первую игру, если его счетчик игр равен 1
+        new_players: int = sum(1 for games in player_games if games == 1)
+        await self._increment(
+            session,
+            ChatStatsModel,
+            ("chat_id",),
+            [{"chat_id": chat_id, "games": 1, "players": new_players}],
+        )
+        await self._increment(
+            session,
+            ChatDayStatsModel,
+            ("chat_id", "day"),
+            [{"chat_id": chat_id, "day": UTC_TODAY, "games": 1}],
+        )
+
+    async def record_cancel(self, session: AsyncSession, chat_id: int) -> None:
+        """Увеличивает счетчики отмененных игр чата."""
+        await self._increment(
+            session,
+            ChatStatsModel,
+            ("chat_id",),
+            [{"chat_id": chat_id, "cancels": 1}],
+        )
+        await self._increment(
+            session,
+            ChatDayStatsModel,
+            ("chat_id", "day"),
+            [{"chat_id": chat_id, "day": UTC_TODAY, "cancels": 1}],
+        )
+
+    async def get_player_stats(
+        self, player_id: int, chat_id: int
+    ) -> PlayerStatsModel | None:
+        """Отдает статистику игрока в определенном чате."""
+        async with self.app.database.session() as session:
+            return await session.get(PlayerStatsModel, (chat_id, player_id))
+
+    async def get_chat_stats(self, chat_id: int) -> ChatStatsModel | None:
+        """Отдает статистику чата."""
+        async with self.app.database.session() as session:
+            return await session.get(ChatStatsModel, chat_id)
+
+    async def list_chat_day_stats(
+        self, chat_id: int, days: int = CHAT_DAY_STATS_DAYS
+    ) -> Sequence[ChatDayStatsModel]:
+        """Отдает статистику чата за последние дни, начиная с последнего."""
+        query = (
+            select(ChatDayStatsModel)
+            .where(ChatDayStatsModel.chat_id == chat_id)
+            .order_by(ChatDayStatsModel.day.desc())
+            .limit(days)
+        )
+        async with self.app.database.session() as session:
+            return (await session.scalars(query)).all()
@@ -0,0 +1,157 @@
+import asyncio
+import time
+import typing
+from contextvars import Context
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.base.base_accessor import BaseAccessor
+from app.base.metrics import Histogram
+from app.store.game.accessor import JoinKey
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+WRITE_BUFFER_FLUSH_INTERVAL_IN_SECONDS = 0.005
+WRITE_BUFFER_MAX_SIZE = 500  # при таком числе изменений буфер пишется сразу
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500)
+FLUSH_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+
+
+@dataclass
+class WriteBatch:
+    """Изменения геймплеев, которые будут записаны одной транзакцией.
+
+    committed завершается, когда транзакция записана (или с ошибкой, если
+    запись не удалась): это и есть гарантия записи для вызывающего кода.
+    """
+
+    updates: dict[int, dict[str, Any]] = field(default_factory=dict)
+    joins: dict[JoinKey, asyncio.Future] = field(default_factory=dict)
+    committed: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+    def __len__(self) -> int:
+        return len(self.updates) + len(self.joins)
+
+
+class GamePlayWriteBuffer(BaseAccessor):
+    """Буфер отложенной записи геймплеев.
+
+    Изменения геймплеев и присоединения игроков к играм из всех чатов
+    копятся несколько миллисекунд и пишутся одной транзакцией через
+    GamePlayAccessor.write_batch. Изменения одного геймплея внутри пачки
+    сливаются в одно.
+    """
+
+    def __init__(
+        self,
+        app: "Application",
+        *args,
+        flush_interval: float = WRITE_BUFFER_FLUSH_INTERVAL_IN_SECONDS,
+        max_size: int = WRITE_BUFFER_MAX_SIZE,
+        **kwargs,
+    ):
+        super().__init__(app, *args, **kwargs)
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.flush_latency = Histogram(FLUSH_LATENCY_BUCKETS)
+        self.failed_flushes = 0
+        self._batch: WriteBatch | None = None
+        self._batch_is_full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.flush_task: asyncio.Task | None = None
+
+    async def connect(self, app: "Application") -> None:
+        self._start_flush_loop()
+
+    async def disconnect(self, app: "Application") -> None:
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+        await self.flush()
+
+    def _start_flush_loop(self) -> None:
+        if self.flush_task is None or self.flush_task.done():
+            # цикл запускается из обработчика update: пустой контекст, чтобы
+            # он не унаследовал текущий спан трассы (см. app.base.tracing)
+            self.flush_task = asyncio.create_task(
+                self._flush_periodically(), context=Context()
+            )
+
+    def _get_batch(self) -> WriteBatch:
+        self._start_flush_loop()
+        if self._batch is None:
+            self._batch = WriteBatch()
+        if len(self._batch) + 1 >= self.max_size:
+            self._batch_is_full.set()
+        return self._batch
+
+    def update_gameplay(
+        self, gameplay_id: int, new_values: dict[str, Any]
+    ) -> asyncio.Future:
+        """Кладет изменение геймплея в буфер. Возвращает future, который
+        завершится, когда изменение будет записано: его нужно дождаться, если
+        дальше изменение читается из БД.
+        """
+        batch: WriteBatch = self._get_batch()
+        batch.updates.setdefault(gameplay_id, {}).update(new_values)
+        return batch.committed
+
+    def join_game(self, game_id: int, player_id: int) -> asyncio.Future:
+        """Кладет в буфер присоединение игрока к игре. Возвращает future
+        с кортежем (created, геймплей), как у BaseAccessor.get_or_create.
+        """
+        batch: WriteBatch = self._get_batch()
+        key: JoinKey = (game_id, player_id)
+        if key not in batch.joins:
+            batch.joins[key] = asyncio.get_running_loop().create_future()
+        return batch.joins[key]
+
+    async def flush(self) -> int:
+        """Записывает текущую пачку одной транзакцией. Вызов flush - это
+        точка гарантии записи: после него все изменения, положенные в буфер
+        раньше, записаны. Возвращает размер записанной пачки.
+        """
+        async with self._flush_lock:
+            batch, self._batch = self._batch, None
+            self._batch_is_full.clear()
+            if batch is None:
+                return 0
+
+            started_at: float = time.perf_counter()
+            try:
+                join_results = await self.app.store.gameplays.write_batch(
+                    list(batch.joins), batch.updates
+                )
+            except Exception as error:
+                self.failed_flushes += 1
+                for future in (*batch.joins.values(), batch.committed):
+                    future.set_exception(error)
+                raise
+
+            self.flush_latency.observe(time.perf_counter() - started_at)
+            self.batch_size.observe(len(batch))
+            for key, future in batch.joins.items():
+                future.set_result(join_results[key])
+            batch.committed.set_result(None)
+            return len(batch)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._batch_is_full.wait(), self.flush_interval
+                )
+            except TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                self.logger.exception("Gameplay write buffer flush failed")
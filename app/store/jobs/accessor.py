@@ -0,0 +1,179 @@
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+
+from app.base.base_accessor import StorageAccessor
+from app.jobs.const import (
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_DELAY_IN_SECONDS,
+    JobStatus,
+)
+from app.jobs.models import JobModel
+
+# время считается на стороне БД, чтобы узлы с разными часами не спорили
+UTC_NOW = func.timezone("utc", func.now())
+
+
+class JobAccessor(StorageAccessor):
+    async def create_job(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        delay_seconds: float = 0,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ) -> JobModel:
+        """Ставит задачу в очередь: ее выполнят через delay_seconds секунд."""
+        query = (
+            insert(JobModel)
+            .values(
+                kind=kind,
+                payload=payload,
+                run_at=UTC_NOW + timedelta(seconds=delay_seconds),
+                max_attempts=max_attempts,
+            )
+            .returning(JobModel)
+        )
+        async with self.app.database.session() as session:
+            job: JobModel = await session.scalar(query)
+            await session.commit()
+        return job
+
+    async def claim_jobs(
+        self, locked_by: str, batch_size: int, lease_seconds: float
+    ) -> list[tuple[JobModel, str | None]]:
+        """Забирает пачку задач, время которых пришло, и берет их в аренду
+        на lease_seconds секунд. Строки, которые в этот момент забирает другой
+        узел, пропускаются (FOR UPDATE SKIP LOCKED). Задачи с истекшей арендой
+        забираются заново.
+        Возвращает пары из задачи и узла, у которого истекла аренда задачи
+        (None, если задача забирается впервые или после ошибки).
+        """
+        due_jobs = (
+            select(
+                JobModel.id,
+                JobModel.locked_by.label("previous_locked_by"),
+            )
+            .where(
+                and_(
+                    JobModel.status == JobStatus.PENDING,
+                    JobModel.run_at <= UTC_NOW,
+                    or_(
+                        JobModel.locked_until.is_(None),
+                        JobModel.locked_until < UTC_NOW,
+                    ),
+                )
+            )
+            .order_by(JobModel.run_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("due_jobs")
+        )
+        query = (
+            update(JobModel)
+            .where(JobModel.id == due_jobs.c.id)
+            .values(
+                locked_by=locked_by,
+                locked_until=UTC_NOW + timedelta(seconds=lease_seconds),
+                attempts=JobModel.attempts + 1,
+            )
+            .returning(JobModel, due_jobs.c.previous_locked_by)
+            .execution_options(synchronize_session=False)
+        )
+        async with self.app.database.session() as session:
+            claimed_jobs = list((await session.execute(query)).tuples())
+            await session.commit()
+        return claimed_jobs
+
+    async def complete_job(self, job_id: int, locked_by: str) -> bool:
+        """Удаляет выполненную задачу, если она все еще в аренде у этого узла.
+        Возвращает, была ли задача удалена.
+        """
+        query = (
+            delete(JobModel)
+            .where(and_(JobModel.id == job_id, JobModel.locked_by == locked_by))
+            .returning(JobModel.id)
+        )
+        async with self.app.database.session() as session:
+            deleted_id: int | None = await session.scalar(query)
+            await session.commit()
+        return deleted_id is not None
+
+    async def fail_job(
+        self, job: JobModel, locked_by: str, error: str
+    ) -> JobModel | None:
+        """Снимает аренду с задачи, которая завершилась ошибкой: задача либо
+        откладывается для повтора (задержка растет с числом попыток), либо,
+        если попытки закончились, помечается как failed.
+        """
+        if job.attempts >= job.max_attempts:
+            new_values = {"status": JobStatus.FAILED}
+        else:
+            new_values = {
+                "run_at": UTC_NOW
+                + timedelta(seconds=JOB_RETRY_DELAY_IN_SECONDS * job.attempts)
+            }
+        query = (
+            update(JobModel)
+            .where(and_(JobModel.id == job.id, JobModel.locked_by == locked_by))
+            .values(
+                locked_by=None,
+                locked_until=None,
+                last_error=error,
+                **new_values,
+            )
+            .returning(JobModel)
+        )
+        async with self.app.database.session() as session:
+            failed_job: JobModel | None = await session.scalar(query)
+            await session.commit()
+        return failed_job
+
+    async def cancel_jobs(self, kind: str, payload: dict[str, Any]) -> int:
+        """Удаляет ожидающие задачи вида kind, в payload которых есть все
+        переданные пары ключ-значение. Возвращает число удаленных задач.
+        """
+        query = (
+            delete(JobModel)
+            .where(
+                and_(
+                    JobModel.kind == kind,
+                    JobModel.status == JobStatus.PENDING,
+                    JobModel.payload.contains(payload),
+                )
+            )
+            .returning(JobModel.id)
+        )
+        async with self.app.database.session() as session:
+            cancelled_ids: list[int] = list(await session.scalars(query))
+            await session.commit()
+        return len(cancelled_ids)
+
+    async def count_jobs(self) -> dict[str, int]:
+        """Считает задачи в очереди: ожидающие, просроченные (время пришло,
+        но никто не взял), выполняющиеся (в аренде) и упавшие.
+        """
+        is_pending = JobModel.status == JobStatus.PENDING
+        is_leased = and_(is_pending, JobModel.locked_until >= UTC_NOW)
+        query = select(
+            func.count().filter(is_pending).label("pending"),
+            func.count()
+            .filter(
+                and_(
+                    is_pending,
+                    JobModel.run_at <= UTC_NOW,
+                    or_(
+                        JobModel.locked_until.is_(None),
+                        JobModel.locked_until < UTC_NOW,
+                    ),
+                )
+            )
+            .label("overdue"),
+            func.count().filter(is_leased).label("leased"),
+            func.count()
+            .filter(JobModel.status == JobStatus.FAILED)
+            .label("failed"),
+        )
+        async with self.app.database.session() as session:
+            counts = (await session.execute(query)).one()
+        return dict(counts._mapping)
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import socket
+import typing
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+from uuid import uuid4
+
+from app.base.base_accessor import BaseAccessor
+from app.jobs.const import (
+    JOB_LEASE_IN_SECONDS,
+    JOBS_BATCH_SIZE,
+    JOBS_POLL_INTERVAL_IN_SECONDS,
+)
+from app.jobs.models import JobModel
+from app.store.jobs.accessor import JobAccessor
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+@dataclass
+class JobStats:
+    """Счетчики работы воркера на этом узле."""
+
+    scheduled: int = 0
+    cancelled: int = 0
+    polls: int = 0
+    claimed: int = 0
+    completed: int = 0
+    retried: int = 0
+    failed: int = 0
+    lease_expired: int = 0  # задачи, забранные у узла с истекшей арендой
+    last_batch_size: int = 0
+    max_lag_seconds: float = 0.0  # насколько позже run_at задача была забрана
+
+
+class JobWorker(BaseAccessor):
+    """Воркер общей очереди отложенных задач (таблица jobs).
+
+    Каждый узел бота опрашивает очередь и выполняет задачи, время которых
+    пришло, обработчиками, зарегистрированными для вида задачи. Благодаря
+    аренде задача, узел которой упал, будет выполнена другим узлом, поэтому
+    обработчики должны быть идемпотентными.
+    """
+
+    def __init__(
+        self,
+        app: "Application",
+        *args,
+        batch_size: int = JOBS_BATCH_SIZE,
+        poll_interval: float = JOBS_POLL_INTERVAL_IN_SECONDS,
+        lease_seconds: float = JOB_LEASE_IN_SECONDS,
+        **kwargs,
+    ):
+        super().__init__(app, *args, **kwargs)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.handlers: dict[str, JobHandler] = {}
+        self.stats = JobStats()
+        self.poll_task: asyncio.Task | None = None
+
+    @property
+    def jobs(self) -> JobAccessor:
+        return self.app.store.jobs
+
+    async def connect(self, app: "Application") -> None:
+        self.poll_task = asyncio.create_task(self.poll())
+
+    async def disconnect(self, app: "Application") -> None:
+        if self.poll_task:
+            self.poll_task.cancel()
+            try:
+                await self.poll_task
+            except asyncio.CancelledError:
+                pass
+            self.poll_task = None
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Регистрирует обработчик задач вида kind."""
+        self.handlers[kind] = handler
+
+    async def schedule(
+        self, kind: str, payload: dict[str, Any], seconds: float = 0
+    ) -> JobModel:
+        """Ставит задачу в очередь через seconds секунд."""
+        job: JobModel = await self.jobs.create_job(kind, payload, seconds)
+        self.stats.scheduled += 1
+        return job
+
+    async def cancel(self, kind: str, **payload: Any) -> int:
+        """Отменяет ожидающие задачи вида kind с такими значениями в payload,
+        например cancel(JobKind.CANCEL_GAME_DUE_TO_TIMER, game_id=1).
+        """
+        cancelled: int = await self.jobs.cancel_jobs(kind, payload)
+        self.stats.cancelled += cancelled
+        return cancelled
+
+    async def poll(self) -> None:
+        """Опрашивает очередь. Если пачка пришла полной, следующая пачка
+        забирается сразу, иначе воркер ждет poll_interval.
+        """
+        while True:
+            try:
+                processed: int = await self.run_once()
+            except Exception:
+                self.logger.exception("Job queue poll failed")
+                processed = 0
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def run_once(self) -> int:
+        """Забирает одну пачку задач и выполняет ее. Возвращает размер пачки."""
+        claimed_jobs = await self.jobs.claim_jobs(
+            self.node_id, self.batch_size, self.lease_seconds
+        )
+        self.stats.polls += 1
+        self.stats.claimed += len(claimed_jobs)
+        self.stats.last_batch_size = len(claimed_jobs)
+
+        now = datetime.now(UTC).replace(tzinfo=None)
+        for job, previous_locked_by in claimed_jobs:
+            if previous_locked_by is not None:
+                self.stats.lease_expired += 1
+                self.logger.warning(
+                    "Job %s lease of %s expired", job.id, previous_locked_by
+                )
+            self.stats.max_lag_seconds = max(
+                self.stats.max_lag_seconds, (now - job.run_at).total_seconds()
+            )
+
+        await asyncio.gather(*(self._run_job(job) for job, _ in claimed_jobs))
+        return len(claimed_jobs)
+
+    async def _run_job(self, job: JobModel) -> None:
+        handler: JobHandler | None = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise LookupError(f"Unknown job kind: {job.kind}")
+            await handler(job.payload)
+        except Exception as error:
+            self.logger.exception("Job %s (%s) failed", job.id, job.kind)
+            failed_job: JobModel | None = await self.jobs.fail_job(
+                job, self.node_id, repr(error)
+            )
+            if failed_job:
+                if job.attempts >= job.max_attempts:
+                    self.stats.failed += 1
+                else:
+                    self.stats.retried += 1
+        else:
+            await self.jobs.complete_job(job.id, self.node_id)
+            self.stats.completed += 1
@@ -0,0 +1,741 @@
+import operator
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.elements import BinaryExpression
+
+from app.admin.models import AdminModel
+from app.base.base_accessor import (
+    BM,
+    CreateParams,
+    StorageAccessor,
+    get_create_params,
+)
+from app.base.pagination import PAGE_SIZE, Page, make_page
+from app.game.const import (
+    MINIMAL_BET,
+    NO_BET,
+    GameEventType,
+    GameStage,
+    GameStatus,
+    PlayerStatus,
+)
+from app.game.models import (
+    BalanceModel,
+    ChatDayStatsModel,
+    ChatStatsModel,
+    GameEventModel,
+    GameModel,
+    GamePlayModel,
+    PlayerModel,
+    PlayerStatsModel,
+)
+from app.game.replay import restore_game_cards
+from app.game.shoe import Shoe
+from app.game.stats import PlayerResult
+from app.jobs.const import (
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_DELAY_IN_SECONDS,
+    JobStatus,
+)
+from app.jobs.models import JobModel
+from app.store.admin.accessor import AdminAccessor
+from app.store.database.sqlalchemy_base import BaseModel
+from app.store.game.accessor import (
+    GameAccessor,
+    GamePlayAccessor,
+    JoinKey,
+    PlayerAccessor,
+)
+from app.store.game.events import GameEventAccessor
+from app.store.game.export import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_TABLES,
+    ExportAccessor,
+    ExportTable,
+)
+from app.store.game.leaderboard import (
+    LEADERBOARD_CAPACITY,
+    LeaderboardAccessor,
+    TopBalances,
+)
+from app.store.game.stats import CHAT_DAY_STATS_DAYS, StatsAccessor
+from app.store.jobs.accessor import JobAccessor
+from app.store.memory.storage import (
+    MemoryStorage,
+    MemoryTable,
+    Row,
+    copy_value,
+    utc_now,
+)
+from app.store.versions import Resource
+
+
+def model_values(instance: BaseModel) -> Row:
+    """Значения колонок, которые были явно заданы экземпляру модели."""
+    return {
+        column.name: instance.__dict__[column.name]
+        for column in instance.__table__.columns
+        if column.name in instance.__dict__
+    }
+
+
+class MemoryAccessor(StorageAccessor):
+    """Общая часть аксессоров, которые хранят данные в MemoryStorage.
+
+    Методы отдают новые экземпляры моделей с копиями строк, как и сессия
+    БД: изменение экземпляра не меняет хранилище. Между проверкой и записью
+    в методах нет await, поэтому каждый метод атомарен, как транзакция.
+    """
+
+    @property
+    def storage(self) -> MemoryStorage:
+        return self.app.store.memory
+
+    def _insert(self, table: MemoryTable, instance: BM) -> BM:
+        """Записывает экземпляр модели и заполняет его id и значения
+        по умолчанию, как это делает flush сессии.
+        """
+        row: Row = table.insert(model_values(instance))
+        for column, value in row.items():
+            setattr(instance, column, copy_value(value))
+        return instance
+
+    async def get_or_create(
+        self,
+        model: BM,
+        get_params: list[BinaryExpression],
+        create_params: CreateParams,
+    ) -> tuple[bool, BM]:
+        """То же, что BaseAccessor.get_or_create. Условия поиска - это
+        сравнения колонок на равенство (Model.column == value).
+        """
+        equals: Row = {}
+        for param in get_params:
+            if param.operator is not operator.eq:
+                raise ValueError(f"Unsupported condition: {param}")
+            equals[param.left.name] = param.right.value
+
+        table: MemoryTable = self.storage[model.__tablename__]
+        row: Row | None = table.get(**equals)
+        if row:
+            return False, table.to_model(row)
+        instance = self._insert(
+            table, model(**get_create_params(create_params))
+        )
+        self.app.store.versions.bump_table(model.__tablename__)
+        return True, instance
+
+
+class MemoryPlayerAccessor(MemoryAccessor, PlayerAccessor):
+    async def create_player(
+        self, username: str | None, tg_id: int, first_name: str
+    ) -> PlayerModel:
+        player = self._insert(
+            self.storage.players,
+            PlayerModel(username=username, tg_id=tg_id, first_name=first_name),
+        )
+        self.app.store.versions.bump(Resource.PLAYERS)
+        return player
+
+    async def change_player_fields(
+        self, player_id: int, new_values: dict[str, Any]
+    ) -> PlayerModel | None:
+        row: Row | None = self.storage.players.update(player_id, new_values)
+        self.app.store.versions.bump(Resource.PLAYERS)
+        return self.storage.players.to_model(row) if row else None
+
+    async def list_players(
+        self,
+        limit: int = PAGE_SIZE,
+        after: int | None = None,
+        tg_id: int | None = None,
+        username: str | None = None,
+        first_name: str | None = None,
+    ) -> Page[PlayerModel]:
+        rows: list[Row] = (
+            self.storage.players.select(tg_id=tg_id)
+            if tg_id is not None
+            else self.storage.players.select()
+        )
+        players: list[PlayerModel] = [
+            self.storage.players.to_model(row)
+            for row in rows
+            if (not after or row["id"] > after)
+            and (
+                not username
+                or (row["username"] or "").lower().startswith(username.lower())
+            )
+            and (
+                not first_name
+                or first_name.lower() in (row["first_name"] or "").lower()
+            )
+        ][: limit + 1]
+        return make_page(players, limit, lambda player: (player.id,))
+
+    async def get_player_by_id(self, id_: int) -> PlayerModel | None:
+        row: Row | None = self.storage.players.get(id=id_)
+        return self.storage.players.to_model(row) if row else None
+
+    async def get_player_by_tg_id(self, tg_id: int) -> PlayerModel | None:
+        row: Row | None = self.storage.players.get(tg_id=tg_id)
+        return self.storage.players.to_model(row) if row else None
+
+    async def create_player_balance(
+        self, chat_id: int, player_id: int
+    ) -> BalanceModel:
+        balance = self._insert(
+            self.storage.balances,
+            BalanceModel(chat_id=chat_id, player_id=player_id),
+        )
+        self.app.store.versions.bump(Resource.BALANCES)
+        self.app.store.leaderboard.on_balance_change(balance)
+        return balance
+
+    async def list_balances(
+        self,
+        player_id: int | None = None,
+        chat_id: int | None = None,
+        limit: int = PAGE_SIZE,
+        after: int | None = None,
+    ) -> Page[BalanceModel]:
+        equals: Row = {}
+        if player_id:
+            equals["player_id"] = player_id
+        if chat_id is not None:
+            equals["chat_id"] = chat_id
+        balances: list[BalanceModel] = [
+            self.storage.balances.to_model(row)
+            for row in self.storage.balances.select(**equals)
+            if not after or row["id"] > after
+        ][: limit + 1]
+        return make_page(balances, limit, lambda balance: (balance.id,))
+
+    async def get_balance_by_player_and_chat(
+        self, player_id: int, chat_id: int
+    ) -> BalanceModel | None:
+        row: Row | None = self.storage.balances.get(
+            player_id=player_id, chat_id=chat_id
+        )
+        return self.storage.balances.to_model(row) if row else None
+
+    async def change_balance_current_value(
+        self, player_id: int, chat_id: int, new_value: int
+    ) -> BalanceModel | None:
+        row: Row | None = self.storage.balances.get(
+            player_id=player_id, chat_id=chat_id
+        )
+        if row is None:
+            return None
+        self.storage.balances.update(row["id"], {"current_value": new_value})
+        self.app.store.versions.bump(Resource.BALANCES)
+        balance: BalanceModel = self.storage.balances.to_model(row)
+        self.app.store.leaderboard.on_balance_change(balance)
+        return balance
+
+
+class MemoryGameAccessor(MemoryAccessor, GameAccessor):
+    def _get_game(self, row: Row, with_players: bool = False) -> GameModel:
+        """Собирает игру с геймплеями (и игроками геймплеев)."""
+        game: GameModel = self.storage.games.to_model(row)
+        gameplays: list[GamePlayModel] = []
+        for gameplay_row in self.storage.gameplays.select(game_id=row["id"]):
+            gameplay: GamePlayModel = self.storage.gameplays.to_model(
+                gameplay_row
+            )
+            if with_players:
+                gameplay.player = self.storage.players.to_model(
+                    self.storage.players.rows[gameplay.player_id]
+                )
+            gameplays.append(gameplay)
+        game.gameplays = gameplays
+        return game
+
+    def _get_active_row(self, chat_id: int) -> Row | None:
+        return self.storage.games.get(chat_id=chat_id, status=GameStatus.ACTIVE)
+
+    async def create_game(
+        self,
+        chat_id: int,
+        diller_cards: list[str],
+        gameplays: list[GamePlayModel],
+        seed: int | None = None,
+    ) -> GameModel:
+        if seed is None:
+            seed = Shoe.generate_seed()
+        game = self._insert(
+            self.storage.games,
+            GameModel(chat_id=chat_id, diller_cards=diller_cards, seed=seed),
+        )
+        for gameplay in gameplays:
+            gameplay.game_id = game.id
+            self._insert(self.storage.gameplays, gameplay)
+        game.gameplays = gameplays
+        self.app.store.versions.bump(Resource.GAMES)
+        return game
+
+    async def list_games(
+        self,
+        limit: int = PAGE_SIZE,
+        after: tuple[datetime, int] | None = None,
+        chat_id: int | None = None,
+        status: GameStatus | None = None,
+        stage: GameStage | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        with_gameplays: bool = False,
+    ) -> Page[GameModel]:
+        equals: Row = {}
+        if chat_id is not None:
+            equals["chat_id"] = chat_id
+        if status:
+            equals["status"] = status
+        if stage:
+            equals["stage"] = stage
+        rows: list[Row] = sorted(
+            (
+                row
+                for row in self.storage.games.select(**equals)
+                if (not after or (row["created_at"], row["id"]) < tuple(after))
+                and (not created_from or row["created_at"] >= created_from)
+                and (not created_to or row["created_at"] < created_to)
+            ),
+            key=lambda row: (row["created_at"], row["id"]),
+            reverse=True,
+        )[: limit + 1]
+        games: list[GameModel] = [
+            self._get_game(row)
+            if with_gameplays
+            else self.storage.games.to_model(row)
+            for row in rows
+        ]
+        return make_page(games, limit, lambda game: (game.created_at, game.id))
+
+    async def get_game_by_id(self, game_id: int) -> GameModel | None:
+        row: Row | None = self.storage.games.get(id=game_id)
+        return self._get_game(row) if row else None
+
+    async def get_active_game_by_chat_id(
+        self, chat_id: int
+    ) -> GameModel | None:
+        row: Row | None = self._get_active_row(chat_id)
+        if row is None:
+            return None
+        game: GameModel = self._get_game(row, with_players=True)
+        restore_game_cards(game)
+        return game
+
+    async def count_active_games_by_stage(self) -> dict[GameStage, int]:
+        counts: dict[GameStage, int] = dict.fromkeys(GameStage, 0)
+        for row in self.storage.games.select(status=GameStatus.ACTIVE):
+            counts[row["stage"]] += 1
+        return counts
+
+    async def get_active_waiting_game_by_chat_id(
+        self, chat_id: int
+    ) -> GameModel | None:
+        row: Row | None = self.storage.games.get(
+            chat_id=chat_id,
+            status=GameStatus.ACTIVE,
+            stage=GameStage.WAITING_FOR_PLAYERS_TO_JOIN,
+        )
+        return self.storage.games.to_model(row) if row else None
+
+    async def change_game_fields(
+        self, game_id: int, new_values: dict[str, Any]
+    ) -> GameModel | None:
+        row: Row | None = self.storage.games.update(game_id, new_values)
+        self.app.store.versions.bump(Resource.GAMES)
+        return self.storage.games.to_model(row) if row else None
+
+    async def finish_game(
+        self, game_id: int, chat_id: int, results: list[PlayerResult]
+    ) -> GameModel | None:
+        row: Row | None = self.storage.games.get(
+            id=game_id, status=GameStatus.ACTIVE
+        )
+        if row:
+            self.storage.games.update(game_id, {"status": GameStatus.FINISHED})
+            await self.app.store.stats.record_game(None, chat_id, results)
+        self.app.store.versions.bump(Resource.GAMES)
+        return self.storage.games.to_model(row) if row else None
+
+    async def append_game_action(
+        self,
+        game_id: int,
+        action: str,
+        new_values: dict[str, Any] | None = None,
+        expected_stage: GameStage | None = None,
+    ) -> bool:
+        row: Row | None = (
+            self.storage.games.get(
+                id=game_id, status=GameStatus.ACTIVE, stage=expected_stage
+            )
+            if expected_stage
+            else self.storage.games.get(id=game_id)
+        )
+        if row:
+            self.storage.games.update(
+                game_id,
+                {"actions": [*row["actions"], action], **(new_values or {})},
+            )
+        self.app.store.versions.bump(Resource.GAMES)
+        return row is not None
+
+    async def change_active_game_stage(
+        self,
+        chat_id: int,
+        stage: GameStage,
+        expected_stage: GameStage | None = None,
+    ) -> GameModel | None:
+        row: Row | None = self._get_active_row(chat_id)
+        if row and expected_stage and row["stage"] != expected_stage:
+            row = None
+        if row:
+            self.storage.games.update(row["id"], {"stage": stage})
+        self.app.store.versions.bump(Resource.GAMES)
+        if row is None:
+            return None
+        game: GameModel = self._get_game(row, with_players=True)
+        restore_game_cards(game)
+        self.app.store.game_events.emit(
+            game.id, chat_id, GameEventType.STAGE, stage=stage
+        )
+        return game
+
+    async def check_all_players_have_bet(self, game_id: int) -> bool:
+        return all(
+            row["player_bet"] >= MINIMAL_BET
+            for row in self.storage.gameplays.select(game_id=game_id)
+        )
+
+    async def cancel_active_game_due_to_timer(
+        self, game_id: int
+    ) -> GameModel | None:
+        row: Row | None = self.storage.games.get(
+            id=game_id, status=GameStatus.ACTIVE, stage=GameStage.BETTING
+        )
+        if row:
+            self.storage.games.update(game_id, {"status": GameStatus.CANCELED})
+            await self.app.store.stats.record_cancel(None, row["chat_id"])
+        self.app.store.versions.bump(Resource.GAMES)
+        if row is None:
+            return None
+        self.app.store.game_events.emit(
+            row["id"], row["chat_id"], GameEventType.CANCEL
+        )
+        return self.storage.games.to_model(row)
+
+
+class MemoryGamePlayAccessor(MemoryAccessor, GamePlayAccessor):
+    async def create_gameplay(
+        self, game_id: int, player_id: int
+    ) -> GamePlayModel:
+        gameplay = self._insert(
+            self.storage.gameplays,
+            GamePlayModel(game_id=game_id, player_id=player_id, player_bet=1),
+        )
+        self.app.store.versions.bump(Resource.GAMES)
+        return gameplay
+
+    async def get_gameplay_by_game_and_player(
+        self, game_id: int, player_id: int
+    ) -> GamePlayModel | None:
+        row: Row | None = self.storage.gameplays.get(
+            game_id=game_id, player_id=player_id
+        )
+        return self.storage.gameplays.to_model(row) if row else None
+
+    async def stand_taking_players(self, game_id: int) -> list[GamePlayModel]:
+        gameplays: list[GamePlayModel] = []
+        for row in self.storage.gameplays.select(
+            game_id=game_id, player_status=PlayerStatus.TAKING
+        ):
+            self.storage.gameplays.update(
+                row["id"], {"player_status": PlayerStatus.STANDING}
+            )
+            gameplays.append(self.storage.gameplays.to_model(row))
+        self.app.store.versions.bump(Resource.GAMES)
+        return gameplays
+
+    async def change_gameplay_fields(
+        self, gameplay_id: int, new_values: dict[str, Any]
+    ) -> GamePlayModel | None:
+        row: Row | None = self.storage.gameplays.update(gameplay_id, new_values)
+        self.app.store.versions.bump(Resource.GAMES)
+        return self.storage.gameplays.to_model(row) if row else None
+
+    async def write_batch(
+        self, joins: list[JoinKey], updates: dict[int, dict[str, Any]]
+    ) -> dict[JoinKey, tuple[bool, GamePlayModel]]:
+        """Присоединения и изменения пачки применяются по очереди. В отличие
+        от транзакции в БД, если изменение нарушает ограничение, уже
+        примененные изменения пачки не откатываются.
+        """
+        join_results: dict[JoinKey, tuple[bool, GamePlayModel]] = {}
+        for game_id, player_id in joins:
+            row: Row | None = self.storage.gameplays.get(
+                game_id=game_id, player_id=player_id
+            )
+            created: bool = row is None
+            if row is None:
+                row = self.storage.gameplays.insert(
+                    {
+                        "game_id": game_id,
+                        "player_id": player_id,
+                        "player_bet": NO_BET,
+                    }
+                )
+            join_results[game_id, player_id] = (
+                created,
+                self.storage.gameplays.to_model(row),
+            )
+        for gameplay_id, new_values in updates.items():
+            self.storage.gameplays.update(gameplay_id, new_values)
+        self.app.store.versions.bump(Resource.GAMES)
+        return join_results
+
+
+class MemoryAdminAccessor(MemoryAccessor, AdminAccessor):
+    async def get_by_email(self, email: str) -> AdminModel | None:
+        row: Row | None = self.storage.admins.get(email=email)
+        return self.storage.admins.to_model(row) if row else None
+
+    async def create_admin(self, email: str, password: str) -> AdminModel:
+        return self._insert(
+            self.storage.admins,
+            AdminModel(
+                email=email, password=AdminModel.hashed_password(password)
+            ),
+        )
+
+
+class MemoryStatsAccessor(MemoryAccessor, StatsAccessor):
+    """Счетчики статистики в памяти. Сессии нет: счетчики меняются
+    в том же методе MemoryGameAccessor, что и игра, без await между ними.
+    """
+
+    async def record_game(
+        self, session: None, chat_id: int, results: list[PlayerResult]
+    ) -> None:
+        new_players = 0
+        for result in results:
+            row: Row = self.storage.player_stats.increment(
+                self._get_player_counters(chat_id, result)
+            )
+            # игрок сыграл в чате первую игру, если его счетчик игр равен 1
+            new_players += row["games"] == 1
+        self.storage.chat_stats.increment(
+            {"chat_id": chat_id, "games": 1, "players": new_players}
+        )
+        self.storage.chat_day_stats.increment(
+            {"chat_id": chat_id, "day": utc_now().date(), "games": 1}
+        )
+
+    async def record_cancel(self, session: None, chat_id: int) -> None:
+        self.storage.chat_stats.increment({"chat_id": chat_id, "cancels": 1})
+        self.storage.chat_day_stats.increment(
+            {"chat_id": chat_id, "day": utc_now().date(), "cancels": 1}
+        )
+
+    async def get_player_stats(
+        self, player_id: int, chat_id: int
+    ) -> PlayerStatsModel | None:
+        row: Row | None = self.storage.player_stats.get(chat_id, player_id)
+        return self.storage.player_stats.to_model(row) if row else None
+
+    async def get_chat_stats(self, chat_id: int) -> ChatStatsModel | None:
+        row: Row | None = self.storage.chat_stats.get(chat_id)
+        return self.storage.chat_stats.to_model(row) if row else None
+
+    async def list_chat_day_stats(
+        self, chat_id: int, days: int = CHAT_DAY_STATS_DAYS
+    ) -> Sequence[ChatDayStatsModel]:
+        rows: list[Row] = sorted(
+            (
+                row
+                for (
+                    row_chat_id,
+                    _,
+                ), row in self.storage.chat_day_stats.rows.items()
+                if row_chat_id == chat_id
+            ),
+            key=lambda row: row["day"],
+            reverse=True,
+        )[:days]
+        return [self.storage.chat_day_stats.to_model(row) for row in rows]
+
+
+class MemoryGameEventAccessor(MemoryAccessor, GameEventAccessor):
+    async def _write_events(self, events: list[dict[str, Any]]) -> None:
+        """Пишет пачку событий целиком или никак: если событие нарушает
+        ограничение, уже записанные события пачки удаляются, как при откате
+        транзакции.
+        """
+        written: list[Row] = []
+        for event in events:
+            try:
+                written.append(self.storage.game_events.insert(event))
+            except IntegrityError:
+                for row in written:
+                    self.storage.game_events.delete(row["id"])
+                raise
+
+    async def list_game_events(self, game_id: int) -> Sequence[GameEventModel]:
+        return [
+            self.storage.game_events.to_model(row)
+            for row in self.storage.game_events.select(game_id=game_id)
+        ]
+
+
+class MemoryJobAccessor(MemoryAccessor, JobAccessor):
+    """Очередь задач в памяти. Ее видит только этот процесс, поэтому
+    аренда задач защищает лишь от повторного запуска после ошибки.
+    """
+
+    @staticmethod
+    def _is_due(row: Row, now: datetime) -> bool:
+        return row["run_at"] <= now and (
+            row["locked_until"] is None or row["locked_until"] < now
+        )
+
+    async def create_job(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        delay_seconds: float = 0,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ) -> JobModel:
+        row: Row = self.storage.jobs.insert(
+            {
+                "kind": kind,
+                "payload": payload,
+                "run_at": utc_now() + timedelta(seconds=delay_seconds),
+                "max_attempts": max_attempts,
+            }
+        )
+        return self.storage.jobs.to_model(row)
+
+    async def claim_jobs(
+        self, locked_by: str, batch_size: int, lease_seconds: float
+    ) -> list[tuple[JobModel, str | None]]:
+        now: datetime = utc_now()
+        due_rows: list[Row] = sorted(
+            (
+                row
+                for row in self.storage.jobs.select(status=JobStatus.PENDING)
+                if self._is_due(row, now)
+            ),
+            key=lambda row: row["run_at"],
+        )[:batch_size]
+        claimed_jobs: list[tuple[JobModel, str | None]] = []
+        for row in due_rows:
+            previous_locked_by: str | None = row["locked_by"]
+            self.storage.jobs.update(
+                row["id"],
+                {
+                    "locked_by": locked_by,
+                    "locked_until": now + timedelta(seconds=lease_seconds),
+                    "attempts": row["attempts"] + 1,
+                },
+            )
+            claimed_jobs.append(
+                (self.storage.jobs.to_model(row), previous_locked_by)
+            )
+        return claimed_jobs
+
+    async def complete_job(self, job_id: int, locked_by: str) -> bool:
+        row: Row | None = self.storage.jobs.get(id=job_id)
+        if row is None or row["locked_by"] != locked_by:
+            return False
+        self.storage.jobs.delete(job_id)
+        return True
+
+    async def fail_job(
+        self, job: JobModel, locked_by: str, error: str
+    ) -> JobModel | None:
+        row: Row | None = self.storage.jobs.get(id=job.id)
+        if row is None or row["locked_by"] != locked_by:
+            return None
+        if job.attempts >= job.max_attempts:
+            new_values: Row = {"status": JobStatus.FAILED}
+        else:
+            new_values = {
+                "run_at": utc_now()
+                + timedelta(seconds=JOB_RETRY_DELAY_IN_SECONDS * job.attempts)
+            }
+        self.storage.jobs.update(
+            job.id,
+            {
+                "locked_by": None,
+                "locked_until": None,
+                "last_error": error,
+                **new_values,
+            },
+        )
+        return self.storage.jobs.to_model(row)
+
+    async def cancel_jobs(self, kind: str, payload: dict[str, Any]) -> int:
+        cancelled = 0
+        for row in self.storage.jobs.select(
+            kind=kind, status=JobStatus.PENDING
+        ):
+            if row["payload"].items() >= payload.items():
+                self.storage.jobs.delete(row["id"])
+                cancelled += 1
+        return cancelled
+
+    async def count_jobs(self) -> dict[str, int]:
+        now: datetime = utc_now()
+        pending: list[Row] = self.storage.jobs.select(status=JobStatus.PENDING)
+        return {
+            "pending": len(pending),
+            "overdue": sum(1 for row in pending if self._is_due(row, now)),
+            "leased": sum(
+                1
+                for row in pending
+                if row["locked_until"] is not None
+                and row["locked_until"] >= now
+            ),
+            "failed": len(self.storage.jobs.select(status=JobStatus.FAILED)),
+        }
+
+
+class MemoryLeaderboardAccessor(MemoryAccessor, LeaderboardAccessor):
+    async def _load(self, chat_id: int | None) -> TopBalances:
+        rows: list[Row] = (
+            self.storage.balances.select(chat_id=chat_id)
+            if chat_id is not None
+            else self.storage.balances.select()
+        )
+        rows.sort(key=lambda row: row["current_value"], reverse=True)
+        self.loads += 1
+        return TopBalances(
+            [
+                ((row["chat_id"], row["player_id"]), row["current_value"])
+                for row in rows[:LEADERBOARD_CAPACITY]
+            ]
+        )
+
+    async def _get_players(
+        self, player_ids: set[int]
+    ) -> dict[int, PlayerModel]:
+        return {
+            row["id"]: self.storage.players.to_model(row)
+            for player_id in player_ids
+            if (row := self.storage.players.get(id=player_id))
+        }
+
+
+class MemoryExportAccessor(MemoryAccessor, ExportAccessor):
+    async def iter_rows(
+        self, table: ExportTable, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[list[Mapping[str, Any]]]:
+        rows: list[Row] = self.storage[EXPORT_TABLES[table].name].select()
+        for start in range(0, len(rows), batch_size):
+            yield [
+                {column: copy_value(value) for column, value in row.items()}
+                for row in rows[start : start + batch_size]
+            ]
@@ -0,0 +1,338 @@
+import itertools
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import ForeignKeyConstraint, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+
+from app.admin.models import AdminModel
+from app.game.models import (
+    BalanceModel,
+    ChatDayStatsModel,
+    ChatStatsModel,
+    GameEventModel,
+    GameModel,
+    GamePlayModel,
+    PlayerModel,
+    PlayerStatsModel,
+)
+from app.jobs.models import JobModel
+from app.store.database.sqlalchemy_base import BaseModel
+
+Row = dict[str, Any]
+RowCheck = Callable[[Row], bool]
+
+
+def utc_now() -> datetime:
+    """Аналог серверного значения по умолчанию TIMEZONE('utc', now())."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def copy_value(value: Any) -> Any:
+    # массивы и JSON хранятся копиями, чтобы изменение списка в модели
+    # не меняло строку таблицы в обход аксессора
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class MemoryTable:
+    """Таблица в памяти процесса с той же семантикой, что и в Postgres.
+
+    Строки лежат в словаре по id (id выдаются по порядку, как sequence).
+    Уникальные ограничения и внешние ключи берутся из метаданных модели,
+    нарушение ограничения вызывает IntegrityError, как и в БД. По колонкам
+    из indexes строятся вторичные индексы, по которым select ищет строки
+    без перебора таблицы.
+    """
+
+    def __init__(
+        self,
+        storage: "MemoryStorage",
+        model: type[BaseModel],
+        indexes: Iterable[tuple[str, ...]] = (),
+        server_defaults: dict[str, Callable[[], Any]] | None = None,
+        checks: dict[str, RowCheck] | None = None,
+    ):
+        self.storage = storage
+        self.model = model
+        self.name: str = model.__tablename__
+        self.columns = list(model.__table__.columns)
+        self.server_defaults = server_defaults or {}
+        self.checks = checks or {}
+        self.rows: dict[int, Row] = {}
+        self._ids = itertools.count(1)
+
+        self.foreign_keys: list[tuple[str, str]] = []
+        self.unique: dict[str, dict[tuple, int]] = {}
+        self.unique_columns: dict[str, tuple[str, ...]] = {}
+        for constraint in model.__table__.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                columns = tuple(column.name for column in constraint.columns)
+                # имя по умолчанию такое же, как у ограничения в Postgres
+                name: str = constraint.name or "_".join(
+                    (self.name, *columns, "key")
+                )
+                self.unique[name] = {}
+                self.unique_columns[name] = columns
+            elif isinstance(constraint, ForeignKeyConstraint):
+                self.foreign_keys.extend(
+                    (element.parent.name, element.column.table.name)
+                    for element in constraint.elements
+                )
+        self.indexes: dict[tuple[str, ...], dict[tuple, set[int]]] = {
+            columns: {} for columns in indexes
+        }
+
+    def clear(self) -> None:
+        self.rows.clear()
+        self._ids = itertools.count(1)
+        for unique_index in self.unique.values():
+            unique_index.clear()
+        for index in self.indexes.values():
+            index.clear()
+
+    def _fail(self, message: str, row: Row) -> None:
+        raise IntegrityError(None, row, ValueError(f"{self.name}: {message}"))
+
+    def _validate(self, row: Row, row_id: int | None = None) -> None:
+        """Проверяет NOT NULL, внешние ключи, CHECK и уникальность."""
+        for column in self.columns:
+            if not column.nullable and row.get(column.name) is None:
+                self._fail(f"null value in column {column.name}", row)
+        for column_name, table_name in self.foreign_keys:
+            value = row.get(column_name)
+            if value is not None and value not in self.storage[table_name].rows:
+                self._fail(f"foreign key {column_name}={value}", row)
+        for name, check in self.checks.items():
+            if not check(row):
+                self._fail(f"check constraint {name}", row)
+        for name, unique_index in self.unique.items():
+            key: tuple = self._key(row, self.unique_columns[name])
+            # как в Postgres, строки с NULL в ключе не конфликтуют
+            if None in key:
+                continue
+            if unique_index.get(key, row_id) != row_id:
+                self._fail(f"duplicate key value violates {name}", row)
+
+    @staticmethod
+    def _key(row: Row, columns: tuple[str, ...]) -> tuple:
+        return tuple(row.get(column) for column in columns)
+
+    def _add_to_indexes(self, row: Row) -> None:
+        for name, unique_index in self.unique.items():
+            key: tuple = self._key(row, self.unique_columns[name])
+            if None not in key:
+                unique_index[key] = row["id"]
+        for columns, index in self.indexes.items():
+            index.setdefault(self._key(row, columns), set()).add(row["id"])
+
+    def _remove_from_indexes(self, row: Row) -> None:
+        for name, unique_index in self.unique.items():
+            unique_index.pop(self._key(row, self.unique_columns[name]), None)
+        for columns, index in self.indexes.items():
+            index.get(self._key(row, columns), set()).discard(row["id"])
+
+    def insert(self, values: Row) -> Row:
+        """Добавляет строку, заполняя значения по умолчанию, и отдает ее."""
+        row: Row = {}
+        for column in self.columns:
+            if column.name in values:
+                row[column.name] = copy_value(values[column.name])
+            elif column.default is not None:
+                default = column.default.arg
+                row[column.name] = (
+                    default(None) if column.default.is_callable else default
+                )
+            elif column.name in self.server_defaults:
+                row[column.name] = self.server_defaults[column.name]()
+            else:
+                row[column.name] = None
+        if row.get("id") is None:
+            row["id"] = next(self._ids)
+        self._validate(row)
+        if row["id"] in self.rows:
+            self._fail(f"duplicate key value id={row['id']}", row)
+        self.rows[row["id"]] = row
+        self._add_to_indexes(row)
+        return row
+
+    def update(self, row_id: int, values: Row) -> Row | None:
+        """Меняет значения колонок строки. Отдает строку или None, если
+        строки с таким id нет. При нарушении ограничений строка не меняется.
+        """
+        row: Row | None = self.rows.get(row_id)
+        if row is None:
+            return None
+        new_row: Row = row | {
+            column: copy_value(value) for column, value in values.items()
+        }
+        self._validate(new_row, row_id)
+        self._remove_from_indexes(row)
+        row.update(new_row)
+        self._add_to_indexes(row)
+        return row
+
+    def delete(self, row_id: int) -> Row | None:
+        """Удаляет строку и отдает ее или None, если строки с таким id нет.
+        Строки других таблиц, которые ссылаются на нее, не удаляются.
+        """
+        row: Row | None = self.rows.pop(row_id, None)
+        if row is not None:
+            self._remove_from_indexes(row)
+        return row
+
+    def select(self, **equals: Any) -> list[Row]:
+        """Отдает строки, у которых колонки равны переданным значениям,
+        в порядке id. Строки ищутся по первичному ключу, уникальному или
+        вторичному индексу, если их колонки есть среди условий.
+        """
+        candidates: Iterable[int]
+        if "id" in equals:
+            candidates = [equals["id"]] if equals["id"] in self.rows else []
+        else:
+            candidates = self._find_by_index(equals)
+        rows: list[Row] = [
+            self.rows[row_id]
+            for row_id in candidates
+            if all(
+                self.rows[row_id][column] == value
+                for column, value in equals.items()
+            )
+        ]
+        rows.sort(key=lambda row: row["id"])
+        return rows
+
+    def _find_by_index(self, equals: Row) -> Iterable[int]:
+        for name, columns in self.unique_columns.items():
+            if set(columns) <= equals.keys():
+                row_id: int | None = self.unique[name].get(
+                    self._key(equals, columns)
+                )
+                return [] if row_id is None else [row_id]
+        for columns, index in self.indexes.items():
+            if set(columns) <= equals.keys():
+                return list(index.get(self._key(equals, columns), ()))
+        return list(self.rows)
+
+    def get(self, **equals: Any) -> Row | None:
+        rows: list[Row] = self.select(**equals)
+        return rows[0] if rows else None
+
+    def to_model(self, row: Row) -> Any:
+        """Отдает новый экземпляр модели с копией строки. Экземпляр не
+        связан с хранилищем: изменения в нем не сохраняются.
+        """
+        return self.model(
+            **{column: copy_value(value) for column, value in row.items()}
+        )
+
+
+class MemoryCounters:
+    """Строки счетчиков статистики в памяти процесса. У таблиц статистики
+    нет id, строки лежат в словаре по составному первичному ключу,
+    а недостающие строки создаются при первом увеличении, как
+    INSERT ... ON CONFLICT DO UPDATE в StatsAccessor.
+    """
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+        self.columns: list[str] = list(model.__table__.columns.keys())
+        self.key_columns: tuple[str, ...] = tuple(
+            column.name for column in model.__table__.primary_key.columns
+        )
+        self.rows: dict[tuple, Row] = {}
+
+    def clear(self) -> None:
+        self.rows.clear()
+
+    def increment(self, values: Row) -> Row:
+        """Прибавляет значения счетчиков к строке с ключом из values
+        и отдает строку.
+        """
+        key: tuple = tuple(values[column] for column in self.key_columns)
+        row: Row | None = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = dict.fromkeys(self.columns, 0) | dict(
+                zip(self.key_columns, key, strict=True)
+            )
+        for column, value in values.items():
+            if column not in self.key_columns:
+                row[column] += value
+        return row
+
+    def get(self, *key: Any) -> Row | None:
+        return self.rows.get(key)
+
+    def to_model(self, row: Row) -> Any:
+        return self.model(**row)
+
+
+class MemoryStorage:
+    """Таблицы бота в памяти процесса (хранилище для StorageBackend.MEMORY,
+    см. app.store.memory.accessor).
+    """
+
+    def __init__(self):
+        self.tables: dict[str, MemoryTable] = {}
+        self.players = self._add_table(PlayerModel)
+        self.balances = self._add_table(
+            BalanceModel, indexes=[("player_id",), ("chat_id",)]
+        )
+        self.games = self._add_table(
+            GameModel,
+            indexes=[("chat_id", "status")],
+            server_defaults={"created_at": utc_now},
+        )
+        self.gameplays = self._add_table(
+            GamePlayModel,
+            indexes=[("game_id",)],
+            checks={
+                "positive_player_bet_constraint": (
+                    lambda row: row["player_bet"] > 0
+                )
+            },
+        )
+        self.admins = self._add_table(AdminModel)
+        self.jobs = self._add_table(
+            JobModel,
+            indexes=[("kind", "status"), ("status",)],
+            server_defaults={
+                "run_at": utc_now,
+                "created_at": utc_now,
+                "attempts": lambda: 0,
+                "payload": dict,
+            },
+        )
+        self.game_events = self._add_table(
+            GameEventModel,
+            indexes=[("game_id",)],
+            server_defaults={"data": dict},
+        )
+        self.counters: dict[str, MemoryCounters] = {}
+        self.player_stats = self._add_counters(PlayerStatsModel)
+        self.chat_stats = self._add_counters(ChatStatsModel)
+        self.chat_day_stats = self._add_counters(ChatDayStatsModel)
+
+    def _add_table(self, model: type[BaseModel], **kwargs: Any) -> MemoryTable:
+        table = MemoryTable(self, model, **kwargs)
+        self.tables[table.name] = table
+        return table
+
+    def _add_counters(self, model: type[BaseModel]) -> MemoryCounters:
+        counters = MemoryCounters(model)
+        self.counters[model.__tablename__] = counters
+        return counters
+
+    def __getitem__(self, table_name: str) -> MemoryTable:
+        return self.tables[table_name]
+
+    def clear(self) -> None:
+        """Очищает все таблицы и сбрасывает счетчики id."""
+        for table in self.tables.values():
+            table.clear()
+        for counters in self.counters.values():
+            counters.clear()
@@ -0,0 +1,332 @@
+import time
+import typing
+
+from sqlalchemy import event
+
+from app.base.base_accessor import BaseAccessor, current_operation
+from app.base.metrics import (
+    Counter,
+    LabeledHistogram,
+    format_histograms,
+    format_samples,
+    format_stats,
+)
+from app.game.models import GameModel
+from app.store.bot import const
+from app.store.database.database import QueryStats
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+# long polling: пустой ответ getUpdates приходит через timeout=30 секунд
+GET_UPDATES_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+GET_UPDATES_BATCH_SIZE_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+HANDLER_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+DB_STATEMENT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1,
+)
+SEND_MESSAGE_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+# DNS, установка соединения (TCP и TLS) и TTFB запросов к Bot API;
+# TTFB getUpdates включает long polling, поэтому корзины до 60 секунд
+TELEGRAM_CONNECT_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    5,
+)
+TELEGRAM_TTFB_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 15, 20, 30, 50, 100)
+
+NO_STAGE = "none"
+OTHER_ACTION = "other"
+# значения метки action: callback_data кнопок и команды бота, все остальное
+# пишется как OTHER_ACTION, чтобы пользователи не плодили временные ряды
+HANDLER_ACTIONS = frozenset(
+    {
+        const.JOIN_GAME_CALLBACK,
+        const.ADD_PLAYER_CALLBACK,
+        const.BET_10_CALLBACK,
+        const.BET_25_CALLBACK,
+        const.BET_50_CALLBACK,
+        const.BET_100_CALLBACK,
+        const.TAKE_CARD_CALLBACK,
+        const.STOP_TAKING_CALLBACK,
+        const.MY_BALANCE_CALLBACK,
+        const.HINT_CALLBACK,
+        "/start",
+        "/top",
+        "/stats",
+    }
+)
+
+
+class MetricsAccessor(BaseAccessor):
+    """Метрики бота для Prometheus (см. MetricsView).
+
+    Гистограммы и счетчики горячих путей (getUpdates, обработчики бота,
+    запросы к БД, sendMessage) обновляются на месте, а остальное - очередь
+    роутера, активные игры, таймеры, счетчики других аксессоров - читается
+    только при запросе метрик.
+    """
+
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.get_updates_latency = LabeledHistogram(
+            "bot_get_updates_seconds",
+            "Latency of getUpdates requests",
+            GET_UPDATES_LATENCY_BUCKETS,
+        )
+        self.get_updates_batch_size = LabeledHistogram(
+            "bot_get_updates_batch_size",
+            "Number of updates returned by getUpdates",
+            GET_UPDATES_BATCH_SIZE_BUCKETS,
+        )
+        self.handler_latency = LabeledHistogram(
+            "bot_handler_seconds",
+            "Latency of bot update handlers",
+            HANDLER_LATENCY_BUCKETS,
+            ("handler", "stage", "action"),
+        )
+        self.db_statement_latency = LabeledHistogram(
+            "db_statement_seconds",
+            "Latency of database statements by accessor method",
+            DB_STATEMENT_LATENCY_BUCKETS,
+            ("operation",),
+        )
+        self.send_message_latency = LabeledHistogram(
+            "telegram_send_message_seconds",
+            "Latency of sendMessage requests",
+            SEND_MESSAGE_LATENCY_BUCKETS,
+        )
+        self.update_statements = LabeledHistogram(
+            "bot_update_db_statements",
+            "Database statements per update",
+            QUERY_COUNT_BUCKETS,
+        )
+        self.update_round_trips = LabeledHistogram(
+            "bot_update_db_round_trips",
+            "Database round trips (statements and transaction control) "
+            "per update",
+            QUERY_COUNT_BUCKETS,
+        )
+        self.update_checkouts = LabeledHistogram(
+            "bot_update_db_checkouts",
+            "Connection pool checkouts per update",
+            QUERY_COUNT_BUCKETS,
+        )
+        self.telegram_dns_latency = LabeledHistogram(
+            "telegram_dns_seconds",
+            "Latency of Bot API host name resolution (cache misses)",
+            TELEGRAM_CONNECT_LATENCY_BUCKETS,
+            ("method",),
+        )
+        self.telegram_connect_latency = LabeledHistogram(
+            "telegram_connect_seconds",
+            "Latency of new Bot API connections, TCP and TLS together",
+            TELEGRAM_CONNECT_LATENCY_BUCKETS,
+            ("method",),
+        )
+        self.telegram_ttfb = LabeledHistogram(
+            "telegram_ttfb_seconds",
+            "Time from the start of a Bot API request to response headers",
+            TELEGRAM_TTFB_BUCKETS,
+            ("method",),
+        )
+        self.update_errors = Counter(
+            "bot_update_errors_total",
+            "Updates whose handling failed, by exception type",
+            ("error",),
+        )
+        self.telegram_connections = Counter(
+            "telegram_connections_total",
+            "Bot API requests by whether a keep-alive connection was reused",
+            ("method", "reused"),
+        )
+        self.telegram_timeouts = Counter(
+            "telegram_timeouts_total",
+            "Bot API requests aborted by the client timeout",
+            ("method",),
+        )
+        self.telegram_retries = Counter(
+            "telegram_retries_total",
+            "Bot API requests retried after an error, by error kind",
+            ("method", "reason"),
+        )
+        self.telegram_give_ups = Counter(
+            "telegram_give_ups_total",
+            "Bot API calls failed for good: a permanent error or no retries "
+            "left",
+            ("method", "reason"),
+        )
+
+    async def connect(self, app: "Application") -> None:
+        engine = app.database.engine.sync_engine
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    async def disconnect(self, app: "Application") -> None:
+        if app.database.engine is None:
+            return
+        engine = app.database.engine.sync_engine
+        if event.contains(
+            engine, "before_cursor_execute", self._before_execute
+        ):
+            event.remove(engine, "before_cursor_execute", self._before_execute)
+            event.remove(engine, "after_cursor_execute", self._after_execute)
+
+    def _before_execute(self, conn, cursor, statement, params, context, *_):
+        if context is not None:
+            context.metrics_started_at = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, params, context, *_):
+        started_at: float | None = getattr(context, "metrics_started_at", None)
+        if started_at is not None:
+            self.db_statement_latency.observe(
+                time.perf_counter() - started_at, current_operation.get()
+            )
+
+    def observe_query_stats(self, stats: QueryStats) -> None:
+        self.update_statements.observe(stats.statements)
+        self.update_round_trips.observe(stats.round_trips)
+        self.update_checkouts.observe(stats.checkouts)
+
+    def time_handler(
+        self, handler: str, game: GameModel | None, action: str | None
+    ):
+        """Замеряет время обработчика update с метками стадии игры
+        и действия (callback_data или команды).
+        """
+        return self.handler_latency.time(
+            handler,
+            game.stage if game else NO_STAGE,
+            action if action in HANDLER_ACTIONS else OTHER_ACTION,
+        )
+
+    async def _collect_active_games(self) -> list[str]:
+        try:
+            active_games = (
+                await self.app.store.games.count_active_games_by_stage()
+            )
+        except Exception:
+            # без БД остальные метрики все равно нужны
+            self.logger.exception("Active games count failed")
+            return []
+        return format_samples(
+            "bot_active_games",
+            "gauge",
+            "Active games by stage",
+            {(stage,): count for stage, count in active_games.items()},
+            ("stage",),
+        )
+
+    async def collect(self) -> str:
+        """Собирает все метрики в текстовом формате Prometheus."""
+        store = self.app.store
+        queue = store.tg_api.queue
+        write_buffer = store.gameplay_writes
+        response_cache = self.app.response_cache
+        lines: list[str] = [
+            *self.get_updates_latency.render(),
+            *self.get_updates_batch_size.render(),
+            *self.handler_latency.render(),
+            *self.db_statement_latency.render(),
+            *self.update_statements.render(),
+            *self.update_round_trips.render(),
+            *self.update_checkouts.render(),
+            *self.update_errors.render(),
+            *self.send_message_latency.render(),
+            *self.telegram_dns_latency.render(),
+            *self.telegram_connect_latency.render(),
+            *self.telegram_ttfb.render(),
+            *self.telegram_connections.render(),
+            *self.telegram_timeouts.render(),
+            *self.telegram_retries.render(),
+            *self.telegram_give_ups.render(),
+            *format_samples(
+                "bot_router_queue_depth",
+                "gauge",
+                "Updates waiting in the router queue",
+                {(): queue.qsize() if queue else 0},
+            ),
+            *await self._collect_active_games(),
+            *format_stats(
+                "bot_timers",
+                store.timers.get_stats(),
+                gauges=("max_batch_size", "pending", "running"),
+            ),
+            *format_stats(
+                "bot_jobs",
+                store.job_worker.stats,
+                gauges=("last_batch_size", "max_lag_seconds"),
+            ),
+            *format_stats(
+                "bot_game_events",
+                store.game_events.get_stats(),
+                gauges=("max_batch_size", "buffered"),
+            ),
+            *format_histograms(
+                "bot_gameplay_writes_batch_size",
+                "Gameplay changes written by one flush",
+                {(): write_buffer.batch_size},
+            ),
+            *format_histograms(
+                "bot_gameplay_writes_flush_seconds",
+                "Latency of gameplay write buffer flushes",
+                {(): write_buffer.flush_latency},
+            ),
+            *format_samples(
+                "bot_gameplay_writes_failed_flushes_total",
+                "counter",
+                "Failed gameplay write buffer flushes",
+                {(): write_buffer.failed_flushes},
+            ),
+            *format_samples(
+                "bot_traces_started_total",
+                "counter",
+                "Updates sampled for tracing",
+                {(): store.tracing.tracer.started},
+            ),
+            *format_samples(
+                "bot_traces_dropped_total",
+                "counter",
+                "Traces evicted from the buffer before export",
+                {(): store.tracing.tracer.dropped},
+            ),
+        ]
+        if response_cache:
+            lines += [
+                *format_samples(
+                    "admin_response_cache_hits_total",
+                    "counter",
+                    "Admin list responses served from the cache",
+                    {(): response_cache.hits},
+                ),
+                *format_samples(
+                    "admin_response_cache_misses_total",
+                    "counter",
+                    "Admin list responses missing in the cache",
+                    {(): response_cache.misses},
+                ),
+                *format_samples(
+                    "admin_response_cache_entries",
+                    "gauge",
+                    "Responses stored in the cache",
+                    {(): len(response_cache.bodies)},
+                ),
+            ]
+        return "\n".join(lines) + "\n"
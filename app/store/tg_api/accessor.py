@@ -1,20 +1,40 @@
 import asyncio
+import time
 import typing
 from urllib.parse import urlencode, urljoin
 
-from aiohttp import TCPConnector
+from aiohttp import ClientError, ClientTimeout
 from aiohttp.client import ClientSession
 
 from app.base.base_accessor import BaseAccessor
+from app.base.tracing import SPAN_KIND_CLIENT, span
+from app.store.tg_api.client import (
+    RETRYABLE_ERROR_KINDS,
+    BotApiErrorKind,
+    classify_error_code,
+    create_session,
+    get_poll_timeout,
+    get_retry_delay,
+    get_send_timeout,
+)
 from app.store.tg_api.dataclasses import SendMessage, Update
 from app.store.tg_api.poller import Poller
-from app.web.exceptions import TgGetUpdatesError
+from app.web.exceptions import (
+    TgApiError,
+    TgApiRetriesExhaustedError,
+    TgApiTimeoutError,
+    TgGetUpdatesError,
+)
 
 from .router import Router
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
+# соединения с Bot API, открываемые при старте: одно занимает long polling
+# getUpdates, другое сразу готово для sendMessage
+BOT_API_WARMUP_CONNECTIONS = 2
+
 
 class TgApiAccessor(BaseAccessor):
     def __init__(self, app: "Application", *args, **kwargs):
@@ -27,11 +47,15 @@ class TgApiAccessor(BaseAccessor):
         self.api_path: str = ""
 
     async def connect(self, app: "Application") -> None:
-        self.session = ClientSession(connector=TCPConnector(verify_ssl=False))
+        self.session = self.create_session()
         self.queue = asyncio.Queue()
         self.api_path: str = (
-            f"https://api.telegram.org/bot{app.config.bot.token}/"
+            f"{app.config.bot.api_url}/bot{app.config.bot.token}/"
         )
+        with app.store.warmup.step("bot_api"):
+            await self.warm_up()
+        app.store.warmup.set_ready()
+
         self.poller = Poller(app.store, self.queue)
         self.logger.info("start polling")
         self.poller.start()
@@ -48,10 +72,132 @@ class TgApiAccessor(BaseAccessor):
         if self.poller:
             await self.poller.stop()
 
+    def create_session(self) -> ClientSession:
+        return create_session(self.app.config.bot, self.app.store.metrics)
+
+    @property
+    def poll_timeout(self) -> int:
+        """Сколько секунд Telegram держит long polling getUpdates."""
+        return self.app.config.bot.poll_timeout
+
+    async def warm_up(self) -> None:
+        """Открывает keep-alive соединения с Bot API (TCP и TLS) запросами
+        getMe, чтобы первые updates не платили за установку соединения.
+        Попытка одна: старт не должен ждать, пока Telegram недоступен.
+        """
+        await asyncio.gather(
+            *(
+                self.get_me(max_attempts=1)
+                for _ in range(BOT_API_WARMUP_CONNECTIONS)
+            )
+        )
+
+    async def get_me(
+        self, max_attempts: int | None = None
+    ) -> dict[str, typing.Any]:
+        """Отдает информацию о боте."""
+        return await self._call("getMe", {}, max_attempts=max_attempts)
+
     @staticmethod
     def _build_query(host: str, method: str, params: dict) -> str:
         return f"{urljoin(host, method)}?{urlencode(params)}"
 
+    async def _request(
+        self,
+        method: str,
+        params: dict[str, typing.Any],
+        timeout: ClientTimeout | None = None,
+    ) -> tuple[int, dict[str, typing.Any]]:
+        """Вызывает метод Bot API и отдает HTTP-статус и ответ. Запрос,
+        не уложившийся в timeout (по умолчанию - таймаут коротких методов),
+        прерывается с TgApiTimeoutError.
+        """
+        try:
+            async with self.session.get(
+                self._build_query(self.api_path, method, params),
+                timeout=timeout or get_send_timeout(self.app.config.bot),
+            ) as response:
+                if response.content_type != "application/json":
+                    # ответ не от Bot API, например 502 от балансировщика
+                    return response.status, {
+                        "ok": False,
+                        "error_code": response.status,
+                        "description": response.reason,
+                    }
+                return response.status, await response.json()
+        except TimeoutError as exc:
+            self.app.store.metrics.telegram_timeouts.inc(method)
+            raise TgApiTimeoutError(method) from exc
+
+    async def _call(
+        self,
+        method: str,
+        params: dict[str, typing.Any],
+        timeout: ClientTimeout | None = None,
+        max_attempts: int | None = None,
+        retry_budget: float | None = None,
+    ) -> typing.Any:
+        """Вызывает метод Bot API и отдает его result.
+
+        Ошибки 429 и 5xx, сетевые ошибки и таймауты повторяются
+        с экспоненциальной задержкой и джиттером, пока у вызова есть
+        попытки и время (max_attempts и retry_budget, по умолчанию -
+        из BotConfig), иначе поднимается TgApiRetriesExhaustedError.
+        Таймаут тоже повторяется, хотя Telegram мог успеть выполнить запрос:
+        лишнее сообщение в чате лучше потерянного. Остальные ошибки
+        (400, 403 и т.п.) повторять бесполезно, они сразу поднимаются
+        как TgApiError.
+        """
+        config = self.app.config.bot
+        metrics = self.app.store.metrics
+        max_attempts = max_attempts or config.retry_attempts
+        deadline: float = time.monotonic() + (
+            retry_budget or config.retry_budget
+        )
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after: float | None = None
+            with span(
+                method, SPAN_KIND_CLIENT, attempt=attempt
+            ) as request_span:
+                try:
+                    status, data = await self._request(method, params, timeout)
+                except TgApiTimeoutError as exc:
+                    kind, error = BotApiErrorKind.TIMEOUT, exc
+                except ClientError as exc:
+                    kind, error = BotApiErrorKind.NETWORK, exc
+                else:
+                    if request_span:
+                        request_span.set_attribute("http.status_code", status)
+                    if data["ok"]:
+                        return data.get("result")
+                    kind = classify_error_code(data["error_code"])
+                    error = TgApiError(
+                        method, data["error_code"], data["description"]
+                    )
+                    retry_after = data.get("parameters", {}).get("retry_after")
+
+            if kind not in RETRYABLE_ERROR_KINDS:
+                metrics.telegram_give_ups.inc(method, kind)
+                self.logger.error("Ошибка Telegram Bot: %s", error)
+                raise error
+            delay: float = get_retry_delay(
+                attempt, config.retry_base_delay, retry_after
+            )
+            if attempt >= max_attempts or time.monotonic() + delay > deadline:
+                metrics.telegram_give_ups.inc(method, kind)
+                raise TgApiRetriesExhaustedError(method, attempt) from error
+            metrics.telegram_retries.inc(method, kind)
+            self.logger.warning(
+                "%s failed (%s: %s), retry in %.2f s",
+                method,
+                kind,
+                error,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
     async def get_updates(
         self,
         offset: int | None = None,
@@ -69,38 +215,26 @@ class TgApiAccessor(BaseAccessor):
         if allowed_updates:
             params["allowed_updates"] = allowed_updates
 
-        async with self.session.get(
-            self._build_query(
-                host=self.api_path,
-                method="getUpdates",
-                params=params,
+        try:
+            result: list[dict[str, typing.Any]] | None = await self._call(
+                "getUpdates",
+                params,
+                timeout=get_poll_timeout(self.app.config.bot, timeout),
             )
-        ) as response:
-            data: dict[str, typing.Any] = await response.json()
-
-            if not data["ok"]:
-                self.logger.error(
-                    "Ошибка Telegram Bot: %s - %s",
-                    data["error_code"],
-                    data["description"],
-                )
-                raise TgGetUpdatesError(
-                    error_code=data["error_code"],
-                    description=data["description"],
-                )
-
-            if not data.get("result"):
-                return []
-
-            updates: list[Update] = [
-                Update.from_dict(update) for update in data.get("result")
-            ]
-            return updates
+        except TgApiError as exc:
+            raise TgGetUpdatesError(
+                error_code=exc.error_code, description=exc.description
+            ) from exc
+
+        if not result:
+            return []
+
+        updates: list[Update] = [Update.from_dict(update) for update in result]
+        return updates
 
     async def send_message(
         self, message: SendMessage, any_buttons_present: bool = False
     ) -> None:
-        is_message_sent = False
         if any_buttons_present:
             reply_markup = message.reply_markup.json_reply_markup_keyboard()
             params = {
@@ -111,25 +245,11 @@ class TgApiAccessor(BaseAccessor):
         else:
             params = {"chat_id": message.chat_id, "text": message.text}
 
-        while not is_message_sent:
-            async with self.session.get(
-                self._build_query(
-                    self.api_path,
-                    "sendMessage",
-                    params=params,
-                )
-            ) as response:
-                data: dict[str, typing.Any] = await response.json()
-                # self.logger.info(data)  # uncomment to see api responses
-                is_message_sent = data["ok"]
-                retry_after: int = (
-                    data.get("parameters").get("retry_after")
-                    if not is_message_sent and data["error_code"] == 429
-                    else 0
-                )
-                if retry_after:
-                    self.logger.info(
-                        "Error 429: Too Many Requests. Sleep for %s seconds",
-                        retry_after,
-                    )
-                    await asyncio.sleep(retry_after)
+        # время вместе с повторами: столько ждет обработчик update, а с ним
+        # и очередь updates, поэтому бюджет повторов здесь короткий
+        with self.app.store.metrics.send_message_latency.time():
+            await self._call(
+                "sendMessage",
+                params,
+                retry_budget=self.app.config.bot.send_retry_budget,
+            )
@@ -0,0 +1,209 @@
+"""HTTP-клиент Bot API: пул keep-alive соединений, профили таймаутов,
+классификация ошибок для повторов и метрики установки соединений.
+
+Метрики пишутся хуками aiohttp (TraceConfig) с меткой method - методом
+Bot API из пути запроса. aiohttp не разделяет установку TCP-соединения
+и TLS-рукопожатие, поэтому telegram_connect_seconds - это время обоих,
+а TTFB - время от начала запроса до заголовков ответа (в него входит
+ожидание свободного соединения и установка нового, если она была).
+"""
+
+import enum
+import random
+import time
+import typing
+from types import SimpleNamespace
+
+from aiohttp import (
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionCreateStartParams,
+    TraceConnectionReuseconnParams,
+    TraceDnsResolveHostEndParams,
+    TraceDnsResolveHostStartParams,
+    TraceRequestEndParams,
+    TraceRequestStartParams,
+)
+
+if typing.TYPE_CHECKING:
+    from app.store.metrics import MetricsAccessor
+    from app.web.config import BotConfig
+
+# больше этой задержки между попытками не бывает (кроме retry_after от 429)
+RETRY_MAX_DELAY_IN_SECONDS = 30
+
+
+class BotApiErrorKind(enum.StrEnum):
+    THROTTLED = "throttled"  # 429 Too Many Requests
+    SERVER_ERROR = "server_error"  # 5xx
+    NETWORK = "network"  # соединение не установилось или оборвалось
+    TIMEOUT = "timeout"
+    CLIENT_ERROR = "client_error"  # остальные 4xx: запрос не выполнится
+
+
+# ошибки, которые могут пройти сами: их вызов повторяет
+RETRYABLE_ERROR_KINDS = frozenset(
+    {
+        BotApiErrorKind.THROTTLED,
+        BotApiErrorKind.SERVER_ERROR,
+        BotApiErrorKind.NETWORK,
+        BotApiErrorKind.TIMEOUT,
+    }
+)
+
+
+def classify_error_code(error_code: int) -> BotApiErrorKind:
+    """Определяет вид ошибки по error_code ответа (или HTTP-статусу)."""
+    if error_code == 429:
+        return BotApiErrorKind.THROTTLED
+    if error_code >= 500:
+        return BotApiErrorKind.SERVER_ERROR
+    return BotApiErrorKind.CLIENT_ERROR
+
+
+def get_retry_delay(
+    attempt: int, base_delay: float, retry_after: float | None = None
+) -> float:
+    """Задержка перед повтором после попытки attempt: экспоненциальная
+    с полным джиттером, чтобы запросы разных чатов не повторялись разом.
+    retry_after из ответа 429 соблюдается, джиттер добавляется сверху.
+    """
+    if retry_after:
+        return retry_after + random.uniform(0, base_delay)
+    return random.uniform(
+        0, min(RETRY_MAX_DELAY_IN_SECONDS, base_delay * 2 ** (attempt - 1))
+    )
+
+
+def get_send_timeout(config: "BotConfig") -> ClientTimeout:
+    """Таймаут коротких методов (sendMessage и т.п.): зависший запрос
+    должен быстро упасть, а не держать обработку update.
+    """
+    return ClientTimeout(
+        total=config.send_timeout, sock_connect=config.connect_timeout
+    )
+
+
+def get_poll_timeout(config: "BotConfig", timeout: int) -> ClientTimeout:
+    """Таймаут getUpdates: Telegram держит long polling до timeout секунд,
+    сверх этого запросу дается столько же, сколько короткому методу.
+    """
+    return ClientTimeout(
+        total=timeout + config.send_timeout,
+        sock_connect=config.connect_timeout,
+    )
+
+
+def _get_method(params: TraceRequestStartParams) -> str:
+    return params.url.path.rsplit("/", 1)[-1]
+
+
+class BotApiTraceHooks:
+    """Хуки aiohttp, которые пишут в metrics время DNS, установки
+    соединения и TTFB, а также число новых и переиспользованных
+    соединений по методам Bot API.
+    """
+
+    def __init__(self, metrics: "MetricsAccessor") -> None:
+        self.metrics = metrics
+
+    async def on_request_start(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestStartParams,
+    ) -> None:
+        context.method = _get_method(params)
+        context.started_at = time.perf_counter()
+
+    async def on_dns_resolvehost_start(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceDnsResolveHostStartParams,
+    ) -> None:
+        context.dns_started_at = time.perf_counter()
+
+    async def on_dns_resolvehost_end(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceDnsResolveHostEndParams,
+    ) -> None:
+        self.metrics.telegram_dns_latency.observe(
+            time.perf_counter() - context.dns_started_at, context.method
+        )
+
+    async def on_connection_create_start(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionCreateStartParams,
+    ) -> None:
+        context.connect_started_at = time.perf_counter()
+
+    async def on_connection_create_end(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionCreateEndParams,
+    ) -> None:
+        self.metrics.telegram_connect_latency.observe(
+            time.perf_counter() - context.connect_started_at, context.method
+        )
+        self.metrics.telegram_connections.inc(context.method, "false")
+
+    async def on_connection_reuseconn(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionReuseconnParams,
+    ) -> None:
+        self.metrics.telegram_connections.inc(context.method, "true")
+
+    async def on_request_end(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestEndParams,
+    ) -> None:
+        self.metrics.telegram_ttfb.observe(
+            time.perf_counter() - context.started_at, context.method
+        )
+
+    def get_trace_config(self) -> TraceConfig:
+        trace_config = TraceConfig()
+        for name in (
+            "on_request_start",
+            "on_dns_resolvehost_start",
+            "on_dns_resolvehost_end",
+            "on_connection_create_start",
+            "on_connection_create_end",
+            "on_connection_reuseconn",
+            "on_request_end",
+        ):
+            getattr(trace_config, name).append(getattr(self, name))
+        return trace_config
+
+
+def create_session(
+    config: "BotConfig", metrics: "MetricsAccessor"
+) -> ClientSession:
+    """Создает сессию для Bot API. Все запросы идут на один хост, поэтому
+    лимит соединений общий, а keep-alive держится дольше, чем пауза между
+    запросами long polling, чтобы соединения не открывались заново.
+    """
+    connector = TCPConnector(
+        ssl=False,
+        limit=config.connection_limit,
+        ttl_dns_cache=config.dns_cache_ttl,
+        keepalive_timeout=config.keepalive_timeout,
+    )
+    return ClientSession(
+        connector=connector,
+        timeout=get_send_timeout(config),
+        trace_configs=[BotApiTraceHooks(metrics).get_trace_config()],
+    )
@@ -1,7 +1,8 @@
 import json
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from typing import Any, Optional
 
+from app.base.tracing import Trace
 from app.game.models import GameModel
 
 
@@ -270,6 +271,8 @@ class Update:
     update_id: int
     message: Message | None = None
     callback_query: CallbackQuery | None = None
+    # не поле Telegram: трасса обработки update, если он попал в выборку
+    trace: Trace | None = field(default=None, repr=False, compare=False)
 
     @classmethod
     def from_dict(cls, update: dict) -> "Update":
@@ -1,8 +1,10 @@
 import asyncio
+import time
 from asyncio import Future, Task
 
+from app.base.tracing import SPAN_KIND_CLIENT
 from app.store import Store
-from app.web.exceptions import TgGetUpdatesError
+from app.web.exceptions import TgApiRetriesExhaustedError, TgGetUpdatesError
 
 from .dataclasses import Update
 from .router import Router
@@ -38,6 +40,24 @@ class Poller:
             except asyncio.CancelledError:
                 self.store.logger.exception("Polling was cancelled")
 
+    def _start_trace(
+        self, update: Update, started_at: int, received_at: int
+    ) -> None:
+        """Заводит трассу update (если он попал в выборку) со временем
+        запроса getUpdates, которым он получен.
+        """
+        update.trace = self.store.tracing.tracer.start_trace(
+            "update", started_at, update_id=update.update_id
+        )
+        if update.trace:
+            update.trace.add_span(
+                "getUpdates",
+                started_at,
+                received_at,
+                kind=SPAN_KIND_CLIENT,
+                queue_size=self.queue.qsize(),
+            )
+
     async def poll(self) -> None:
         """Получает список updates из TgApiAccessor и по одному складывает их
         в очередь, увеличивая параметр offset на единицу по сравнению с
@@ -46,12 +66,21 @@ class Poller:
         offset: int = 0
         while self.is_running:
             try:
-                updates: list[Update] = await self.store.tg_api.get_updates(
-                    offset=offset, timeout=30
-                )
+                started_at: int = time.time_ns()
+                with self.store.metrics.get_updates_latency.time():
+                    updates: list[Update] = await self.store.tg_api.get_updates(
+                        offset=offset, timeout=self.store.tg_api.poll_timeout
+                    )
+                self.store.metrics.get_updates_batch_size.observe(len(updates))
                 if updates:
+                    received_at: int = time.time_ns()
                     for update in updates:
+                        self._start_trace(update, started_at, received_at)
                         self.queue.put_nowait(update)
                         offset = update.update_id + 1
             except TgGetUpdatesError:
                 self.is_running = False
+            except TgApiRetriesExhaustedError:
+                # Telegram недоступен дольше бюджета повторов одного вызова:
+                # следующий вызов начнет повторы заново с тем же offset
+                self.store.logger.exception("getUpdates failed")
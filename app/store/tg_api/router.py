@@ -1,10 +1,14 @@
 import asyncio
+import time
+from contextlib import nullcontext
 from logging import getLogger
 
+from app.base.tracing import Trace, span
 from app.game.models import GameModel
 from app.store import Store
 from app.store.bot import const
-from app.store.tg_api.dataclasses import CallbackQuery, Message
+from app.store.database.database import QueryStats, count_queries
+from app.store.tg_api.dataclasses import CallbackQuery, Message, Update
 
 from .dataclasses import BotContext
 
@@ -26,18 +30,62 @@ class Router:
         """
         while True:
             update = await self.queue.get()
+            trace: Trace | None = update.trace
+            if trace:
+                # последний спан трассы - getUpdates, после него update
+                # лежал в очереди
+                trace.add_span(
+                    "queue", trace.spans[-1].end_time, time.time_ns()
+                )
             try:
-                message: Message | None = update.message
-                callback_query: CallbackQuery | None = update.callback_query
-                if message:
-                    await self._process_message_update(message)
-                elif callback_query:
-                    await self._process_callback_query_update(callback_query)
-                else:
-                    self.logger.error("Another type of update: %s", update)
+                with trace.activate() if trace else nullcontext():
+                    await self.handle_update(update)
+            except Exception as exc:
+                # ответ в чат не ушел или ошибка в обработчике (например,
+                # в БД), но остальные чаты ждать не должны: цикл продолжается,
+                # а задачу останавливает только отмена (CancelledError)
+                self.logger.exception("Update %s failed", update.update_id)
+                self.store.metrics.update_errors.inc(type(exc).__name__)
             finally:
                 self.queue.task_done()
 
+    async def handle_update(self, update: Update) -> QueryStats:
+        """Обрабатывает один update и отдает, сколько запросов к БД на это
+        понадобилось (без записей буферов, которые идут общими пачками).
+        """
+        with count_queries() as stats:
+            try:
+                await self._process_update(update)
+            finally:
+                self.store.metrics.observe_query_stats(stats)
+                if update.trace:
+                    update.trace.root.attributes.update(
+                        {
+                            "db.statements": stats.statements,
+                            "db.round_trips": stats.round_trips,
+                            "db.checkouts": stats.checkouts,
+                        }
+                    )
+        return stats
+
+    async def _process_update(self, update: Update) -> None:
+        message: Message | None = update.message
+        callback_query: CallbackQuery | None = update.callback_query
+        if message:
+            with span(
+                "Router._process_message_update", chat_id=message.chat.id
+            ):
+                await self._process_message_update(message)
+        elif callback_query:
+            with span(
+                "Router._process_callback_query_update",
+                chat_id=callback_query.message.chat.id,
+                data=callback_query.data,
+            ):
+                await self._process_callback_query_update(callback_query)
+        else:
+            self.logger.error("Another type of update: %s", update)
+
     async def _process_message_update(self, message: Message) -> None:
         """Обрабатывает update типа message."""
         bot_context = BotContext(
@@ -50,11 +98,27 @@ class Router:
         )
 
         if message.text == "/start" and not current_game:
-            await self.store.bot_manager.say_hi_and_play(bot_context)
+            handler = "say_hi_and_play"
+            handling = self.store.bot_manager.say_hi_and_play(bot_context)
         elif message.text == "/start" and current_game:
-            await self.store.bot_manager.say_hi_and_wait(bot_context)
+            handler = "say_hi_and_wait"
+            handling = self.store.bot_manager.say_hi_and_wait(bot_context)
+        elif message.text == "/top":
+            handler = "handle_top_command"
+            handling = self.store.bot_handler.handle_top_command(bot_context)
+        elif message.text == "/stats":
+            handler = "handle_stats_command"
+            handling = self.store.bot_handler.handle_stats_command(
+                message, bot_context
+            )
         else:
             self.logger.error("Another type of message: %s", message)
+            return
+
+        with self.store.metrics.time_handler(
+            handler, current_game, message.text
+        ):
+            await handling
 
     async def _process_callback_query_update(
         self, callback_query: CallbackQuery
@@ -73,15 +137,23 @@ class Router:
         )
 
         if callback_query.data == const.MY_BALANCE_CALLBACK:
-            await self.store.bot_handler.handle_my_balance_query(
+            handler = "handle_my_balance_query"
+            handling = self.store.bot_handler.handle_my_balance_query(
                 callback_query, bot_context
             )
         elif current_game:
             bot_context.current_game = current_game
-            await self.store.bot_handler.handle_active_game(
+            handler = "handle_active_game"
+            handling = self.store.bot_handler.handle_active_game(
                 callback_query, bot_context
             )
         else:
-            await self.store.bot_handler.handle_no_game_case(
+            handler = "handle_no_game_case"
+            handling = self.store.bot_handler.handle_no_game_case(
                 callback_query, bot_context
             )
+
+        with self.store.metrics.time_handler(
+            handler, current_game, callback_query.data
+        ):
+            await handling
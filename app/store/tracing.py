@@ -0,0 +1,88 @@
+import asyncio
+import json
+import typing
+
+from aiohttp import ClientSession, ClientTimeout
+
+from app.base.base_accessor import BaseAccessor
+from app.base.tracing import Trace, Tracer, to_otlp
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+TRACES_EXPORT_INTERVAL_IN_SECONDS = 5
+TRACES_EXPORT_TIMEOUT_IN_SECONDS = 10
+
+
+class TracingAccessor(BaseAccessor):
+    """Выгрузка трасс updates (см. app.base.tracing).
+
+    Раз в несколько секунд накопленные трассы выгружаются одним документом
+    OTLP JSON: дописываются строкой в файл и (или) отправляются
+    в OTLP/HTTP коллектор. Пока sample_rate равен 0, трассы не заводятся.
+    """
+
+    def __init__(
+        self,
+        app: "Application",
+        *args,
+        export_interval: float = TRACES_EXPORT_INTERVAL_IN_SECONDS,
+        **kwargs,
+    ):
+        super().__init__(app, *args, **kwargs)
+        self.export_interval = export_interval
+        self.tracer = Tracer()
+        self.session: ClientSession | None = None
+        self.export_task: asyncio.Task | None = None
+
+    async def connect(self, app: "Application") -> None:
+        config = app.config.tracing
+        if not config or not config.sample_rate:
+            return
+        self.tracer.sample_rate = config.sample_rate
+        if config.endpoint:
+            self.session = ClientSession(
+                timeout=ClientTimeout(total=TRACES_EXPORT_TIMEOUT_IN_SECONDS)
+            )
+        self.export_task = asyncio.create_task(self._export_periodically())
+
+    async def disconnect(self, app: "Application") -> None:
+        if self.export_task:
+            self.export_task.cancel()
+            try:
+                await self.export_task
+            except asyncio.CancelledError:
+                pass
+            self.export_task = None
+            await self.export()
+        if self.session:
+            await self.session.close()
+
+    async def export(self) -> int:
+        """Выгружает накопленные трассы. Возвращает их число."""
+        traces: list[Trace] = self.tracer.drain()
+        if not traces:
+            return 0
+        config = self.app.config.tracing
+        document = to_otlp(traces, config.service_name)
+        if config.file:
+            await asyncio.to_thread(self._append_to_file, config.file, document)
+        if config.endpoint and self.session:
+            async with self.session.post(
+                config.endpoint, json=document
+            ) as response:
+                response.raise_for_status()
+        return len(traces)
+
+    @staticmethod
+    def _append_to_file(path: str, document: dict[str, typing.Any]) -> None:
+        with open(path, "a") as file:
+            file.write(json.dumps(document) + "\n")
+
+    async def _export_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.export_interval)
+            try:
+                await self.export()
+            except Exception:
+                self.logger.exception("Traces export failed")
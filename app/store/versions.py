@@ -0,0 +1,48 @@
+import enum
+import time
+import uuid
+
+# как часто версии меняются сами по себе: так ответы, закешированные
+# по версии, устаревают не дольше чем за это время, даже если данные
+# изменил не этот процесс (другой узел или Django-админка)
+VERSION_MAX_AGE_IN_SECONDS = 60
+
+
+class Resource(enum.StrEnum):
+    GAMES = "games"  # игры вместе с геймплеями
+    PLAYERS = "players"
+    BALANCES = "balances"
+
+
+# таблицы, изменения которых меняют версию ресурса
+TABLE_RESOURCES: dict[str, Resource] = {
+    "games": Resource.GAMES,
+    "gameplays": Resource.GAMES,
+    "players": Resource.PLAYERS,
+    "balances": Resource.BALANCES,
+}
+
+
+class ResourceVersions:
+    """Счетчики изменений ресурсов админского API. Аксессоры увеличивают
+    счетчик ресурса после каждой записи, а списки ресурсов отдаются
+    с ETag по текущей версии, поэтому повторный запрос без изменений
+    обслуживается без обращения к БД.
+    """
+
+    def __init__(self, max_age: float = VERSION_MAX_AGE_IN_SECONDS) -> None:
+        self.max_age = max_age
+        # версии разных запусков не должны совпадать
+        self.epoch: str = uuid.uuid4().hex[:8]
+        self.counters: dict[Resource, int] = dict.fromkeys(Resource, 0)
+
+    def bump(self, resource: Resource) -> None:
+        self.counters[resource] += 1
+
+    def bump_table(self, table_name: str) -> None:
+        if table_name in TABLE_RESOURCES:
+            self.bump(TABLE_RESOURCES[table_name])
+
+    def get_version(self, resource: Resource) -> str:
+        window: int = int(time.time() // self.max_age)
+        return f"{self.epoch}-{window}-{self.counters[resource]}"
@@ -0,0 +1,135 @@
+import asyncio
+import time
+import typing
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from app.base.base_accessor import BaseAccessor
+from app.game.const import GameStatus
+from app.game.models import GameModel
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+# сколько активных игр (самых новых) загружается при старте
+WARMUP_MAX_GAMES = 100
+# id, которых нет в БД: запросы с ними только готовят выражения
+WARMUP_MISSING_ID = 0
+# сколько запросов прогрева выполняется одновременно без настроек БД
+WARMUP_CONCURRENCY = 5
+
+
+@dataclass
+class WarmupStep:
+    name: str
+    duration: float
+    error: str | None = None
+
+
+class WarmupAccessor(BaseAccessor):
+    """Прогрев перед приемом updates: после деплоя первые updates
+    не должны платить за открытие соединений, подготовку запросов
+    и пустые кеши.
+
+    Шаги прогрева выполняются при старте приложения по порядку:
+    Database.connect открывает соединения пула, connect этого аксессора
+    готовит горячие запросы и загружает активные игры, TgApiAccessor.connect
+    открывает соединения с Bot API и, перед запуском поллера, объявляет
+    готовность (см. ReadinessView). Ошибка шага не останавливает старт:
+    она пишется в лог и в отчет о прогреве, а работа продолжается
+    с холодными соединениями, как и без прогрева.
+    """
+
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.steps: list[WarmupStep] = []
+        self.is_ready = False
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Замеряет шаг прогрева и запоминает его ошибку, не пробрасывая ее."""
+        started_at: float = time.perf_counter()
+        error: str | None = None
+        try:
+            yield
+        except Exception as exc:
+            self.logger.exception("Warm-up step %s failed", name)
+            error = repr(exc)
+        duration: float = time.perf_counter() - started_at
+        self.steps.append(WarmupStep(name, duration, error))
+        self.logger.info("Warm-up step %s took %.3f s", name, duration)
+
+    def set_ready(self) -> None:
+        self.is_ready = True
+        self.logger.info(
+            "Warm-up finished in %.3f s",
+            sum(step.duration for step in self.steps),
+        )
+
+    def get_report(self) -> dict[str, typing.Any]:
+        return {
+            "ready": self.is_ready,
+            "steps": [
+                {
+                    "name": step.name,
+                    "duration": round(step.duration, 3),
+                    "error": step.error,
+                }
+                for step in self.steps
+            ],
+        }
+
+    def _get_concurrency(self) -> int:
+        if self.app.config.database is None:
+            return WARMUP_CONCURRENCY
+        return self.app.config.database.pool_size
+
+    async def connect(self, app: "Application") -> None:
+        if app.store.memory is not None:
+            return  # в памяти нечего готовить и нечего загружать
+        with self.step("statements"):
+            await self._prepare_statements()
+        with self.step("active_games"):
+            await self._preload_active_games()
+
+    async def _run_hot_queries(self) -> None:
+        store = self.app.store
+        await store.players.get_player_by_tg_id(WARMUP_MISSING_ID)
+        await store.players.get_balance_by_player_and_chat(
+            WARMUP_MISSING_ID, WARMUP_MISSING_ID
+        )
+        await store.games.get_active_game_by_chat_id(WARMUP_MISSING_ID)
+        await store.gameplays.get_gameplay_by_game_and_player(
+            WARMUP_MISSING_ID, WARMUP_MISSING_ID
+        )
+
+    async def _prepare_statements(self) -> None:
+        """Выполняет запросы, которые нужны почти каждому update, по разу
+        на каждое соединение пула: SQLAlchemy кеширует скомпилированные
+        выражения, а asyncpg - подготовленные запросы соединения.
+        Запросы ищут несуществующие id и ничего не меняют.
+        """
+        await asyncio.gather(
+            *(self._run_hot_queries() for _ in range(self._get_concurrency()))
+        )
+
+    async def _preload_active_games(self) -> None:
+        """Читает активные игры с геймплеями и игроками, чтобы их строки
+        и индексы оказались в кеше Postgres, а также загружает в память
+        топы балансов чатов с активными играми.
+        """
+        page = await self.app.store.games.list_games(
+            limit=WARMUP_MAX_GAMES, status=GameStatus.ACTIVE
+        )
+        semaphore = asyncio.Semaphore(self._get_concurrency())
+
+        async def preload(game: GameModel) -> None:
+            async with semaphore:
+                await self.app.store.games.get_active_game_by_chat_id(
+                    game.chat_id
+                )
+                await self.app.store.leaderboard.get_top(game.chat_id)
+
+        await asyncio.gather(*(preload(game) for game in page.items))
+        self.logger.info("Preloaded %s active games", len(page.items))
@@ -3,7 +3,6 @@ from aiohttp.web import (
     Request as AiohttpRequest,
     View as AiohttpView,
 )
-from aiohttp_apispec import setup_aiohttp_apispec
 from aiohttp_session import setup as session_setup
 from aiohttp_session.cookie_storage import EncryptedCookieStorage
 
@@ -11,7 +10,9 @@ from app.admin.models import AdminModel
 from app.store import Store, setup_store
 from app.store.database.database import Database
 
+from .cache import ResponseCache
 from .config import Config, setup_config
+from .docs import setup_docs
 from .logger import setup_logging
 from .mw import setup_middlewares
 from .routes import setup_routes
@@ -23,6 +24,7 @@ class Application(AiohttpApplication):
     config: Config | None = None
     store: Store | None = None
     database: Database | None = None
+    response_cache: ResponseCache | None = None
 
 
 class Request(AiohttpRequest):
@@ -59,9 +61,8 @@ def setup_app(config_path: str) -> Application:
     setup_config(app, config_path)
     session_setup(app, EncryptedCookieStorage(app.config.session.key))
     setup_routes(app)
-    setup_aiohttp_apispec(
-        app, title="Black Jack Chat Bot", url="/docs/json", swagger_path="/docs"
-    )
+    setup_docs(app)
     setup_middlewares(app)
     setup_store(app)
+    app.response_cache = ResponseCache()
     return app
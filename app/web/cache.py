@@ -0,0 +1,44 @@
+from collections import OrderedDict
+
+RESPONSE_CACHE_MAX_ENTRIES = 256
+RESPONSE_CACHE_MAX_BODY_SIZE = 1024 * 1024  # большие ответы не кешируются
+
+CacheKey = tuple[str, str, str]  # (ресурс, версия ресурса, путь с запросом)
+
+
+class ResponseCache:
+    """Небольшой LRU-кеш тел ответов процесса. Ключ содержит версию
+    ресурса, поэтому после изменения ресурса старые ответы просто
+    перестают запрашиваться и вытесняются новыми.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_body_size: int = RESPONSE_CACHE_MAX_BODY_SIZE,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_body_size = max_body_size
+        self.bodies: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey) -> bytes | None:
+        body: bytes | None = self.bodies.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bodies.move_to_end(key)
+        return body
+
+    def put(self, key: CacheKey, body: bytes) -> None:
+        if len(body) > self.max_body_size:
+            return
+        self.bodies[key] = body
+        self.bodies.move_to_end(key)
+        while len(self.bodies) > self.max_entries:
+            self.bodies.popitem(last=False)
+
+    def clear(self) -> None:
+        self.bodies.clear()
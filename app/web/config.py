@@ -1,6 +1,7 @@
+import enum
 import os
 import typing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import yaml
 
@@ -22,6 +23,22 @@ class AdminConfig:
 @dataclass
 class BotConfig:
     token: str
+    api_url: str = "https://api.telegram.org"
+    # HTTP-клиент Bot API (см. app.store.tg_api.client), время в секундах
+    connection_limit: int = 100
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 60
+    connect_timeout: float = 5  # установка соединения вместе с TLS
+    send_timeout: float = 10  # весь запрос любого метода, кроме getUpdates
+    poll_timeout: int = 30  # long polling getUpdates
+    # повторы вызовов Bot API (см. TgApiAccessor._call): попытки на вызов,
+    # начальная задержка и сколько секунд вызов может занять с повторами
+    retry_attempts: int = 5
+    retry_base_delay: float = 0.5
+    retry_budget: float = 60
+    # бюджет sendMessage: updates разбираются по очереди, и пока обработчик
+    # ждет повтора, сообщения остальных чатов тоже ждут
+    send_retry_budget: float = 3
 
 
 @dataclass
@@ -31,6 +48,26 @@ class DatabaseConfig:
     user: str = "postgres"
     password: str = "postgres"
     database: str = "project"
+    # соединения пула; все они открываются при старте (см. Database.warm_up)
+    pool_size: int = 5
+
+
+@dataclass
+class TracingConfig:
+    sample_rate: float = 0.0  # доля updates, для которых пишется трасса
+    file: str | None = None  # файл, в который дописываются трассы
+    endpoint: str | None = None  # OTLP/HTTP коллектор, .../v1/traces
+    service_name: str = "chat-bot-game"
+
+
+class StorageBackend(enum.StrEnum):
+    POSTGRES = "postgres"
+    MEMORY = "memory"  # данные живут только в процессе (см. app.store.memory)
+
+
+@dataclass
+class StorageConfig:
+    backend: StorageBackend = StorageBackend.POSTGRES
 
 
 # @dataclass
@@ -46,6 +83,8 @@ class Config:
     session: SessionConfig | None = None
     bot: BotConfig | None = None
     database: DatabaseConfig | None = None
+    tracing: TracingConfig | None = None
+    storage: StorageConfig = field(default_factory=StorageConfig)
     # rabbit: RabbitConfig | None = None
 
 
@@ -63,6 +102,19 @@ def setup_config(app: "Application", config_path: str):
         ),
         bot=BotConfig(
             token=os.environ.get("BOT_TOKEN", "token"),
+            api_url=os.environ.get("BOT_API_URL", "https://api.telegram.org"),
+            connection_limit=int(os.environ.get("BOT_CONNECTION_LIMIT", 100)),
+            dns_cache_ttl=int(os.environ.get("BOT_DNS_CACHE_TTL", 300)),
+            keepalive_timeout=float(
+                os.environ.get("BOT_KEEPALIVE_TIMEOUT", 60)
+            ),
+            connect_timeout=float(os.environ.get("BOT_CONNECT_TIMEOUT", 5)),
+            send_timeout=float(os.environ.get("BOT_SEND_TIMEOUT", 10)),
+            poll_timeout=int(os.environ.get("BOT_POLL_TIMEOUT", 30)),
+            retry_attempts=int(os.environ.get("BOT_RETRY_ATTEMPTS", 5)),
+            retry_base_delay=float(os.environ.get("BOT_RETRY_BASE_DELAY", 0.5)),
+            retry_budget=float(os.environ.get("BOT_RETRY_BUDGET", 60)),
+            send_retry_budget=float(os.environ.get("BOT_SEND_RETRY_BUDGET", 3)),
         ),
         database=DatabaseConfig(
             host=os.environ.get("POSTGRES_HOST", "localhost"),
@@ -70,6 +122,17 @@ def setup_config(app: "Application", config_path: str):
             user=os.environ.get("POSTGRES_USER", "postgres"),
             password=os.environ.get("POSTGRES_PASSWORD", "postgres"),
             database=os.environ.get("POSTGRES_DB", "postgres"),
+            pool_size=int(os.environ.get("POSTGRES_POOL_SIZE", 5)),
+        ),
+        tracing=TracingConfig(
+            sample_rate=float(os.environ.get("TRACING_SAMPLE_RATE", 0)),
+            file=os.environ.get("TRACING_FILE"),
+            endpoint=os.environ.get("TRACING_ENDPOINT"),
+        ),
+        storage=StorageConfig(
+            backend=StorageBackend(
+                os.environ.get("STORAGE_BACKEND", StorageBackend.POSTGRES)
+            ),
         ),
         # rabbit=RabbitConfig(
         #     host=os.environ.get("RABBIT_HOST", "localhost"),
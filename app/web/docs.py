@@ -0,0 +1,98 @@
+"""Документация API в формате OpenAPI (Swagger).
+
+Документ собирается по маршрутам и схемам views. Чтобы не собирать его
+при каждом старте приложения, он генерируется при сборке образа
+и при старте только читается из файла:
+
+    python -m app.web.docs --output etc/openapi.json
+
+Если файла нет (например, при локальной разработке), документ, как и раньше,
+собирается при старте.
+"""
+
+import argparse
+import json
+import os
+import sys
+import typing
+from typing import Any
+
+from aiohttp.web import Application as AiohttpApplication
+from aiohttp_apispec import AiohttpApiSpec, setup_aiohttp_apispec
+
+from app.web.routes import setup_routes
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+DOCS_TITLE = "Black Jack Chat Bot"
+DOCS_VERSION = "0.0.1"
+DOCS_JSON_URL = "/docs/json"
+SWAGGER_PATH = "/docs"
+OPENAPI_SPEC_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "etc",
+    "openapi.json",
+)
+
+
+class PrebuiltApiSpec(AiohttpApiSpec):
+    """Отдает заранее сгенерированный документ вместо сборки по маршрутам."""
+
+    def __init__(self, spec: dict[str, Any], **kwargs: Any):
+        super().__init__(**kwargs)
+        self.prebuilt_spec = spec
+
+    def _register(self, app: "Application") -> None:
+        app["swagger_dict"] = self.prebuilt_spec
+
+
+def build_spec() -> dict[str, Any]:
+    """Собирает документ по маршрутам приложения."""
+    app = AiohttpApplication()
+    setup_routes(app)
+    spec = AiohttpApiSpec(url=None, title=DOCS_TITLE, version=DOCS_VERSION)
+    spec.register(app, in_place=True)
+    return app["swagger_dict"]
+
+
+def setup_docs(app: "Application", spec_path: str = OPENAPI_SPEC_PATH) -> None:
+    """Подключает документ (по адресу /docs/json) и Swagger UI (/docs),
+    а также разбор и валидацию запросов по схемам views.
+    """
+    if not os.path.exists(spec_path):
+        setup_aiohttp_apispec(
+            app,
+            title=DOCS_TITLE,
+            version=DOCS_VERSION,
+            url=DOCS_JSON_URL,
+            swagger_path=SWAGGER_PATH,
+        )
+        return
+
+    with open(spec_path) as file:
+        spec: dict[str, Any] = json.load(file)
+    PrebuiltApiSpec(
+        spec,
+        title=DOCS_TITLE,
+        version=DOCS_VERSION,
+        url=DOCS_JSON_URL,
+        swagger_path=SWAGGER_PATH,
+    ).register(app, in_place=True)
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="файл для документа")
+    parsed_args = parser.parse_args(args)
+
+    document: str = json.dumps(build_spec(), indent=2, ensure_ascii=False)
+    if parsed_args.output:
+        with open(parsed_args.output, "w") as file:
+            file.write(document + "\n")
+    else:
+        sys.stdout.write(document + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,15 @@ TG_GET_UPDATES_FAILED_ERROR = (
     "error_code - {error_code}, description - {description}"
 )
 
+TG_API_TIMEOUT_ERROR = "Telegram Bot API не ответил на {method} вовремя"
+TG_API_ERROR = (
+    "Ошибка Telegram Bot API в {method}: "
+    "error_code - {error_code}, description - {description}"
+)
+TG_API_RETRIES_EXHAUSTED_ERROR = (
+    "Telegram Bot API не выполнил {method} за {attempts} попыток"
+)
+
 
 class BaseTgBotApiError(Exception):
     """Базовое исключение для ошибок Telegram Bot API."""
@@ -26,9 +35,75 @@ class TgGetUpdatesError(BaseTgBotApiError):
         super().__init__(self.message)
 
 
+class TgApiTimeoutError(BaseTgBotApiError):
+    """Вызывается, если запрос к Telegram Bot API не уложился в таймаут
+    (не удалось соединиться или ответ не пришел вовремя).
+    """
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+        self.message = TG_API_TIMEOUT_ERROR.format(method=method)
+        super().__init__(self.message)
+
+
+class TgApiError(BaseTgBotApiError):
+    """Вызывается, если Telegram Bot API ответил на запрос ошибкой,
+    повторять которую бесполезно (например, 400 или 403).
+    """
+
+    def __init__(self, method: str, error_code: int, description: str) -> None:
+        self.method = method
+        self.error_code = error_code
+        self.description = description
+        self.message = TG_API_ERROR.format(
+            method=method, error_code=error_code, description=description
+        )
+        super().__init__(self.message)
+
+
+class TgApiRetriesExhaustedError(BaseTgBotApiError):
+    """Вызывается, если запрос к Telegram Bot API так и не выполнился
+    за отведенные ему попытки или время. Последняя ошибка - в __cause__.
+    """
+
+    def __init__(self, method: str, attempts: int) -> None:
+        self.method = method
+        self.attempts = attempts
+        self.message = TG_API_RETRIES_EXHAUSTED_ERROR.format(
+            method=method, attempts=attempts
+        )
+        super().__init__(self.message)
+
+
 class TgUsernameError(BaseTgBotApiError):
     """Вызывается, если username не соответствует правилам Telegram."""
 
     def __init__(self, message: str = TG_USERNAME_ERROR) -> None:
         self.message = message
         super().__init__(self.message)
+
+
+class SimulationBusyError(Exception):
+    """Вызывается, если уже идет столько симуляций, сколько разрешено."""
+
+
+class MoveIsOverError(Exception):
+    """Вызывается, если ход игрока не записался в журнал игры: пока он
+    обрабатывался, игра ушла с его стадии (например, итоги подвел таймер).
+    """
+
+    def __init__(self, game_id: int) -> None:
+        self.game_id = game_id
+        self.message = f"Игра {game_id} уже ушла со стадии этого хода"
+        super().__init__(self.message)
+
+
+class SeedlessGameError(Exception):
+    """Вызывается, если у игры нет сида: ее карты нельзя восстановить,
+    а раздавать карты из заново перемешанного шу нельзя.
+    """
+
+    def __init__(self, game_id: int | None) -> None:
+        self.game_id = game_id
+        self.message = f"Игра {game_id} создана без сида"
+        super().__init__(self.message)
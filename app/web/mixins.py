@@ -1,5 +1,11 @@
+from aiohttp import hdrs
 from aiohttp.abc import StreamResponse
+from aiohttp.helpers import ETAG_ANY
 from aiohttp.web_exceptions import HTTPUnauthorized
+from aiohttp.web_response import Response
+
+from app.store.versions import Resource
+from app.web.cache import CacheKey
 
 
 class AuthRequiredMixin:
@@ -8,3 +14,42 @@ class AuthRequiredMixin:
             raise HTTPUnauthorized
 
         return await super()._iter()
+
+
+class ConditionalGetMixin:
+    """Отдает список ресурса с ETag по версии ресурса (см. ResourceVersions).
+    Если версия совпадает с If-None-Match, отвечает 304 без запроса к БД,
+    иначе ищет тело ответа в кеше ответов по версии и адресу запроса.
+    """
+
+    resource: Resource
+
+    async def _iter(self) -> StreamResponse:
+        if self.request.method != hdrs.METH_GET:
+            return await super()._iter()
+
+        # версия берется до чтения данных: если данные изменятся во время
+        # запроса, ответ закешируется под старой версией и больше не отдастся
+        version: str = self.request.app.store.versions.get_version(
+            self.resource
+        )
+        if any(
+            etag.value in (version, ETAG_ANY)
+            for etag in self.request.if_none_match or ()
+        ):
+            response = Response(status=304)
+        else:
+            cache_key: CacheKey = (self.resource, version, self.request.path_qs)
+            body: bytes | None = self.request.app.response_cache.get(cache_key)
+            if body is None:
+                response = await super()._iter()
+                if response.status != 200 or not isinstance(
+                    response.body, bytes
+                ):
+                    return response
+                self.request.app.response_cache.put(cache_key, response.body)
+            else:
+                response = Response(body=body, content_type="application/json")
+        response.etag = version
+        response.headers[hdrs.CACHE_CONTROL] = "no-cache"
+        return response
@@ -20,7 +20,9 @@ HTTP_ERROR_CODES = {
     404: "not_found",
     405: "not_implemented",
     409: "conflict",
+    429: "too_many_requests",
     500: "internal_server_error",
+    503: "service_unavailable",
 }
 
 
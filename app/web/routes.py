@@ -6,6 +6,9 @@ __all__ = ("setup_routes",)
 def setup_routes(application: Application):
     import app.admin.routes
     import app.game.routes
+    from app.web.views import MetricsView, ReadinessView
 
     app.admin.routes.setup_routes(application)
     app.game.routes.setup_routes(application)
+    application.router.add_view("/metrics", MetricsView)
+    application.router.add_view("/ready", ReadinessView)
@@ -0,0 +1,71 @@
+"""Быстрая сериализация моделей для ответов админского API.
+
+Для каждой модели заранее собирается функция, которая переводит строку
+в словарь по готовому списку колонок, без схем marshmallow с их
+проверками и обходом полей. Словари кодируются в JSON через orjson,
+который сразу отдает bytes.
+"""
+
+import asyncio
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import orjson
+from sqlalchemy import inspect
+
+from app.store.database.sqlalchemy_base import BaseModel
+
+# начиная с такого числа строк сериализация уходит из event loop в поток
+OFFLOAD_THRESHOLD = 1000
+
+Serializer = Callable[[Any], dict[str, Any]]
+
+
+def make_serializer(
+    model: type[BaseModel],
+    exclude: Sequence[str] = (),
+    nested: dict[str, Serializer] | None = None,
+) -> Serializer:
+    """Собирает функцию сериализации строк модели: все колонки, кроме
+    exclude, и связи из nested (списки сериализуются поэлементно).
+    """
+    columns: tuple[str, ...] = tuple(
+        attr.key
+        for attr in inspect(model).column_attrs
+        if attr.key not in exclude
+    )
+    nested_items = tuple((nested or {}).items())
+
+    def serialize(row: Any) -> dict[str, Any]:
+        # загруженные значения лежат в __dict__ экземпляра: чтение оттуда
+        # в разы быстрее дескрипторов SQLAlchemy и никогда не вызывает
+        # ленивую загрузку (незагруженное поле отдается как None)
+        values: dict[str, Any] = row.__dict__
+        data: dict[str, Any] = {
+            column: values.get(column) for column in columns
+        }
+        for name, serialize_nested in nested_items:
+            value = values.get(name)
+            if isinstance(value, list):
+                data[name] = [serialize_nested(item) for item in value]
+            else:
+                data[name] = None if value is None else serialize_nested(value)
+        return data
+
+    return serialize
+
+
+async def serialize_many(
+    serializer: Serializer, rows: Sequence[Any]
+) -> list[dict[str, Any]]:
+    """Сериализует строки. Большие списки сериализуются в отдельном потоке,
+    чтобы не задерживать event loop, на котором работает и бот.
+    """
+    if len(rows) < OFFLOAD_THRESHOLD:
+        return [serializer(row) for row in rows]
+    return await asyncio.to_thread(lambda: [serializer(row) for row in rows])
+
+
+def dump_json(data: Any) -> bytes:
+    """Кодирует данные в JSON."""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
@@ -1,13 +1,17 @@
-from aiohttp.web import json_response as aiohttp_json_response
 from aiohttp.web_response import Response
 
+from app.web.serializers import dump_json
+
 
 def json_response(data: dict | None = None, status: str = "ok") -> Response:
-    return aiohttp_json_response(
-        data={
-            "status": status,
-            "data": data or {},
-        }
+    return Response(
+        body=dump_json(
+            {
+                "status": status,
+                "data": data or {},
+            }
+        ),
+        content_type="application/json",
     )
 
 
@@ -17,11 +21,14 @@ def error_json_response(
     message: str | None = None,
     data: dict | None = None,
 ):
-    return aiohttp_json_response(
+    return Response(
         status=http_status,
-        data={
-            "status": status,
-            "message": str(message),
-            "data": data or {},
-        },
+        body=dump_json(
+            {
+                "status": status,
+                "message": str(message),
+                "data": data or {},
+            }
+        ),
+        content_type="application/json",
     )
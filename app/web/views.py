@@ -0,0 +1,39 @@
+from aiohttp.web import Response
+from aiohttp_apispec import docs
+
+from app.web.app import View
+from app.web.utils import error_json_response, json_response
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsView(View):
+    """Метрики для Prometheus. Без авторизации: Prometheus не умеет
+    логиниться в админку, а метрики не содержат данных игроков.
+    """
+
+    @docs(tags=["metrics"], summary="Get metrics in Prometheus text format")
+    async def get(self):
+        body: str = await self.store.metrics.collect()
+        return Response(
+            body=body.encode(), headers={"Content-Type": METRICS_CONTENT_TYPE}
+        )
+
+
+class ReadinessView(View):
+    """Готовность бота для проб оркестратора: 503, пока не закончился
+    прогрев соединений и кешей (см. WarmupAccessor). Без авторизации,
+    как и метрики.
+    """
+
+    @docs(tags=["metrics"], summary="Check that warm-up has finished")
+    async def get(self):
+        report: dict = self.store.warmup.get_report()
+        if not report["ready"]:
+            return error_json_response(
+                http_status=503,
+                status="service_unavailable",
+                message="Warm-up is in progress",
+                data=report,
+            )
+        return json_response(data=report)
@@ -0,0 +1,87 @@
+"""Сравнение двух запусков бенчмарков (см. benchmarks.hot_paths).
+
+Бенчмарк считается регрессией, если его лучшее время во втором запуске
+больше, чем в первом, более чем на threshold процентов. При регрессиях
+команда завершается с кодом 1, поэтому ее можно ставить в CI.
+
+Запуск: python -m benchmarks.compare before.json after.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_THRESHOLD_PERCENT = 10.0
+
+
+@dataclass
+class Comparison:
+    name: str
+    before_us: float
+    after_us: float
+    regression: bool
+
+    @property
+    def change_percent(self) -> float:
+        return (self.after_us / self.before_us - 1) * 100
+
+
+def compare_results(
+    before: dict[str, Any],
+    after: dict[str, Any],
+    threshold_percent: float = DEFAULT_THRESHOLD_PERCENT,
+) -> list[Comparison]:
+    """Сравнивает бенчмарки, которые есть в обоих запусках."""
+    comparisons: list[Comparison] = []
+    for name, after_result in after["benchmarks"].items():
+        before_result: dict[str, float] | None = before["benchmarks"].get(name)
+        if before_result is None:
+            continue
+        before_us: float = before_result["best_us"]
+        after_us: float = after_result["best_us"]
+        comparisons.append(
+            Comparison(
+                name,
+                before_us,
+                after_us,
+                after_us > before_us * (1 + threshold_percent / 100),
+            )
+        )
+    return comparisons
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    width: int = max((len(item.name) for item in comparisons), default=0)
+    return "".join(
+        f"{item.name:<{width}}  {item.before_us:>10.3f} us"
+        f"  {item.after_us:>10.3f} us  {item.change_percent:+7.1f}%"
+        f"{'  REGRESSION' if item.regression else ''}\n"
+        for item in comparisons
+    )
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD_PERCENT,
+        help="допустимое замедление в процентах",
+    )
+    parsed_args = parser.parse_args(args)
+
+    with open(parsed_args.before) as file:
+        before = json.load(file)
+    with open(parsed_args.after) as file:
+        after = json.load(file)
+    comparisons = compare_results(before, after, parsed_args.threshold)
+    sys.stdout.write(format_comparisons(comparisons))
+    return 1 if any(item.regression for item in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
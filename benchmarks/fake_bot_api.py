@@ -0,0 +1,105 @@
+"""Поддельный Bot API для нагрузочного теста (см. benchmarks.load).
+
+Сервер поднимается локально: getUpdates отдает updates, положенные через
+push(), с той же семантикой offset и long polling, что и Telegram,
+а sendMessage просто отвечает ok и считает сообщения. getMe отвечает
+для прогрева соединений при старте бота.
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Any
+
+from aiohttp import web
+
+GET_UPDATES_LIMIT = 100
+
+
+class FakeBotApi:
+    def __init__(self, token: str = "load-test") -> None:
+        self.token = token
+        self.pending: list[dict[str, Any]] = []
+        self.confirmed_offset = 0  # все updates с меньшим id уже получены
+        self.sent_messages = 0
+        self.polled = asyncio.Event()  # бот хотя бы раз запросил getUpdates
+        self._message_ids = itertools.count(1)
+        self._new_updates = asyncio.Event()
+        self._offset_changed = asyncio.Event()
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> str:
+        """Запускает сервер на свободном порту, отдает путь API для бота."""
+        app = web.Application()
+        app.router.add_get(f"/bot{self.token}/getMe", self.get_me)
+        app.router.add_get(f"/bot{self.token}/getUpdates", self.get_updates)
+        app.router.add_get(f"/bot{self.token}/sendMessage", self.send_message)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}/bot{self.token}/"
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    def push(self, updates: list[dict[str, Any]]) -> None:
+        self.pending.extend(updates)
+        self._new_updates.set()
+
+    async def wait_confirmed(self, update_id: int) -> None:
+        """Ждет, пока бот не подтвердит получение update следующим offset."""
+        while self.confirmed_offset <= update_id:
+            self._offset_changed.clear()
+            await self._offset_changed.wait()
+
+    def _confirm(self, offset: int) -> None:
+        if offset > self.confirmed_offset:
+            self.confirmed_offset = offset
+            self.pending = [
+                update
+                for update in self.pending
+                if update["update_id"] >= offset
+            ]
+            self._offset_changed.set()
+
+    async def get_me(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "ok": True,
+                "result": {"id": 1, "is_bot": True, "first_name": "Bot"},
+            }
+        )
+
+    async def get_updates(self, request: web.Request) -> web.Response:
+        self.polled.set()
+        self._confirm(int(request.query.get("offset", 0)))
+        if not self.pending:
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(
+                    self._new_updates.wait(),
+                    int(request.query.get("timeout", 0)),
+                )
+            except TimeoutError:
+                pass
+        limit = int(request.query.get("limit", GET_UPDATES_LIMIT))
+        return web.json_response({"ok": True, "result": self.pending[:limit]})
+
+    async def send_message(self, request: web.Request) -> web.Response:
+        self.sent_messages += 1
+        return web.json_response(
+            {
+                "ok": True,
+                "result": {
+                    "message_id": next(self._message_ids),
+                    "date": int(time.time()),
+                    "chat": {
+                        "id": int(request.query["chat_id"]),
+                        "type": "group",
+                    },
+                    "text": request.query["text"],
+                },
+            }
+        )
@@ -0,0 +1,214 @@
+"""Микробенчмарки горячих путей игры и протокола Bot API.
+
+Каждый бенчмарк - это функция без аргументов над заранее подготовленными
+данными. Число вызовов в замере подбирается автоматически (timeit.autorange),
+в результат пишется лучшее и медианное время одного вызова в микросекундах.
+Результаты двух запусков сравниваются через benchmarks.compare.
+
+Запуск: python -m benchmarks.hot_paths --output results.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from app.game.const import GameAction
+from app.game.models import GameModel
+from app.game.replay import draw_diller_cards, make_action, replay_game
+from app.store.bot import const
+from app.store.bot.handler import BotHandler
+from app.store.game.manager import GameManager
+from app.store.tg_api.dataclasses import (
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Update,
+)
+from app.web.app import Application
+
+from .serialization import fast_path, make_games, marshmallow_path
+
+GAME_LIST_ROWS = 500
+
+# записанные ответы getUpdates (идентификаторы заменены)
+MESSAGE_UPDATE: dict[str, Any] = {
+    "update_id": 815623001,
+    "message": {
+        "message_id": 4021,
+        "from": {
+            "id": 123456,
+            "is_bot": False,
+            "first_name": "player",
+            "username": "test_player",
+            "language_code": "ru",
+        },
+        "chat": {"id": -4242424242, "title": "Blackjack", "type": "group"},
+        "date": 1760886000,
+        "text": "/start",
+        "entities": [{"offset": 0, "length": 6, "type": "bot_command"}],
+    },
+}
+CALLBACK_QUERY_UPDATE: dict[str, Any] = {
+    "update_id": 815623002,
+    "callback_query": {
+        "id": "530021741290823745",
+        "from": {
+            "id": 123456,
+            "is_bot": False,
+            "first_name": "player",
+            "username": "test_player",
+            "language_code": "ru",
+        },
+        "message": {
+            "message_id": 4022,
+            "from": {
+                "id": 654321,
+                "is_bot": True,
+                "first_name": "Blackjack bot",
+                "username": "blackjack_bot",
+            },
+            "chat": {"id": -4242424242, "title": "Blackjack", "type": "group"},
+            "date": 1760886005,
+            "text": "Игра началась! Участники: player. Делайте ставки.",
+            "reply_markup": {
+                "inline_keyboard": [
+                    [
+                        {"text": "10💰", "callback_data": "make_bet_10"},
+                        {"text": "25💰", "callback_data": "make_bet_25"},
+                        {"text": "50💰", "callback_data": "make_bet_50"},
+                        {"text": "100💰", "callback_data": "make_bet_100"},
+                    ]
+                ]
+            },
+        },
+        "chat_instance": "-5120983345776104816",
+        "data": "make_bet_25",
+    },
+}
+
+PLAYER_CARDS = ["A♠️", "7♥️", "A♦️", "2♣️"]
+RESULT_PLAYERS = 5
+
+
+def make_playerhit_game() -> GameModel:
+    """Игра с тремя игроками, которые сделали ставки и остановились."""
+    return GameModel(
+        id=1,
+        chat_id=-100,
+        seed=2026,
+        diller_cards=["Q♣️"],
+        actions=[
+            *(
+                make_action(GameAction.BET, player_id)
+                for player_id in (1, 2, 3)
+            ),
+            *(
+                make_action(GameAction.STAND, player_id)
+                for player_id in (1, 2, 3)
+            ),
+        ],
+    )
+
+
+def make_betting_keyboard() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        [
+            InlineKeyboardButton(text=text, callback_data=callback_data)
+            for text, callback_data in (
+                (const.BET_10_BUTTON, const.BET_10_CALLBACK),
+                (const.BET_25_BUTTON, const.BET_25_CALLBACK),
+                (const.BET_50_BUTTON, const.BET_50_CALLBACK),
+                (const.BET_100_BUTTON, const.BET_100_CALLBACK),
+            )
+        ]
+    )
+
+
+def format_game_results() -> str:
+    """Итоги игры так же, как их собирает BotHandler: строка на игрока."""
+    cards: str = BotHandler._get_cards_string(PLAYER_CARDS)
+    players: str = "".join(
+        const.PLAYER_WON_RESULTS_MESSAGE.format(
+            player=f"player{number}", cards=cards, bet=25, score=21
+        )
+        for number in range(RESULT_PLAYERS)
+    )
+    return const.GAME_RESULTS_MESSAGE.format(
+        players=players,
+        diller_cards=BotHandler._get_cards_string(["Q♣️", "7♥️"]),
+        score=17,
+    )
+
+
+def get_benchmarks() -> dict[str, Callable[[], Any]]:
+    game_manager = GameManager(Application())
+    game: GameModel = make_playerhit_game()
+    keyboard: InlineKeyboardMarkup = make_betting_keyboard()
+    games: list[GameModel] = make_games(GAME_LIST_ROWS)
+    return {
+        "process_score_with_aces": lambda: (
+            game_manager.process_score_with_aces(PLAYER_CARDS)
+        ),
+        # без записи в БД: восстановление шу по журналу и добор диллера
+        "take_cards_by_diller": lambda: draw_diller_cards(
+            list(game.diller_cards), replay_game(game.seed, game.actions).shoe
+        ),
+        "update_from_dict_message": lambda: Update.from_dict(MESSAGE_UPDATE),
+        "update_from_dict_callback_query": lambda: (
+            Update.from_dict(CALLBACK_QUERY_UPDATE)
+        ),
+        "json_reply_markup_keyboard": keyboard.json_reply_markup_keyboard,
+        "get_cards_string": lambda: BotHandler._get_cards_string(PLAYER_CARDS),
+        "format_game_results": format_game_results,
+        "game_list_marshmallow": lambda: marshmallow_path(games),
+        "game_list_fast": lambda: fast_path(games),
+    }
+
+
+def run_benchmark(function: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    timings: list[float] = [
+        timing / number * 1_000_000
+        for timing in timer.repeat(repeat=repeat, number=number)
+    ]
+    return {
+        "number": number,
+        "best_us": round(min(timings), 3),
+        "median_us": round(statistics.median(timings), 3),
+    }
+
+
+def main(args: list[str] | None = None) -> None:
+    """Печатает (или пишет в файл) результаты одним JSON-документом."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="файл для результатов")
+    parser.add_argument(
+        "--filter", default="", help="запускать только бенчмарки с подстрокой"
+    )
+    parsed_args = parser.parse_args(args)
+
+    results: dict[str, Any] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": {
+            name: run_benchmark(function, parsed_args.repeat)
+            for name, function in get_benchmarks().items()
+            if parsed_args.filter in name
+        },
+    }
+    document: str = json.dumps(results, indent=2, ensure_ascii=False) + "\n"
+    if parsed_args.output:
+        with open(parsed_args.output, "w") as file:
+            file.write(document)
+    else:
+        sys.stdout.write(document)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""Нагрузочный тест: тысячи чатов одновременно играют полные игры.
+
+Updates проходят настоящий путь Router -> BotHandler -> аксессоры -> Postgres
+из базы, указанной в конфиге, поэтому запускать тест нужно на отдельной базе.
+Сообщения бота уходят в поддельный Bot API (benchmarks.fake_bot_api),
+а updates либо кладутся прямо в очередь роутера (--mode direct), либо
+забираются поллером через getUpdates поддельного API (--mode api).
+
+Таймеры стадий идут по виртуальным часам: планировщик таймеров и отложенные
+задачи (задачи пишутся в таблицу jobs как обычно) срабатывают, когда тест
+переводит часы, а не через реальные 10-45 секунд.
+
+Запуск: python -m benchmarks.load --chats 1000 --players 3 --rounds 2
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from aiohttp import web
+from sqlalchemy import event
+
+from app.jobs.models import JobModel
+from app.store import Store
+from app.store.bot import const
+from app.store.database.database import QueryStats
+from app.store.jobs.worker import JobWorker
+from app.store.tg_api.dataclasses import Update
+from app.store.tg_api.poller import Poller
+from app.store.tg_api.router import Router
+from app.web.app import Application, setup_app
+
+from .fake_bot_api import FakeBotApi
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    "etc",
+    "config.yml",
+)
+BET_CALLBACKS = (
+    const.BET_10_CALLBACK,
+    const.BET_25_CALLBACK,
+    const.BET_50_CALLBACK,
+    const.BET_100_CALLBACK,
+)
+MAX_HITS = 2
+TOP_ALLOCATIONS = 10
+# id чатов и игроков теста не пересекаются с настоящими и с прошлыми запусками
+ID_BASE = 10**12
+
+
+class VirtualClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class VirtualJobWorker(JobWorker):
+    """Воркер задач для виртуальных часов: задачи пишутся в таблицу jobs как
+    обычно, но срабатывают, когда run_due() видит, что их время пришло по
+    виртуальным часам. Очередь в БД воркер не опрашивает.
+    """
+
+    def __init__(self, app: "Application", clock: VirtualClock) -> None:
+        super().__init__(app)
+        self.clock = clock
+        self.due: list[tuple[float, JobModel]] = []
+
+    async def connect(self, app: "Application") -> None:
+        pass
+
+    async def schedule(
+        self, kind: str, payload: dict[str, Any], seconds: float = 0
+    ) -> JobModel:
+        job: JobModel = await super().schedule(kind, payload, seconds)
+        self.due.append((self.clock() + seconds, job))
+        return job
+
+    async def cancel(self, kind: str, **payload: Any) -> int:
+        self.due = [
+            (run_at, job)
+            for run_at, job in self.due
+            if job.kind != kind or payload.items() - job.payload.items()
+        ]
+        return await super().cancel(kind, **payload)
+
+    async def run_due(self) -> int:
+        """Выполняет задачи, время которых пришло, и удаляет их из таблицы."""
+        now: float = self.clock()
+        due_jobs: list[JobModel] = [
+            job for run_at, job in self.due if run_at <= now
+        ]
+        self.due = [(run_at, job) for run_at, job in self.due if run_at > now]
+
+        async def run(job: JobModel) -> None:
+            await self.handlers[job.kind](job.payload)
+            await self.jobs.cancel_jobs(job.kind, job.payload)
+
+        # пачками, как настоящий воркер забирает задачи из очереди
+        for start in range(0, len(due_jobs), self.batch_size):
+            batch = due_jobs[start : start + self.batch_size]
+            await asyncio.gather(*(run(job) for job in batch))
+        return len(due_jobs)
+
+
+class MeasuredRouter(Router):
+    """Роутер, который запоминает время обработки каждого update."""
+
+    def __init__(self, store: Store, queue: asyncio.Queue) -> None:
+        super().__init__(store, queue)
+        self.latencies: list[float] = []
+
+    async def handle_update(self, update: Update) -> QueryStats:
+        started_at: float = time.perf_counter()
+        try:
+            return await super().handle_update(update)
+        finally:
+            self.latencies.append(time.perf_counter() - started_at)
+
+
+@dataclass
+class EngineCounter:
+    """Все запросы и выдачи соединений движка, включая фоновые записи."""
+
+    statements: int = 0
+    checkouts: int = 0
+
+    def listen(self, app: "Application") -> None:
+        engine = app.database.engine.sync_engine
+        event.listen(engine, "before_cursor_execute", self._count_statement)
+        event.listen(engine.pool, "checkout", self._count_checkout)
+
+    def _count_statement(self, *_) -> None:
+        self.statements += 1
+
+    def _count_checkout(self, *_) -> None:
+        self.checkouts += 1
+
+
+@dataclass
+class Chat:
+    chat_id: int
+    player_ids: list[int]
+
+
+class Scenario:
+    """Генерирует updates от игроков всех чатов в формате Bot API."""
+
+    def __init__(self, chats: int, players: int, afk_share: float) -> None:
+        base: int = ID_BASE + random.randrange(10**6) * chats * players
+        self.chats: list[Chat] = [
+            Chat(
+                -(base + number),
+                [base + number * players + player for player in range(players)],
+            )
+            for number in range(chats)
+        ]
+        self.afk_share = afk_share
+        self._update_ids = itertools.count(1)
+
+    def _callback_update(
+        self, chat: Chat, player_id: int, data: str
+    ) -> dict[str, Any]:
+        update_id: int = next(self._update_ids)
+        user = {
+            "id": player_id,
+            "is_bot": False,
+            "first_name": f"player{player_id}",
+            "username": f"player{player_id}",
+        }
+        return {
+            "update_id": update_id,
+            "callback_query": {
+                "id": str(update_id),
+                "from": user,
+                "chat_instance": str(chat.chat_id),
+                "data": data,
+                "message": {
+                    "message_id": update_id,
+                    "date": int(time.time()),
+                    "chat": {"id": chat.chat_id, "type": "group"},
+                    "from": user,
+                },
+            },
+        }
+
+    @staticmethod
+    def _interleave(
+        per_chat: Iterable[list[dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        """Перемешивает updates разных чатов, сохраняя порядок внутри чата."""
+        return [
+            update
+            for updates in itertools.zip_longest(*per_chat)
+            for update in updates
+            if update is not None
+        ]
+
+    def join(self) -> list[dict[str, Any]]:
+        return self._interleave(
+            [
+                self._callback_update(
+                    chat,
+                    player_id,
+                    const.ADD_PLAYER_CALLBACK
+                    if number
+                    else const.JOIN_GAME_CALLBACK,
+                )
+                for number, player_id in enumerate(chat.player_ids)
+            ]
+            for chat in self.chats
+        )
+
+    def bet(self) -> list[dict[str, Any]]:
+        return self._interleave(
+            [
+                self._callback_update(
+                    chat, player_id, random.choice(BET_CALLBACKS)
+                )
+                for player_id in chat.player_ids
+            ]
+            for chat in self.chats
+        )
+
+    def play(self) -> list[dict[str, Any]]:
+        """Игроки берут 0-2 карты и останавливаются, а доля afk_share игроков
+        ничего не нажимает, и стадию за них завершает таймер.
+        """
+        per_chat: list[list[dict[str, Any]]] = []
+        for chat in self.chats:
+            updates: list[dict[str, Any]] = []
+            for player_id in chat.player_ids:
+                if random.random() < self.afk_share:
+                    continue
+                updates.extend(
+                    self._callback_update(
+                        chat, player_id, const.TAKE_CARD_CALLBACK
+                    )
+                    for _ in range(random.randint(0, MAX_HITS))
+                )
+                updates.append(
+                    self._callback_update(
+                        chat, player_id, const.STOP_TAKING_CALLBACK
+                    )
+                )
+            per_chat.append(updates)
+        return self._interleave(per_chat)
+
+
+def get_rss() -> int:
+    """Текущий RSS процесса в байтах (без /proc - пиковый)."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.clock = VirtualClock()
+        self.bot_api = FakeBotApi()
+        self.scenario = Scenario(args.chats, args.players, args.afk_share)
+        self.engine_counter = EngineCounter()
+        self.app: Application = setup_app(args.config)
+        self.store: Store = self.app.store
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.router = MeasuredRouter(self.store, self.queue)
+        self.runner = web.AppRunner(self.app)
+        self.updates = 0
+        self.rss_per_active_game: float = 0
+        self.allocations: dict[str, Any] | None = None
+
+    def _setup_store(self) -> None:
+        """Отключает настоящие поллер и воркер задач, часы - виртуальные."""
+        self.app.on_startup.remove(self.store.tg_api.connect)
+        self.app.on_startup.remove(self.store.job_worker.connect)
+        job_worker = VirtualJobWorker(self.app, self.clock)
+        self.store.job_worker = job_worker
+        self.store.bot_manager.register_jobs(job_worker)
+        self.store.timers.clock = self.clock
+
+    async def start(self) -> None:
+        self._setup_store()
+        tg_api = self.store.tg_api
+        tg_api.api_path = await self.bot_api.start()
+        tg_api.session = tg_api.create_session()
+        tg_api.queue = self.queue
+        await self.runner.setup()  # on_startup приложения, без веб-сервера
+        self.engine_counter.listen(self.app)
+        if self.args.mode == "api":
+            tg_api.poller = Poller(self.store, self.queue)
+            tg_api.poller.start()
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+        await self.bot_api.stop()
+
+    async def _send(self, updates: list[dict[str, Any]]) -> None:
+        """Отдает боту пачку updates и ждет, пока роутер их обработает."""
+        if self.args.mode == "api":
+            self.bot_api.push(updates)
+            await self.bot_api.wait_confirmed(updates[-1]["update_id"])
+        else:
+            for update in updates:
+                self.queue.put_nowait(Update.from_dict(update))
+        await self.queue.join()
+        self.updates += len(updates)
+
+    async def _advance_clock(self, seconds: float) -> None:
+        self.clock.now += seconds
+        await self.store.job_worker.run_due()
+        self.store.timers.fire_due_timers()
+        await self.store.timers.wait_running()
+
+    def _measure_memory(self, rss_before: int) -> None:
+        """Снимает память, когда игры всех чатов идут одновременно."""
+        self.rss_per_active_game = (get_rss() - rss_before) / self.args.chats
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")
+            self.allocations = {
+                "current_kb": round(current / 1024),
+                "peak_kb": round(peak / 1024),
+                "per_active_game_kb": round(
+                    current / 1024 / self.args.chats, 2
+                ),
+                "top": [str(stat) for stat in top[:TOP_ALLOCATIONS]],
+            }
+
+    async def play_round(self) -> None:
+        rss_before: int = get_rss()
+        await self._send(self.scenario.join())
+        await self._advance_clock(const.WAITING_STAGE_TIMER_IN_SECONDS)
+        await self._send(self.scenario.bet())
+        self._measure_memory(rss_before)
+        await self._send(self.scenario.play())
+        await self._advance_clock(const.PLAYERHIT_STAGE_TIMER_IN_SECONDS)
+
+    async def run(self) -> dict[str, Any]:
+        await self.start()
+        router_task = asyncio.create_task(self.router.route_update())
+        try:
+            if self.args.tracemalloc:
+                tracemalloc.start()
+            started_at: float = time.perf_counter()
+            for _ in range(self.args.rounds):
+                await self.play_round()
+            await self.store.gameplay_writes.flush()
+            duration: float = time.perf_counter() - started_at
+            tracemalloc.stop()
+        finally:
+            router_task.cancel()
+            await self.stop()
+        return self.report(duration)
+
+    def report(self, duration: float) -> dict[str, Any]:
+        games: int = self.args.chats * self.args.rounds
+        latencies: list[float] = self.router.latencies
+        return {
+            "mode": self.args.mode,
+            "chats": self.args.chats,
+            "players_per_chat": self.args.players,
+            "games": games,
+            "updates": self.updates,
+            "messages_sent": self.bot_api.sent_messages,
+            "duration_seconds": round(duration, 3),
+            "updates_per_second": round(self.updates / duration, 1),
+            "handler_latency_ms": {
+                name: round(value * 1000, 3)
+                for name, value in (
+                    ("p50", percentile(latencies, 50)),
+                    ("p95", percentile(latencies, 95)),
+                    ("p99", percentile(latencies, 99)),
+                    ("max", max(latencies)),
+                )
+            },
+            "db_statements_per_game": round(
+                self.engine_counter.statements / games, 1
+            ),
+            "db_checkouts_per_game": round(
+                self.engine_counter.checkouts / games, 1
+            ),
+            "rss_per_active_game_kb": round(self.rss_per_active_game / 1024, 2),
+            "tracemalloc": self.allocations,
+        }
+
+
+def main(args: list[str] | None = None) -> None:
+    """Печатает отчет одной JSON-строкой."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chats", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--mode", choices=("direct", "api"), default="direct")
+    parser.add_argument(
+        "--afk-share",
+        type=float,
+        default=0.1,
+        help="доля игроков, за которых ход завершает таймер",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="считать аллокации (заметно замедляет обработку)",
+    )
+    parser.add_argument("--config", default=CONFIG_PATH)
+    parsed_args = parser.parse_args(args)
+
+    # тысячи чатов пишут в лог каждое действие
+    logging.disable(logging.INFO)
+    result: dict[str, Any] = asyncio.run(LoadTest(parsed_args).run())
+    sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
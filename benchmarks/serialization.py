@@ -0,0 +1,86 @@
+"""Сравнение сериализации ответа /game.list: схемы marshmallow и
+stdlib json против app.web.serializers.
+
+Запуск: python -m benchmarks.serialization --rows 500
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from app.game.const import GameStage, GameStatus, PlayerStatus
+from app.game.models import GameModel, GamePlayModel
+from app.game.schemes import GameListSchema
+from app.game.serializers import serialize_game
+from app.web.serializers import dump_json
+
+PLAYERS_PER_GAME = 3
+
+
+def make_games(rows: int) -> list[GameModel]:
+    started_at = datetime(2026, 10, 19)
+    return [
+        GameModel(
+            id=game_id,
+            chat_id=-100,
+            created_at=started_at + timedelta(seconds=game_id),
+            status=GameStatus.FINISHED,
+            stage=GameStage.SUMMARIZING,
+            diller_cards=["Q♣️", "7♥️"],
+            seed=game_id,
+            actions=["b1", "b2", "b3", "s1", "s2", "s3", "d"],
+            gameplays=[
+                GamePlayModel(
+                    id=game_id * PLAYERS_PER_GAME + player_id,
+                    game_id=game_id,
+                    player_id=player_id,
+                    player_bet=25,
+                    player_status=PlayerStatus.WON,
+                    player_cards=["K♠️", "Q♦️"],
+                )
+                for player_id in range(PLAYERS_PER_GAME)
+            ],
+        )
+        for game_id in range(rows)
+    ]
+
+
+def marshmallow_path(games: list[GameModel]) -> bytes:
+    data = GameListSchema().dump({"games": games})
+    return json.dumps({"status": "ok", "data": data}).encode()
+
+
+def fast_path(games: list[GameModel]) -> bytes:
+    data = {"games": [serialize_game(game) for game in games]}
+    return dump_json({"status": "ok", "data": data})
+
+
+def main(args: list[str] | None = None) -> None:
+    """Печатает лучшее время на ответ для каждого пути одной JSON-строкой."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    parsed_args = parser.parse_args(args)
+
+    games = make_games(parsed_args.rows)
+    results: dict[str, float] = {}
+    for name, path in (("marshmallow", marshmallow_path), ("fast", fast_path)):
+        timings = timeit.repeat(
+            lambda path=path: path(games),
+            repeat=parsed_args.repeat,
+            number=parsed_args.number,
+        )
+        results[f"{name}_ms"] = round(
+            min(timings) / parsed_args.number * 1000, 3
+        )
+    results["speedup"] = round(
+        results["marshmallow_ms"] / results["fast_ms"], 1
+    )
+    sys.stdout.write(json.dumps({"rows": parsed_args.rows, **results}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Время старта бота: от запуска процесса до первого запроса getUpdates.
+
+Бот запускается отдельным процессом так же, как main.py, но Bot API
+подменяется поддельным (benchmarks.fake_bot_api): время замеряется
+до момента, когда поддельный API получает первый getUpdates. Если медиана
+запусков больше бюджета, команда завершается с кодом 1.
+
+С флагом --importtime вместо замера печатаются модули, импорт которых
+дольше всего занимает при сборке приложения (python -X importtime).
+
+Запуск: python -m benchmarks.startup --repeat 5 --budget 1.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+from .fake_bot_api import FakeBotApi
+from .load import CONFIG_PATH
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+STARTUP_BUDGET_IN_SECONDS = 1.5
+STARTUP_TIMEOUT_IN_SECONDS = 30
+IMPORTTIME_TOP = 25
+
+# процесс бота: то же, что main.py, но на свободном порту и без вывода
+BOT_PROCESS_CODE = """
+import sys
+from aiohttp.web import run_app
+from app.web.app import setup_app
+run_app(setup_app(sys.argv[1]), port=0, print=None)
+"""
+SETUP_APP_CODE = """
+import sys
+from app.web.app import setup_app
+setup_app(sys.argv[1])
+"""
+
+
+async def measure_startup(config_path: str, env: dict[str, str]) -> float:
+    """Запускает бота и отдает время до первого getUpdates в секундах."""
+    bot_api = FakeBotApi()
+    api_path: str = await bot_api.start()
+    started_at: float = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        BOT_PROCESS_CODE,
+        config_path,
+        env=env
+        | {
+            "BOT_API_URL": api_path.removesuffix(f"/bot{bot_api.token}/"),
+            "BOT_TOKEN": bot_api.token,
+        },
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        await asyncio.wait_for(
+            bot_api.polled.wait(), STARTUP_TIMEOUT_IN_SECONDS
+        )
+        return time.perf_counter() - started_at
+    finally:
+        process.terminate()
+        await process.wait()
+        await bot_api.stop()
+
+
+def profile_imports(config_path: str, env: dict[str, str]) -> list[str]:
+    """Отдает строки отчета python -X importtime о сборке приложения,
+    отсортированные по суммарному времени импорта модуля.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SETUP_APP_CODE, config_path],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split(
+            "|"
+        )
+        rows.append(
+            (
+                int(cumulative_us),
+                f"{int(cumulative_us) / 1000:>9.1f} ms"
+                f"  {int(self_us) / 1000:>8.1f} ms  {name.rstrip()}",
+            )
+        )
+    rows.sort(reverse=True)
+    return [row for _, row in rows]
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=STARTUP_BUDGET_IN_SECONDS,
+        help="допустимая медиана времени старта в секундах",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=("postgres", "memory"),
+        default="postgres",
+        help="хранилище бота (memory - старт без Postgres)",
+    )
+    parser.add_argument(
+        "--importtime",
+        action="store_true",
+        help="напечатать самые долгие импорты вместо замера",
+    )
+    parser.add_argument("--config", default=CONFIG_PATH)
+    parsed_args = parser.parse_args(args)
+
+    env: dict[str, str] = os.environ | {
+        "STORAGE_BACKEND": parsed_args.storage,
+        "PYTHONPATH": ROOT_PATH,
+    }
+    if parsed_args.importtime:
+        sys.stdout.write("cumulative       self  module\n")
+        sys.stdout.write(
+            "\n".join(profile_imports(parsed_args.config, env)[:IMPORTTIME_TOP])
+            + "\n"
+        )
+        return 0
+
+    timings: list[float] = [
+        asyncio.run(measure_startup(parsed_args.config, env))
+        for _ in range(parsed_args.repeat)
+    ]
+    result: dict[str, Any] = {
+        "best_s": round(min(timings), 3),
+        "median_s": round(statistics.median(timings), 3),
+        "budget_s": parsed_args.budget,
+    }
+    sys.stdout.write(json.dumps(result) + "\n")
+    return 1 if result["median_s"] > parsed_args.budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
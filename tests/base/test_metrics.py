@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+
+from app.base.metrics import (
+    Counter,
+    Histogram,
+    LabeledHistogram,
+    format_stats,
+)
+
+
+class TestHistogram:
+    def test_observe(self):
+        histogram = Histogram([1, 5, 10])
+        for value in (0.5, 1, 3, 7, 100):
+            histogram.observe(value)
+
+        assert histogram.count == 5
+        assert histogram.sum == 111.5
+        assert histogram.cumulative_counts() == [
+            (1, 2),
+            (5, 3),
+            (10, 4),
+            (float("inf"), 5),
+        ]
+
+    def test_quantile(self):
+        histogram = Histogram([1, 5, 10])
+        assert histogram.quantile(0.5) == 0
+
+        for value in range(1, 11):
+            histogram.observe(value)
+
+        assert histogram.quantile(0.1) == 1
+        assert histogram.quantile(0.5) == 5
+        assert histogram.quantile(0.99) == 10
+
+
+class TestPrometheusFormat:
+    def test_labeled_histogram(self):
+        histogram = LabeledHistogram("x_seconds", "X", [1, 5], ("handler",))
+        histogram.observe(0.5, "start")
+        histogram.observe(7, "start")
+        histogram.observe(2, 'say "hi"')
+
+        assert histogram.render() == [
+            "# HELP x_seconds X",
+            "# TYPE x_seconds histogram",
+            'x_seconds_bucket{handler="start",le="1"} 1',
+            'x_seconds_bucket{handler="start",le="5"} 1',
+            'x_seconds_bucket{handler="start",le="+Inf"} 2',
+            'x_seconds_sum{handler="start"} 7.5',
+            'x_seconds_count{handler="start"} 2',
+            'x_seconds_bucket{handler="say \\"hi\\"",le="1"} 0',
+            'x_seconds_bucket{handler="say \\"hi\\"",le="5"} 1',
+            'x_seconds_bucket{handler="say \\"hi\\"",le="+Inf"} 1',
+            'x_seconds_sum{handler="say \\"hi\\""} 2',
+            'x_seconds_count{handler="say \\"hi\\""} 1',
+        ]
+
+    def test_time(self):
+        histogram = LabeledHistogram("x_seconds", "X", [1])
+        with histogram.time():
+            pass
+
+        assert histogram.labels().count == 1
+        assert histogram.labels().bucket_counts == [1, 0]
+
+    def test_counter(self):
+        counter = Counter("x_total", "X")
+        assert counter.render()[-1] == "x_total 0"
+
+        counter.inc()
+        counter.inc(amount=2)
+        assert counter.render()[-1] == "x_total 3"
+
+    def test_format_stats(self):
+        @dataclass
+        class Stats:
+            done: int = 3
+            pending: int = 1
+
+        assert format_stats("x", Stats(), gauges=("pending",)) == [
+            "# HELP x_done_total Stats.done",
+            "# TYPE x_done_total counter",
+            "x_done_total 3",
+            "# HELP x_pending Stats.pending",
+            "# TYPE x_pending gauge",
+            "x_pending 1",
+        ]
@@ -0,0 +1,31 @@
+import pytest
+
+from app.base.pagination import (
+    decode_cursor,
+    encode_cursor,
+    escape_like,
+    make_page,
+)
+
+
+class TestPagination:
+    def test_cursor_roundtrip(self):
+        cursor = encode_cursor("2026-10-19 10:00:00", 42)
+        assert decode_cursor(cursor) == ["2026-10-19 10:00:00", 42]
+
+    @pytest.mark.parametrize("cursor", ["!!!", "bm90IGpzb24", "NDI"])
+    def test_invalid_cursor(self, cursor: str):
+        with pytest.raises(ValueError, match="invalid cursor"):
+            decode_cursor(cursor)
+
+    def test_make_page(self):
+        page = make_page([3, 2, 1], 2, lambda row: (row,))
+        assert page.items == [3, 2]
+        assert decode_cursor(page.next_cursor) == [2]
+
+        last_page = make_page([1], 2, lambda row: (row,))
+        assert last_page.items == [1]
+        assert last_page.next_cursor is None
+
+    def test_escape_like(self):
+        assert escape_like("a_b%c\\") == "a\\_b\\%c\\\\"
@@ -0,0 +1,112 @@
+import pytest
+
+from app.base.tracing import (
+    STATUS_CODE_ERROR,
+    Tracer,
+    current_span,
+    span,
+    to_otlp,
+)
+from app.store.bot.scheduler import StageTimerScheduler
+from app.store.game.accessor import GameAccessor
+from app.store.jobs.worker import JobWorker
+
+
+class TestTracer:
+    def test_sampling_off(self):
+        tracer = Tracer(sample_rate=0)
+        assert tracer.start_trace("update") is None
+
+        with span("outside trace") as outside_span:
+            assert outside_span is None
+        assert tracer.started == 0
+
+    def test_nested_spans(self):
+        tracer = Tracer(sample_rate=1)
+        trace = tracer.start_trace("update", update_id=1)
+        trace.add_span("getUpdates", 1, 2)
+
+        with trace.activate() as root:
+            with span("Router._process_message_update") as router_span:
+                with span("GameAccessor.get_game_by_id") as accessor_span:
+                    assert current_span.get() is accessor_span
+                assert accessor_span.parent_span_id == router_span.span_id
+            assert router_span.parent_span_id == root.span_id
+        assert current_span.get() is None
+
+        assert [span.name for span in trace.spans] == [
+            "update",
+            "getUpdates",
+            "Router._process_message_update",
+            "GameAccessor.get_game_by_id",
+        ]
+        assert all(span.end_time for span in trace.spans)
+        assert tracer.drain() == [trace]
+        assert tracer.drain() == []
+
+        # спаны задач, переживших трассу, в нее не добавляются
+        token = current_span.set(root)
+        with span("late") as late_span:
+            assert late_span is None
+        current_span.reset(token)
+
+    def test_error_status(self):
+        tracer = Tracer(sample_rate=1)
+        trace = tracer.start_trace("update")
+
+        def handle() -> None:
+            with trace.activate(), span("handler"):
+                raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            handle()
+
+        otlp_spans = to_otlp(tracer.drain(), "bot")["resourceSpans"][0][
+            "scopeSpans"
+        ][0]["spans"]
+        assert [otlp_span["status"] for otlp_span in otlp_spans] == [
+            {"code": STATUS_CODE_ERROR, "message": "ValueError"},
+            {"code": STATUS_CODE_ERROR, "message": "ValueError"},
+        ]
+        assert "parentSpanId" not in otlp_spans[0]
+        assert otlp_spans[1]["parentSpanId"] == otlp_spans[0]["spanId"]
+
+    def test_bounded_buffer(self):
+        tracer = Tracer(sample_rate=1, buffer_size=2)
+        for _ in range(3):
+            with tracer.start_trace("update").activate():
+                pass
+
+        assert tracer.started == 3
+        assert tracer.dropped == 1
+        assert len(tracer.drain()) == 2
+
+    def test_otlp_attributes(self):
+        tracer = Tracer(sample_rate=1)
+        trace = tracer.start_trace(
+            "update", update_id=1, chat="test", ok=True, ratio=0.5
+        )
+        with trace.activate():
+            pass
+
+        document = to_otlp(tracer.drain(), "bot")
+        resource_span = document["resourceSpans"][0]
+        assert resource_span["resource"]["attributes"] == [
+            {"key": "service.name", "value": {"stringValue": "bot"}}
+        ]
+        otlp_span = resource_span["scopeSpans"][0]["spans"][0]
+        assert otlp_span["traceId"] == trace.trace_id
+        assert len(otlp_span["traceId"]) == 32
+        assert len(otlp_span["spanId"]) == 16
+        assert otlp_span["attributes"] == [
+            {"key": "update_id", "value": {"intValue": "1"}},
+            {"key": "chat", "value": {"stringValue": "test"}},
+            {"key": "ok", "value": {"boolValue": True}},
+            {"key": "ratio", "value": {"doubleValue": 0.5}},
+        ]
+
+    def test_only_storage_accessors_are_wrapped(self):
+        # спаны получают методы доступа к данным, а не циклы и таймеры
+        assert hasattr(GameAccessor.get_game_by_id, "__wrapped__")
+        assert not hasattr(JobWorker.poll, "__wrapped__")
+        assert not hasattr(StageTimerScheduler.wait_running, "__wrapped__")
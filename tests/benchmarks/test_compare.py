@@ -0,0 +1,33 @@
+from benchmarks.compare import compare_results
+
+
+def make_results(**best_us: float) -> dict:
+    return {
+        "benchmarks": {
+            name: {"number": 1000, "best_us": value, "median_us": value}
+            for name, value in best_us.items()
+        }
+    }
+
+
+class TestCompareResults:
+    def test_flags_only_slowdowns_beyond_threshold(self):
+        comparisons = compare_results(
+            make_results(score=2.0, update=8.0, keyboard=20.0),
+            make_results(score=2.1, update=9.6, keyboard=10.0),
+            threshold_percent=10,
+        )
+
+        assert {item.name: item.regression for item in comparisons} == {
+            "score": False,
+            "update": True,
+            "keyboard": False,
+        }
+        assert round(comparisons[1].change_percent) == 20
+
+    def test_skips_benchmarks_missing_in_one_run(self):
+        comparisons = compare_results(
+            make_results(score=2.0), make_results(score=2.0, new=1.0)
+        )
+
+        assert [item.name for item in comparisons] == ["score"]
@@ -0,0 +1,336 @@
+import asyncio
+import itertools
+from typing import NamedTuple
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.game.const import BLACK_JACK, GameAction, GameStage
+from app.game.models import DEFAULT_NEW_BALANCE, BalanceModel, GameModel
+from app.game.replay import make_action, replay_game
+from app.game.shoe import Shoe
+from app.jobs.const import JobKind
+from app.store import Store
+from app.store.bot import const
+from app.store.database.database import QueryStats, count_queries
+from app.store.tg_api.dataclasses import SendMessage, Update
+from app.store.tg_api.router import Router
+from app.web.exceptions import TgApiTimeoutError
+from tests.const import (
+    TEST_CHAT_ID,
+    TEST_PLAYER_FIRST_NAME,
+    TEST_PLAYER_TG_ID,
+    TEST_PLAYER_VALID_USERNAME,
+)
+
+
+class QueryBudget(NamedTuple):
+    statements: int
+    checkouts: int
+
+
+# бюджеты для игры с одним игроком; если бюджет превышен, скорее всего
+# в обработчик попала ленивая подгрузка или лишний запрос в цикле
+JOIN_BUDGET = QueryBudget(statements=7, checkouts=5)
+BET_BUDGET = QueryBudget(statements=12, checkouts=7)
+HIT_BUDGET = QueryBudget(statements=9, checkouts=5)
+STAND_BUDGET = QueryBudget(statements=23, checkouts=12)
+SETTLE_BUDGET = QueryBudget(statements=19, checkouts=10)
+BALANCE_BUDGET = QueryBudget(statements=3, checkouts=3)
+
+
+def assert_within_budget(stats: QueryStats, budget: QueryBudget) -> None:
+    assert stats.statements <= budget.statements
+    assert stats.checkouts <= budget.checkouts
+    # кроме самих запросов, на каждое соединение - BEGIN и COMMIT/ROLLBACK
+    assert stats.round_trips <= stats.statements + 2 * stats.checkouts
+
+
+def make_callback_update(update_id: int, data: str) -> Update:
+    user = {
+        "id": TEST_PLAYER_TG_ID,
+        "is_bot": False,
+        "first_name": TEST_PLAYER_FIRST_NAME,
+        "username": TEST_PLAYER_VALID_USERNAME,
+    }
+    return Update.from_dict(
+        {
+            "update_id": update_id,
+            "callback_query": {
+                "id": update_id,
+                "from": user,
+                "chat_instance": str(TEST_CHAT_ID),
+                "data": data,
+                "message": {
+                    "message_id": update_id,
+                    "date": 1,
+                    "chat": {"id": TEST_CHAT_ID, "type": "group"},
+                    "from": user,
+                },
+            },
+        }
+    )
+
+
+def find_seed(store: Store) -> int:
+    """Ищет сид, при котором у игрока нет блэкджека, третья карта не дает
+    перебора, а игра без третьей карты не заканчивается ничьей - тогда
+    все пути ниже проходят одинаковое число запросов.
+    """
+    score = store.game_manager.process_score_with_aces
+    for seed in itertools.count():
+        replay = replay_game(
+            seed,
+            [make_action(GameAction.BET, 1), make_action(GameAction.HIT, 1)],
+        )
+        cards: list[str] = replay.player_cards[1]
+        if score(cards[:2]) >= BLACK_JACK or score(cards) > BLACK_JACK:
+            continue
+        settled = replay_game(
+            seed,
+            [make_action(GameAction.BET, 1), make_action(GameAction.DILLER)],
+        )
+        if score(settled.diller_cards) != score(cards[:2]):
+            return seed
+    raise AssertionError("unreachable")
+
+
+@pytest.fixture
+def sent_messages(
+    store: Store, monkeypatch: pytest.MonkeyPatch
+) -> list[SendMessage]:
+    sent: list[SendMessage] = []
+
+    async def send_message(
+        message: SendMessage, any_buttons_present: bool = False
+    ) -> None:
+        await asyncio.sleep(0)
+        sent.append(message)
+
+    monkeypatch.setattr(store.tg_api, "send_message", send_message)
+    return sent
+
+
+@pytest.fixture
+def router(
+    store: Store,
+    sent_messages: list[SendMessage],
+    monkeypatch: pytest.MonkeyPatch,
+) -> Router:
+    seed: int = find_seed(store)
+    monkeypatch.setattr(Shoe, "generate_seed", staticmethod(lambda: seed))
+    return Router(store, asyncio.Queue())
+
+
+async def start_betting(store: Store, router: Router) -> GameModel:
+    await router.handle_update(
+        make_callback_update(1, const.JOIN_GAME_CALLBACK)
+    )
+    game: GameModel = await store.games.get_active_game_by_chat_id(TEST_CHAT_ID)
+    await store.bot_manager.run_start_betting_stage_job(
+        {"chat_id": TEST_CHAT_ID, "game_id": game.id}
+    )
+    return game
+
+
+async def start_playerhit(store: Store, router: Router) -> GameModel:
+    game: GameModel = await start_betting(store, router)
+    await router.handle_update(make_callback_update(2, const.BET_10_CALLBACK))
+    return game
+
+
+async def get_stage(store: Store) -> GameStage | None:
+    game: GameModel | None = await store.games.get_active_game_by_chat_id(
+        TEST_CHAT_ID
+    )
+    return game.stage if game else None
+
+
+class TestQueryBudgets:
+    async def test_join(self, store: Store, router: Router):
+        stats = await router.handle_update(
+            make_callback_update(1, const.JOIN_GAME_CALLBACK)
+        )
+
+        assert await get_stage(store) == GameStage.WAITING_FOR_PLAYERS_TO_JOIN
+        assert_within_budget(stats, JOIN_BUDGET)
+
+    async def test_bet(self, store: Store, router: Router):
+        game: GameModel = await start_betting(store, router)
+
+        stats = await router.handle_update(
+            make_callback_update(2, const.BET_10_CALLBACK)
+        )
+
+        assert await get_stage(store) == GameStage.PLAYERHIT
+        store.timers.cancel(game.id, GameStage.PLAYERHIT)
+        assert_within_budget(stats, BET_BUDGET)
+
+    async def test_hit(self, store: Store, router: Router):
+        game: GameModel = await start_playerhit(store, router)
+
+        stats = await router.handle_update(
+            make_callback_update(3, const.TAKE_CARD_CALLBACK)
+        )
+
+        assert await get_stage(store) == GameStage.PLAYERHIT
+        store.timers.cancel(game.id, GameStage.PLAYERHIT)
+        assert_within_budget(stats, HIT_BUDGET)
+
+    async def test_stand_and_settle(
+        self, store: Store, router: Router, sent_messages: list[SendMessage]
+    ):
+        await start_playerhit(store, router)
+
+        stats = await router.handle_update(
+            make_callback_update(3, const.STOP_TAKING_CALLBACK)
+        )
+
+        assert await get_stage(store) is None
+        assert sent_messages[-1].text.startswith(
+            const.GAME_RESULTS_MESSAGE.split("{", 1)[0]
+        )
+        assert_within_budget(stats, STAND_BUDGET)
+
+    async def test_settle_by_timer(self, store: Store, router: Router):
+        game: GameModel = await start_playerhit(store, router)
+
+        with count_queries() as stats:
+            await store.bot_handler.handle_playerhit_timeout(
+                TEST_CHAT_ID, game.id
+            )
+
+        assert await get_stage(store) is None
+        assert_within_budget(stats, SETTLE_BUDGET)
+
+    async def test_balance(
+        self,
+        router: Router,
+        balance: BalanceModel,
+        sent_messages: list[SendMessage],
+    ):
+        stats = await router.handle_update(
+            make_callback_update(1, const.MY_BALANCE_CALLBACK)
+        )
+
+        assert str(balance.current_value) in sent_messages[-1].text
+        assert_within_budget(stats, BALANCE_BUDGET)
+
+
+class TestStageTransitions:
+    async def test_timer_fires_during_stand(
+        self, store: Store, router: Router, sent_messages: list[SendMessage]
+    ):
+        game: GameModel = await start_playerhit(store, router)
+
+        # отправка сообщений уступает цикл событий, так что таймер
+        # срабатывает, пока обрабатывается отказ от карт
+        await asyncio.gather(
+            router.handle_update(
+                make_callback_update(3, const.STOP_TAKING_CALLBACK)
+            ),
+            store.bot_handler.handle_playerhit_timeout(TEST_CHAT_ID, game.id),
+        )
+
+        assert await get_stage(store) is None
+        results_prefix: str = const.GAME_RESULTS_MESSAGE.split("{", 1)[0]
+        assert [
+            message
+            for message in sent_messages
+            if message.text.startswith(results_prefix)
+        ] == [sent_messages[-1]]
+        balance: BalanceModel = (
+            await store.players.get_balance_by_player_and_chat(
+                game.gameplays[0].player_id, TEST_CHAT_ID
+            )
+        )
+        assert abs(balance.current_value - DEFAULT_NEW_BALANCE) == 10
+
+    async def test_timer_fires_during_hit(
+        self,
+        store: Store,
+        router: Router,
+        sent_messages: list[SendMessage],
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        game: GameModel = await start_playerhit(store, router)
+        append_game_action = store.games.append_game_action
+
+        async def append_after_timer(*args, **kwargs) -> bool:
+            # таймер подводит итоги между раздачей карты и ее записью
+            await store.bot_handler.handle_playerhit_timeout(
+                TEST_CHAT_ID, game.id
+            )
+            return await append_game_action(*args, **kwargs)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(store.games, "append_game_action", append_after_timer)
+            await router.handle_update(
+                make_callback_update(3, const.TAKE_CARD_CALLBACK)
+            )
+
+        assert await get_stage(store) is None
+        assert sent_messages[-1].text == const.MOVE_IS_OVER_MESSAGE.format(
+            player=TEST_PLAYER_FIRST_NAME
+        )
+        finished_game: GameModel = await store.games.get_game_by_id(game.id)
+        player_id: int = game.gameplays[0].player_id
+        assert make_action(GameAction.HIT, player_id) not in (
+            finished_game.actions
+        )
+        replay = replay_game(finished_game.seed, finished_game.actions)
+        assert replay.diller_cards == finished_game.diller_cards
+
+    async def test_betting_stage_resumes_after_failed_send(
+        self,
+        store: Store,
+        router: Router,
+        sent_messages: list[SendMessage],
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        await router.handle_update(
+            make_callback_update(1, const.JOIN_GAME_CALLBACK)
+        )
+        game: GameModel = await store.games.get_active_game_by_chat_id(
+            TEST_CHAT_ID
+        )
+        payload = {"chat_id": TEST_CHAT_ID, "game_id": game.id}
+
+        async def send_message(
+            message: SendMessage, any_buttons_present: bool = False
+        ) -> None:
+            await asyncio.sleep(0)
+            raise TgApiTimeoutError("sendMessage")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(store.tg_api, "send_message", send_message)
+            with pytest.raises(TgApiTimeoutError):
+                await store.bot_manager.run_start_betting_stage_job(payload)
+        # повтор задачи продолжает со стадии ставок, которую начала первая
+        # попытка, и не оставляет лишних таймеров ставок
+        await store.bot_manager.run_start_betting_stage_job(payload)
+
+        assert await get_stage(store) == GameStage.BETTING
+        assert sent_messages[-1].text.startswith(
+            const.END_WAITING_STAGE_TIMER_MESSAGE.split("{", 1)[0]
+        )
+        assert (
+            await store.job_worker.cancel(
+                JobKind.CANCEL_GAME_DUE_TO_TIMER, game_id=game.id
+            )
+            == 1
+        )
+
+
+class TestLazyLoads:
+    async def test_gameplays_are_not_loaded_lazily(
+        self,
+        db_sessionmaker: async_sessionmaker[AsyncSession],
+        game: GameModel,
+    ):
+        async with db_sessionmaker() as session:
+            loaded_game: GameModel = await session.get(GameModel, game.id)
+
+            with pytest.raises(InvalidRequestError, match="raise_on_sql"):
+                _ = loaded_game.gameplays
@@ -0,0 +1,84 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app.store import Store
+from app.store.bot import const
+from app.store.tg_api.dataclasses import BotContext, CallbackQuery, SendMessage
+from app.store.tg_api.router import Router
+from app.web.app import Application
+from app.web.config import (
+    AdminConfig,
+    Config,
+    StorageBackend,
+    StorageConfig,
+)
+from tests.bot.test_query_budgets import make_callback_update
+from tests.const import TEST_PLAYER_FIRST_NAME
+
+
+@pytest.fixture
+async def memory_store() -> AsyncGenerator[Store]:
+    app = Application()
+    app.config = Config(
+        admin=AdminConfig(email="admin@admin.com", password="admin"),
+        storage=StorageConfig(backend=StorageBackend.MEMORY),
+    )
+    app.store = Store(app)
+    yield app.store
+    await app.store.gameplay_writes.disconnect(app)
+
+
+class TestRouter:
+    async def test_failed_handler_does_not_stop_routing(
+        self, memory_store: Store, monkeypatch: pytest.MonkeyPatch
+    ):
+        sent: list[SendMessage] = []
+
+        async def send_message(
+            message: SendMessage, any_buttons_present: bool = False
+        ) -> None:
+            await asyncio.sleep(0)
+            sent.append(message)
+
+        handle_my_balance_query = (
+            memory_store.bot_handler.handle_my_balance_query
+        )
+
+        async def fail_once(query: CallbackQuery, context: BotContext) -> None:
+            await asyncio.sleep(0)
+            # как ленивая подгрузка связи, которую забыли подгрузить заранее
+            monkeypatch.setattr(
+                memory_store.bot_handler,
+                "handle_my_balance_query",
+                handle_my_balance_query,
+            )
+            raise InvalidRequestError("'GameModel.gameplays' is raise_on_sql")
+
+        monkeypatch.setattr(memory_store.tg_api, "send_message", send_message)
+        monkeypatch.setattr(
+            memory_store.bot_handler, "handle_my_balance_query", fail_once
+        )
+        queue: asyncio.Queue = asyncio.Queue()
+        router = Router(memory_store, queue)
+        router_task = asyncio.create_task(router.route_update())
+        for update_id in (1, 2):
+            queue.put_nowait(
+                make_callback_update(update_id, const.MY_BALANCE_CALLBACK)
+            )
+        await asyncio.wait_for(queue.join(), 1)
+
+        assert not router_task.done()
+        # второй update обработан, хотя обработчик первого упал
+        assert [message.text for message in sent] == [
+            const.NO_BALANCE_MESSAGE.format(username=TEST_PLAYER_FIRST_NAME)
+        ]
+        assert memory_store.metrics.update_errors.values == {
+            ("InvalidRequestError",): 1
+        }
+
+        router_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await router_task
@@ -0,0 +1,101 @@
+import asyncio
+
+from app.game.const import GameStage
+from app.store.bot.scheduler import StageTimerScheduler
+from app.web.app import Application
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_scheduler() -> tuple[StageTimerScheduler, FakeClock]:
+    clock = FakeClock()
+    return StageTimerScheduler(Application(), clock=clock), clock
+
+
+class TestStageTimerScheduler:
+    async def test_due_timers_fire_in_one_batch(self):
+        scheduler, clock = make_scheduler()
+        fired: list[int] = []
+
+        async def callback(game_id: int) -> None:
+            await asyncio.sleep(0)
+            fired.append(game_id)
+
+        for game_id in range(1000):
+            scheduler.schedule(
+                game_id,
+                GameStage.BETTING,
+                10.01 + game_id % 2 * 0.04,
+                lambda game_id=game_id: callback(game_id),
+            )
+        scheduler.schedule(1000, GameStage.BETTING, 20, lambda: callback(1000))
+
+        clock.now = 10.2
+        assert scheduler.fire_due_timers() == 1000
+        await asyncio.sleep(0)
+        await asyncio.gather(*scheduler._batch_tasks)
+
+        stats = scheduler.get_stats()
+        assert sorted(fired) == list(range(1000))
+        assert stats.batches == 1
+        assert stats.max_batch_size == 1000
+        assert stats.pending == 1
+        await scheduler.disconnect(scheduler.app)
+
+    async def test_cancel_and_reschedule(self):
+        scheduler, clock = make_scheduler()
+        fired: list[str] = []
+
+        async def callback(name: str) -> None:
+            await asyncio.sleep(0)
+            fired.append(name)
+
+        scheduler.schedule(1, GameStage.BETTING, 5, lambda: callback("old"))
+        scheduler.schedule(1, GameStage.BETTING, 15, lambda: callback("new"))
+        scheduler.schedule(2, GameStage.PLAYERHIT, 5, lambda: callback("2"))
+        assert scheduler.cancel(2, GameStage.PLAYERHIT)
+        assert not scheduler.cancel(2, GameStage.PLAYERHIT)
+
+        clock.now = 10
+        assert scheduler.fire_due_timers() == 0
+        clock.now = 15
+        assert scheduler.fire_due_timers() == 1
+        await asyncio.gather(*scheduler._batch_tasks)
+
+        stats = scheduler.get_stats()
+        assert fired == ["new"]
+        assert (stats.scheduled, stats.rescheduled, stats.cancelled) == (
+            2,
+            1,
+            1,
+        )
+        assert stats.pending == 0
+        await scheduler.disconnect(scheduler.app)
+
+    async def test_failed_timer_does_not_stop_batch(self):
+        scheduler, clock = make_scheduler()
+        fired: list[int] = []
+
+        async def failing() -> None:
+            await asyncio.sleep(0)
+            raise ValueError
+
+        async def callback() -> None:
+            await asyncio.sleep(0)
+            fired.append(1)
+
+        scheduler.schedule(1, GameStage.BETTING, 1, failing)
+        scheduler.schedule(2, GameStage.BETTING, 1, callback)
+        clock.now = 1
+        scheduler.fire_due_timers()
+        await asyncio.gather(*scheduler._batch_tasks)
+
+        assert fired == [1]
+        assert scheduler.get_stats().failed == 1
+        await scheduler.disconnect(scheduler.app)
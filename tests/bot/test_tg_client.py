@@ -0,0 +1,181 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+from aiohttp import web
+from aiohttp.pytest_plugin import AiohttpServer
+
+from app.store import Store
+from app.store.tg_api.accessor import TgApiAccessor
+from app.store.tg_api.dataclasses import SendMessage
+from app.web.app import Application
+from app.web.config import (
+    AdminConfig,
+    BotConfig,
+    Config,
+    StorageBackend,
+    StorageConfig,
+)
+from app.web.exceptions import (
+    TgApiError,
+    TgApiRetriesExhaustedError,
+    TgApiTimeoutError,
+)
+
+TEST_SEND_TIMEOUT = 0.2
+TEST_RETRY_ATTEMPTS = 3
+TEST_SEND_RETRY_BUDGET = 1
+TEST_MESSAGE = SendMessage(chat_id=1, text="hi")
+
+
+def ok_response() -> web.Response:
+    return web.json_response({"ok": True, "result": {}})
+
+
+def error_response(error_code: int, **parameters: int) -> web.Response:
+    return web.json_response(
+        {
+            "ok": False,
+            "error_code": error_code,
+            "description": "error",
+            "parameters": parameters,
+        },
+        status=error_code,
+    )
+
+
+class BotApiStub:
+    """Bot API, который отвечает на getMe, а на sendMessage - заданными
+    ответами по очереди и зависает, когда они кончились.
+    """
+
+    def __init__(self) -> None:
+        self.responses: list[web.Response] = []
+        self.send_message_requests = 0
+
+    async def get_me(self, request: web.Request) -> web.Response:
+        return web.json_response({"ok": True, "result": {"id": 1}})
+
+    async def send_message(self, request: web.Request) -> web.Response:
+        self.send_message_requests += 1
+        if self.responses:
+            return self.responses.pop(0)
+        await asyncio.sleep(TEST_SEND_TIMEOUT * 10)
+        return ok_response()
+
+
+@pytest.fixture
+def bot_api_stub() -> BotApiStub:
+    return BotApiStub()
+
+
+@pytest.fixture
+async def tg_api(
+    aiohttp_server: AiohttpServer, bot_api_stub: BotApiStub
+) -> AsyncGenerator[TgApiAccessor]:
+    stub = bot_api_stub
+    bot_api = web.Application()
+    bot_api.router.add_get("/bottest/getMe", stub.get_me)
+    bot_api.router.add_get("/bottest/sendMessage", stub.send_message)
+    server = await aiohttp_server(bot_api)
+
+    app = Application()
+    app.config = Config(
+        admin=AdminConfig(email="admin@admin.com", password="admin"),
+        bot=BotConfig(
+            token="test",
+            send_timeout=TEST_SEND_TIMEOUT,
+            retry_attempts=TEST_RETRY_ATTEMPTS,
+            retry_base_delay=0.01,
+            send_retry_budget=TEST_SEND_RETRY_BUDGET,
+        ),
+        storage=StorageConfig(backend=StorageBackend.MEMORY),
+    )
+    app.store = Store(app)
+    tg_api = app.store.tg_api
+    tg_api.api_path = str(server.make_url("/bottest/"))
+    tg_api.session = tg_api.create_session()
+    yield tg_api
+    await tg_api.session.close()
+
+
+class TestTgApiClient:
+    async def test_keep_alive_connection_is_reused(self, tg_api: TgApiAccessor):
+        await tg_api.warm_up()
+        assert (await tg_api.get_me())["id"] == 1
+
+        metrics = tg_api.app.store.metrics
+        # warm_up открывает два соединения, третий запрос идет по готовому
+        assert metrics.telegram_connections.values == {
+            ("getMe", "false"): 2,
+            ("getMe", "true"): 1,
+        }
+        assert metrics.telegram_ttfb.labels("getMe").count == 3
+
+    async def test_hung_request_fails_fast(self, tg_api: TgApiAccessor):
+        with pytest.raises(TgApiTimeoutError):
+            await asyncio.wait_for(
+                tg_api._request("sendMessage", {"chat_id": 1, "text": "hi"}),
+                TEST_SEND_TIMEOUT * 5,
+            )
+        timeouts = tg_api.app.store.metrics.telegram_timeouts.values
+        assert timeouts == {("sendMessage",): 1}
+
+    async def test_transient_errors_are_retried(
+        self, tg_api: TgApiAccessor, bot_api_stub: BotApiStub
+    ):
+        bot_api_stub.responses = [
+            error_response(429, retry_after=0),
+            web.Response(status=502, text="Bad Gateway"),
+            ok_response(),
+        ]
+        await tg_api.send_message(TEST_MESSAGE)
+
+        assert bot_api_stub.send_message_requests == 3
+        assert tg_api.app.store.metrics.telegram_retries.values == {
+            ("sendMessage", "throttled"): 1,
+            ("sendMessage", "server_error"): 1,
+        }
+
+    async def test_permanent_error_is_not_retried(
+        self, tg_api: TgApiAccessor, bot_api_stub: BotApiStub
+    ):
+        bot_api_stub.responses = [error_response(403), ok_response()]
+        with pytest.raises(TgApiError) as exc_info:
+            await tg_api.send_message(TEST_MESSAGE)
+
+        assert exc_info.value.error_code == 403
+        assert bot_api_stub.send_message_requests == 1
+        assert tg_api.app.store.metrics.telegram_give_ups.values == {
+            ("sendMessage", "client_error"): 1
+        }
+
+    async def test_retries_are_bounded(
+        self, tg_api: TgApiAccessor, bot_api_stub: BotApiStub
+    ):
+        bot_api_stub.responses = [
+            error_response(500) for _ in range(TEST_RETRY_ATTEMPTS + 1)
+        ]
+        with pytest.raises(TgApiRetriesExhaustedError) as exc_info:
+            await tg_api.send_message(TEST_MESSAGE)
+
+        assert exc_info.value.attempts == TEST_RETRY_ATTEMPTS
+        assert bot_api_stub.send_message_requests == TEST_RETRY_ATTEMPTS
+        assert tg_api.app.store.metrics.telegram_give_ups.values == {
+            ("sendMessage", "server_error"): 1
+        }
+
+    async def test_send_message_does_not_wait_past_budget(
+        self, tg_api: TgApiAccessor, bot_api_stub: BotApiStub
+    ):
+        bot_api_stub.responses = [
+            error_response(429, retry_after=TEST_SEND_RETRY_BUDGET * 10),
+            ok_response(),
+        ]
+        with pytest.raises(TgApiRetriesExhaustedError) as exc_info:
+            await asyncio.wait_for(
+                tg_api.send_message(TEST_MESSAGE), TEST_SEND_RETRY_BUDGET
+            )
+
+        assert exc_info.value.attempts == 1
+        assert bot_api_stub.send_message_requests == 1
@@ -71,13 +71,18 @@ async def clear_db(application: Application) -> AsyncGenerator[None]:
     finally:
         session = AsyncSession(application.database.engine)
         connection = session.connection()
-        for table in application.database._db.metadata.tables:
+        tables = application.database._db.metadata.tables
+        for table, columns in tables.items():
             await session.execute(text(f"TRUNCATE {table} CASCADE"))
-            await session.execute(
-                text(f"ALTER SEQUENCE {table}_id_seq RESTART WITH 1")
-            )
+            if "id" in columns.c:
+                await session.execute(
+                    text(f"ALTER SEQUENCE {table}_id_seq RESTART WITH 1")
+                )
 
         await session.commit()
+        # таблицы очищены в обход аксессоров: сбрасываем состояние в памяти
+        application.response_cache.clear()
+        application.store.leaderboard.clear()
         connection.close()
 
 
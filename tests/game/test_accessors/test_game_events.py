@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.game.const import GameEventType
+from app.game.models import GameModel
+from app.store import Store
+from tests.const import TEST_CHAT_ID
+
+MISSING_GAME_ID = 0
+
+
+class TestGameEventAccessor:
+    async def test_events_are_written_in_one_flush(
+        self, store: Store, game: GameModel
+    ):
+        store.game_events.emit(game.id, TEST_CHAT_ID, GameEventType.CREATE)
+        store.game_events.emit(
+            game.id, TEST_CHAT_ID, GameEventType.STAGE, stage="betting"
+        )
+
+        assert await store.game_events.flush() == 2
+        assert await store.game_events.flush() == 0
+
+        events = await store.game_events.list_game_events(game.id)
+        assert [event.type for event in events] == [
+            GameEventType.CREATE,
+            GameEventType.STAGE,
+        ]
+        assert events[1].data == {"stage": "betting"}
+        assert store.game_events.get_stats().buffered == 0
+
+    async def test_failing_event_is_dropped_after_retries(
+        self, store: Store, game: GameModel, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(store.game_events, "max_failed_flushes", 2)
+        dropped: int = store.game_events.stats.dropped
+        store.game_events.emit(
+            MISSING_GAME_ID, TEST_CHAT_ID, GameEventType.CREATE
+        )
+        store.game_events.emit(game.id, TEST_CHAT_ID, GameEventType.CREATE)
+
+        # событие несуществующей игры валит весь INSERT
+        with pytest.raises(IntegrityError):
+            await store.game_events.flush()
+        assert store.game_events.get_stats().buffered == 2
+
+        assert await store.game_events.flush() == 1
+        assert store.game_events.stats.dropped == dropped + 1
+        assert store.game_events.get_stats().buffered == 0
+        events = await store.game_events.list_game_events(game.id)
+        assert [event.type for event in events] == [GameEventType.CREATE]
+
+    async def test_full_buffer_drops_new_events(
+        self, store: Store, game: GameModel, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(store.game_events, "max_buffered", 2)
+        dropped: int = store.game_events.stats.dropped
+        for _ in range(3):
+            store.game_events.emit(game.id, TEST_CHAT_ID, GameEventType.CREATE)
+
+        assert store.game_events.stats.dropped == dropped + 1
+        assert await store.game_events.flush() == 2
@@ -0,0 +1,32 @@
+from app.game.models import BalanceModel, PlayerModel
+from app.store import Store
+from tests.const import TEST_CHAT_ID
+
+
+class TestLeaderboardAccessor:
+    async def test_top_is_updated_without_reload(
+        self, store: Store, player: PlayerModel, balance: BalanceModel
+    ):
+        loads: int = store.leaderboard.loads
+        top = await store.leaderboard.get_top(TEST_CHAT_ID)
+        assert [entry.current_value for entry in top] == [balance.current_value]
+        assert top[0].player.id == player.id
+        assert store.leaderboard.loads == loads + 1
+
+        await store.players.change_balance_current_value(
+            player.id, TEST_CHAT_ID, 1500
+        )
+        top = await store.leaderboard.get_top(TEST_CHAT_ID)
+        assert top[0].current_value == 1500
+        assert store.leaderboard.loads == loads + 1
+
+    async def test_overall_top(
+        self, store: Store, player: PlayerModel, balance: BalanceModel
+    ):
+        await store.players.create_player_balance(TEST_CHAT_ID - 1, player.id)
+
+        top = await store.leaderboard.get_top()
+        assert {entry.chat_id for entry in top} == {
+            TEST_CHAT_ID,
+            TEST_CHAT_ID - 1,
+        }
@@ -0,0 +1,249 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.game.const import NO_BET, GameAction, GameStage, GameStatus
+from app.game.models import DEFAULT_NEW_BALANCE, GameModel, PlayerModel
+from app.game.replay import make_action
+from app.game.shoe import Shoe
+from app.jobs.const import JobKind
+from app.store import Store
+from app.store.bot import const
+from app.store.memory.accessor import MemoryGameAccessor, MemoryPlayerAccessor
+from app.store.memory.storage import utc_now
+from app.store.tg_api.dataclasses import SendMessage
+from app.store.tg_api.router import Router
+from app.web.app import Application
+from app.web.config import (
+    AdminConfig,
+    Config,
+    StorageBackend,
+    StorageConfig,
+)
+from tests.bot.test_query_budgets import find_seed, make_callback_update
+from tests.const import *
+
+
+@pytest.fixture
+async def memory_store() -> AsyncGenerator[Store]:
+    app = Application()
+    app.config = Config(
+        admin=AdminConfig(email="admin@admin.com", password="admin"),
+        storage=StorageConfig(backend=StorageBackend.MEMORY),
+    )
+    app.store = Store(app)
+    yield app.store
+    await app.store.gameplay_writes.disconnect(app)
+
+
+@pytest.fixture
+async def memory_player(memory_store: Store) -> PlayerModel:
+    return await memory_store.player_manager.get_player(
+        TEST_PLAYER_TG_ID,
+        TEST_PLAYER_VALID_USERNAME,
+        TEST_PLAYER_FIRST_NAME,
+        TEST_CHAT_ID,
+    )
+
+
+class TestMemoryStorage:
+    async def test_backend_is_selected_by_config(self, memory_store: Store):
+        assert isinstance(memory_store.players, MemoryPlayerAccessor)
+        assert isinstance(memory_store.games, MemoryGameAccessor)
+        assert memory_store.memory is not None
+
+    async def test_player_with_balance(
+        self, memory_store: Store, memory_player: PlayerModel
+    ):
+        assert memory_player.id == 1
+        balance = await memory_store.players.get_balance_by_player_and_chat(
+            memory_player.id, TEST_CHAT_ID
+        )
+        assert balance.current_value == DEFAULT_NEW_BALANCE
+
+        await memory_store.player_manager.change_player_balance(
+            memory_player.id, TEST_CHAT_ID, -100
+        )
+        page = await memory_store.players.list_balances(chat_id=TEST_CHAT_ID)
+        assert [item.current_value for item in page.items] == [900]
+
+    async def test_unique_constraints(
+        self, memory_store: Store, memory_player: PlayerModel
+    ):
+        with pytest.raises(IntegrityError):
+            await memory_store.players.create_player(
+                username=TEST_PLAYER_VALID_USERNAME,
+                tg_id=TEST_PLAYER_TG_ID + 1,
+                first_name=TEST_PLAYER_FIRST_NAME,
+            )
+        with pytest.raises(IntegrityError):
+            await memory_store.players.create_player_balance(
+                TEST_CHAT_ID, memory_player.id
+            )
+        # как в Postgres, NULL в уникальной колонке не конфликтует
+        for tg_id in (TEST_PLAYER_TG_ID + 1, TEST_PLAYER_TG_ID + 2):
+            await memory_store.players.create_player(
+                username=None, tg_id=tg_id, first_name=TEST_PLAYER_FIRST_NAME
+            )
+
+        page = await memory_store.players.list_players(username="TEST_")
+        assert [player.id for player in page.items] == [memory_player.id]
+        page = await memory_store.players.list_players(limit=2)
+        assert len(page.items) == 2
+        assert page.next_cursor is not None
+
+    async def test_game_round_trip(
+        self, memory_store: Store, memory_player: PlayerModel
+    ):
+        game: GameModel = await memory_store.game_manager.get_game(TEST_CHAT_ID)
+        assert (await memory_store.game_manager.get_game(TEST_CHAT_ID)).id == (
+            game.id
+        )
+        assert game.status == GameStatus.ACTIVE
+        assert game.actions == []
+
+        join = memory_store.gameplay_writes.join_game(game.id, memory_player.id)
+        assert await memory_store.gameplay_writes.flush() == 1
+        created, gameplay = await join
+        assert created
+        assert gameplay.player_bet == NO_BET
+
+        game = await memory_store.games.change_active_game_stage(
+            TEST_CHAT_ID, GameStage.BETTING
+        )
+        assert game.gameplays[0].player.tg_id == TEST_PLAYER_TG_ID
+        assert not await memory_store.games.check_all_players_have_bet(game.id)
+
+        memory_store.gameplay_writes.update_gameplay(
+            gameplay.id, {"player_bet": 25}
+        )
+        await memory_store.gameplay_writes.flush()
+        await memory_store.games.append_game_action(
+            game.id, make_action(GameAction.BET, memory_player.id)
+        )
+        assert await memory_store.games.check_all_players_have_bet(game.id)
+        game = await memory_store.games.get_active_game_by_chat_id(TEST_CHAT_ID)
+        assert game.actions == [make_action(GameAction.BET, memory_player.id)]
+
+        # изменение экземпляра не меняет хранилище
+        game.actions.append(make_action(GameAction.STAND, memory_player.id))
+        assert (
+            len((await memory_store.games.get_game_by_id(game.id)).actions) == 1
+        )
+
+        assert await memory_store.games.finish_game(game.id, TEST_CHAT_ID, [])
+        assert not await memory_store.games.finish_game(
+            game.id, TEST_CHAT_ID, []
+        )
+        assert not await memory_store.games.get_active_game_by_chat_id(
+            TEST_CHAT_ID
+        )
+
+    async def test_existing_game_is_got_without_new_shoe(
+        self, memory_store: Store, monkeypatch: pytest.MonkeyPatch
+    ):
+        seeds: list[int] = []
+
+        def generate_seed() -> int:
+            seeds.append(len(seeds))
+            return seeds[-1]
+
+        monkeypatch.setattr(Shoe, "generate_seed", staticmethod(generate_seed))
+        game: GameModel = await memory_store.game_manager.get_game(TEST_CHAT_ID)
+        assert (await memory_store.game_manager.get_game(TEST_CHAT_ID)).id == (
+            game.id
+        )
+
+        assert seeds == [game.seed]
+        assert game.diller_cards == [Shoe(game.seed).draw()]
+
+    async def test_game_without_seed_gets_one(self, memory_store: Store):
+        game: GameModel = await memory_store.games.create_game(
+            TEST_CHAT_ID, diller_cards=[], gameplays=[]
+        )
+        assert game.seed is not None
+
+        game = await memory_store.games.get_active_game_by_chat_id(TEST_CHAT_ID)
+        assert game.diller_cards == [Shoe(game.seed).draw()]
+        assert game.shoe.position == 1
+
+    async def test_check_constraint(
+        self, memory_store: Store, memory_player: PlayerModel
+    ):
+        game: GameModel = await memory_store.game_manager.get_game(TEST_CHAT_ID)
+        gameplay = await memory_store.gameplays.create_gameplay(
+            game.id, memory_player.id
+        )
+
+        with pytest.raises(IntegrityError):
+            await memory_store.gameplays.change_gameplay_fields(
+                gameplay.id, {"player_bet": 0}
+            )
+        with pytest.raises(IntegrityError):
+            await memory_store.gameplays.create_gameplay(
+                game.id + 1, memory_player.id
+            )
+
+    async def test_full_game_without_database(
+        self, memory_store: Store, monkeypatch: pytest.MonkeyPatch
+    ):
+        sent: list[SendMessage] = []
+
+        async def send_message(
+            message: SendMessage, any_buttons_present: bool = False
+        ) -> None:
+            await asyncio.sleep(0)
+            sent.append(message)
+
+        monkeypatch.setattr(memory_store.tg_api, "send_message", send_message)
+        seed: int = find_seed(memory_store)
+        monkeypatch.setattr(Shoe, "generate_seed", staticmethod(lambda: seed))
+        router = Router(memory_store, asyncio.Queue())
+
+        await router.handle_update(
+            make_callback_update(1, const.JOIN_GAME_CALLBACK)
+        )
+        game: GameModel = await memory_store.games.get_active_game_by_chat_id(
+            TEST_CHAT_ID
+        )
+        # стадию ставок запускает задача из очереди: торопим ее
+        [job_row] = memory_store.memory.jobs.select(
+            kind=JobKind.START_BETTING_STAGE
+        )
+        memory_store.memory.jobs.update(job_row["id"], {"run_at": utc_now()})
+        assert await memory_store.job_worker.run_once() == 1
+        assert memory_store.job_worker.stats.completed == 1
+
+        await router.handle_update(
+            make_callback_update(2, const.BET_10_CALLBACK)
+        )
+        await router.handle_update(
+            make_callback_update(3, const.STOP_TAKING_CALLBACK)
+        )
+
+        finished_game = await memory_store.games.get_game_by_id(game.id)
+        assert finished_game.status == GameStatus.FINISHED
+        # задача отмены игры по таймеру снята, когда все сделали ставки
+        assert (await memory_store.jobs.count_jobs())["pending"] == 0
+
+        player_stats = await memory_store.stats.get_player_stats(
+            finished_game.gameplays[0].player_id, TEST_CHAT_ID
+        )
+        assert player_stats.games == 1
+        assert (
+            await memory_store.stats.get_chat_stats(TEST_CHAT_ID)
+        ).games == 1
+
+        assert await memory_store.game_events.flush() > 0
+        events = await memory_store.game_events.list_game_events(game.id)
+        assert {event.game_id for event in events} == {game.id}
+
+        [entry] = await memory_store.leaderboard.get_top(TEST_CHAT_ID)
+        assert entry.player.tg_id == TEST_PLAYER_TG_ID
+        assert entry.current_value != DEFAULT_NEW_BALANCE
+        assert any(
+            message.text.startswith(const.GAME_RESULTS_MESSAGE.split("{")[0])
+            for message in sent
+        )
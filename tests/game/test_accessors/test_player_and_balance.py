@@ -24,11 +24,35 @@ class TestPlayerAccessor:
         assert new_player.tg_id == TEST_PLAYER_TG_ID
 
     async def test_list_players(self, store: Store, player: PlayerModel):
-        player_list: Iterable[PlayerModel] = await store.players.list_players()
+        player_list: Iterable[PlayerModel] = (
+            await store.players.list_players()
+        ).items
 
         assert isinstance(player_list, Iterable)
         assert players_to_list(player_list)[0] == player_to_dict(player)
 
+    async def test_search_players(self, store: Store, player: PlayerModel):
+        other_player: PlayerModel = await store.players.create_player(
+            username="other_player",
+            tg_id=TEST_PLAYER_TG_ID + 1,
+            first_name="Other",
+        )
+
+        page = await store.players.list_players(
+            username=TEST_PLAYER_VALID_USERNAME[:3].upper()
+        )
+        assert [found.id for found in page.items] == [player.id]
+        page = await store.players.list_players(username="other_")
+        assert [found.id for found in page.items] == [other_player.id]
+        page = await store.players.list_players(first_name="THE")
+        assert [found.id for found in page.items] == [other_player.id]
+
+        page = await store.players.list_players(limit=1)
+        assert [found.id for found in page.items] == [player.id]
+        page = await store.players.list_players(after=player.id)
+        assert [found.id for found in page.items] == [other_player.id]
+        assert page.next_cursor is None
+
     async def test_get_player_by_id(self, store: Store, player: PlayerModel):
         player_found: PlayerModel = await store.players.get_player_by_id(
             player.id
@@ -60,9 +84,9 @@ class TestBalanceAccessor:
         assert new_balance.current_value == DEFAULT_NEW_BALANCE
 
     async def test_list_balances(self, store: Store, balance: BalanceModel):
-        balance_list: Iterable[
-            BalanceModel
-        ] = await store.players.list_balances()
+        balance_list: Iterable[BalanceModel] = (
+            await store.players.list_balances()
+        ).items
 
         assert isinstance(balance_list, Iterable)
         assert balances_to_list(balance_list)[0] == balance_to_dict(balance)
@@ -0,0 +1,43 @@
+from app.game.const import GameStage, GameStatus, PlayerStatus
+from app.game.models import GameModel, PlayerModel
+from app.game.stats import PlayerResult
+from app.store import Store
+from tests.const import TEST_CHAT_ID
+
+TEST_BET = 25
+
+
+class TestStatsAccessor:
+    async def test_finish_game_updates_stats_once(
+        self, store: Store, game: GameModel, player: PlayerModel
+    ):
+        results = [
+            PlayerResult(player.id, PlayerStatus.WON, TEST_BET, black_jack=True)
+        ]
+
+        finished = await store.games.finish_game(game.id, TEST_CHAT_ID, results)
+        assert finished.status == GameStatus.FINISHED
+        assert not await store.games.finish_game(game.id, TEST_CHAT_ID, results)
+
+        player_stats = await store.stats.get_player_stats(
+            player.id, TEST_CHAT_ID
+        )
+        assert (player_stats.games, player_stats.wins) == (1, 1)
+        assert player_stats.black_jacks == 1
+        assert (player_stats.wagered, player_stats.net) == (TEST_BET, TEST_BET)
+
+        chat_stats = await store.stats.get_chat_stats(TEST_CHAT_ID)
+        assert (chat_stats.games, chat_stats.players) == (1, 1)
+        [day_stats] = await store.stats.list_chat_day_stats(TEST_CHAT_ID)
+        assert day_stats.games == 1
+
+    async def test_cancel_game_updates_chat_stats(
+        self, store: Store, game: GameModel
+    ):
+        await store.games.change_game_fields(
+            game.id, {"stage": GameStage.BETTING}
+        )
+        assert await store.games.cancel_active_game_due_to_timer(game.id)
+
+        chat_stats = await store.stats.get_chat_stats(TEST_CHAT_ID)
+        assert (chat_stats.games, chat_stats.cancels) == (0, 1)
@@ -0,0 +1,47 @@
+import asyncio
+
+from app.game.const import NO_BET, PlayerStatus
+from app.game.models import GameModel, GamePlayModel, PlayerModel
+from app.store import Store
+
+
+class TestGamePlayWriteBuffer:
+    async def test_join_and_update_in_one_batch(
+        self, store: Store, game: GameModel, player: PlayerModel
+    ):
+        first_join = store.gameplay_writes.join_game(game.id, player.id)
+        second_join = store.gameplay_writes.join_game(game.id, player.id)
+
+        assert await store.gameplay_writes.flush() == 1
+        created, gameplay = await first_join
+        assert created
+        assert gameplay.player_bet == NO_BET
+        assert await second_join == (created, gameplay)
+
+        store.gameplay_writes.update_gameplay(gameplay.id, {"player_bet": 25})
+        committed = store.gameplay_writes.update_gameplay(
+            gameplay.id, {"player_status": PlayerStatus.TAKING}
+        )
+        assert await store.gameplay_writes.flush() == 1
+        await committed
+
+        updated: GamePlayModel = (
+            await store.gameplays.get_gameplay_by_game_and_player(
+                game.id, player.id
+            )
+        )
+        assert updated.player_bet == 25
+        assert updated.player_status == PlayerStatus.TAKING
+        assert store.gameplay_writes.batch_size.count == 2
+
+    async def test_existing_gameplay_is_not_created(
+        self, store: Store, game: GameModel, player: PlayerModel
+    ):
+        await store.gameplays.create_gameplay(game.id, player.id)
+
+        join = store.gameplay_writes.join_game(game.id, player.id)
+        await asyncio.wait_for(join, timeout=1)
+
+        created, gameplay = join.result()
+        assert not created
+        assert gameplay.player_id == player.id
@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Any
+
+from app.game.const import (
+    GameEventType,
+    GameStage,
+    GameStatus,
+    PlayerStatus,
+)
+from app.game.events import rebuild_game
+from app.game.models import GameEventModel
+from app.game.replay import replay_game
+
+TEST_SEED = 42
+TEST_GAME_ID, TEST_CHAT_ID = 7, -100
+FIRST_PLAYER_ID, SECOND_PLAYER_ID = 1, 2
+
+
+def make_event(
+    event_type: GameEventType, player_id: int | None = None, **data: Any
+) -> GameEventModel:
+    return GameEventModel(
+        game_id=TEST_GAME_ID,
+        chat_id=TEST_CHAT_ID,
+        player_id=player_id,
+        type=event_type,
+        data=data,
+        created_at=datetime(2026, 10, 19),
+    )
+
+
+class TestRebuildGame:
+    def test_rebuild_finished_game(self):
+        events = [
+            make_event(GameEventType.CREATE, seed=TEST_SEED),
+            make_event(GameEventType.JOIN, FIRST_PLAYER_ID),
+            make_event(GameEventType.JOIN, SECOND_PLAYER_ID),
+            make_event(GameEventType.STAGE, stage=GameStage.BETTING),
+            make_event(
+                GameEventType.BET,
+                FIRST_PLAYER_ID,
+                bet=25,
+                status=PlayerStatus.TAKING,
+            ),
+            make_event(
+                GameEventType.BET,
+                SECOND_PLAYER_ID,
+                bet=10,
+                status=PlayerStatus.TAKING,
+            ),
+            make_event(GameEventType.STAGE, stage=GameStage.PLAYERHIT),
+            make_event(
+                GameEventType.HIT, FIRST_PLAYER_ID, status=PlayerStatus.TAKING
+            ),
+            make_event(GameEventType.STAND, FIRST_PLAYER_ID),
+            make_event(GameEventType.STAND, SECOND_PLAYER_ID),
+            make_event(GameEventType.STAGE, stage=GameStage.DILLERHIT),
+            make_event(GameEventType.DILLER, score=18),
+            make_event(GameEventType.STAGE, stage=GameStage.SUMMARIZING),
+            make_event(
+                GameEventType.SETTLE,
+                FIRST_PLAYER_ID,
+                status=PlayerStatus.WON,
+                balance_change=25,
+            ),
+            make_event(
+                GameEventType.SETTLE,
+                SECOND_PLAYER_ID,
+                status=PlayerStatus.LOST,
+                balance_change=-10,
+            ),
+            make_event(GameEventType.FINISH),
+        ]
+
+        game = rebuild_game(events)
+
+        assert (game.id, game.chat_id, game.seed) == (
+            TEST_GAME_ID,
+            TEST_CHAT_ID,
+            TEST_SEED,
+        )
+        assert game.status == GameStatus.FINISHED
+        assert game.stage == GameStage.SUMMARIZING
+        assert game.actions == ["b:1", "b:2", "h:1", "s:1", "s:2", "d"]
+
+        replay = replay_game(TEST_SEED, game.actions)
+        assert game.diller_cards == replay.diller_cards
+        assert [
+            (
+                gameplay.player_id,
+                gameplay.player_bet,
+                gameplay.player_status,
+                gameplay.player_cards,
+            )
+            for gameplay in game.gameplays
+        ] == [
+            (
+                FIRST_PLAYER_ID,
+                25,
+                PlayerStatus.WON,
+                replay.player_cards[FIRST_PLAYER_ID],
+            ),
+            (
+                SECOND_PLAYER_ID,
+                10,
+                PlayerStatus.LOST,
+                replay.player_cards[SECOND_PLAYER_ID],
+            ),
+        ]
+
+    def test_rebuild_cancelled_game(self):
+        game = rebuild_game(
+            [
+                make_event(GameEventType.CREATE, seed=TEST_SEED),
+                make_event(GameEventType.JOIN, FIRST_PLAYER_ID),
+                make_event(GameEventType.STAGE, stage=GameStage.BETTING),
+                make_event(GameEventType.CANCEL),
+            ]
+        )
+
+        assert game.status == GameStatus.CANCELED
+        assert game.stage == GameStage.BETTING
+        assert game.gameplays[0].player_status == PlayerStatus.BETTING
+        assert game.gameplays[0].player_cards is None
+
+    def test_no_create_event(self):
+        assert rebuild_game([make_event(GameEventType.FINISH)]) is None
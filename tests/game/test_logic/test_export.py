@@ -0,0 +1,30 @@
+import json
+from datetime import datetime
+
+from app.game.const import GameStatus
+from app.store.game.export import format_csv, format_ndjson
+
+TEST_ROW = {
+    "id": 1,
+    "created_at": datetime(2026, 10, 19, 12, 30),
+    "status": GameStatus.FINISHED,
+    "diller_cards": ["Q♣️", "7♥️"],
+}
+
+
+class TestExportFormats:
+    def test_ndjson(self):
+        lines = format_ndjson([TEST_ROW, TEST_ROW]).splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0]) == {
+            "id": 1,
+            "created_at": "2026-10-19T12:30:00",
+            "status": "finished",
+            "diller_cards": ["Q♣️", "7♥️"],
+        }
+
+    def test_csv(self):
+        assert format_csv([TEST_ROW], list(TEST_ROW)) == (
+            "id,created_at,status,diller_cards\n"
+            '1,2026-10-19T12:30:00,finished,"[""Q♣️"", ""7♥️""]"\n'
+        )
@@ -0,0 +1,50 @@
+from app.store.game.leaderboard import TopBalances
+
+TEST_CHAT_ID = -100
+TEST_CAPACITY = 3
+
+
+def make_top(*values: int) -> TopBalances:
+    return TopBalances(
+        [((TEST_CHAT_ID, player_id), value) for player_id, value in values],
+        capacity=TEST_CAPACITY,
+    )
+
+
+class TestTopBalances:
+    def test_not_full_top_is_complete(self):
+        top = make_top((1, 1000), (2, 900))
+        top.update((TEST_CHAT_ID, 2), 1100)
+        top.update((TEST_CHAT_ID, 3), 10)
+
+        assert top.floor is None
+        assert top.can_serve(TEST_CAPACITY)
+        assert top.top(2) == [
+            ((TEST_CHAT_ID, 2), 1100),
+            ((TEST_CHAT_ID, 1), 1000),
+        ]
+
+    def test_overflow_raises_floor(self):
+        top = make_top((1, 1000), (2, 900))
+        top.update((TEST_CHAT_ID, 3), 800)
+        top.update((TEST_CHAT_ID, 4), 950)
+
+        assert top.floor == 800
+        assert len(top.values) == TEST_CAPACITY
+        assert [value for _, value in top.top(TEST_CAPACITY)] == [
+            1000,
+            950,
+            900,
+        ]
+
+    def test_balance_below_floor_is_dropped(self):
+        top = make_top((1, 1000), (2, 900), (3, 800))
+        assert top.floor == 800
+
+        top.update((TEST_CHAT_ID, 4), 500)
+        assert (TEST_CHAT_ID, 4) not in top.values
+
+        top.update((TEST_CHAT_ID, 1), 700)
+        assert (TEST_CHAT_ID, 1) not in top.values
+        assert top.can_serve(2)
+        assert not top.can_serve(TEST_CAPACITY)
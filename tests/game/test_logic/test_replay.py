@@ -0,0 +1,87 @@
+import pytest
+
+from app.game.const import DILLER_STOP_SCORE, GameAction
+from app.game.models import GameModel
+from app.game.replay import (
+    make_action,
+    parse_action,
+    replay_game,
+    restore_game_cards,
+)
+from app.game.shoe import Shoe
+from app.game.strategy import get_hand_state
+from app.store.game.manager import GameManager
+from app.web.exceptions import SeedlessGameError
+
+TEST_SEED = 42
+FIRST_PLAYER_ID, SECOND_PLAYER_ID = 1, 2
+
+
+class TestReplay:
+    def test_action_records(self):
+        record = make_action(GameAction.HIT, FIRST_PLAYER_ID)
+
+        assert record == "h:1"
+        assert parse_action(record) == (GameAction.HIT, FIRST_PLAYER_ID)
+        assert parse_action(make_action(GameAction.DILLER)) == (
+            GameAction.DILLER,
+            None,
+        )
+
+    def test_cards_dealt_in_actions_order(self):
+        cards = Shoe(TEST_SEED).draw_many(6)
+        actions = [
+            make_action(GameAction.BET, SECOND_PLAYER_ID),
+            make_action(GameAction.BET, FIRST_PLAYER_ID),
+            make_action(GameAction.HIT, SECOND_PLAYER_ID),
+            make_action(GameAction.STAND, FIRST_PLAYER_ID),
+        ]
+
+        replay = replay_game(TEST_SEED, actions)
+
+        assert replay.diller_cards == cards[:1]
+        assert replay.player_cards == {
+            SECOND_PLAYER_ID: [cards[1], cards[2], cards[5]],
+            FIRST_PLAYER_ID: cards[3:5],
+        }
+        assert replay.shoe.position == 6
+
+    def test_diller_takes_cards(self):
+        replay = replay_game(TEST_SEED, [make_action(GameAction.DILLER)])
+
+        assert len(replay.diller_cards) > 1
+        assert replay.diller_cards[0] == Shoe(TEST_SEED).draw()
+        assert get_hand_state(replay.diller_cards[:-1])[0] < DILLER_STOP_SCORE
+
+    def test_replay_is_deterministic(self):
+        actions = [
+            make_action(GameAction.BET, FIRST_PLAYER_ID),
+            make_action(GameAction.HIT, FIRST_PLAYER_ID),
+            make_action(GameAction.DILLER),
+        ]
+
+        assert (
+            replay_game(TEST_SEED, actions).diller_cards
+            == replay_game(TEST_SEED, actions).diller_cards
+        )
+
+    def test_restored_shoe_is_reused(self):
+        game = GameModel(
+            seed=TEST_SEED,
+            actions=[make_action(GameAction.BET, FIRST_PLAYER_ID)],
+            gameplays=[],
+        )
+        restore_game_cards(game)
+
+        shoe = GameManager._get_shoe(game)
+        assert shoe is game.shoe
+        assert shoe.position == 3
+        assert GameManager._get_shoe(game) is shoe
+
+    def test_seedless_game_is_rejected(self):
+        game = GameModel(id=1, seed=None, actions=[], gameplays=[])
+
+        with pytest.raises(SeedlessGameError):
+            restore_game_cards(game)
+        with pytest.raises(SeedlessGameError):
+            GameManager._get_shoe(game)
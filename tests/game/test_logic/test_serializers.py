@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import orjson
+
+from app.game.const import GameAction, GameStage, GameStatus, PlayerStatus
+from app.game.models import GameModel, GamePlayModel, PlayerModel
+from app.game.replay import make_action
+from app.game.schemes import GameSchema, PlayerSchema
+from app.game.serializers import (
+    serialize_game,
+    serialize_game_without_gameplays,
+    serialize_player,
+)
+from app.web.serializers import dump_json, serialize_many
+
+
+def make_game() -> GameModel:
+    return GameModel(
+        id=1,
+        chat_id=-100,
+        created_at=datetime(2026, 10, 19, 12, 30, 15, 250),
+        status=GameStatus.FINISHED,
+        stage=GameStage.SUMMARIZING,
+        diller_cards=["Q♣️", "7♥️"],
+        seed=42,
+        actions=[
+            make_action(GameAction.BET, 2),
+            make_action(GameAction.STAND, 2),
+            make_action(GameAction.DILLER),
+        ],
+        gameplays=[
+            GamePlayModel(
+                id=3,
+                game_id=1,
+                player_id=2,
+                player_bet=25,
+                player_status=PlayerStatus.WON,
+                player_cards=["K♠️", "Q♦️"],
+            )
+        ],
+    )
+
+
+def as_json(data: object) -> object:
+    return orjson.loads(dump_json(data))
+
+
+class TestSerializers:
+    def test_game_matches_schema(self):
+        game = make_game()
+        assert as_json(serialize_game(game)) == as_json(GameSchema().dump(game))
+        assert "gameplays" not in serialize_game_without_gameplays(game)
+
+    def test_player_matches_schema(self):
+        player = PlayerModel(id=1, username=None, first_name="Ann", tg_id=7)
+        assert serialize_player(player) == PlayerSchema().dump(player)
+
+    async def test_serialize_many_offloads_large_lists(self):
+        players = [
+            PlayerModel(id=i, username=None, first_name="Ann", tg_id=i)
+            for i in range(1500)
+        ]
+        rows = await serialize_many(serialize_player, players)
+        assert rows[-1]["id"] == 1499
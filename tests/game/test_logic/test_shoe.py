@@ -0,0 +1,40 @@
+from collections import Counter
+
+from app.game.const import CARDS, SHOE_DECKS_NUMBER, SHOE_PENETRATION
+from app.game.shoe import CARD_NAMES, Shoe
+
+TEST_SEED = 42
+
+
+class TestShoe:
+    def test_shuffled_shoe_contains_all_decks(self):
+        shoe = Shoe(TEST_SEED)
+
+        assert len(shoe.cards) == len(CARDS) * SHOE_DECKS_NUMBER
+        assert set(Counter(shoe.cards).values()) == {SHOE_DECKS_NUMBER}
+
+    def test_draw_advances_position(self):
+        shoe = Shoe(TEST_SEED)
+        first_card = CARD_NAMES[shoe.cards[0]]
+
+        assert shoe.draw() == first_card
+        assert shoe.position == 1
+        assert shoe.draw_many(2) == [
+            CARD_NAMES[shoe.cards[1]],
+            CARD_NAMES[shoe.cards[2]],
+        ]
+        assert shoe.position == 3
+
+    def test_same_seed_gives_same_cards(self):
+        assert Shoe(TEST_SEED).draw_many(300) == Shoe(TEST_SEED).draw_many(300)
+
+    def test_reshuffle_after_cut_card(self):
+        shoe = Shoe(TEST_SEED, decks_number=1)
+        cut_position = int(len(CARDS) * SHOE_PENETRATION)
+        first_order = shoe.cards
+
+        shoe.draw_many(cut_position + 1)
+
+        assert shoe.position == 1
+        assert shoe.cards != first_order
+        assert Counter(shoe.cards) == Counter(first_order)
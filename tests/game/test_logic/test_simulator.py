@@ -0,0 +1,44 @@
+import pytest
+
+from app.game.simulator import SimulationConfig, simulate
+
+
+class TestSimulator:
+    def test_same_seed_gives_same_result(self):
+        config = SimulationConfig(hands=10_000, seed=42)
+
+        assert simulate(config, batch_size=3_000) == simulate(
+            config, batch_size=3_000
+        )
+
+    def test_results_add_up(self):
+        result = simulate(SimulationConfig(hands=100_000, seed=42))
+
+        assert result.hands == 100_000
+        assert result.win_rate + result.loss_rate + result.tie_rate == (
+            pytest.approx(1)
+        )
+        assert result.rtp == pytest.approx(1 - result.house_edge)
+
+    def test_player_never_exceeds_when_never_taking_cards(self):
+        result = simulate(
+            SimulationConfig(hands=100_000, player_stop_score=0, seed=42)
+        )
+
+        assert result.exceeded_rate == 0
+
+    def test_black_jack_payout_raises_rtp(self):
+        config = SimulationConfig(hands=100_000, seed=42)
+        black_jack_config = SimulationConfig(
+            hands=100_000, black_jack_payout=1.5, seed=42
+        )
+
+        assert simulate(black_jack_config).rtp > simulate(config).rtp
+
+    @pytest.mark.parametrize(
+        "field", ["diller_stop_score", "black_jack", "player_stop_score"]
+    )
+    def test_scores_are_bounded(self, field: str):
+        # очки в int16 переполнились бы, и раздача не закончилась бы никогда
+        with pytest.raises(ValueError, match=field):
+            SimulationConfig(hands=10, **{field: 40_000})
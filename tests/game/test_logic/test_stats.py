@@ -0,0 +1,28 @@
+from app.game.const import PlayerStatus
+from app.game.models import GamePlayModel
+from app.game.stats import PlayerResult, get_player_result
+
+TEST_BET = 25
+
+
+class TestPlayerResult:
+    def test_balance_change(self):
+        assert PlayerResult(1, PlayerStatus.WON, TEST_BET).balance_change == (
+            TEST_BET
+        )
+        assert PlayerResult(1, PlayerStatus.TIE, TEST_BET).balance_change == 0
+        assert PlayerResult(
+            1, PlayerStatus.EXCEEDED, TEST_BET
+        ).balance_change == (-TEST_BET)
+
+    def test_black_jack_needs_two_cards(self):
+        gameplay = GamePlayModel(
+            player_id=1,
+            player_bet=TEST_BET,
+            player_status=PlayerStatus.WON,
+            player_cards=["A♠️", "K♥️"],
+        )
+        assert get_player_result(gameplay, 21).black_jack
+
+        gameplay.player_cards = ["7♠️", "7♥️", "7♦️"]
+        assert not get_player_result(gameplay, 21).black_jack
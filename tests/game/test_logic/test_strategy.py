@@ -0,0 +1,44 @@
+import pytest
+
+from app.game.const import PlayerAction
+from app.game.strategy import DILLER_BUST, get_hand_state, get_strategy_table
+
+
+class TestStrategyTable:
+    def test_diller_outcomes_are_distributions(self):
+        table = get_strategy_table()
+
+        for outcomes in table.diller_outcomes.values():
+            assert sum(outcomes.values()) == pytest.approx(1)
+            assert min(outcomes) >= table.diller_stop_score
+            assert max(outcomes) <= DILLER_BUST
+
+    @pytest.mark.parametrize(
+        ("cards", "state"),
+        [
+            (["10♦️", "6♠️"], (16, False)),
+            (["A♦️", "6♠️"], (17, True)),
+            (["A♦️", "A♠️"], (12, True)),
+            (["A♦️", "6♠️", "10♣️"], (17, False)),
+        ],
+    )
+    def test_hand_state(self, cards: list[str], state: tuple[int, bool]):
+        assert get_hand_state(cards) == state
+
+    def test_obvious_decisions(self):
+        table = get_strategy_table()
+
+        assert table.get_hint(["2♦️", "3♠️"], "10♣️").action == (PlayerAction.HIT)
+        assert table.get_hint(["10♦️", "Q♠️"], "10♣️").action == (
+            PlayerAction.STAND
+        )
+
+    def test_hint_is_best_expected_value(self):
+        table = get_strategy_table()
+
+        for hint in table.hints.values():
+            best_ev = max(hint.hit_ev, hint.stand_ev)
+            if hint.action == PlayerAction.HIT:
+                assert hint.hit_ev == best_ev
+            else:
+                assert hint.stand_ev == best_ev
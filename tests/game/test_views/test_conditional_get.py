@@ -0,0 +1,35 @@
+from aiohttp.test_utils import TestClient
+
+from app.game.models import PlayerModel
+from app.store import Store
+from tests.const import TEST_PLAYER_TG_ID
+
+
+class TestConditionalGet:
+    async def test_not_modified_until_write(
+        self, auth_cli: TestClient, store: Store, player: PlayerModel
+    ):
+        response = await auth_cli.get("/game.player.list")
+        assert response.status == 200
+        etag = response.headers["ETag"]
+        players = (await response.json())["data"]["players"]
+
+        response = await auth_cli.get(
+            "/game.player.list", headers={"If-None-Match": etag}
+        )
+        assert response.status == 304
+
+        # ответ из кеша совпадает с ответом из БД
+        response = await auth_cli.get("/game.player.list")
+        assert response.headers["ETag"] == etag
+        assert (await response.json())["data"]["players"] == players
+
+        await store.players.create_player(
+            username=None, tg_id=TEST_PLAYER_TG_ID + 1, first_name="Other"
+        )
+        response = await auth_cli.get(
+            "/game.player.list", headers={"If-None-Match": etag}
+        )
+        assert response.status == 200
+        assert response.headers["ETag"] != etag
+        assert len((await response.json())["data"]["players"]) == 2
@@ -0,0 +1,56 @@
+import gzip
+import json
+from contextlib import aclosing
+
+from aiohttp.test_utils import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.game.models import BalanceModel, GameModel
+from app.store import Store
+from app.store.game.export import ExportFormat, ExportTable
+
+
+class TestExportView:
+    async def test_unauthorized(self, cli: TestClient):
+        response = await cli.get("/game.export", params={"table": "games"})
+        assert response.status == 401
+
+    async def test_ndjson(self, auth_cli: TestClient, game: GameModel):
+        response = await auth_cli.get("/game.export", params={"table": "games"})
+        assert response.status == 200
+        assert response.headers["Content-Type"] == "application/x-ndjson"
+
+        [row] = [
+            json.loads(line) for line in (await response.text()).splitlines()
+        ]
+        assert row["id"] == game.id
+        assert row["diller_cards"] == game.diller_cards
+
+    async def test_gzipped_csv(
+        self, auth_cli: TestClient, balance: BalanceModel
+    ):
+        response = await auth_cli.get(
+            "/game.export",
+            params={"table": "balances", "format": "csv", "gzip": "true"},
+            auto_decompress=False,
+        )
+        assert response.status == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+
+        lines = gzip.decompress(await response.read()).decode().splitlines()
+        assert lines[0] == "id,chat_id,player_id,current_value"
+        assert lines[1] == (
+            f"{balance.id},{balance.chat_id},{balance.player_id},"
+            f"{balance.current_value}"
+        )
+
+    async def test_abandoned_export_releases_connection(
+        self, store: Store, db_engine: AsyncEngine, game: GameModel
+    ):
+        async with aclosing(
+            store.exports.export(ExportTable.GAMES, ExportFormat.NDJSON)
+        ) as chunks:
+            assert json.loads(await anext(chunks))["id"] == game.id
+            assert db_engine.pool.checkedout() == 1
+        # выгрузку бросили на первой пачке: курсор закрыт сразу
+        assert db_engine.pool.checkedout() == 0
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from aiohttp.test_utils import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.game.const import GameStatus
+from app.game.models import GameModel
+from tests.const import TEST_CHAT_ID, TEST_DILLER_CARD
+
+GAMES_NUMBER = 5
+
+
+class TestGameListView:
+    async def test_keyset_pages(
+        self,
+        auth_cli: TestClient,
+        db_sessionmaker: async_sessionmaker[AsyncSession],
+    ):
+        started_at = datetime(2026, 10, 19)
+        async with db_sessionmaker() as session:
+            session.add_all(
+                GameModel(
+                    chat_id=TEST_CHAT_ID,
+                    diller_cards=[TEST_DILLER_CARD],
+                    created_at=started_at + timedelta(minutes=number),
+                    status=(
+                        GameStatus.FINISHED if number % 2 else GameStatus.ACTIVE
+                    ),
+                )
+                for number in range(GAMES_NUMBER)
+            )
+            await session.commit()
+
+        game_ids: list[int] = []
+        params = {"limit": 2, "chat_id": TEST_CHAT_ID}
+        while True:
+            response = await auth_cli.get("/game.list", params=params)
+            assert response.status == 200
+            data = (await response.json())["data"]
+            game_ids.extend(game["id"] for game in data["games"])
+            assert all("gameplays" not in game for game in data["games"])
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        assert game_ids == list(range(GAMES_NUMBER, 0, -1))
+
+        response = await auth_cli.get(
+            "/game.list",
+            params={"status": "finished", "with_gameplays": "true"},
+        )
+        games = (await response.json())["data"]["games"]
+        assert [game["id"] for game in games] == [4, 2]
+        assert all(game["gameplays"] == [] for game in games)
+
+    async def test_invalid_cursor(self, auth_cli: TestClient):
+        response = await auth_cli.get("/game.list", params={"cursor": "!!!"})
+        assert response.status == 400
@@ -0,0 +1,51 @@
+import pytest
+from aiohttp.test_utils import TestClient
+
+from app.game.const import DILLER_STOP_SCORE
+from app.store import Store
+
+
+class TestSimulationView:
+    async def test_unauthorized(self, cli: TestClient):
+        response = await cli.post("/game.simulate", json={})
+        assert response.status == 401
+
+        data = await response.json()
+        assert data["status"] == "unauthorized"
+
+    async def test_success(self, auth_cli: TestClient):
+        response = await auth_cli.post(
+            "/game.simulate", json={"hands": 10_000, "seed": 42}
+        )
+        assert response.status == 200
+
+        data = await response.json()
+        assert data["status"] == "ok"
+        assert data["data"]["hands"] == 10_000
+        assert data["data"]["config"]["diller_stop_score"] == DILLER_STOP_SCORE
+        assert 0 < data["data"]["rtp"] < 2
+
+    async def test_too_many_hands(self, auth_cli: TestClient):
+        response = await auth_cli.post("/game.simulate", json={"hands": 10**12})
+        assert response.status == 400
+
+    @pytest.mark.parametrize(
+        "rules",
+        [
+            {"diller_stop_score": 40_000},
+            {"black_jack": 40_000},
+            {"player_stop_score": 22},
+        ],
+    )
+    async def test_scores_out_of_range(self, auth_cli: TestClient, rules: dict):
+        response = await auth_cli.post(
+            "/game.simulate", json={"hands": 10} | rules
+        )
+        assert response.status == 400
+
+    async def test_one_simulation_at_a_time(
+        self, auth_cli: TestClient, store: Store
+    ):
+        async with store.simulations.semaphore:
+            response = await auth_cli.post("/game.simulate", json={"hands": 10})
+        assert response.status == 429
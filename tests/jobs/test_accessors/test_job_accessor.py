@@ -0,0 +1,76 @@
+from app.jobs.const import JobKind, JobStatus
+from app.jobs.models import JobModel
+from app.store import Store
+from tests.const import TEST_CHAT_ID
+
+TEST_NODE = "node-1"
+OTHER_TEST_NODE = "node-2"
+TEST_PAYLOAD = {"chat_id": TEST_CHAT_ID, "game_id": 1}
+
+
+class TestJobAccessor:
+    async def test_claim_only_due_jobs(self, store: Store):
+        due_job: JobModel = await store.jobs.create_job(
+            JobKind.START_BETTING_STAGE, TEST_PAYLOAD
+        )
+        await store.jobs.create_job(
+            JobKind.CANCEL_GAME_DUE_TO_TIMER, TEST_PAYLOAD, delay_seconds=60
+        )
+
+        claimed = await store.jobs.claim_jobs(TEST_NODE, 10, 60)
+
+        assert [(job.id, previous) for job, previous in claimed] == [
+            (due_job.id, None)
+        ]
+        assert claimed[0][0].locked_by == TEST_NODE
+        assert claimed[0][0].attempts == 1
+        assert claimed[0][0].payload == TEST_PAYLOAD
+
+    async def test_leased_job_is_not_claimed_twice(self, store: Store):
+        await store.jobs.create_job(JobKind.START_BETTING_STAGE, TEST_PAYLOAD)
+
+        assert len(await store.jobs.claim_jobs(TEST_NODE, 10, 60)) == 1
+        assert await store.jobs.claim_jobs(OTHER_TEST_NODE, 10, 60) == []
+
+    async def test_expired_lease_is_claimed_by_other_node(self, store: Store):
+        await store.jobs.create_job(JobKind.START_BETTING_STAGE, TEST_PAYLOAD)
+        await store.jobs.claim_jobs(TEST_NODE, 10, -1)
+
+        claimed = await store.jobs.claim_jobs(OTHER_TEST_NODE, 10, 60)
+
+        assert len(claimed) == 1
+        job, previous_locked_by = claimed[0]
+        assert previous_locked_by == TEST_NODE
+        assert job.attempts == 2
+        assert not await store.jobs.complete_job(job.id, TEST_NODE)
+        assert await store.jobs.complete_job(job.id, OTHER_TEST_NODE)
+
+    async def test_fail_job_retries_then_marks_failed(self, store: Store):
+        await store.jobs.create_job(
+            JobKind.START_BETTING_STAGE, TEST_PAYLOAD, max_attempts=1
+        )
+        [(job, _)] = await store.jobs.claim_jobs(TEST_NODE, 10, 60)
+
+        failed_job = await store.jobs.fail_job(job, TEST_NODE, "error")
+
+        assert failed_job.status == JobStatus.FAILED
+        assert failed_job.last_error == "error"
+        assert failed_job.locked_by is None
+        assert (await store.jobs.count_jobs())["failed"] == 1
+
+    async def test_cancel_jobs_by_payload(self, store: Store):
+        await store.jobs.create_job(
+            JobKind.CANCEL_GAME_DUE_TO_TIMER, TEST_PAYLOAD, delay_seconds=60
+        )
+        await store.jobs.create_job(
+            JobKind.CANCEL_GAME_DUE_TO_TIMER,
+            {**TEST_PAYLOAD, "game_id": 2},
+            delay_seconds=60,
+        )
+
+        cancelled = await store.jobs.cancel_jobs(
+            JobKind.CANCEL_GAME_DUE_TO_TIMER, {"game_id": 1}
+        )
+
+        assert cancelled == 1
+        assert (await store.jobs.count_jobs())["pending"] == 1
@@ -0,0 +1,33 @@
+from app.store.versions import Resource, ResourceVersions
+from app.web.cache import ResponseCache
+
+
+class TestResourceVersions:
+    def test_bump_changes_only_own_version(self):
+        versions = ResourceVersions()
+        games_version = versions.get_version(Resource.GAMES)
+        players_version = versions.get_version(Resource.PLAYERS)
+
+        versions.bump_table("gameplays")
+
+        assert versions.get_version(Resource.GAMES) != games_version
+        assert versions.get_version(Resource.PLAYERS) == players_version
+
+
+class TestResponseCache:
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put(("games", "1", "/a"), b"a")
+        cache.put(("games", "1", "/b"), b"b")
+        assert cache.get(("games", "1", "/a")) == b"a"
+
+        cache.put(("games", "1", "/c"), b"c")
+
+        assert cache.get(("games", "1", "/b")) is None
+        assert cache.get(("games", "1", "/a")) == b"a"
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_large_body_is_not_cached(self):
+        cache = ResponseCache(max_body_size=1)
+        cache.put(("games", "1", "/a"), b"ab")
+        assert cache.get(("games", "1", "/a")) is None
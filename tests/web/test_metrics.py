@@ -0,0 +1,16 @@
+from aiohttp.test_utils import TestClient
+
+from app.game.models import GameModel
+
+
+class TestMetricsView:
+    async def test_metrics(self, cli: TestClient, game: GameModel):
+        response = await cli.get("/metrics")
+        assert response.status == 200
+        assert response.content_type == "text/plain"
+
+        text = await response.text()
+        assert 'bot_active_games{stage="waiting_for_players_to_join"} 1' in text
+        assert "# TYPE bot_handler_seconds histogram" in text
+        assert "bot_router_queue_depth 0" in text
+        assert "bot_timers_pending 0" in text
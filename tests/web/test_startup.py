@@ -0,0 +1,79 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from aiohttp.pytest_plugin import AiohttpClient
+
+from app.store import Store
+from app.web.app import Application
+from app.web.config import AdminConfig, Config, StorageBackend, StorageConfig
+from app.web.docs import DOCS_JSON_URL, build_spec, setup_docs
+from app.web.routes import setup_routes
+
+# модули, которые не нужны для обработки updates и грузятся по требованию
+LAZY_MODULES = ("numpy", "app.game.simulator", "app.store.memory.accessor")
+ROOT_PATH = Path(__file__).parents[2]
+
+
+class TestStartup:
+    def test_heavy_modules_are_not_imported(self):
+        config_path = str(ROOT_PATH / "tests" / "config.yml")
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys\n"
+                "from app.web.app import setup_app\n"
+                f"setup_app({config_path!r})\n"
+                f"print([name for name in {LAZY_MODULES!r}"
+                " if name in sys.modules])",
+            ],
+            cwd=ROOT_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
+
+    async def test_prebuilt_spec_is_served(
+        self, tmp_path: Path, aiohttp_client: AiohttpClient
+    ):
+        spec = build_spec()
+        assert "/game.list" in spec["paths"]
+        spec_path = tmp_path / "openapi.json"
+        spec_path.write_text(json.dumps(spec))
+
+        app = Application()
+        setup_routes(app)
+        setup_docs(app, str(spec_path))
+        client = await aiohttp_client(app)
+
+        response = await client.get(DOCS_JSON_URL)
+        assert response.status == 200
+        assert await response.json() == spec
+
+    async def test_ready_after_warmup(self, aiohttp_client: AiohttpClient):
+        app = Application()
+        app.config = Config(
+            admin=AdminConfig(email="admin@admin.com", password="admin"),
+            storage=StorageConfig(backend=StorageBackend.MEMORY),
+        )
+        app.store = Store(app)
+        app.on_startup.clear()  # без Bot API и фоновых задач
+        app.on_cleanup.clear()
+        setup_routes(app)
+        client = await aiohttp_client(app)
+
+        response = await client.get("/ready")
+        assert response.status == 503
+
+        with app.store.warmup.step("bot_api"):
+            raise ConnectionError
+        app.store.warmup.set_ready()
+        response = await client.get("/ready")
+        assert response.status == 200
+        [step] = (await response.json())["data"]["steps"]
+        assert step["name"] == "bot_api"
+        assert step["error"] == "ConnectionError()"